@@ -6,9 +6,13 @@ Machine Learning in Finance - Przykład
 """
 
 import pandas as pd
-import numpy as np
 from sklearn.preprocessing import StandardScaler
 import warnings
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from genius_feature_store import FeatureStore
 
 warnings.filterwarnings('ignore')
 
@@ -25,63 +29,24 @@ except FileNotFoundError:
     print("⚠ Plik nie znaleziony. Uruchom najpierw 1_Data_Collection.py")
     exit(1)
 
-# Techniczne wskaźniki
+# Techniczne i fundamentalne wskaźniki - definicja 'ml_finance' w genius_feature_store,
+# zmaterializowana w data/feature_store (kolejne uruchomienia liczą tylko nowe dni)
 print("\n[2] Dodawanie wskaźników technicznych...")
 
-# MACD (Moving Average Convergence Divergence)
-df['EMA_12'] = df['Close'].ewm(span=12).mean()
-df['EMA_26'] = df['Close'].ewm(span=26).mean()
-df['MACD'] = df['EMA_12'] - df['EMA_26']
-df['Signal'] = df['MACD'].ewm(span=9).mean()
-df['MACD_Hist'] = df['MACD'] - df['Signal']
-print("  ✓ MACD")
+store = FeatureStore()
+features = store.materialize('training_data', '1d', df, 'ml_finance')
+features = features.reindex(pd.DatetimeIndex(pd.to_datetime(df['Date'])))
+for column in features.columns:
+    df[column] = features[column].to_numpy()
 
-# Bollinger Bands
-sma = df['Close'].rolling(window=20).mean()
-std = df['Close'].rolling(window=20).std()
-df['BB_Upper'] = sma + (std * 2)
-df['BB_Lower'] = sma - (std * 2)
-df['BB_Middle'] = sma
+print("  ✓ MACD")
 print("  ✓ Bollinger Bands")
-
-# ATR (Average True Range)
-df['TR'] = np.maximum(
-    df['High'] - df['Low'],
-    np.maximum(
-        abs(df['High'] - df['Close'].shift(1)),
-        abs(df['Low'] - df['Close'].shift(1))
-    )
-)
-df['ATR'] = df['TR'].rolling(window=14).mean()
 print("  ✓ ATR (Average True Range)")
-
-# Stochastic Oscillator
-df['Lowest_Low'] = df['Low'].rolling(window=14).min()
-df['Highest_High'] = df['High'].rolling(window=14).max()
-df['K%'] = 100 * ((df['Close'] - df['Lowest_Low']) / 
-                  (df['Highest_High'] - df['Lowest_Low']))
-df['D%'] = df['K%'].rolling(window=3).mean()
 print("  ✓ Stochastic Oscillator")
 
-# Wskaźniki fundamentalne
 print("\n[3] Dodawanie wskaźników fundamentalnych...")
-
-# Momentum
-df['Momentum'] = df['Close'] - df['Close'].shift(10)
 print("  ✓ Momentum")
-
-# Rate of Change (ROC)
-df['ROC'] = ((df['Close'] - df['Close'].shift(12)) / 
-             df['Close'].shift(12) * 100)
 print("  ✓ Rate of Change")
-
-# CCI (Commodity Channel Index)
-typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-sma_tp = typical_price.rolling(window=20).mean()
-mad = typical_price.rolling(window=20).apply(
-    lambda x: abs(x - x.mean()).mean()
-)
-df['CCI'] = (typical_price - sma_tp) / (0.015 * mad)
 print("  ✓ CCI (Commodity Channel Index)")
 
 # Normalizacja
@@ -87,7 +87,7 @@ class AdvancedLiveBot:
         )
         
         # Try to load previous learning
-        self.brain.load_brain("trading_brain.pkl")
+        self.brain.load_brain("trading_brain.npz")
         
     def fetch_live_data(self, num_candles: int = 200) -> pd.DataFrame:
         """Pobierz LIVE dane z rynku"""
@@ -678,7 +678,7 @@ class AdvancedLiveBot:
         self.brain.print_learning_report()
         
         # Save learned brain
-        self.brain.save_brain("trading_brain.pkl")
+        self.brain.save_brain("trading_brain.npz")
         print(f"\n{Fore.GREEN}[✓] AI Brain saved for future sessions{Style.RESET_ALL}\n")
         
         print(f"\n{Fore.CYAN}{'='*100}{Style.RESET_ALL}\n")
@@ -118,6 +118,45 @@ class AdvancedMarketLevels:
             'equal_lows': eql_list,
         }
     
+    @staticmethod
+    def label_wyckoff_phases(close: pd.Series, volume: pd.Series) -> pd.DataFrame:
+        """
+        Fazy Wyckoffa dla każdej świecy (okno 40 świec wokół świecy: i-20 .. i+19),
+        liczone operacjami rolling. Świece bez pełnego okna / bez fazy: phase=None.
+        
+        Returns:
+            DataFrame: phase, signal_strength
+        """
+        n = len(close)
+        prices = close.values.astype(float)
+        vol = volume.values.astype(float)
+        
+        trend = np.full(n, np.nan)
+        if n >= 41:
+            trend[20:n - 20] = (prices[39:n - 1] - prices[:n - 40]) / prices[:n - 40]
+        # Średni wolumen okna - trend = NaN poza oknem, więc brzegi odpadają same
+        avg_volume = pd.Series(vol).rolling(40).mean().shift(-19).values
+        
+        accumulation = (np.abs(trend) < 0.01) & (vol > avg_volume * 1.5)
+        markup = (trend > 0.02) & (vol > avg_volume)
+        distribution = (trend < 0.02) & (trend > -0.01) & (vol > avg_volume * 2)
+        markdown = (trend < -0.02) & (vol > avg_volume)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            conditions = [accumulation, markup, distribution, markdown]
+            phase = np.select(conditions, ['ACCUMULATION', 'MARKUP', 'DISTRIBUTION', 'MARKDOWN'], default=None)
+            strength = np.select(conditions, [
+                np.minimum(vol / (avg_volume * 1.5), 2.0),
+                np.minimum(trend / 0.05, 2.0),
+                np.minimum(vol / (avg_volume * 2), 2.0),
+                np.minimum(np.abs(trend) / 0.05, 2.0)
+            ], default=np.nan)
+        
+        return pd.DataFrame({
+            'phase': pd.Series(phase, index=close.index, dtype=object),
+            'signal_strength': strength
+        }, index=close.index)
+    
     @staticmethod
     def detect_wyckoff_phases(close: pd.Series, volume: pd.Series) -> List[Dict]:
         """
@@ -127,53 +166,17 @@ class AdvancedMarketLevels:
         3. Distribution (szczyt, rosnący wolumen)
         4. Mark-Down (trend spadkowy)
         """
-        phases = []
-        
         if len(close) < 50:
-            return phases
+            return []
         
-        for i in range(20, len(close) - 20):
-            window = close.iloc[i-20:i+20]
-            volume_window = volume.iloc[i-20:i+20]
-            
-            # Oblicz trend w oknie
-            trend = (window.iloc[-1] - window.iloc[0]) / window.iloc[0]
-            avg_volume = volume_window.mean()
-            current_volume = volume.iloc[i]
-            
-            # Accumulation: boczny, podwyższony wolumen
-            if abs(trend) < 0.01 and current_volume > avg_volume * 1.5:
-                phases.append({
-                    'index': i,
-                    'phase': 'ACCUMULATION',
-                    'signal_strength': min(current_volume / (avg_volume * 1.5), 2.0)
-                })
-            
-            # Mark-Up: trend wzrostowy
-            elif trend > 0.02 and current_volume > avg_volume:
-                phases.append({
-                    'index': i,
-                    'phase': 'MARKUP',
-                    'signal_strength': min(trend / 0.05, 2.0)
-                })
-            
-            # Distribution: szczyt, rosnący wolumen
-            elif trend < 0.02 and trend > -0.01 and current_volume > avg_volume * 2:
-                phases.append({
-                    'index': i,
-                    'phase': 'DISTRIBUTION',
-                    'signal_strength': min(current_volume / (avg_volume * 2), 2.0)
-                })
-            
-            # Mark-Down: trend spadkowy
-            elif trend < -0.02 and current_volume > avg_volume:
-                phases.append({
-                    'index': i,
-                    'phase': 'MARKDOWN',
-                    'signal_strength': min(abs(trend) / 0.05, 2.0)
-                })
+        labels = AdvancedMarketLevels.label_wyckoff_phases(close, volume)
+        phases = labels['phase'].values
+        strengths = labels['signal_strength'].values
         
-        return phases
+        return [
+            {'index': int(i), 'phase': phases[i], 'signal_strength': float(strengths[i])}
+            for i in np.flatnonzero(pd.notna(phases))
+        ]
     
     @staticmethod
     def calculate_liquidity_levels(orderbook_data: Dict = None, price: float = 0) -> Dict:
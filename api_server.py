@@ -22,6 +22,8 @@ import numpy as np
 import asyncio
 import random
 
+from trading_bot.strategies.session_calendar import SessionCalendar, SessionZone
+
 # AI/ML Modules Integration
 try:
     from sentiment_analyzer import SentimentAnalyzer
@@ -838,60 +840,34 @@ def build_analytics_snapshot():
     return snapshot
 
 
+KILLZONE_CALENDAR = SessionCalendar([
+    SessionZone('asia', '00:00', '06:00', 'low', 'Asia Range'),
+    SessionZone('london', '07:00', '10:00', 'high', 'London Open'),
+    SessionZone('newyork_am', '13:00', '16:00', 'high', 'NY Open'),
+    SessionZone('newyork_pm', '19:00', '21:00', 'medium', 'NY PM Sweep'),
+], tz='UTC')
+
+
 def update_killzone_snapshot():
     now = datetime.utcnow()
-    zones = [
-        {
-            'name': 'asia',
-            'label': 'Asia Range',
-            'start_hour': 0,
-            'end_hour': 6,
-            'priority': 'low'
-        },
-        {
-            'name': 'london',
-            'label': 'London Open',
-            'start_hour': 7,
-            'end_hour': 10,
-            'priority': 'high'
-        },
-        {
-            'name': 'newyork_am',
-            'label': 'NY Open',
-            'start_hour': 13,
-            'end_hour': 16,
-            'priority': 'high'
-        },
-        {
-            'name': 'newyork_pm',
-            'label': 'NY PM Sweep',
-            'start_hour': 19,
-            'end_hour': 21,
-            'priority': 'medium'
-        }
-    ]
 
     overlays = []
-    current_zone = None
-    upcoming_zone = None
-    minutes_now = now.hour * 60 + now.minute
-
-    for zone in zones:
-        start_minute = zone['start_hour'] * 60
-        end_minute = zone['end_hour'] * 60
+    for zone in KILLZONE_CALENDAR.zones:
         overlays.append({
-            'name': zone['name'],
-            'label': zone['label'],
-            'startTime': f"{zone['start_hour']:02d}:00",
-            'endTime': f"{zone['end_hour']:02d}:00",
-            'startMinute': start_minute,
-            'endMinute': end_minute,
-            'priority': zone['priority']
+            'name': zone.name,
+            'label': zone.label,
+            'startTime': zone.start,
+            'endTime': zone.end,
+            'startMinute': zone.start_minute,
+            'endMinute': zone.end_minute,
+            'priority': zone.priority
         })
-        if start_minute <= minutes_now < end_minute:
-            current_zone = overlays[-1]
-        elif minutes_now < start_minute and upcoming_zone is None:
-            upcoming_zone = overlays[-1]
+    overlay_by_name = {overlay['name']: overlay for overlay in overlays}
+
+    current = KILLZONE_CALENDAR.current_zone(now)
+    upcoming = KILLZONE_CALENDAR.next_zone(now)
+    current_zone = overlay_by_name[current['name']] if current else None
+    upcoming_zone = overlay_by_name[upcoming['name']] if upcoming else None
 
     snapshot = {
         'ok': True,
@@ -10,6 +10,9 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
+from genius_monte_carlo import MonteCarloEngine, ReturnModel
+from genius_drawdown import max_drawdown
+
 logger = logging.getLogger(__name__)
 
 # Backtrader import
@@ -238,9 +241,7 @@ class BacktestEngine:
         sharpe = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
         
         cumulative = (1 + returns).cumprod()
-        running_max = cumulative.cummax()
-        drawdown = ((cumulative - running_max) / running_max) * 100
-        max_dd = drawdown.min()
+        max_dd = max_drawdown(cumulative.values) * 100
         
         return {
             'status': 'simple_backtest',
@@ -293,7 +294,8 @@ class BacktestEngine:
     
     def monte_carlo_simulation(self, returns: pd.Series, 
                               num_simulations: int = 1000,
-                              periods: int = 252) -> Dict[str, Any]:
+                              periods: int = 252,
+                              seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Monte Carlo simulation for risk assessment
         
@@ -301,23 +303,18 @@ class BacktestEngine:
             returns: Historical returns
             num_simulations: Number of simulation runs
             periods: Forecast periods (252 = 1 year)
+            seed: Random seed for reproducible runs
             
         Returns:
             Simulation results with confidence intervals
         """
-        mean_return = returns.mean()
-        std_return = returns.std()
-        
-        simulations = np.zeros((num_simulations, periods))
-        
-        for i in range(num_simulations):
-            # Generate random returns
-            random_returns = np.random.normal(mean_return, std_return, periods)
-            # Calculate cumulative returns
-            simulations[i] = (1 + random_returns).cumprod()
+        model = ReturnModel(kind='normal', mu=float(returns.mean()), sigma=float(returns.std()))
+        result = MonteCarloEngine(seed=seed).simulate(
+            model, num_simulations, horizons=(periods,), confidences=(0.95,), keep_terminal=True
+        )
         
         # Calculate percentiles
-        final_values = simulations[:, -1]
+        final_values = 1.0 + result.terminal[:, 0].astype(np.float64)
         percentiles = {
             '5th': np.percentile(final_values, 5),
             '25th': np.percentile(final_values, 25),
@@ -18,6 +18,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import requests
 
+from genius_drawdown import max_drawdown
+
 # Konfiguracja
 TWELVE_DATA_API_KEY = os.environ.get('TWELVE_DATA_API_KEY', 'd54ad684cd8f40de895ec569d6128821')
 BACKTEST_DATA_DIR = 'backtest_data'
@@ -577,14 +579,8 @@ def run_backtest(
     total_losses = abs(sum(t.pnl_usd for t in losing_trades))
     profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
     
-    # Max Drawdown
-    peak = initial_capital
-    max_dd = 0
-    for eq in equity_curve:
-        if eq > peak:
-            peak = eq
-        dd = (peak - eq) / peak * 100
-        max_dd = max(max_dd, dd)
+    # Max Drawdown (krzywa zaczyna się od kapitału początkowego)
+    max_dd = -max_drawdown(equity_curve) * 100
     
     # Sharpe Ratio (simplified)
     returns = []
@@ -23,6 +23,9 @@ import logging
 import json
 import os
 
+from genius_monte_carlo import MonteCarloEngine, ReturnModel
+from genius_drawdown import running_peak
+
 # Try imports
 try:
     import yfinance as yf
@@ -484,18 +487,12 @@ class GeniusBacktestEngine:
         downside_std = np.std(negative_returns) if len(negative_returns) > 0 else 0.0001
         sortino = np.mean(excess_returns) / downside_std * np.sqrt(365) if downside_std > 0 else 0
         
-        # Max drawdown
-        peak = equity_array[0]
-        max_dd = 0
-        max_dd_pct = 0
-        for eq in equity_array:
-            if eq > peak:
-                peak = eq
-            dd = peak - eq
-            dd_pct = dd / peak * 100 if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-                max_dd_pct = dd_pct
+        # Max drawdown (w dolarach; % liczony przy najgłębszym spadku kwotowym)
+        peak = running_peak(equity_array)
+        dd = peak - equity_array
+        worst = int(np.argmax(dd))
+        max_dd = max(float(dd[worst]), 0.0)
+        max_dd_pct = max_dd / peak[worst] * 100 if max_dd > 0 and peak[worst] > 0 else 0
         
         # Calmar ratio
         calmar = annualized_return / max_dd_pct if max_dd_pct > 0 else 0
@@ -563,39 +560,25 @@ class GeniusBacktestEngine:
         )
     
     def monte_carlo_simulation(self, result: BacktestResult, 
-                                num_simulations: int = 1000) -> Dict:
+                                num_simulations: int = 1000,
+                                seed: Optional[int] = None) -> Dict:
         """
         Monte Carlo simulation to estimate strategy robustness
+        
+        Trade returns are bootstrapped (with replacement) into equity paths.
         """
         if not result or not result.trades:
             return {}
         
-        trade_returns = [t.pnl_pct for t in result.trades]
-        
-        final_returns = []
-        max_drawdowns = []
+        trade_returns = np.array([t.pnl_pct for t in result.trades], dtype=np.float64) / 100
+        model = ReturnModel(kind='bootstrap', sample=trade_returns)
+        simulated = MonteCarloEngine(seed=seed).simulate(
+            model, num_simulations, horizons=(len(trade_returns),), confidences=(0.95,),
+            keep_terminal=True, track_drawdown=True
+        )
         
-        for _ in range(num_simulations):
-            # Shuffle trade returns
-            shuffled = np.random.choice(trade_returns, size=len(trade_returns), replace=True)
-            
-            # Calculate equity curve
-            equity = [100]
-            for ret in shuffled:
-                equity.append(equity[-1] * (1 + ret/100))
-            
-            final_returns.append(equity[-1] - 100)
-            
-            # Calculate max drawdown
-            peak = equity[0]
-            max_dd = 0
-            for eq in equity:
-                if eq > peak:
-                    peak = eq
-                dd = (peak - eq) / peak * 100
-                if dd > max_dd:
-                    max_dd = dd
-            max_drawdowns.append(max_dd)
+        final_returns = simulated.terminal[:, 0].astype(np.float64) * 100
+        max_drawdowns = simulated.max_drawdown * 100
         
         return {
             'simulations': num_simulations,
@@ -611,7 +594,7 @@ class GeniusBacktestEngine:
                 '50th': round(np.percentile(max_drawdowns, 50), 2),
                 '95th': round(np.percentile(max_drawdowns, 95), 2)
             },
-            'probability_profit': round(sum(1 for r in final_returns if r > 0) / num_simulations * 100, 1),
+            'probability_profit': round(float((final_returns > 0).mean()) * 100, 1),
             'expected_return': round(np.mean(final_returns), 2),
             'return_std': round(np.std(final_returns), 2)
         }
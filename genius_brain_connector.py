@@ -816,11 +816,16 @@ class ModuleLoader:
         - Bid walls = SUPPORT
         - Ask walls = RESISTANCE
         - Imbalance = przewaga kupujących/sprzedających
+        
+        Najpierw lokalna księga L2 (diff stream), REST tylko jako fallback.
         """
         try:
-            from orderbook_depth_analyzer import get_orderbook_signal
+            from order_flow_engine import get_local_orderbook_signal
             
-            result = get_orderbook_signal(symbol)
+            result = get_local_orderbook_signal(symbol)
+            if result is None:
+                from orderbook_depth_analyzer import get_orderbook_signal
+                result = get_orderbook_signal(symbol)
             
             reasons = [
                 f"Imbalance: {result.get('imbalance', 0):.2f}",
@@ -0,0 +1,190 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    GENIUS DRAWDOWN ANALYTICS v1.0                             ║
+║                    Vectorized Drawdowns for Risk & Backtests                 ║
+║                                                                              ║
+║  Features:                                                                   ║
+║  • Running peak / drawdown series (NaN-tolerant, 1-D or stacked paths)      ║
+║  • Max drawdown in one pass - no Python loops over the equity curve         ║
+║  • Underwater episodes via run-length encoding                              ║
+║  • Per-episode depth / trough / duration / recovery (np.minimum.reduceat)   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Any
+from dataclasses import dataclass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DRAWDOWN SERIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def running_peak(equity, axis: int = -1) -> np.ndarray:
+    """High-water mark of an equity curve (NaN bars are skipped, like pandas cummax)"""
+    return np.fmax.accumulate(np.asarray(equity, dtype=np.float64), axis=axis)
+
+
+def drawdown_series(equity, axis: int = -1) -> np.ndarray:
+    """Drawdown from the running peak as a negative fraction (0 at new highs)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return equity / running_peak(equity, axis=axis) - 1.0
+
+
+def max_drawdown(equity, axis: int = -1):
+    """
+    Maximum drawdown as a negative fraction
+
+    1-D curve -> float; stacked curves (e.g. Monte Carlo paths) -> array along `axis`
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[axis] == 0:
+        return 0.0 if equity.ndim == 1 else np.zeros(np.delete(equity.shape, axis))
+    drawdown = drawdown_series(equity, axis=axis)
+    with np.errstate(invalid='ignore'):
+        result = np.fmin.reduce(drawdown, axis=axis)
+    result = np.where(np.isnan(result), 0.0, result)
+    return float(result) if equity.ndim == 1 else result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# UNDERWATER EPISODES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _runs(mask: np.ndarray):
+    """Run-length encoding of True stretches -> (starts, ends) with exclusive ends"""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+@dataclass
+class DrawdownEpisodes:
+    """Columnar set of underwater episodes (positions are bar indices)"""
+    start: np.ndarray    # first bar under the threshold
+    trough: np.ndarray   # deepest bar of the episode
+    end: np.ndarray      # first bar back above the threshold, -1 = still underwater
+    depth: np.ndarray    # deepest drawdown (negative fraction)
+    n_bars: int
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def recovered(self) -> np.ndarray:
+        return self.end >= 0
+
+    @property
+    def duration(self) -> np.ndarray:
+        """Bars spent underwater (open episodes count up to the last bar)"""
+        return np.where(self.recovered, self.end, self.n_bars) - self.start
+
+    @property
+    def recovery(self) -> np.ndarray:
+        """Bars from trough back to the threshold (-1 while still underwater)"""
+        return np.where(self.recovered, self.end - self.trough, -1)
+
+    def worst(self, k: Optional[int] = None) -> np.ndarray:
+        """Episode positions ordered from deepest to shallowest"""
+        order = np.argsort(self.depth, kind='stable')
+        return order if k is None else order[:k]
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Episodes as a DataFrame; with an index the positions become labels"""
+        frame = pd.DataFrame({
+            'start': self.start,
+            'trough': self.trough,
+            'end': self.end,
+            'depth': self.depth,
+            'duration': self.duration,
+            'recovery': self.recovery
+        })
+        if index is not None:
+            labels = np.asarray(index)
+            frame['start'] = labels[self.start]
+            frame['trough'] = labels[self.trough]
+            ends = labels[np.where(self.recovered, self.end, 0)]
+            frame['end'] = pd.Series(ends).where(self.recovered, None)
+        return frame
+
+
+def drawdown_episodes(drawdown, threshold: float = 0.0) -> DrawdownEpisodes:
+    """
+    Underwater episodes of a drawdown series (see drawdown_series)
+
+    An episode is a maximal stretch with drawdown < threshold. Because every
+    bar between two episodes sits at or above the threshold, the minimum of
+    each [start_i, start_{i+1}) block is that episode's depth, so a single
+    np.minimum.reduceat gives all depths.
+    """
+    drawdown = np.asarray(drawdown, dtype=np.float64)
+    n = len(drawdown)
+    underwater = drawdown < threshold  # NaN nigdy nie jest pod wodą
+    starts, ends = _runs(underwater)
+
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return DrawdownEpisodes(empty, empty, empty, np.empty(0), n)
+
+    filled = np.where(underwater, drawdown, np.inf)
+    depth = np.minimum.reduceat(filled, starts)
+
+    # Dołek = pierwszy słupek epizodu równy jego głębokości
+    lengths = ends - starts
+    episode = np.repeat(np.arange(len(starts)), lengths)
+    bars = np.flatnonzero(underwater)
+    hits = filled[bars] == depth[episode]
+    _, first = np.unique(episode[hits], return_index=True)
+    trough = bars[hits][first]
+
+    end = np.where(ends < n, ends, -1)
+    return DrawdownEpisodes(starts, trough, end, depth, n)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SUMMARY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def drawdown_summary(equity) -> Dict[str, Any]:
+    """
+    Headline drawdown statistics of one equity curve (positions are bar indices)
+
+    Returns:
+        max_drawdown, trough, peak, recovery (None if not recovered),
+        current_drawdown, avg_drawdown, time_underwater (fraction of bars),
+        max_duration (bars), n_episodes
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    drawdown = drawdown_series(equity)
+    episodes = drawdown_episodes(drawdown)
+
+    if len(episodes) == 0:
+        return {
+            'max_drawdown': 0.0,
+            'trough': None,
+            'peak': None,
+            'recovery': None,
+            'current_drawdown': 0.0,
+            'avg_drawdown': 0.0,
+            'time_underwater': 0.0,
+            'max_duration': 0,
+            'n_episodes': 0
+        }
+
+    worst = int(episodes.worst(1)[0])
+    trough = int(episodes.trough[worst])
+    # Szczyt = pierwszy słupek na poziomie high-water mark sprzed dołka
+    peak = int(np.nanargmax(equity[:trough + 1]))
+
+    return {
+        'max_drawdown': float(episodes.depth[worst]),
+        'trough': trough,
+        'peak': peak,
+        'recovery': int(episodes.end[worst]) if episodes.recovered[worst] else None,
+        'current_drawdown': float(np.nan_to_num(drawdown[-1])),
+        'avg_drawdown': float(np.nanmean(drawdown)),
+        'time_underwater': float(np.mean(drawdown < 0)),
+        'max_duration': int(episodes.duration.max()),
+        'n_episodes': len(episodes)
+    }
@@ -0,0 +1,420 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    GENIUS FEATURE STORE v1.0                                  ║
+║                    Versioned, Cached Feature Matrices for ML Training        ║
+║                                                                              ║
+║  Features:                                                                   ║
+║  • Named, versioned feature sets per (symbol, interval)                     ║
+║  • Columnar storage - one raw binary file per column, read via np.memmap    ║
+║  • Incremental materialization: appended bars recompute only the tail       ║
+║  • Automatic invalidation when a feature definition (source code) changes   ║
+║  • Built-in sets shared with the RL agent, ML predictor, LSTM/Transformer   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    store = FeatureStore()
+    frame = store.materialize('BTC/USD', '1h', bars, 'rl_trading')   # compute / append / reuse
+    frame = store.load('BTC/USD', '1h', 'rl_trading')                # later runs: no recompute
+
+    env = TradingEnvironment(bars, features=frame)                   # rl_trading_agent
+    X, y = GeniusTransformerTF().prepare_data(store.load('BTC/USD', '1h', 'ohlcv'))
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Optional, Any, Callable, Union
+from dataclasses import dataclass
+from datetime import datetime
+import importlib
+import hashlib
+import inspect
+import logging
+import shutil
+import json
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join('data', 'feature_store')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FEATURE SETS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _resolve(target: Union[Callable, str]) -> Callable:
+    """'module:attr.attr' -> obiekt (import dopiero przy użyciu)"""
+    if not isinstance(target, str):
+        return target
+    module, _, attr = target.partition(':')
+    obj = importlib.import_module(module)
+    for part in attr.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _source(target: Union[Callable, str]) -> str:
+    obj = _resolve(target)
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, '__qualname__', repr(obj))
+
+
+@dataclass
+class FeatureSet:
+    """
+    Named feature definition: compute(bars) -> DataFrame indexed by bar timestamps
+
+    compute receives normalized OHLCV bars (DatetimeIndex, lowercase columns)
+    and returns numeric columns for the bars whose features are final (e.g.
+    without rows that still wait for a future label). `warmup` is the number
+    of bars of history a row needs so that recomputing it from a tail matches
+    a full recompute (for EWM: enough bars for the dropped weight to vanish);
+    None means every append recomputes the whole history.
+    """
+    name: str
+    compute: Union[Callable[[pd.DataFrame], pd.DataFrame], str]
+    version: str = '1'
+    warmup: Optional[int] = 0
+    depends: Tuple[str, ...] = ()   # extra definitions ('module:attr') hashed into the fingerprint
+    description: str = ''
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of name, version and the source of compute + depends"""
+        parts = [self.name, self.version, _source(self.compute)]
+        parts += [_source(dep) for dep in self.depends]
+        return hashlib.sha256('\x00'.join(parts).encode()).hexdigest()[:16]
+
+    def __call__(self, bars: pd.DataFrame) -> pd.DataFrame:
+        return _resolve(self.compute)(bars)
+
+
+FEATURE_SETS: Dict[str, FeatureSet] = {}
+
+
+def register_feature_set(feature_set: FeatureSet) -> FeatureSet:
+    """Add (or replace) a feature set in the global registry"""
+    FEATURE_SETS[feature_set.name] = feature_set
+    return feature_set
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILT-IN DEFINITIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def ohlcv_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """Raw OHLCV columns (LSTM / Transformer inputs - scaling stays in the models)"""
+    columns = [c for c in ('open', 'high', 'low', 'close', 'volume') if c in bars.columns]
+    return bars[columns].astype(np.float64)
+
+
+# Kolumny FeatureEngineer.create_features (bez 'datetime') - dla pustej historii
+_ML_SIGNAL_COLUMNS = (
+    'price_change_1', 'price_change_5', 'price_change_10', 'volatility', 'range_pct', 'avg_range',
+    'rsi', 'rsi_change', 'macd_normalized', 'bb_position', 'bb_width',
+    'price_to_sma_5', 'price_to_sma_20', 'price_to_sma_50', 'sma_5_to_sma_20',
+    'golden_cross', 'death_cross', 'volume_ratio', 'momentum_5', 'momentum_10',
+    'price', 'label', 'future_return'
+)
+
+
+def ml_signal_features(bars: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """ml_signal_predictor.FeatureEngineer.create_features as a frame (label included)"""
+    from ml_signal_predictor import FeatureEngineer
+
+    records = bars.assign(datetime=bars.index).to_dict('records')
+    frame = pd.DataFrame(FeatureEngineer.create_features(records, lookback))
+    if frame.empty:
+        # Za krótka historia (< 206 świec): pusta macierz z tym samym indeksem i kolumnami
+        return pd.DataFrame({name: np.empty(0, dtype=np.float64) for name in _ML_SIGNAL_COLUMNS},
+                            index=pd.DatetimeIndex([], dtype='datetime64[ns]', name=bars.index.name))
+    return frame.set_index(pd.DatetimeIndex(frame.pop('datetime'), name=bars.index.name))
+
+
+def ml_finance_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """Technical block of ML_Finance_Codes/2_Feature_Engineering.py (same column names)"""
+    close, high, low = bars['close'], bars['high'], bars['low']
+    df = pd.DataFrame(index=bars.index)
+
+    # MACD (Moving Average Convergence Divergence)
+    df['EMA_12'] = close.ewm(span=12).mean()
+    df['EMA_26'] = close.ewm(span=26).mean()
+    df['MACD'] = df['EMA_12'] - df['EMA_26']
+    df['Signal'] = df['MACD'].ewm(span=9).mean()
+    df['MACD_Hist'] = df['MACD'] - df['Signal']
+
+    # Bollinger Bands
+    sma = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    df['BB_Upper'] = sma + (std * 2)
+    df['BB_Lower'] = sma - (std * 2)
+    df['BB_Middle'] = sma
+
+    # ATR (Average True Range)
+    df['TR'] = np.maximum(high - low, np.maximum(abs(high - close.shift(1)), abs(low - close.shift(1))))
+    df['ATR'] = df['TR'].rolling(window=14).mean()
+
+    # Stochastic Oscillator
+    df['Lowest_Low'] = low.rolling(window=14).min()
+    df['Highest_High'] = high.rolling(window=14).max()
+    df['K%'] = 100 * ((close - df['Lowest_Low']) / (df['Highest_High'] - df['Lowest_Low']))
+    df['D%'] = df['K%'].rolling(window=3).mean()
+
+    # Momentum / Rate of Change
+    df['Momentum'] = close - close.shift(10)
+    df['ROC'] = (close - close.shift(12)) / close.shift(12) * 100
+
+    # CCI (Commodity Channel Index) - mean absolute deviation na oknach
+    typical_price = (high + low + close) / 3
+    sma_tp = typical_price.rolling(window=20).mean()
+    mad = typical_price.rolling(window=20).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+    df['CCI'] = (typical_price - sma_tp) / (0.015 * mad)
+
+    return df
+
+
+# EWM (span <= 26): po 500 słupkach pominięta waga < 1e-16 -> ogon zgodny z pełnym
+# przeliczeniem z dokładnością do zaokrągleń kroczących sum pandas
+register_feature_set(FeatureSet(
+    'ohlcv', ohlcv_features,
+    description='Raw OHLCV for sequence models (genius_lstm_predictor, lstm_predictor, genius_transformer_model)'))
+register_feature_set(FeatureSet(
+    'rl_trading', 'rl_trading_agent:compute_trading_features', warmup=500,
+    description='TradingEnvironment features (unscaled) + close/high/low'))
+register_feature_set(FeatureSet(
+    'ml_signal', ml_signal_features, warmup=200,
+    depends=('ml_signal_predictor:FeatureEngineer',),
+    description='ml_signal_predictor features with 5-bar label'))
+register_feature_set(FeatureSet(
+    'ml_finance', ml_finance_features, warmup=500,
+    description='ML_Finance_Codes technical indicators'))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _safe(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]', '_', str(name))
+
+
+def normalize_bars(bars: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """OHLCV -> DataFrame with sorted, unique DatetimeIndex and lowercase columns"""
+    df = pd.DataFrame(bars) if not isinstance(bars, pd.DataFrame) else bars.copy()
+    df.columns = [str(c).lower() for c in df.columns]
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        time_col = next((c for c in ('datetime', 'timestamp', 'date', 'time') if c in df.columns), None)
+        if time_col is None:
+            raise ValueError("Bars need a DatetimeIndex or a datetime/timestamp/date column")
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(time_col)), name=time_col)
+
+    df.index = df.index.as_unit('ns')   # pliki indeksu trzymają int64 ns (UTC dla stref)
+    df = df[~df.index.duplicated(keep='last')]
+    return df.sort_index()
+
+
+class FeatureStore:
+    """
+    💾 Feature matrices on disk, one directory per (symbol, interval, feature set)
+
+    Layout: <root>/<symbol>/<interval>/<set>/
+        meta.json    - fingerprint, columns, row count, last source bar
+        index.bin    - int64 timestamps (ns)
+        col_XXX.bin  - one column, raw little-endian values
+
+    Readers only trust `n_rows` from meta.json, which is replaced atomically
+    after data is written, so a crashed append leaves the store readable.
+    Single writer per feature directory.
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+
+    def _dir(self, symbol: str, interval: str, name: str) -> str:
+        return os.path.join(self.root, _safe(symbol), _safe(interval), _safe(name))
+
+    @staticmethod
+    def _feature_set(feature_set: Union[str, FeatureSet]) -> FeatureSet:
+        if isinstance(feature_set, FeatureSet):
+            return feature_set
+        if feature_set not in FEATURE_SETS:
+            raise KeyError(f"Unknown feature set '{feature_set}', registered: {list(FEATURE_SETS)}")
+        return FEATURE_SETS[feature_set]
+
+    # ─── meta ───
+
+    def info(self, symbol: str, interval: str, name: str) -> Optional[Dict[str, Any]]:
+        """Stored metadata (None if the set was never materialized)"""
+        path = os.path.join(self._dir(symbol, interval, name), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_meta(directory: str, meta: Dict[str, Any]):
+        meta['updated'] = datetime.now().isoformat()
+        tmp = os.path.join(directory, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(directory, 'meta.json'))
+
+    # ─── write ───
+
+    @staticmethod
+    def _columns(frame: pd.DataFrame) -> List[Dict[str, str]]:
+        columns = []
+        for k, (name, dtype) in enumerate(frame.dtypes.items()):
+            if dtype == bool:
+                dtype = np.dtype(np.int8)
+            if not (np.issubdtype(dtype, np.number)):
+                raise ValueError(f"Feature column '{name}' is not numeric ({dtype})")
+            columns.append({'name': str(name), 'dtype': np.dtype(dtype).newbyteorder('<').str,
+                            'file': f'col_{k:03d}.bin'})
+        return columns
+
+    @staticmethod
+    def _write_columns(directory: str, frame: pd.DataFrame, columns: List[Dict[str, str]],
+                       n_stored: int, append: bool):
+        index = frame.index.asi8.astype('<i8')
+        for file, values, dtype in [('index.bin', index, '<i8')] + [
+                (col['file'], frame[col['name']].to_numpy(), col['dtype']) for col in columns]:
+            path = os.path.join(directory, file)
+            dtype = np.dtype(dtype)
+            if append:
+                # Obetnij ewentualny ogon po przerwanym zapisie
+                with open(path, 'r+b') as f:
+                    f.truncate(n_stored * dtype.itemsize)
+            with open(path, 'ab' if append else 'wb') as f:
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def _rebuild(self, directory: str, feature_set: FeatureSet, bars: pd.DataFrame):
+        frame = feature_set(bars)
+        columns = self._columns(frame)
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+        self._write_columns(directory, frame, columns, 0, append=False)
+        self._write_meta(directory, {
+            'name': feature_set.name,
+            'version': feature_set.version,
+            'fingerprint': feature_set.fingerprint,
+            'columns': columns,
+            'n_rows': len(frame),
+            'last_index': int(frame.index.asi8[-1]) if len(frame) else None,
+            'first_bar': int(bars.index.asi8[0]),
+            'last_bar': int(bars.index.asi8[-1]),
+            'last_close': float(bars['close'].iloc[-1]) if 'close' in bars.columns else None
+        })
+        logger.info(f"💾 Materialized '{feature_set.name}' in {directory}: {len(frame)} rows")
+
+    def materialize(self,
+                    symbol: str,
+                    interval: str,
+                    bars: Union[pd.DataFrame, List[Dict]],
+                    feature_set: Union[str, FeatureSet] = 'ohlcv',
+                    load: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Bring a feature set up to date with `bars` and return it
+
+        - no stored data / definition changed (fingerprint) -> full compute
+        - same bars -> nothing computed, stored matrix is loaded
+        - appended bars -> compute() only on the new rows + `warmup` bars of context
+        - revised history (last stored bar missing or its close changed) -> full compute,
+          so pass closed bars only (drop a still-forming live candle)
+
+        For an append, `bars` must reach back `warmup` bars before the first
+        new row (or start where the stored history starts).
+        """
+        feature_set = self._feature_set(feature_set)
+        bars = normalize_bars(bars)
+        directory = self._dir(symbol, interval, feature_set.name)
+        meta = self.info(symbol, interval, feature_set.name)
+
+        times = bars.index.asi8
+        reason = None
+        if meta is None:
+            reason = 'new'
+        elif meta['fingerprint'] != feature_set.fingerprint:
+            reason = 'definition changed'
+        elif meta['n_rows'] == 0 or feature_set.warmup is None:
+            reason = 'full recompute'
+        else:
+            pos = np.searchsorted(times, meta['last_bar'])
+            if pos == len(times) or times[pos] != meta['last_bar'] or (
+                    meta['last_close'] is not None and bars['close'].iloc[pos] != meta['last_close']):
+                reason = 'history revised'
+
+        if reason is None and times[-1] > meta['last_bar']:
+            first = np.searchsorted(times, meta['last_index'], side='right')
+            start = first - feature_set.warmup
+            if start < 0 and times[0] > meta['first_bar']:
+                raise ValueError(f"Append to '{feature_set.name}' needs {feature_set.warmup} bars "
+                                 f"of history before the first new row")
+
+            frame = feature_set(bars.iloc[max(start, 0):])
+            frame = frame[frame.index.asi8 > meta['last_index']]
+            columns = self._columns(frame)
+            if [c['name'] for c in columns] != [c['name'] for c in meta['columns']]:
+                reason = 'columns changed'
+            else:
+                self._write_columns(directory, frame, meta['columns'], meta['n_rows'], append=True)
+                meta['n_rows'] += len(frame)
+                if len(frame):
+                    meta['last_index'] = int(frame.index.asi8[-1])
+                meta['last_bar'] = int(times[-1])
+                meta['last_close'] = float(bars['close'].iloc[-1]) if 'close' in bars.columns else None
+                self._write_meta(directory, meta)
+                logger.info(f"💾 Appended {len(frame)} rows to '{feature_set.name}' ({directory})")
+
+        if reason is not None:
+            logger.info(f"💾 Rebuilding '{feature_set.name}' for {symbol} {interval}: {reason}")
+            self._rebuild(directory, feature_set, bars)
+
+        return self.load(symbol, interval, feature_set.name) if load else None
+
+    # ─── read ───
+
+    def arrays(self, symbol: str, interval: str, name: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Zero-copy access: (datetime64 index, {column: read-only memmap})
+        """
+        meta = self.info(symbol, interval, name)
+        if meta is None:
+            raise FileNotFoundError(f"Feature set '{name}' not materialized for {symbol} {interval}")
+        directory = self._dir(symbol, interval, name)
+        n = meta['n_rows']
+
+        def column(file: str, dtype: str) -> np.ndarray:
+            if n == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(os.path.join(directory, file), dtype=dtype, mode='r', shape=(n,))
+
+        index = column('index.bin', '<i8').view('datetime64[ns]')
+        return index, {col['name']: column(col['file'], col['dtype']) for col in meta['columns']}
+
+    def load(self,
+             symbol: str,
+             interval: str,
+             name: str,
+             columns: Optional[List[str]] = None,
+             start=None,
+             end=None) -> pd.DataFrame:
+        """Feature matrix as a DataFrame (only the selected columns / time range are read)"""
+        index, data = self.arrays(symbol, interval, name)
+        lo = 0 if start is None else np.searchsorted(index, np.datetime64(pd.Timestamp(start), 'ns'))
+        hi = len(index) if end is None else np.searchsorted(index, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        columns = list(data) if columns is None else columns
+        return pd.DataFrame({c: np.array(data[c][lo:hi]) for c in columns},
+                            index=pd.DatetimeIndex(index[lo:hi], name='datetime'))
+
+    def invalidate(self, symbol: str, interval: str, name: Optional[str] = None):
+        """Drop one feature set (or all sets of the symbol/interval)"""
+        directory = (self._dir(symbol, interval, name) if name is not None
+                     else os.path.join(self.root, _safe(symbol), _safe(interval)))
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
@@ -36,7 +36,6 @@ except ImportError:
 
 try:
     from sklearn.preprocessing import MinMaxScaler
-    from sklearn.model_selection import train_test_split
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
@@ -47,6 +46,8 @@ try:
 except ImportError:
     YFINANCE_AVAILABLE = False
 
+from genius_sequence_dataset import SequenceDataset
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -152,11 +153,11 @@ class GeniusLSTMPredictor:
         
         return model
     
-    def prepare_data(self, data: pd.DataFrame, 
-                     feature_cols: List[str] = None) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare data for LSTM training"""
+    def build_dataset(self, data: pd.DataFrame,
+                      feature_cols: List[str] = None) -> Optional[SequenceDataset]:
+        """Scale features and window them without copying (None on failure)"""
         if not SKLEARN_AVAILABLE:
-            return None, None
+            return None
         
         if feature_cols is None:
             feature_cols = ['close', 'high', 'low', 'volume']
@@ -166,7 +167,7 @@ class GeniusLSTMPredictor:
         
         if 'close' not in available_cols:
             logger.error("'close' column required")
-            return None, None
+            return None
         
         # Extract features
         features = data[available_cols].values
@@ -174,19 +175,30 @@ class GeniusLSTMPredictor:
         # Scale data
         scaled_data = self.scaler.fit_transform(features)
         
-        # Create sequences
-        X, y = [], []
-        for i in range(self.sequence_length, len(scaled_data)):
-            X.append(scaled_data[i-self.sequence_length:i])
-            y.append(scaled_data[i, 0])  # Predict close price
+        # Sequences ending at i predict close price at i
+        return SequenceDataset(scaled_data, self.sequence_length, targets=scaled_data[:, 0])
+    
+    def prepare_data(self, data: pd.DataFrame, 
+                     feature_cols: List[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Prepare data for LSTM training (X is a read-only window view)"""
+        dataset = self.build_dataset(data, feature_cols)
+        if dataset is None:
+            return None, None
         
-        return np.array(X), np.array(y)
+        return dataset.X, dataset.y
     
     def train(self, symbol: str = 'BTC-USD', 
               period: str = '2y',
               epochs: int = 50,
-              batch_size: int = 32) -> Dict:
-        """Train LSTM model on historical data"""
+              batch_size: int = 32,
+              feature_store=None) -> Dict:
+        """
+        Train LSTM model on historical data
+
+        With a genius_feature_store.FeatureStore the downloaded bars (minus the
+        still-open last candle) are appended to the stored 'ohlcv' set and
+        training uses the full stored history.
+        """
         if not TF_AVAILABLE or not YFINANCE_AVAILABLE:
             return {'error': 'Required libraries not available'}
         
@@ -198,22 +210,26 @@ class GeniusLSTMPredictor:
             return {'error': 'Insufficient data'}
         
         data.columns = [c.lower() if isinstance(c, str) else c[0].lower() for c in data.columns]
+        if feature_store is not None:
+            # Last 1h bar is still forming - its close changes between runs and
+            # the store would treat that as revised history and rebuild
+            data = feature_store.materialize(symbol, '1h', data.iloc[:-1], 'ohlcv')
         
         # Prepare data
-        X, y = self.prepare_data(data)
-        if X is None:
+        dataset = self.build_dataset(data)
+        if dataset is None:
             return {'error': 'Data preparation failed'}
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, shuffle=False
-        )
+        # Split data (chronological, windows stay views of one array)
+        train_set, test_set = dataset.split(0.2)
+        fit_set, val_set = train_set.split(0.1)
+        y_test = test_set.y
         
-        logger.info(f"   Training samples: {len(X_train)}")
-        logger.info(f"   Test samples: {len(X_test)}")
+        logger.info(f"   Training samples: {len(train_set)}")
+        logger.info(f"   Test samples: {len(test_set)}")
         
         # Build model
-        self.model = self.build_model((X.shape[1], X.shape[2]))
+        self.model = self.build_model((dataset.sequence_length, dataset.data.shape[1]))
         
         # Callbacks
         callbacks = [
@@ -223,19 +239,19 @@ class GeniusLSTMPredictor:
         
         # Train
         history = self.model.fit(
-            X_train, y_train,
+            fit_set.to_tf_dataset(batch_size, shuffle=True),
+            validation_data=val_set.to_tf_dataset(batch_size),
             epochs=epochs,
-            batch_size=batch_size,
-            validation_split=0.1,
             callbacks=callbacks,
             verbose=0
         )
         
         # Evaluate
-        loss, mae = self.model.evaluate(X_test, y_test, verbose=0)
+        test_data = test_set.to_tf_dataset(batch_size)
+        loss, mae = self.model.evaluate(test_data, verbose=0)
         
         # Calculate accuracy as inverse of normalized error
-        y_pred = self.model.predict(X_test, verbose=0)
+        y_pred = self.model.predict(test_data, verbose=0)
         mape = np.mean(np.abs((y_test - y_pred.flatten()) / y_test)) * 100
         accuracy = max(0, 100 - mape)
         
@@ -258,7 +274,7 @@ class GeniusLSTMPredictor:
             'val_loss': round(history.history['val_loss'][-1], 4),
             'mae': round(mae, 4),
             'accuracy': round(accuracy, 1),
-            'samples': len(X_train)
+            'samples': len(train_set)
         }
     
     def load_model(self) -> bool:
@@ -0,0 +1,393 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    GENIUS MONTE CARLO ENGINE v1.0                             ║
+║                    Shared Path Simulation for Risk & Backtests               ║
+║                                                                              ║
+║  Features:                                                                   ║
+║  • Seeded numpy.random.Generator streams (reproducible per chunk)           ║
+║  • GBM, Normal, Bootstrap (block), Student-t and GARCH(1,1) innovations     ║
+║  • Memory-bounded chunks - 1M paths without materializing all of them       ║
+║  • VaR / CVaR for several horizons × confidence levels in one run           ║
+║  • Optional process-parallel chunks                                         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import numpy as np
+from scipy import stats
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+from typing import Dict, List, Tuple, Optional, Any, Sequence
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_KINDS = ('gbm', 'normal', 'bootstrap', 'student_t', 'garch')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RETURN MODELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def fit_garch11(returns: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Gaussian QMLE of GARCH(1,1) on demeaned returns
+
+    Returns:
+        (omega, alpha, beta, next_sigma2) - next_sigma2 is the one-step-ahead
+        conditional variance after the last observation
+    """
+    eps = np.asarray(returns, dtype=np.float64)
+    eps = eps - eps.mean()
+    var = float(eps.var()) or 1e-12
+    eps2 = eps * eps
+
+    def conditional_variance(params):
+        omega, alpha, beta = params
+        # σ²_t = ω + α·ε²_{t-1} + β·σ²_{t-1}  ->  filtr IIR na wejściu ω + α·ε²_{t-1}
+        drive = np.concatenate([[var], omega + alpha * eps2[:-1]])
+        return lfilter([1.0], [1.0, -beta], drive, zi=[0.0])[0]
+
+    def neg_loglik(params):
+        sigma2 = np.maximum(conditional_variance(params), 1e-20)
+        return 0.5 * np.sum(np.log(sigma2) + eps2 / sigma2)
+
+    x0 = np.array([var * 0.05, 0.08, 0.9])
+    constraints = ({'type': 'ineq', 'fun': lambda p: 0.9999 - p[1] - p[2]},)
+    bounds = [(var * 1e-6, var * 10), (0.0, 0.5), (0.0, 0.9999)]
+    try:
+        fit = minimize(neg_loglik, x0, method='SLSQP', bounds=bounds, constraints=constraints)
+        omega, alpha, beta = fit.x if fit.success else x0
+    except (ValueError, np.linalg.LinAlgError):
+        omega, alpha, beta = x0
+
+    sigma2 = conditional_variance((omega, alpha, beta))
+    next_sigma2 = omega + alpha * eps2[-1] + beta * sigma2[-1]
+    return float(omega), float(alpha), float(beta), float(next_sigma2)
+
+
+def _t_df_from_kurtosis(excess_kurtosis: float) -> float:
+    """Student-t degrees of freedom matching excess kurtosis 6/(ν-4)"""
+    if not np.isfinite(excess_kurtosis) or excess_kurtosis <= 0.2:
+        return 30.0
+    return float(np.clip(4.0 + 6.0 / excess_kurtosis, 4.1, 30.0))
+
+
+@dataclass
+class ReturnModel:
+    """
+    Per-step return process used to generate paths
+
+    mu / sigma are per-step mean and std of simple returns. 'gbm' draws log
+    returns with drift mu - σ²/2; the other kinds draw simple returns.
+    """
+    kind: str = 'gbm'
+    mu: float = 0.0
+    sigma: float = 0.0
+    df: float = 5.0                         # Student-t innovations (student_t, garch)
+    sample: Optional[np.ndarray] = None     # historical simple returns (bootstrap)
+    block: int = 1                          # bootstrap block length
+    omega: float = 0.0                      # GARCH(1,1)
+    alpha: float = 0.0
+    beta: float = 0.0
+    sigma2_0: float = 0.0                   # starting conditional variance
+
+    def __post_init__(self):
+        if self.kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown return model: {self.kind} (expected one of {MODEL_KINDS})")
+        if self.kind == 'bootstrap' and (self.sample is None or len(self.sample) == 0):
+            raise ValueError("Bootstrap model requires a non-empty return sample")
+
+    @classmethod
+    def from_returns(cls, returns, kind: str = 'gbm', block: int = 1) -> 'ReturnModel':
+        """Fit the chosen model to a series / array of historical simple returns"""
+        sample = np.asarray(returns, dtype=np.float64)
+        sample = sample[np.isfinite(sample)]
+        if len(sample) < 2:
+            raise ValueError("At least 2 finite returns are required")
+
+        mu, sigma = float(sample.mean()), float(sample.std(ddof=1))
+        model = cls(kind=kind, mu=mu, sigma=sigma, sample=sample, block=max(1, int(block)))
+
+        if kind == 'student_t':
+            model.df = _t_df_from_kurtosis(stats.kurtosis(sample))
+        elif kind == 'garch':
+            model.omega, model.alpha, model.beta, model.sigma2_0 = fit_garch11(sample)
+            standardized = (sample - mu) / np.sqrt(max(model.sigma2_0, 1e-20))
+            model.df = _t_df_from_kurtosis(stats.kurtosis(standardized))
+        return model
+
+    def log_returns(self, rng: np.random.Generator, n_paths: int, n_steps: int) -> np.ndarray:
+        """Draw (n_paths, n_steps) per-step log returns"""
+        if self.kind == 'gbm':
+            return rng.normal(self.mu - 0.5 * self.sigma ** 2, self.sigma, (n_paths, n_steps))
+
+        if self.kind == 'normal':
+            simple = rng.normal(self.mu, self.sigma, (n_paths, n_steps))
+        elif self.kind == 'student_t':
+            scale = self.sigma * np.sqrt((self.df - 2) / self.df)
+            simple = self.mu + scale * rng.standard_t(self.df, (n_paths, n_steps))
+        elif self.kind == 'bootstrap':
+            n = len(self.sample)
+            if self.block <= 1:
+                return np.log1p(self.sample)[rng.integers(0, n, (n_paths, n_steps))]
+            n_blocks = -(-n_steps // self.block)
+            starts = rng.integers(0, n, (n_paths, n_blocks))
+            idx = (starts[:, :, None] + np.arange(self.block)).reshape(n_paths, -1)[:, :n_steps] % n
+            return np.log1p(self.sample)[idx]
+        else:
+            simple = self._garch_returns(rng, n_paths, n_steps)
+
+        # Prosty zwrot poniżej -100% nie ma sensu dla ceny
+        return np.log1p(np.maximum(simple, -0.999999))
+
+    def _garch_returns(self, rng: np.random.Generator, n_paths: int, n_steps: int) -> np.ndarray:
+        """GARCH(1,1) with standardized Student-t shocks, vectorized across paths"""
+        shocks = rng.standard_t(self.df, (n_paths, n_steps)) * np.sqrt((self.df - 2) / self.df)
+        out = np.empty((n_paths, n_steps))
+        sigma2 = np.full(n_paths, self.sigma2_0 if self.sigma2_0 > 0 else self.sigma ** 2)
+        for t in range(n_steps):
+            eps = np.sqrt(sigma2) * shocks[:, t]
+            out[:, t] = eps
+            sigma2 = self.omega + self.alpha * eps * eps + self.beta * sigma2
+        return self.mu + out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESULT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class MonteCarloResult:
+    """VaR / CVaR grid (horizons × confidences) of compounded path returns"""
+    model: str
+    n_paths: int
+    horizons: np.ndarray            # steps
+    confidences: np.ndarray
+    var: np.ndarray                 # (n_horizons, n_confidences) loss as fraction (positive = loss)
+    cvar: np.ndarray
+    mean: np.ndarray                # per-horizon mean return
+    std: np.ndarray
+    prob_loss: np.ndarray
+    terminal: Optional[np.ndarray] = None       # (n_paths, n_horizons) returns when kept
+    max_drawdown: Optional[np.ndarray] = None   # (n_paths,) over the longest horizon
+    seed: Optional[int] = None
+
+    def _index(self, horizon: int, confidence: float) -> Tuple[int, int]:
+        h = np.flatnonzero(self.horizons == horizon)
+        c = np.flatnonzero(np.isclose(self.confidences, confidence))
+        if not len(h) or not len(c):
+            raise KeyError(f"Horizon {horizon} / confidence {confidence} not simulated")
+        return int(h[0]), int(c[0])
+
+    def var_at(self, horizon: int, confidence: float) -> float:
+        return float(self.var[self._index(horizon, confidence)])
+
+    def cvar_at(self, horizon: int, confidence: float) -> float:
+        return float(self.cvar[self._index(horizon, confidence)])
+
+    def percentiles(self, q: Sequence[float] = (5, 25, 50, 75, 95), horizon: int = None) -> Dict[float, float]:
+        """Return percentiles at a horizon (requires keep_terminal=True)"""
+        if self.terminal is None:
+            raise ValueError("Terminal returns were not kept - run with keep_terminal=True")
+        h = len(self.horizons) - 1 if horizon is None else int(np.flatnonzero(self.horizons == horizon)[0])
+        values = np.percentile(self.terminal[:, h], q)
+        return {float(p): float(v) for p, v in zip(q, values)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        grid = {}
+        for i, h in enumerate(self.horizons):
+            for j, c in enumerate(self.confidences):
+                grid[f"{int(h)}d_{c:.1%}"] = {'var': float(self.var[i, j]), 'cvar': float(self.cvar[i, j])}
+        return {
+            'model': self.model,
+            'n_paths': self.n_paths,
+            'seed': self.seed,
+            'risk': grid,
+            'mean_return': dict(zip(map(int, self.horizons), map(float, self.mean))),
+            'prob_loss': dict(zip(map(int, self.horizons), map(float, self.prob_loss)))
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _simulate_chunk(task: Tuple) -> Dict[str, Any]:
+    """
+    One chunk of paths -> horizon statistics (top-level so processes can pickle it)
+
+    Keeps only the `tail_size` worst returns per horizon, which is enough to get
+    exact lower quantiles and CVaR of the full run after merging chunks.
+    """
+    model, n_paths, n_steps, seed_seq, horizons, tail_size, keep_terminal, track_drawdown = task
+    rng = np.random.default_rng(seed_seq)
+
+    log_paths = model.log_returns(rng, n_paths, n_steps)
+    np.cumsum(log_paths, axis=1, out=log_paths)
+    at_horizons = np.expm1(log_paths[:, horizons - 1])
+
+    k = min(tail_size, n_paths)
+    tails = np.partition(at_horizons, k - 1, axis=0)[:k] if k < n_paths else at_horizons.copy()
+
+    out = {
+        'tails': tails,
+        'sum': at_horizons.sum(axis=0),
+        'sum_sq': (at_horizons * at_horizons).sum(axis=0),
+        'losses': (at_horizons < 0).sum(axis=0),
+        'terminal': at_horizons.astype(np.float32) if keep_terminal else None,
+        'max_drawdown': None
+    }
+    if track_drawdown:
+        # Szczyt liczony od kapitału startowego (log = 0)
+        peak = np.maximum(np.maximum.accumulate(log_paths[:, :horizons[-1]], axis=1), 0.0)
+        out['max_drawdown'] = -np.expm1((log_paths[:, :horizons[-1]] - peak).min(axis=1))
+    return out
+
+
+class MonteCarloEngine:
+    """
+    🎲 Shared Monte Carlo path engine
+
+    Paths are generated in chunks of at most `max_chunk_elements` path-steps,
+    each from its own child SeedSequence, so a seeded run gives the same
+    numbers whether it runs serially or across `n_jobs` processes.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        max_chunk_elements: int = 4_000_000,
+        n_jobs: int = 1
+    ):
+        self.seed = seed
+        self.max_chunk_elements = max_chunk_elements
+        self.n_jobs = n_jobs
+
+    def _chunk_sizes(self, n_paths: int, n_steps: int) -> List[int]:
+        chunk = max(1, self.max_chunk_elements // max(n_steps, 1))
+        sizes = [chunk] * (n_paths // chunk)
+        if n_paths % chunk:
+            sizes.append(n_paths % chunk)
+        return sizes
+
+    def simulate(
+        self,
+        model: ReturnModel,
+        n_paths: int = 100_000,
+        horizons: Sequence[int] = (1,),
+        confidences: Sequence[float] = (0.95, 0.99),
+        keep_terminal: bool = False,
+        track_drawdown: bool = False,
+        seed: Optional[int] = None,
+        n_jobs: Optional[int] = None
+    ) -> MonteCarloResult:
+        """
+        Simulate compounded returns and aggregate VaR / CVaR per horizon
+
+        Args:
+            model: ReturnModel generating per-step returns
+            n_paths: Number of simulated paths
+            horizons: Horizons in steps (all from the same paths)
+            confidences: Confidence levels, e.g. (0.95, 0.99)
+            keep_terminal: Keep per-path returns at each horizon (float32)
+            track_drawdown: Per-path max drawdown up to the longest horizon
+            seed: Overrides the engine seed for this run
+            n_jobs: Overrides the engine worker count for this run
+        """
+        horizons = np.unique(np.asarray(horizons, dtype=np.int64))
+        confidences = np.asarray(confidences, dtype=np.float64)
+        if n_paths < 1 or horizons[0] < 1:
+            raise ValueError("n_paths and horizons must be positive")
+        n_steps = int(horizons[-1])
+        seed = self.seed if seed is None else seed
+
+        # Najgorsze ogony wystarczą do dokładnego kwantyla: pozycja p·(n-1) + 2 zapasu
+        tail_size = min(n_paths, int(np.floor((1 - confidences.min()) * (n_paths - 1))) + 2)
+        sizes = self._chunk_sizes(n_paths, n_steps)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [
+            (model, size, n_steps, child, horizons, tail_size, keep_terminal, track_drawdown)
+            for size, child in zip(sizes, seeds)
+        ]
+
+        tails = None
+        total = np.zeros(len(horizons))
+        total_sq = np.zeros(len(horizons))
+        losses = np.zeros(len(horizons))
+        terminal, drawdowns = [], []
+
+        for chunk in self._run(tasks, n_jobs):
+            merged = chunk['tails'] if tails is None else np.concatenate([tails, chunk['tails']])
+            if len(merged) > tail_size:
+                merged = np.partition(merged, tail_size - 1, axis=0)[:tail_size]
+            tails = merged
+            total += chunk['sum']
+            total_sq += chunk['sum_sq']
+            losses += chunk['losses']
+            if keep_terminal:
+                terminal.append(chunk['terminal'])
+            if track_drawdown:
+                drawdowns.append(chunk['max_drawdown'])
+
+        tails = np.sort(tails, axis=0)
+        var = np.empty((len(horizons), len(confidences)))
+        cvar = np.empty_like(var)
+        for j, confidence in enumerate(confidences):
+            # Interpolacja liniowa jak np.percentile na pełnej próbie
+            pos = (1 - confidence) * (n_paths - 1)
+            lo = int(np.floor(pos))
+            hi = min(lo + 1, len(tails) - 1)
+            quantile = tails[lo] + (pos - lo) * (tails[hi] - tails[lo])
+            var[:, j] = -quantile
+            in_tail = tails <= quantile
+            cvar[:, j] = -(np.where(in_tail, tails, 0).sum(axis=0) / np.maximum(in_tail.sum(axis=0), 1))
+
+        mean = total / n_paths
+        std = np.sqrt(np.maximum(total_sq / n_paths - mean ** 2, 0) * n_paths / max(n_paths - 1, 1))
+
+        return MonteCarloResult(
+            model=model.kind,
+            n_paths=n_paths,
+            horizons=horizons,
+            confidences=confidences,
+            var=var,
+            cvar=cvar,
+            mean=mean,
+            std=std,
+            prob_loss=losses / n_paths,
+            terminal=np.concatenate(terminal) if keep_terminal else None,
+            max_drawdown=np.concatenate(drawdowns) if track_drawdown else None,
+            seed=seed
+        )
+
+    def _run(self, tasks: List[Tuple], n_jobs: Optional[int] = None):
+        """Yield chunk statistics in task order (serial or process pool)"""
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if n_jobs <= 1 or len(tasks) == 1:
+            for task in tasks:
+                yield _simulate_chunk(task)
+            return
+
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                # Statystyki chunków są małe (ogony + sumy), można je zebrać w całości
+                results = list(pool.map(_simulate_chunk, tasks))
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Process pool unavailable ({e}) - simulating serially")
+            results = map(_simulate_chunk, tasks)
+        yield from results
+
+    def var_grid(
+        self,
+        returns,
+        kind: str = 'bootstrap',
+        n_paths: int = 100_000,
+        horizons: Sequence[int] = (1, 5, 10),
+        confidences: Sequence[float] = (0.95, 0.99),
+        block: int = 1
+    ) -> MonteCarloResult:
+        """Fit `kind` to historical returns and simulate the VaR / CVaR grid"""
+        model = ReturnModel.from_returns(returns, kind=kind, block=block)
+        return self.simulate(model, n_paths, horizons, confidences)
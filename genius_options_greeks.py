@@ -16,12 +16,14 @@
 
 import numpy as np
 from scipy.stats import norm
-from scipy.optimize import brentq
-from dataclasses import dataclass
+from scipy.special import ndtr
+from scipy.optimize import brentq, least_squares
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Tuple, Optional
 from enum import Enum
 from datetime import datetime, timedelta
 import math
+import time
 
 class OptionType(Enum):
     """Option type enumeration"""
@@ -73,6 +75,231 @@ class OptionData:
     option_type: OptionType  # CALL or PUT
 
 
+def svi_total_variance(params: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """
+    Raw SVI total variance w(k) = a + b·(ρ(k-m) + √((k-m)² + σ²))
+    
+    params: (..., 5) rows of [a, b, rho, m, sigma], broadcast against k
+    """
+    params = np.asarray(params, dtype=np.float64)
+    a, b, rho, m, sigma = (params[..., i, None] if params.ndim > 1 else params[i] for i in range(5))
+    x = k - m
+    return a + b * (rho * x + np.sqrt(x * x + sigma * sigma))
+
+
+def fit_svi_slice(
+    k: np.ndarray,
+    total_variance: np.ndarray,
+    weights: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    Fit raw SVI to one expiry (log-moneyness k -> total variance σ²T)
+    
+    Returns [a, b, rho, m, sigma] or None when there are fewer than 5 points
+    or the fitted slice goes negative inside the quoted range.
+    """
+    k = np.asarray(k, dtype=np.float64)
+    w = np.asarray(total_variance, dtype=np.float64)
+    if len(k) < 5:
+        return None
+    weights = np.ones_like(w) if weights is None else np.asarray(weights, dtype=np.float64)
+    
+    k_span = max(float(k.max() - k.min()), 1e-3)
+    w_max = float(w.max())
+    lower = np.array([-w_max, 0.0, -0.999, k.min() - k_span, 1e-4])
+    upper = np.array([w_max, 10.0 * w_max / k_span + 1.0, 0.999, k.max() + k_span, 2.0 * k_span + 1.0])
+    
+    # Start quasi-explicit: for fixed (m, σ) SVI is linear in (a, bρ, b) - one
+    # batched weighted least-squares solve over a (m, σ) grid picks the seed
+    m_grid, s_grid = np.meshgrid(
+        np.linspace(k.min(), k.max(), 12),
+        np.geomspace(0.02 * k_span, 1.5 * k_span, 10),
+        indexing='ij'
+    )
+    m_grid, s_grid = m_grid.ravel(), s_grid.ravel()
+    x = k[None, :] - m_grid[:, None]
+    design = np.stack([np.ones_like(x), x, np.sqrt(x * x + s_grid[:, None] ** 2)], axis=-1)
+    weighted = design * weights[None, :, None]
+    normal = np.einsum('gni,gnj->gij', weighted, weighted) + 1e-12 * np.eye(3)
+    rhs = np.einsum('gni,n->gi', weighted, w * weights)
+    coef = np.linalg.solve(normal, rhs[..., None])[..., 0]
+    b_lin = np.clip(coef[:, 2], 1e-6, upper[1])
+    rho_lin = np.clip(coef[:, 1] / b_lin, lower[2], upper[2])
+    coef_fixed = np.column_stack([coef[:, 0], rho_lin * b_lin, b_lin])
+    sse = (((np.einsum('gni,gi->gn', weighted, coef_fixed) - (w * weights)[None, :])) ** 2).sum(axis=1)
+    best = int(np.argmin(sse))
+    x0 = np.array([coef[best, 0], b_lin[best], rho_lin[best], m_grid[best], s_grid[best]])
+    x0 = np.clip(x0, lower + 1e-9, upper - 1e-9)
+    
+    def residuals(params):
+        return (svi_total_variance(params, k) - w) * weights
+    
+    def jacobian(params):
+        _, b, rho, m, sigma = params
+        x = k - m
+        root = np.sqrt(x * x + sigma * sigma)
+        return np.column_stack([
+            np.ones_like(k),
+            rho * x + root,
+            b * x,
+            -b * (rho + x / root),
+            b * sigma / root
+        ]) * weights[:, None]
+    
+    try:
+        fit = least_squares(residuals, x0, jac=jacobian, bounds=(lower, upper), method='trf', x_scale='jac', max_nfev=50)
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    
+    a, b, rho, m, sigma = fit.x
+    # Slice minimum a + bσ√(1-ρ²) must stay positive
+    if a + b * sigma * np.sqrt(1 - rho * rho) <= 0:
+        return None
+    return fit.x
+
+
+@dataclass
+class VolatilitySurface:
+    """
+    Implied volatility surface (smile per expiry) built from a solved chain
+    
+    Interpolation: linear in log-moneyness log(K/F) within an expiry (flat
+    beyond the quoted wings), linear in total variance σ²T between expiries.
+    Expiries with a fitted SVI slice (fit_svi) use the parametric smile instead.
+    """
+    spot: float
+    expiries: np.ndarray            # unique T (years), ascending
+    forwards: np.ndarray            # forward per expiry
+    strikes: List[np.ndarray]       # ascending strikes per expiry
+    ivs: List[np.ndarray]           # implied vols matching strikes
+    svi_params: Optional[np.ndarray] = None     # (n_expiries, 5), NaN row = no fit
+    built_at: float = field(default_factory=time.time)
+    
+    def smile(self, T: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Strikes and IVs of the quoted expiry closest to T"""
+        i = int(np.argmin(np.abs(self.expiries - T)))
+        return self.strikes[i], self.ivs[i]
+    
+    def fit_svi(self) -> int:
+        """Fit an SVI slice per expiry (vega-ish weights around ATM); returns number fitted"""
+        params = np.full((len(self.expiries), 5), np.nan)
+        for i, (t, forward, strikes, ivs) in enumerate(zip(self.expiries, self.forwards, self.strikes, self.ivs)):
+            k = np.log(strikes / forward)
+            weights = 1.0 / (1.0 + (k / max(ivs.mean() * np.sqrt(t), 1e-3)) ** 2)
+            fitted = fit_svi_slice(k, ivs * ivs * t, np.sqrt(weights))
+            if fitted is not None:
+                params[i] = fitted
+        self.svi_params = params
+        return int(np.isfinite(params[:, 0]).sum())
+    
+    def _expiry_ivs(self, K: np.ndarray) -> np.ndarray:
+        """IV at strikes K for every quoted expiry -> (n_expiries, len(K))"""
+        log_k = np.log(K[None, :] / self.forwards[:, None])
+        rows = np.empty(log_k.shape)
+        fitted = np.zeros(len(self.expiries), dtype=bool)
+        if self.svi_params is not None:
+            fitted = np.isfinite(self.svi_params[:, 0])
+            if fitted.any():
+                w = svi_total_variance(self.svi_params[fitted], log_k[fitted])
+                rows[fitted] = np.sqrt(np.maximum(w, 1e-12) / self.expiries[fitted, None])
+        for i in np.flatnonzero(~fitted):
+            forward, strikes, ivs = self.forwards[i], self.strikes[i], self.ivs[i]
+            rows[i] = np.interp(log_k[i], np.log(strikes / forward), ivs)
+        return rows
+    
+    def iv(self, K, T) -> np.ndarray:
+        """Interpolated IV for arrays of strikes and expiries (broadcast)"""
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=np.float64), np.asarray(T, dtype=np.float64))
+        shape = K.shape
+        K, T = K.ravel(), T.ravel()
+        
+        per_expiry = self._expiry_ivs(K)
+        if len(self.expiries) == 1:
+            return per_expiry[0].reshape(shape)
+        
+        hi = np.clip(np.searchsorted(self.expiries, T), 1, len(self.expiries) - 1)
+        lo = hi - 1
+        cols = np.arange(len(K))
+        t_lo, t_hi = self.expiries[lo], self.expiries[hi]
+        w_lo = per_expiry[lo, cols] ** 2 * t_lo
+        w_hi = per_expiry[hi, cols] ** 2 * t_hi
+        
+        # Flat vol poza zakresem zapadalności, liniowa wariancja całkowita wewnątrz
+        weight = np.clip((T - t_lo) / (t_hi - t_lo), 0.0, 1.0)
+        total_var = w_lo + weight * (w_hi - w_lo)
+        t_eff = np.where(T < t_lo, t_lo, np.where(T > t_hi, t_hi, T))
+        return np.sqrt(np.maximum(total_var, 0) / np.maximum(t_eff, 1e-12)).reshape(shape)
+    
+    def atm_iv(self, T: float) -> float:
+        """At-the-money-forward IV for expiry T"""
+        forward = float(np.interp(T, self.expiries, self.forwards))
+        return float(self.iv(forward, T))
+    
+    def skew(self, T: float, moneyness: float = 0.1) -> float:
+        """IV(put wing) - IV(call wing) at ±moneyness around the forward"""
+        forward = float(np.interp(T, self.expiries, self.forwards))
+        wings = self.iv(forward * np.array([1 - moneyness, 1 + moneyness]), T)
+        return float(wings[0] - wings[1])
+    
+    def age_seconds(self) -> float:
+        return time.time() - self.built_at
+
+
+class VolSurfaceCache:
+    """
+    🗂️ Cache of fitted vol surfaces per symbol with a TTL
+    
+    A surface is fitted once per refresh and then serves every Greeks / risk
+    lookup until it expires; get() returns None for a stale or missing entry.
+    """
+    
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._surfaces: Dict[str, VolatilitySurface] = {}
+    
+    def put(self, symbol: str, surface: VolatilitySurface) -> VolatilitySurface:
+        self._surfaces[symbol.upper()] = surface
+        return surface
+    
+    def get(self, symbol: str, max_age_seconds: float = None) -> Optional[VolatilitySurface]:
+        surface = self._surfaces.get(symbol.upper())
+        if surface is None:
+            return None
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        if surface.age_seconds() > max_age:
+            return None
+        return surface
+    
+    def get_or_build(self, symbol: str, builder) -> Optional[VolatilitySurface]:
+        """Cached surface or builder() -> fresh surface (None from builder is not cached)"""
+        surface = self.get(symbol)
+        if surface is None:
+            surface = builder()
+            if surface is not None:
+                self.put(symbol, surface)
+        return surface
+    
+    def invalidate(self, symbol: str = None):
+        if symbol is None:
+            self._surfaces.clear()
+        else:
+            self._surfaces.pop(symbol.upper(), None)
+
+
+# Shared surface cache (fed by CryptoOptionsAnalyzer.refresh_surface)
+_VOL_SURFACES = VolSurfaceCache()
+
+
+def register_vol_surface(symbol: str, surface: VolatilitySurface) -> VolatilitySurface:
+    """Register a freshly fitted surface for a symbol"""
+    return _VOL_SURFACES.put(symbol, surface)
+
+
+def get_vol_surface(symbol: str, max_age_seconds: float = None) -> Optional[VolatilitySurface]:
+    """Surface for a symbol unless it is older than the TTL"""
+    return _VOL_SURFACES.get(symbol, max_age_seconds)
+
+
 class GeniusOptionsGreeks:
     """
     Professional Options Greeks Calculator
@@ -509,18 +736,122 @@ class GeniusOptionsGreeks:
             OptionGreeks dataclass with all values
         """
         
-        return OptionGreeks(
-            delta=self.delta(S, K, T, r, sigma, q, option_type),
-            gamma=self.gamma(S, K, T, r, sigma, q),
-            theta=self.theta(S, K, T, r, sigma, q, option_type),
-            vega=self.vega(S, K, T, r, sigma, q),
-            rho=self.rho(S, K, T, r, sigma, q, option_type),
-            lambda_=self.lambda_leverage(S, K, T, r, sigma, q, option_type),
-            vanna=self.vanna(S, K, T, r, sigma, q),
-            volga=self.volga(S, K, T, r, sigma, q),
-            charm=self.charm(S, K, T, r, sigma, q, option_type),
-            speed=self.speed(S, K, T, r, sigma, q)
+        chain = self.calculate_chain_greeks(S, K, T, r, sigma, q, option_type)
+        values = {name: round(float(chain[name]), self.precision) for name in OptionGreeks.__dataclass_fields__
+                  if name != 'lambda_'}
+        
+        return OptionGreeks(lambda_=round(float(chain['lambda']), self.precision), **values)
+    
+    @staticmethod
+    def _is_call_array(option_type) -> np.ndarray:
+        """OptionType / 'call'/'put' / bool (True = call), skalar lub tablica -> bool array"""
+        if isinstance(option_type, OptionType):
+            return np.asarray(option_type == OptionType.CALL)
+        if isinstance(option_type, str):
+            return np.asarray(option_type.lower() == 'call')
+        
+        types = np.asarray(option_type)
+        if types.dtype == bool:
+            return types
+        if types.dtype == object:
+            types = np.array([t.value if isinstance(t, OptionType) else t for t in types.ravel()]).reshape(types.shape)
+        return np.char.lower(types.astype(str)) == 'call'
+    
+    def calculate_chain_greeks(
+        self,
+        S,
+        K,
+        T,
+        r,
+        sigma,
+        q=0,
+        option_type=OptionType.CALL
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price and all Greeks for a whole option chain in one broadcasted pass
+        
+        All inputs broadcast against each other (scalars or arrays); option_type
+        may be an array of OptionType / 'call' / 'put' / bool (True = call).
+        d1/d2 are computed once per option. Units match the scalar methods
+        (theta and charm per day, vega and rho per 1%); values are not rounded.
+        
+        Returns:
+            Dict of arrays: price, delta, gamma, theta, vega, rho, lambda,
+            vanna, volga, charm, speed, d1, d2
+        """
+        S, K, T, r, sigma, q, is_call = np.broadcast_arrays(
+            np.asarray(S, dtype=np.float64),
+            np.asarray(K, dtype=np.float64),
+            np.asarray(T, dtype=np.float64),
+            np.asarray(r, dtype=np.float64),
+            np.asarray(sigma, dtype=np.float64),
+            np.asarray(q, dtype=np.float64),
+            self._is_call_array(option_type)
+        )
+        
+        live = T > 0
+        smooth = live & (sigma > 0)
+        sign = np.where(is_call, 1.0, -1.0)
+        
+        # d1 / d2 raz na opcję (0 gdy T <= 0 lub sigma <= 0, jak _d1/_d2)
+        T_safe = np.where(live, T, 1.0)
+        sqrt_T = np.sqrt(T_safe)
+        sigma_safe = np.where(smooth, sigma, 1.0)
+        sig_sqrt_T = sigma_safe * sqrt_T
+        d1 = np.where(smooth, (np.log(S / K) + (r - q + 0.5 * sigma_safe**2) * T_safe) / sig_sqrt_T, 0.0)
+        d2 = np.where(smooth, d1 - sig_sqrt_T, 0.0)
+        
+        disc_q = np.exp(-q * T_safe)
+        disc_r = np.exp(-r * T_safe)
+        pdf_d1 = np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi)
+        cdf_sd1 = ndtr(sign * d1)   # N(d1) dla call, N(-d1) dla put
+        cdf_sd2 = ndtr(sign * d2)
+        
+        # Cena
+        intrinsic = np.maximum(0.0, sign * (S - K))
+        price = np.where(live, sign * (S * disc_q * cdf_sd1 - K * disc_r * cdf_sd2), intrinsic)
+        
+        # Pierwszy rząd
+        expiry_delta = np.where(is_call, (S > K).astype(np.float64), -(S < K).astype(np.float64))
+        delta = np.where(live, sign * disc_q * cdf_sd1, expiry_delta)
+        gamma = np.where(smooth, disc_q * pdf_d1 / (S * sig_sqrt_T), 0.0)
+        
+        term1 = -(S * disc_q * pdf_d1 * sigma) / (2 * sqrt_T)
+        theta = np.where(live, (term1 + sign * (q * S * disc_q * cdf_sd1 - r * K * disc_r * cdf_sd2)) / 365, 0.0)
+        
+        raw_vega = S * disc_q * pdf_d1 * sqrt_T
+        vega = np.where(live, raw_vega / 100, 0.0)
+        rho = np.where(live, sign * K * T_safe * disc_r * cdf_sd2 / 100, 0.0)
+        
+        # Wyższe rzędy (lambda = 0 gdy cena zaokrągla się do zera, jak lambda_leverage)
+        priced = price >= 0.5 * 10.0**-self.precision
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lambda_ = np.where(priced, delta * S / np.where(priced, price, 1.0), 0.0)
+        vanna = np.where(smooth, -disc_q * pdf_d1 * d2 / sigma_safe, 0.0)
+        volga = np.where(smooth, raw_vega * d1 * d2 / sigma_safe, 0.0)
+        charm = np.where(
+            smooth,
+            (-q * disc_q * cdf_sd1
+             + disc_q * pdf_d1 * (2 * (r - q) * T_safe - d2 * sig_sqrt_T) / (2 * T_safe * sig_sqrt_T)) / 365,
+            0.0
         )
+        speed = np.where(smooth, -gamma / S * (d1 / sig_sqrt_T + 1), 0.0)
+        
+        return {
+            'price': price,
+            'delta': delta,
+            'gamma': gamma,
+            'theta': theta,
+            'vega': vega,
+            'rho': rho,
+            'lambda': lambda_,
+            'vanna': vanna,
+            'volga': volga,
+            'charm': charm,
+            'speed': speed,
+            'd1': d1,
+            'd2': d2
+        }
     
     def calculate_from_option_data(self, data: OptionData) -> OptionGreeks:
         """Calculate all Greeks from OptionData object"""
@@ -552,7 +883,7 @@ class GeniusOptionsGreeks:
         max_iterations: int = 100
     ) -> float:
         """
-        Calculate Implied Volatility using Brent's method
+        Calculate Implied Volatility (single option view of implied_volatility_chain)
         
         Args:
             market_price: Observed option price
@@ -563,16 +894,217 @@ class GeniusOptionsGreeks:
             Implied volatility (annualized)
         """
         
-        def objective(sigma):
-            return self.black_scholes_price(S, K, T, r, sigma, q, option_type) - market_price
-        
-        try:
-            # Search between 0.1% and 500% volatility
-            iv = brentq(objective, 0.001, 5.0, xtol=precision, maxiter=max_iterations)
-            return round(iv, self.precision)
-        except ValueError:
+        # Search between 0.1% and 500% volatility
+        result = self.implied_volatility_chain(
+            market_price, S, K, T, r, q, option_type,
+            tol=precision, max_iterations=max_iterations, sigma_bounds=(0.001, 5.0)
+        )
+        if not result['converged']:
             # If no solution found, return NaN
             return float('nan')
+        return round(float(result['iv']), self.precision)
+    
+    def implied_volatility_chain(
+        self,
+        market_price,
+        S,
+        K,
+        T,
+        r,
+        q=0,
+        option_type=OptionType.CALL,
+        tol: float = 1e-8,
+        max_iterations: int = 20,
+        sigma_bounds: Tuple[float, float] = (1e-4, 10.0)
+    ) -> Dict[str, np.ndarray]:
+        """
+        Solve implied volatility for a whole chain at once
+        
+        Every price is mapped to the out-of-the-money side via put-call parity,
+        seeded with the Corrado-Miller rational approximation and refined with
+        vectorized Halley steps. Entries that do not converge fall back to Brent.
+        
+        Args:
+            market_price, S, K, T, r, q: scalars or arrays (broadcast)
+            option_type: OptionType / 'call' / 'put' / bool array (True = call)
+            tol: convergence tolerance on sigma
+            sigma_bounds: admissible volatility range
+        
+        Returns:
+            Dict of arrays: iv (NaN if unsolvable, outside sigma_bounds or not
+            determined to `tol` by the price), converged (bool),
+            iterations (Halley steps), fallback (bool, solved by Brent)
+        """
+        price, S, K, T, r, q, is_call = np.broadcast_arrays(
+            np.asarray(market_price, dtype=np.float64),
+            np.asarray(S, dtype=np.float64),
+            np.asarray(K, dtype=np.float64),
+            np.asarray(T, dtype=np.float64),
+            np.asarray(r, dtype=np.float64),
+            np.asarray(q, dtype=np.float64),
+            self._is_call_array(option_type)
+        )
+        shape = price.shape
+        price, S, K, T, r, q, is_call = (a.ravel() for a in (price, S, K, T, r, q, is_call))
+        n = price.size
+        lo_sigma, hi_sigma = sigma_bounds
+        
+        T_safe = np.where(T > 0, T, 1.0)
+        fwd_spot = S * np.exp(-q * T_safe)     # S·e^(-qT)
+        disc_strike = K * np.exp(-r * T_safe)  # K·e^(-rT)
+        
+        # Cena opcji OTM (put-call parity): call gdy K·e^(-rT) >= S·e^(-qT), inaczej put
+        parity = fwd_spot - disc_strike
+        otm_call = disc_strike >= fwd_spot
+        call_price = np.where(is_call, price, price + parity)
+        # Kwotowania już po stronie OTM bez przejścia przez parytet (bez utraty precyzji)
+        otm_price = np.where(is_call == otm_call, price, np.where(otm_call, call_price, call_price - parity))
+        
+        # Arbitrage bounds
+        upper = np.where(otm_call, fwd_spot, disc_strike)
+        valid = (T > 0) & (S > 0) & (K > 0) & np.isfinite(price) & (otm_price > 0) & (otm_price < upper)
+        
+        sign = np.where(otm_call, 1.0, -1.0)
+        sqrt_T = np.sqrt(T_safe)
+        log_fk = np.log(fwd_spot / disc_strike)
+        
+        # Corrado-Miller (na cenie call)
+        half_diff = (fwd_spot - disc_strike) / 2
+        c = call_price - half_diff
+        disc = np.maximum(c**2 - (fwd_spot - disc_strike)**2 / np.pi, 0.0)
+        sigma = np.sqrt(2 * np.pi / T_safe) / (fwd_spot + disc_strike) * (c + np.sqrt(disc))
+        sigma = np.where(np.isfinite(sigma) & (sigma > 0), sigma, 0.5)
+        sigma = np.clip(sigma, max(lo_sigma, 0.01), min(hi_sigma, 5.0))
+        
+        iv = np.full(n, np.nan)
+        converged = np.zeros(n, dtype=bool)
+        iterations = np.zeros(n, dtype=np.int64)
+        active = np.flatnonzero(valid)
+        
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            sig = sigma[active]
+            st = sig * sqrt_T[active]
+            d1 = log_fk[active] / st + 0.5 * st
+            d2 = d1 - st
+            sg = sign[active]
+            model = sg * (fwd_spot[active] * ndtr(sg * d1) - disc_strike[active] * ndtr(sg * d2))
+            diff = model - otm_price[active]
+            vega = fwd_spot[active] * np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi) * sqrt_T[active]
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = diff / vega
+                # Halley: vomma/vega = d1·d2/σ
+                correction = 1 - 0.5 * newton * d1 * d2 / sig
+                step = np.where(correction > 0.5, newton / correction, newton)
+            
+            raw_sig = sig - step
+            new_sig = np.clip(raw_sig, lo_sigma, hi_sigma)
+            bad = ~np.isfinite(new_sig) | (vega < 1e-12)
+            # Krok obcięty do granicy to nie zbieżność (IV poza sigma_bounds -> Brent / NaN)
+            pinned = new_sig != raw_sig
+            new_sig = np.where(bad, sig, new_sig)
+            sigma[active] = new_sig
+            iterations[active] += 1
+            
+            done = (np.abs(new_sig - sig) < tol) & ~bad & ~pinned
+            converged[active[done]] = True
+            active = active[~done & ~bad]
+        
+        iv[converged] = sigma[converged]
+        
+        # Brent dla przypadków bez zbieżności
+        fallback = np.zeros(n, dtype=bool)
+        for i in np.flatnonzero(valid & ~converged):
+            def objective(vol, i=i):
+                st = vol * sqrt_T[i]
+                d1 = log_fk[i] / st + 0.5 * st
+                sg = sign[i]
+                return sg * (fwd_spot[i] * ndtr(sg * d1) - disc_strike[i] * ndtr(sg * (d1 - st))) - otm_price[i]
+            try:
+                iv[i] = brentq(objective, lo_sigma, hi_sigma, xtol=tol, maxiter=200)
+                converged[i] = True
+                fallback[i] = True
+            except ValueError:
+                pass
+        
+        # Rozwiązanie musi odtwarzać cenę: residuum + szum zaokrągleń (cena wejściowa,
+        # parytet, różnica dwóch nóg wzoru) <= tol·vega, czyli cena wyznacza σ z dokładnością tol.
+        # Głęboko ITM opcja OTM bywa na poziomie zaokrągleń - wtedy IV nieokreślona (NaN).
+        solved = np.flatnonzero(converged)
+        if solved.size:
+            sig = iv[solved]
+            st = sig * sqrt_T[solved]
+            d1 = log_fk[solved] / st + 0.5 * st
+            sg = sign[solved]
+            fwd_leg = fwd_spot[solved] * ndtr(sg * d1)
+            strike_leg = disc_strike[solved] * ndtr(sg * (d1 - st))
+            model = sg * (fwd_leg - strike_leg)
+            vega = fwd_spot[solved] * np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi) * sqrt_T[solved]
+            converted = is_call[solved] != otm_call[solved]
+            noise = 4 * np.finfo(np.float64).eps * (
+                np.abs(price[solved]) + np.where(converted, np.abs(parity[solved]), 0.0)
+                + fwd_leg + strike_leg)
+            exact = np.abs(model - otm_price[solved]) + noise <= tol * vega
+            rejected = solved[~exact]
+            iv[rejected] = np.nan
+            converged[rejected] = False
+            fallback[rejected] = False
+        
+        return {
+            'iv': iv.reshape(shape),
+            'converged': converged.reshape(shape),
+            'iterations': iterations.reshape(shape),
+            'fallback': fallback.reshape(shape)
+        }
+    
+    def build_vol_surface(
+        self,
+        market_price,
+        S: float,
+        K,
+        T,
+        r: float = 0.0,
+        q: float = 0.0,
+        option_type=OptionType.CALL,
+        min_points: int = 2
+    ) -> Optional[VolatilitySurface]:
+        """
+        Solve IVs for quoted chain points and assemble a VolatilitySurface
+        
+        Points that fail to converge are dropped; when both a call and a put
+        are quoted at the same strike/expiry their IVs are averaged.
+        """
+        solved = self.implied_volatility_chain(market_price, S, K, T, r, q, option_type)
+        K_all, T_all = np.broadcast_arrays(np.asarray(K, dtype=np.float64), np.asarray(T, dtype=np.float64))
+        K_all = np.broadcast_to(K_all, solved['iv'].shape).ravel()
+        T_all = np.broadcast_to(T_all, solved['iv'].shape).ravel()
+        ok = solved['converged'].ravel()
+        K_ok, T_ok, iv_ok = K_all[ok], T_all[ok], solved['iv'].ravel()[ok]
+        
+        expiries, strikes, ivs, forwards = [], [], [], []
+        for t in np.unique(T_ok):
+            in_expiry = T_ok == t
+            uniq, inverse = np.unique(K_ok[in_expiry], return_inverse=True)
+            if len(uniq) < min_points:
+                continue
+            mean_iv = np.bincount(inverse, weights=iv_ok[in_expiry]) / np.bincount(inverse)
+            expiries.append(t)
+            strikes.append(uniq)
+            ivs.append(mean_iv)
+            forwards.append(S * np.exp((r - q) * t))
+        
+        if not expiries:
+            return None
+        
+        return VolatilitySurface(
+            spot=float(S),
+            expiries=np.array(expiries),
+            forwards=np.array(forwards),
+            strikes=strikes,
+            ivs=ivs
+        )
     
     # ═══════════════════════════════════════════════════════════════════════
     # TRADING SIGNAL INTEGRATION
@@ -662,14 +1194,50 @@ class CryptoOptionsAnalyzer:
         # Default crypto parameters
         self.default_risk_free_rate = 0.05  # 5% (conservative)
         self.default_dividend_yield = 0.0   # Crypto has no dividends
+        self.symbol = 'BTC'
+    
+    def refresh_surface(
+        self,
+        spot_price: float,
+        strikes,
+        days_to_expiry,
+        market_prices,
+        option_type='call',
+        symbol: str = None,
+        fit_svi: bool = True
+    ) -> Optional[VolatilitySurface]:
+        """
+        Solve the quoted chain once, fit SVI per expiry and cache the surface
+        
+        Later analyze_btc_option / analyze_btc_chain calls without volatility
+        read IVs from the cached surface until its TTL runs out.
+        """
+        surface = self.greeks_calc.build_vol_surface(
+            market_prices, spot_price, strikes,
+            np.asarray(days_to_expiry, dtype=np.float64) / 365,
+            self.default_risk_free_rate, self.default_dividend_yield, option_type
+        )
+        if surface is None:
+            return None
+        if fit_svi:
+            surface.fit_svi()
+        return register_vol_surface(symbol or self.symbol, surface)
+    
+    def surface_iv(self, strikes, days_to_expiry, symbol: str = None) -> Optional[np.ndarray]:
+        """IVs from the cached surface (None when no fresh surface is registered)"""
+        surface = get_vol_surface(symbol or self.symbol)
+        if surface is None:
+            return None
+        return surface.iv(strikes, np.asarray(days_to_expiry, dtype=np.float64) / 365)
     
     def analyze_btc_option(
         self,
         spot_price: float,
         strike: float,
         days_to_expiry: int,
-        volatility: float,  # As decimal (0.80 = 80%)
-        option_type: str = 'call'
+        volatility: float = None,  # As decimal (0.80 = 80%)
+        option_type: str = 'call',
+        market_price: float = None
     ) -> Dict[str, Any]:
         """
         Analyze a BTC option
@@ -678,13 +1246,31 @@ class CryptoOptionsAnalyzer:
             spot_price: Current BTC price
             strike: Strike price
             days_to_expiry: Days until expiration
-            volatility: IV as decimal
+            volatility: IV as decimal (optional with market_price or a cached surface)
             option_type: 'call' or 'put'
+            market_price: Observed option price - IV is solved from it
         """
         
         opt_type = OptionType.CALL if option_type.lower() == 'call' else OptionType.PUT
         T = days_to_expiry / 365
         
+        iv_converged = None
+        if market_price is not None:
+            solved = self.greeks_calc.implied_volatility_chain(
+                market_price, spot_price, strike, T,
+                self.default_risk_free_rate, self.default_dividend_yield, opt_type
+            )
+            iv_converged = bool(solved['converged'])
+            if iv_converged:
+                volatility = float(solved['iv'])
+            elif volatility is None:
+                raise ValueError(f"Cannot solve implied volatility from price {market_price}")
+        elif volatility is None:
+            cached = self.surface_iv(strike, days_to_expiry)
+            if cached is None:
+                raise ValueError("Either volatility, market_price or a cached vol surface is required")
+            volatility = float(cached)
+        
         # Calculate price
         price = self.greeks_calc.black_scholes_price(
             S=spot_price,
@@ -726,6 +1312,7 @@ class CryptoOptionsAnalyzer:
             'strike': strike,
             'expiry_days': days_to_expiry,
             'iv': volatility,
+            'iv_converged': iv_converged,
             'moneyness': moneyness,
             'price': price,
             'greeks': greeks.to_dict(),
@@ -733,6 +1320,54 @@ class CryptoOptionsAnalyzer:
             'analysis': analysis
         }
     
+    def analyze_btc_chain(
+        self,
+        spot_price: float,
+        strikes,
+        days_to_expiry,
+        volatility=None,
+        option_type='call',
+        market_prices=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price a whole BTC chain (arrays of strikes / expiries / IVs / types)
+        
+        With market_prices the IVs are solved first (implied_volatility_chain);
+        without volatility they are read from the cached surface.
+        
+        Returns:
+            Dict of arrays from calculate_chain_greeks plus strike, expiry_days,
+            iv, iv_converged and prob_itm
+        """
+        days = np.asarray(days_to_expiry, dtype=np.float64)
+        iv_converged = None
+        if market_prices is not None:
+            solved = self.greeks_calc.implied_volatility_chain(
+                market_prices, spot_price, strikes, days / 365,
+                self.default_risk_free_rate, self.default_dividend_yield, option_type
+            )
+            volatility, iv_converged = solved['iv'], solved['converged']
+        elif volatility is None:
+            volatility = self.surface_iv(strikes, days)
+            if volatility is None:
+                raise ValueError("Either volatility, market_prices or a cached vol surface is required")
+        chain = self.greeks_calc.calculate_chain_greeks(
+            S=spot_price,
+            K=strikes,
+            T=days / 365,
+            r=self.default_risk_free_rate,
+            sigma=volatility,
+            q=self.default_dividend_yield,
+            option_type=option_type
+        )
+        shape = chain['price'].shape
+        chain['strike'] = np.broadcast_to(np.asarray(strikes, dtype=np.float64), shape)
+        chain['expiry_days'] = np.broadcast_to(days, shape)
+        chain['iv'] = np.broadcast_to(np.asarray(volatility, dtype=np.float64), shape)
+        chain['iv_converged'] = iv_converged if iv_converged is not None else np.ones(shape, dtype=bool)
+        chain['prob_itm'] = np.abs(chain['delta'])
+        return chain
+    
     def create_greeks_summary(self, results: List[Dict]) -> str:
         """Create a formatted summary of Greeks analysis"""
         
@@ -46,6 +46,372 @@ class BlackLittermanView:
     confidence: float  # Confidence level (0-1)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# COVARIANCE ESTIMATORS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def ledoit_wolf_covariance(returns) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf (2004) shrinkage of the sample covariance toward scaled identity
+    
+    Returns:
+        (covariance, shrinkage) - covariance is per-period (not annualized)
+    """
+    X = np.asarray(returns, dtype=np.float64)
+    X = X[~np.isnan(X).any(axis=1)]
+    t, n = X.shape
+    X = X - X.mean(axis=0)
+    sample = X.T @ X / t
+    
+    mu = np.trace(sample) / n
+    delta = np.sum((sample - mu * np.eye(n)) ** 2) / n
+    X2 = X * X
+    beta_bar = (np.sum((X2.T @ X2) / t) - np.sum(sample ** 2)) / (n * t)
+    shrinkage = float(np.clip(beta_bar / delta, 0.0, 1.0)) if delta > 0 else 1.0
+    
+    # Skala próbkowa (ddof=1) jak DataFrame.cov()
+    covariance = (shrinkage * mu * np.eye(n) + (1 - shrinkage) * sample) * t / max(t - 1, 1)
+    return covariance, shrinkage
+
+
+@dataclass
+class FactorCovariance:
+    """
+    Factor risk model Σ = B·F·B' + diag(D)
+    
+    Portfolio variance and Σ·w are evaluated in O(n·k) without ever forming
+    the dense n×n matrix (dense() is there for solvers that need it).
+    """
+    loadings: np.ndarray       # B (n_assets, n_factors)
+    factor_cov: np.ndarray     # F (n_factors, n_factors)
+    specific_var: np.ndarray   # D (n_assets,)
+    
+    def __post_init__(self):
+        self.loadings = np.asarray(self.loadings, dtype=np.float64)
+        self.factor_cov = np.asarray(self.factor_cov, dtype=np.float64)
+        self.specific_var = np.asarray(self.specific_var, dtype=np.float64)
+        # F = L·L' -> w'Σw = |L'B'w|² + Σ D·w²
+        vals, vecs = np.linalg.eigh(self.factor_cov)
+        self._root = vecs * np.sqrt(np.maximum(vals, 0.0))
+    
+    @property
+    def n_assets(self) -> int:
+        return self.loadings.shape[0]
+    
+    @property
+    def n_factors(self) -> int:
+        return self.loadings.shape[1]
+    
+    @classmethod
+    def from_pca(cls, returns, n_factors: int = 5) -> 'FactorCovariance':
+        """Statistical factors - top principal components of the sample covariance (per-period)"""
+        X = np.asarray(returns, dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        t, n = X.shape
+        X = (X - X.mean(axis=0)) / np.sqrt(max(t - 1, 1))
+        k = int(min(n_factors, n, t))
+    
+        # Cienkie SVD danych zamiast macierzy n×n
+        _, s, vt = np.linalg.svd(X, full_matrices=False)
+        loadings = vt[:k].T * s[:k]
+        total_var = np.einsum('ij,ij->j', X, X)
+        specific = total_var - np.einsum('ij,ij->i', loadings, loadings)
+        floor = 1e-6 * max(total_var.mean(), 1e-300)
+        return cls(loadings, np.eye(k), np.maximum(specific, floor))
+    
+    @classmethod
+    def from_exposures(cls, returns, exposures, market: bool = True) -> 'FactorCovariance':
+        """
+        Fundamental factors - known exposures (e.g. standardized QuantMuse
+        factor scores, one row per asset); factor returns come from a
+        cross-sectional regression per period
+        """
+        X = np.asarray(returns, dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        B = np.asarray(exposures, dtype=np.float64)
+        if market:
+            B = np.column_stack([np.ones(len(B)), B])
+    
+        # f_t = (B'B)⁻¹B'r_t dla wszystkich okresów naraz
+        factor_returns = np.linalg.lstsq(B, X.T, rcond=None)[0].T
+        residuals = X - factor_returns @ B.T
+        factor_cov = np.atleast_2d(np.cov(factor_returns, rowvar=False))
+        specific = residuals.var(axis=0, ddof=1)
+        floor = 1e-6 * max(X.var(axis=0, ddof=1).mean(), 1e-300)
+        return cls(B, factor_cov, np.maximum(specific, floor))
+    
+    def scaled(self, factor: float) -> 'FactorCovariance':
+        """Same model with every variance multiplied by `factor` (e.g. annualization)"""
+        return FactorCovariance(self.loadings, self.factor_cov * factor, self.specific_var * factor)
+    
+    def matvec(self, w: np.ndarray) -> np.ndarray:
+        """Σ·w for one portfolio (n,) or a batch of columns (n, m)"""
+        w = np.asarray(w, dtype=np.float64)
+        d = self.specific_var if w.ndim == 1 else self.specific_var[:, None]
+        return self.loadings @ (self.factor_cov @ (self.loadings.T @ w)) + d * w
+    
+    def variance(self, w: np.ndarray):
+        """w'Σw for one portfolio (n,) -> float or a batch of rows (m, n) -> (m,)"""
+        w = np.asarray(w, dtype=np.float64)
+        exposure = w @ self.loadings @ self._root
+        var = np.sum(exposure ** 2, axis=-1) + np.sum(self.specific_var * w ** 2, axis=-1)
+        return float(var) if w.ndim == 1 else var
+    
+    def dense(self) -> np.ndarray:
+        """Full n×n covariance matrix"""
+        cov = self.loadings @ self.factor_cov @ self.loadings.T
+        cov[np.diag_indices_from(cov)] += self.specific_var
+        return cov
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FRONTIER ENGINE (CRITICAL LINE ALGORITHM)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CriticalLineFrontier:
+    """
+    📈 Exact mean-variance frontier under a budget and per-asset bounds
+    
+    Markowitz' Critical Line Algorithm: the frontier is piecewise linear in the
+    weights between turning points, so it is solved once and any number of
+    frontier / target-return / target-volatility / max-Sharpe portfolios are
+    interpolated in closed form. Entering assets are screened for all bounded
+    candidates at once through a Schur-complement update of Σ_FF⁻¹.
+    """
+    
+    def __init__(
+        self,
+        mean: np.ndarray,
+        cov: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        tol: float = 1e-10
+    ):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.cov = np.asarray(cov, dtype=np.float64)
+        n = len(self.mean)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=np.float64), (n,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=np.float64), (n,)).copy()
+        self.tol = tol
+        
+        if self.lower.sum() > 1 + tol or self.upper.sum() < 1 - tol or np.any(self.lower > self.upper):
+            raise ValueError("Bounds are infeasible for a fully invested portfolio")
+        
+        # Remisy w średnich dają niejednoznaczny punkt startowy - rozbij je o pomijalny epsilon
+        spread = max(np.ptp(self.mean), np.abs(self.mean).max(), 1e-12)
+        ranks = np.argsort(np.argsort(self.mean, kind='stable'), kind='stable')
+        self._mu = self.mean + spread * 1e-9 * ranks / max(n, 1)
+        self._flat = 1e-8 * spread
+        
+        self.weights, self.lambdas = self._solve()
+        # Punkty zwrotne rosnąco po λ (od min-variance do max-return); przy remisach
+        # w średnich szczyt frontu jest płaski - punkty bez przyrostu zwrotu są zdominowane
+        order = np.argsort(self.lambdas, kind='stable')
+        rets = self.weights[order] @ self.mean
+        keep = np.concatenate([[True], rets[1:] > np.maximum.accumulate(rets)[:-1] + self._flat])
+        self.weights = self.weights[order[keep]]
+        self.lambdas = self.lambdas[order[keep]]
+        self.returns = self.weights @ self.mean
+        self.variances = np.einsum('ij,jk,ik->i', self.weights, self.cov, self.weights)
+    
+    # ───────────────────────────────────────────────────────────────────────
+    # Solver
+    # ───────────────────────────────────────────────────────────────────────
+    
+    def _initial(self) -> Tuple[List[int], np.ndarray]:
+        """Fill assets from the highest mean up to their upper bound until the budget is met"""
+        w = self.lower.copy()
+        order = np.argsort(-self._mu, kind='stable')
+        free = int(order[0])
+        for i in order:
+            if w.sum() >= 1 - self.tol:
+                break
+            free = int(i)
+            w[i] = self.upper[i]
+        w[free] += 1 - w.sum()
+        return [free], w
+    
+    def _line(self, free: np.ndarray, bound: np.ndarray, w: np.ndarray):
+        """Free weights on the current critical line: w_F(λ) = α + λ·β"""
+        cov_ff = self.cov[np.ix_(free, free)]
+        try:
+            inv_ff = np.linalg.inv(cov_ff)
+        except np.linalg.LinAlgError:
+            inv_ff = np.linalg.pinv(cov_ff)
+        cov_fb = self.cov[np.ix_(free, bound)]
+        w_b = w[bound]
+        
+        # β nie zależy od przesunięcia μ o stałą - centrowanie na zbiorze wolnym
+        # usuwa kancelację przy (prawie) równych średnich
+        a = inv_ff.sum(axis=1)
+        m = inv_ff @ (self._mu[free] - self._mu[free].mean())
+        c_f = cov_fb @ w_b
+        h = inv_ff @ c_f
+        sa, sm, sh = a.sum(), m.sum(), h.sum()
+        beta = m - a * sm / sa
+        alpha = a * (1 - w_b.sum() + sh) / sa - h
+        return inv_ff, cov_fb, c_f, (a, m, h, sa, sm, sh), alpha, beta
+    
+    def _solve(self) -> Tuple[np.ndarray, np.ndarray]:
+        free, w = self._initial()
+        weights, lambdas = [w.copy()], [np.inf]
+        lam_prev = np.inf
+        n = len(self.mean)
+        
+        for _ in range(4 * n + 10):
+            is_free = np.zeros(n, dtype=bool)
+            is_free[free] = True
+            f_idx, b_idx = np.array(free), np.flatnonzero(~is_free)
+            inv_ff, cov_fb, c_f, (a, m, h, sa, sm, sh), alpha, beta = self._line(f_idx, b_idx, w)
+            
+            # a) wolna waga dochodzi do granicy - także remis przy bieżącej λ
+            # (kilka wag trafia w granice jednocześnie), więc bez ostrej nierówności
+            lam_in, i_in, bound_in = -np.inf, None, None
+            if len(f_idx) > 1:
+                bound = np.where(beta < 0, self.upper[f_idx], self.lower[f_idx])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    cand = (bound - alpha) / beta
+                slack = 1e-9 * max(1.0, abs(lam_prev)) if np.isfinite(lam_prev) else np.inf
+                valid = (beta != 0) & (cand <= lam_prev + slack)
+                if valid.any():
+                    j = int(np.argmax(np.where(valid, cand, -np.inf)))
+                    lam_in, i_in, bound_in = min(cand[j], lam_prev), int(f_idx[j]), bound[j]
+            
+            # b) związana waga wchodzi do zbioru wolnych (wszyscy kandydaci naraz)
+            lam_out, i_out = -np.inf, None
+            if len(b_idx):
+                w_b = w[b_idx]
+                centre = self._mu[f_idx].mean()
+                mu_f, mu_b = self._mu[f_idx] - centre, self._mu[b_idx] - centre
+                diag_b = np.diag(self.cov)[b_idx]
+                U = inv_ff @ cov_fb
+                d = diag_b - np.sum(cov_fb * U, axis=0)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    u1 = U.sum(axis=0)
+                    um = U.T @ mu_f
+                    sa2 = sa + (u1 - 1) ** 2 / d
+                    a_i = (1 - u1) / d
+                    m_i = (mu_b - um) / d
+                    sm2 = sm + (u1 - 1) * (um - mu_b) / d
+                    v_i = self.cov[np.ix_(b_idx, b_idx)] @ w_b - diag_b * w_b
+                    u_v = U.T @ c_f - (diag_b - d) * w_b
+                    h_i = (v_i - u_v) / d
+                    sh2 = (sh - u1 * w_b) + (u1 - 1) * (u_v - v_i) / d
+                    beta_i = m_i - a_i * sm2 / sa2
+                    alpha_i = a_i * (1 - (w_b.sum() - w_b) + sh2) / sa2 - h_i
+                    cand = (w_b - alpha_i) / beta_i
+                valid = (d > self.tol) & (beta_i != 0) & (cand < lam_prev - self.tol)
+                if valid.any():
+                    j = int(np.argmax(np.where(valid, cand, -np.inf)))
+                    lam_out, i_out = cand[j], int(b_idx[j])
+            
+            if lam_in <= 0 and lam_out <= 0:
+                # Portfel minimalnej wariancji na bieżącej linii krytycznej
+                w[f_idx] = alpha
+                weights.append(w.copy())
+                lambdas.append(0.0)
+                break
+            
+            if lam_in >= lam_out:
+                lam = lam_in
+                free.remove(i_in)
+                w[i_in] = bound_in
+            else:
+                lam = lam_out
+                free.append(i_out)
+            
+            is_free[:] = False
+            is_free[free] = True
+            f_idx, b_idx = np.array(free), np.flatnonzero(~is_free)
+            _, _, _, _, alpha, beta = self._line(f_idx, b_idx, w)
+            w[f_idx] = alpha + lam * beta
+            weights.append(w.copy())
+            lambdas.append(lam)
+            lam_prev = lam
+        
+        weights, lambdas = np.array(weights), np.array(lambdas)
+        # Odrzuć punkty z błędem numerycznym (granice / budżet)
+        slack = 1e-7
+        ok = (
+            np.all(weights >= self.lower - slack, axis=1) &
+            np.all(weights <= self.upper + slack, axis=1) &
+            (np.abs(weights.sum(axis=1) - 1) < slack)
+        )
+        return np.clip(weights[ok], self.lower, self.upper), lambdas[ok]
+    
+    # ───────────────────────────────────────────────────────────────────────
+    # Queries
+    # ───────────────────────────────────────────────────────────────────────
+    
+    @property
+    def min_return(self) -> float:
+        return float(self.returns[0])
+    
+    @property
+    def max_return(self) -> float:
+        return float(self.returns[-1])
+    
+    def min_variance(self) -> np.ndarray:
+        return self.weights[0].copy()
+    
+    def weights_for_returns(self, targets) -> np.ndarray:
+        """Frontier weights for target returns (clipped to the attainable range) -> (len(targets), n)"""
+        targets = np.clip(np.atleast_1d(np.asarray(targets, dtype=np.float64)), self.min_return, self.max_return)
+        if len(self.returns) == 1:
+            return np.repeat(self.weights, len(targets), axis=0)
+        k = np.clip(np.searchsorted(self.returns, targets) - 1, 0, len(self.returns) - 2)
+        span = self.returns[k + 1] - self.returns[k]
+        t = np.where(span > 0, (targets - self.returns[k]) / np.where(span > 0, span, 1), 0.0)
+        return self.weights[k] + t[:, None] * (self.weights[k + 1] - self.weights[k])
+    
+    def frontier(self, n_points: int = 50, min_return: float = None, max_return: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(target_returns, weights) for n_points evenly spaced target returns"""
+        lo = self.min_return if min_return is None else max(min_return, self.min_return)
+        hi = self.max_return if max_return is None else min(max_return, self.max_return)
+        targets = np.linspace(lo, hi, n_points)
+        return targets, self.weights_for_returns(targets)
+    
+    def _segments(self):
+        w0, d = self.weights[:-1], np.diff(self.weights, axis=0)
+        r0, dr = self.returns[:-1], np.diff(self.returns)
+        v0 = self.variances[:-1]
+        c = np.einsum('ij,jk,ik->i', w0, self.cov, d)
+        dv = np.einsum('ij,jk,ik->i', d, self.cov, d)
+        return w0, d, r0, dr, v0, c, dv
+    
+    def max_sharpe(self, risk_free: float = 0.0) -> np.ndarray:
+        """Tangency portfolio - closed-form optimum of Sharpe on every segment"""
+        if len(self.weights) == 1:
+            return self.weights[0].copy()
+        w0, d, r0, dr, v0, c, dv = self._segments()
+        excess = r0 - risk_free
+        # d/dt [(r0 + t·dr - rf) / √(v0 + 2tc + t²dv)] = 0 jest liniowe w t
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (excess * c - dr * v0) / (c * dr - excess * dv)
+        t = np.clip(np.nan_to_num(t, nan=0.0), 0.0, 1.0)
+        candidates = np.concatenate([w0 + t[:, None] * d, self.weights[-1:]])
+        rets = candidates @ self.mean
+        vols = np.sqrt(np.maximum(np.einsum('ij,jk,ik->i', candidates, self.cov, candidates), 1e-300))
+        return candidates[int(np.argmax((rets - risk_free) / vols))].copy()
+    
+    def weights_for_volatility(self, target_vol: float) -> np.ndarray:
+        """Highest-return frontier portfolio with volatility <= target_vol"""
+        vols = np.sqrt(self.variances)
+        if target_vol <= vols[0]:
+            return self.weights[0].copy()
+        if target_vol >= vols[-1]:
+            return self.weights[-1].copy()
+        k = int(np.searchsorted(vols, target_vol) - 1)
+        w0, d = self.weights[k], self.weights[k + 1] - self.weights[k]
+        c, dv = w0 @ self.cov @ d, d @ self.cov @ d
+        gap = self.variances[k] - target_vol ** 2
+        if dv > 0:
+            t = (-c + np.sqrt(max(c * c - dv * gap, 0.0))) / dv
+        else:
+            t = -gap / (2 * c) if c != 0 else 0.0
+        return w0 + float(np.clip(t, 0.0, 1.0)) * d
+
+
 class GeniusPortfolioOptimizer:
     """
     Professional Portfolio Optimizer
@@ -62,7 +428,10 @@ class GeniusPortfolioOptimizer:
         self,
         returns: pd.DataFrame,
         risk_free_rate: float = 0.04,
-        trading_days: int = 252
+        trading_days: int = 252,
+        covariance: str = 'sample',
+        n_factors: int = 5,
+        factor_exposures: Optional[pd.DataFrame] = None
     ):
         """
         Initialize optimizer
@@ -71,6 +440,10 @@ class GeniusPortfolioOptimizer:
             returns: DataFrame of asset returns (daily)
             risk_free_rate: Annual risk-free rate
             trading_days: Number of trading days per year
+            covariance: 'sample', 'ledoit_wolf' (shrinkage toward scaled identity)
+                or 'factor' (PCA factors, or factor_exposures if given, + diagonal)
+            n_factors: Number of principal components for the PCA factor model
+            factor_exposures: Asset × factor exposures (e.g. QuantMuse scores)
         """
         self.returns = returns
         self.assets = list(returns.columns)
@@ -80,11 +453,57 @@ class GeniusPortfolioOptimizer:
         
         # Calculate statistics
         self.mean_returns = returns.mean() * trading_days  # Annualized
-        self.cov_matrix = returns.cov() * trading_days  # Annualized
+        self.shrinkage = 0.0
+        self.risk_model: Optional[FactorCovariance] = None
+        if covariance == 'ledoit_wolf':
+            cov, self.shrinkage = ledoit_wolf_covariance(returns.values)
+            self.cov_matrix = pd.DataFrame(cov * trading_days, index=self.assets, columns=self.assets)
+        elif covariance == 'factor':
+            if factor_exposures is not None:
+                exposures = factor_exposures.reindex(self.assets).fillna(0.0).values
+                model = FactorCovariance.from_exposures(returns.values, exposures)
+            else:
+                model = FactorCovariance.from_pca(returns.values, n_factors)
+            self.risk_model = model.scaled(trading_days)
+            self.cov_matrix = pd.DataFrame(self.risk_model.dense(), index=self.assets, columns=self.assets)
+        elif covariance == 'sample':
+            self.cov_matrix = returns.cov() * trading_days  # Annualized
+        else:
+            raise ValueError(f"Unknown covariance estimator: {covariance}")
         self.corr_matrix = returns.corr()
         
+        # Prekalkulowane macierze dla optymalizatorów (bez narzutu pandas w pętli)
+        self._mu = self.mean_returns.values.astype(np.float64)
+        self._sigma = self.cov_matrix.values.astype(np.float64)
+        self._frontiers: Dict[Tuple[float, float], Optional[CriticalLineFrontier]] = {}
+        
         self.logger = logging.getLogger('PortfolioOptimizer')
     
+    def _bounds(self, constraints: Optional[Dict] = None) -> Tuple[float, float]:
+        """Per-asset (lower, upper) weight bounds from constraints"""
+        constraints = constraints or {}
+        return float(constraints.get('min_weight', 0.0)), float(constraints.get('max_weight', 1.0))
+    
+    def _frontier_engine(self, constraints: Optional[Dict] = None) -> Optional[CriticalLineFrontier]:
+        """Critical-line frontier for the given bounds (solved once, then cached)"""
+        key = self._bounds(constraints)
+        if key not in self._frontiers:
+            try:
+                self._frontiers[key] = CriticalLineFrontier(self._mu, self._sigma, key[0], key[1])
+            except (ValueError, np.linalg.LinAlgError) as e:
+                self.logger.warning(f"Critical line frontier unavailable ({e}), using SLSQP")
+                self._frontiers[key] = None
+        return self._frontiers[key]
+    
+    def _result(self, w: np.ndarray, method: str) -> PortfolioResult:
+        return PortfolioResult(
+            weights=dict(zip(self.assets, w)),
+            expected_return=self._portfolio_return(w),
+            volatility=self._portfolio_volatility(w),
+            sharpe_ratio=self._sharpe_ratio(w),
+            method=method
+        )
+    
     # ═══════════════════════════════════════════════════════════════════════
     # MEAN-VARIANCE OPTIMIZATION
     # ═══════════════════════════════════════════════════════════════════════
@@ -98,40 +517,52 @@ class GeniusPortfolioOptimizer:
         """
         Mean-Variance Optimization (Markowitz)
         
+        Budget + per-asset bound problems are answered from the critical line
+        frontier; SLSQP with analytic gradients is the fallback.
+        
         Args:
             target_return: Target annual return
             target_volatility: Target annual volatility
             constraints: Additional constraints
         """
         
+        cla = self._frontier_engine(constraints)
+        if cla is not None:
+            if target_return is not None:
+                if cla.min_return - 1e-12 <= target_return <= cla.max_return + 1e-12:
+                    return self._result(cla.weights_for_returns(target_return)[0], 'Mean-Variance')
+                if target_return > cla.max_return:
+                    self.logger.warning(f"Target return {target_return:.2%} not attainable, using max-return portfolio")
+                    return self._result(cla.weights[-1].copy(), 'Mean-Variance')
+            elif target_volatility is not None:
+                return self._result(cla.weights_for_volatility(target_volatility), 'Mean-Variance')
+            elif cla.max_return > self.rf:
+                return self._result(cla.max_sharpe(self.rf), 'Mean-Variance')
+        
         # Default constraints - weights sum to 1, long only
-        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1}]
-        bounds = tuple((0, 1) for _ in range(self.n_assets))
+        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)}]
+        lo, hi = self._bounds(constraints)
+        bounds = tuple((lo, hi) for _ in range(self.n_assets))
         
         if target_return is not None:
             # Minimize volatility for given return
             cons.append({
                 'type': 'eq',
-                'fun': lambda x: self._portfolio_return(x) - target_return
+                'fun': lambda x: self._portfolio_return(x) - target_return,
+                'jac': lambda x: self._mu
             })
-            objective = self._portfolio_volatility
+            objective, jac = self._portfolio_volatility, self._volatility_grad
         elif target_volatility is not None:
             # Maximize return for given volatility
             cons.append({
                 'type': 'ineq',
-                'fun': lambda x: target_volatility - self._portfolio_volatility(x)
+                'fun': lambda x: target_volatility - self._portfolio_volatility(x),
+                'jac': lambda x: -self._volatility_grad(x)
             })
-            objective = lambda x: -self._portfolio_return(x)
+            objective, jac = (lambda x: -self._portfolio_return(x)), (lambda x: -self._mu)
         else:
             # Maximize Sharpe ratio
-            objective = lambda x: -self._sharpe_ratio(x)
-        
-        # Add custom constraints
-        if constraints:
-            if 'max_weight' in constraints:
-                bounds = tuple((0, constraints['max_weight']) for _ in range(self.n_assets))
-            if 'min_weight' in constraints:
-                bounds = tuple((constraints['min_weight'], 1) for _ in range(self.n_assets))
+            objective, jac = (lambda x: -self._sharpe_ratio(x)), (lambda x: -self._sharpe_grad(x))
         
         # Initial guess - equal weights
         x0 = np.array([1/self.n_assets] * self.n_assets)
@@ -140,27 +571,42 @@ class GeniusPortfolioOptimizer:
             objective,
             x0,
             method='SLSQP',
+            jac=jac,
             bounds=bounds,
             constraints=cons
         )
         
-        weights = dict(zip(self.assets, result.x))
-        
-        return PortfolioResult(
-            weights=weights,
-            expected_return=self._portfolio_return(result.x),
-            volatility=self._portfolio_volatility(result.x),
-            sharpe_ratio=self._sharpe_ratio(result.x),
-            method='Mean-Variance'
-        )
+        return self._result(result.x, 'Mean-Variance')
     
     def _portfolio_return(self, weights: np.ndarray) -> float:
         """Calculate portfolio expected return"""
-        return np.dot(weights, self.mean_returns)
+        return float(np.dot(weights, self._mu))
+    
+    def _cov_matvec(self, weights: np.ndarray) -> np.ndarray:
+        """Σ·w - O(n·k) through the factor model when one is fitted"""
+        if self.risk_model is not None:
+            return self.risk_model.matvec(weights)
+        return np.dot(self._sigma, weights)
     
     def _portfolio_volatility(self, weights: np.ndarray) -> float:
         """Calculate portfolio volatility"""
-        return np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix, weights)))
+        if self.risk_model is not None:
+            return float(np.sqrt(self.risk_model.variance(weights)))
+        return float(np.sqrt(np.dot(weights, np.dot(self._sigma, weights))))
+    
+    def _volatility_grad(self, weights: np.ndarray) -> np.ndarray:
+        """∂σ/∂w = Σw / σ"""
+        sigma_w = self._cov_matvec(weights)
+        vol = np.sqrt(np.dot(weights, sigma_w))
+        return sigma_w / vol if vol > 0 else sigma_w
+    
+    def _sharpe_grad(self, weights: np.ndarray) -> np.ndarray:
+        """∂S/∂w = μ/σ - (μ'w - rf)·Σw/σ³"""
+        sigma_w = self._cov_matvec(weights)
+        vol = np.sqrt(np.dot(weights, sigma_w))
+        if vol <= 0:
+            return np.zeros_like(weights)
+        return self._mu / vol - (np.dot(weights, self._mu) - self.rf) * sigma_w / vol ** 3
     
     def _sharpe_ratio(self, weights: np.ndarray) -> float:
         """Calculate Sharpe ratio"""
@@ -263,50 +709,34 @@ class GeniusPortfolioOptimizer:
         """
         Risk Parity Portfolio
         
-        Each asset contributes equally to portfolio risk
+        Each asset contributes equally to portfolio risk. Solved as the
+        convex problem min ½y'Σy - (1/n)·Σ log y (Spinu, 2013) whose
+        normalized solution is the equal-risk-contribution portfolio;
+        every evaluation is a single Σ·y product.
         """
         
-        def risk_contribution(weights):
-            """Calculate risk contribution of each asset"""
-            sigma = self.cov_matrix.values
-            port_vol = np.sqrt(np.dot(weights.T, np.dot(sigma, weights)))
-            
-            # Marginal risk contribution
-            mrc = np.dot(sigma, weights)
-            
-            # Risk contribution = weight * marginal contribution
-            rc = weights * mrc / port_vol
-            
-            return rc
+        budget = 1.0 / self.n_assets
         
-        def objective(weights):
-            """Minimize deviation from equal risk contribution"""
-            rc = risk_contribution(weights)
-            target_rc = np.mean(rc)
-            return np.sum((rc - target_rc) ** 2)
+        def objective(y):
+            sigma_y = self._cov_matvec(y)
+            value = 0.5 * np.dot(y, sigma_y) - budget * np.sum(np.log(y))
+            return value, sigma_y - budget / y
         
-        # Constraints and bounds
-        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1}]
-        bounds = tuple((0.01, 1) for _ in range(self.n_assets))
-        x0 = np.array([1/self.n_assets] * self.n_assets)
+        # Start: odwrotność zmienności, przeskalowana tak, by y'Σy = 1
+        vols = np.sqrt(np.maximum(np.diag(self._sigma), 1e-300))
+        y0 = 1.0 / vols
+        y0 /= np.sqrt(np.dot(y0, self._cov_matvec(y0)))
         
         result = minimize(
             objective,
-            x0,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=cons
+            y0,
+            method='L-BFGS-B',
+            jac=True,
+            bounds=tuple((1e-12, None) for _ in range(self.n_assets)),
+            options={'gtol': 1e-12, 'ftol': 1e-15, 'maxiter': 1000}
         )
         
-        weights = dict(zip(self.assets, result.x))
-        
-        return PortfolioResult(
-            weights=weights,
-            expected_return=self._portfolio_return(result.x),
-            volatility=self._portfolio_volatility(result.x),
-            sharpe_ratio=self._sharpe_ratio(result.x),
-            method='Risk Parity'
-        )
+        return self._result(result.x / result.x.sum(), 'Risk Parity')
     
     # ═══════════════════════════════════════════════════════════════════════
     # MAXIMUM SHARPE RATIO
@@ -319,15 +749,17 @@ class GeniusPortfolioOptimizer:
         Also known as tangency portfolio
         """
         
+        # Tangens leży na froncie efektywnym tylko gdy da się pobić stopę wolną od ryzyka
+        cla = self._frontier_engine(constraints)
+        if cla is not None and cla.max_return > self.rf:
+            return self._result(cla.max_sharpe(self.rf), 'Maximum Sharpe Ratio')
+        
         def neg_sharpe(weights):
             return -self._sharpe_ratio(weights)
         
-        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1}]
-        bounds = tuple((0, 1) for _ in range(self.n_assets))
-        
-        if constraints:
-            if 'max_weight' in constraints:
-                bounds = tuple((0, constraints['max_weight']) for _ in range(self.n_assets))
+        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)}]
+        lo, hi = self._bounds(constraints)
+        bounds = tuple((lo, hi) for _ in range(self.n_assets))
         
         x0 = np.array([1/self.n_assets] * self.n_assets)
         
@@ -335,19 +767,12 @@ class GeniusPortfolioOptimizer:
             neg_sharpe,
             x0,
             method='SLSQP',
+            jac=lambda x: -self._sharpe_grad(x),
             bounds=bounds,
             constraints=cons
         )
         
-        weights = dict(zip(self.assets, result.x))
-        
-        return PortfolioResult(
-            weights=weights,
-            expected_return=self._portfolio_return(result.x),
-            volatility=self._portfolio_volatility(result.x),
-            sharpe_ratio=self._sharpe_ratio(result.x),
-            method='Maximum Sharpe Ratio'
-        )
+        return self._result(result.x, 'Maximum Sharpe Ratio')
     
     # ═══════════════════════════════════════════════════════════════════════
     # MINIMUM VOLATILITY
@@ -360,12 +785,13 @@ class GeniusPortfolioOptimizer:
         Also known as Global Minimum Variance (GMV) portfolio
         """
         
-        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1}]
-        bounds = tuple((0, 1) for _ in range(self.n_assets))
+        cla = self._frontier_engine(constraints)
+        if cla is not None:
+            return self._result(cla.min_variance(), 'Minimum Volatility')
         
-        if constraints:
-            if 'max_weight' in constraints:
-                bounds = tuple((0, constraints['max_weight']) for _ in range(self.n_assets))
+        cons = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)}]
+        lo, hi = self._bounds(constraints)
+        bounds = tuple((lo, hi) for _ in range(self.n_assets))
         
         x0 = np.array([1/self.n_assets] * self.n_assets)
         
@@ -373,19 +799,12 @@ class GeniusPortfolioOptimizer:
             self._portfolio_volatility,
             x0,
             method='SLSQP',
+            jac=self._volatility_grad,
             bounds=bounds,
             constraints=cons
         )
         
-        weights = dict(zip(self.assets, result.x))
-        
-        return PortfolioResult(
-            weights=weights,
-            expected_return=self._portfolio_return(result.x),
-            volatility=self._portfolio_volatility(result.x),
-            sharpe_ratio=self._sharpe_ratio(result.x),
-            method='Minimum Volatility'
-        )
+        return self._result(result.x, 'Minimum Volatility')
     
     # ═══════════════════════════════════════════════════════════════════════
     # EFFICIENT FRONTIER
@@ -399,28 +818,47 @@ class GeniusPortfolioOptimizer:
         """
         Generate Efficient Frontier
         
-        Returns portfolios along the efficient frontier
+        Returns portfolios along the efficient frontier. With the critical line
+        engine every point is an interpolation between turning points; otherwise
+        each SLSQP solve is warm-started from the previous frontier point.
         """
         
         # Find min/max returns
         min_vol_port = self.min_volatility(constraints)
-        max_sharpe_port = self.max_sharpe(constraints)
         
         min_ret = min_vol_port.expected_return
         max_ret = max(self.mean_returns) * 0.95  # 95% of max individual return
         
+        cla = self._frontier_engine(constraints)
+        if cla is not None:
+            _, weights = cla.frontier(n_points, min_return=min_ret, max_return=max_ret)
+            return [self._result(w, 'Mean-Variance') for w in weights]
+        
         target_returns = np.linspace(min_ret, max_ret, n_points)
+        lo, hi = self._bounds(constraints)
+        bounds = tuple((lo, hi) for _ in range(self.n_assets))
+        x0 = np.array([min_vol_port.weights[a] for a in self.assets])
         
         frontier = []
         for target_ret in target_returns:
+            cons = [
+                {'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)},
+                {'type': 'eq', 'fun': lambda x, r=target_ret: np.dot(x, self._mu) - r, 'jac': lambda x: self._mu}
+            ]
             try:
-                port = self.mean_variance_optimize(
-                    target_return=target_ret,
-                    constraints=constraints
+                # ½w'Σw ma ten sam optymalny w co σ, a gładszy gradient Σw
+                result = minimize(
+                    lambda x: 0.5 * np.dot(x, self._cov_matvec(x)),
+                    x0,
+                    method='SLSQP',
+                    jac=self._cov_matvec,
+                    bounds=bounds,
+                    constraints=cons
                 )
-                frontier.append(port)
             except Exception:
                 continue
+            frontier.append(self._result(result.x, 'Mean-Variance'))
+            x0 = result.x
         
         return frontier
     
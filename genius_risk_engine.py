@@ -21,7 +21,13 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from collections import deque
+import bisect
 import logging
+import math
+
+from genius_monte_carlo import MonteCarloEngine, ReturnModel
+from genius_drawdown import drawdown_series, drawdown_episodes, drawdown_summary
 
 
 class VaRMethod(Enum):
@@ -68,6 +74,358 @@ class KellyResult:
     max_loss_probability: float  # Probability of max loss
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREAMING RISK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LogBucketSketch:
+    """
+    Log-bucket quantile sketch (DDSketch-style) with per-bucket sums
+    
+    Bucket m holds |x| in (gamma^(m-1), gamma^m], one set per sign, so any
+    quantile is within `relative_accuracy` of a true order statistic and tail
+    sums are exact up to the bucket holding the threshold - whatever the order
+    of the input (no drift after regime changes). Memory grows with
+    log(max|x| / min_value), not with the number of values.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        # Przesunięcie tak, by każde |x| > min_value miało klucz >= 1 (0 = kubełek zera)
+        self._offset = 1 - math.ceil(math.log(min_value) / self._log_gamma)
+        self.count = 0
+        self._keys: List[int] = []   # posortowane klucze (kolejność = kolejność wartości)
+        self._counts: Dict[int, int] = {}
+        self._sums: Dict[int, float] = {}
+    
+    def _key(self, x: float) -> int:
+        if abs(x) <= self.min_value:
+            return 0
+        m = math.ceil(math.log(abs(x)) / self._log_gamma) + self._offset
+        return m if x > 0 else -m
+    
+    def _bounds(self, key: int) -> Tuple[float, float]:
+        if key == 0:
+            return -self.min_value, self.min_value
+        hi = self.gamma ** (abs(key) - self._offset)
+        lo = hi / self.gamma
+        return (lo, hi) if key > 0 else (-hi, -lo)
+    
+    def update(self, x: float):
+        key = self._key(x)
+        if key not in self._counts:
+            bisect.insort(self._keys, key)
+            self._counts[key] = 0
+            self._sums[key] = 0.0
+        self._counts[key] += 1
+        self._sums[key] += x
+        self.count += 1
+    
+    def quantile(self, p: float) -> float:
+        if self.count == 0:
+            return float('nan')
+        rank = p * (self.count - 1)
+        seen = 0
+        for key in self._keys:
+            seen += self._counts[key]
+            if seen > rank:
+                break
+        if key == 0:
+            return 0.0
+        lo, hi = self._bounds(key)
+        # Reprezentant kubełka o błędzie względnym <= relative_accuracy
+        magnitude = 2 * max(abs(lo), abs(hi)) / (self.gamma + 1)
+        return magnitude if key > 0 else -magnitude
+    
+    def below(self, threshold: float) -> Tuple[float, float]:
+        """(count, sum) of values <= threshold; the boundary bucket is prorated"""
+        count, total = 0.0, 0.0
+        for key in self._keys:
+            lo, hi = self._bounds(key)
+            if lo >= threshold:
+                break
+            n, s = self._counts[key], self._sums[key]
+            if hi <= threshold:
+                count += n
+                total += s
+            else:
+                share = (threshold - lo) / (hi - lo)
+                count += share * n
+                total += share * n * (lo + threshold) / 2
+        return count, total
+
+
+class StreamingRiskAccumulator:
+    """
+    📡 Incremental risk state for live loops
+    
+    Each update(r) is O(1) plus one sorted insert (window or bounded tail):
+    - mean / std / skew / kurtosis via Welford-Pébay (with exact removal for rolling windows)
+    - historical VaR / CVaR: sorted window (rolling, exact) or, expanding, the
+      tail_size smallest returns (exact while the tail fits) + a LogBucketSketch beyond
+    - running drawdown, max drawdown and longest underwater stretch
+    - omega ratio from running gain / loss sums
+    
+    Skew and kurtosis match scipy.stats defaults (biased, excess kurtosis).
+    """
+    
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        trading_days: int = 252,
+        tail_size: int = 4096,
+        relative_accuracy: float = 0.01
+    ):
+        self.window = window
+        self.tail_size = tail_size
+        self.trading_days = trading_days
+        
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+        self._gains = 0.0
+        self._losses = 0.0
+        
+        # Rolling: bufor okna + posortowana kopia do dokładnych kwantyli
+        self._buffer: deque = deque()
+        self._sorted: List[float] = []
+        self._removals = 0
+        
+        # Expanding: szkic log-kubełkowy + ograniczony ogon (tail_size najmniejszych zwrotów)
+        self._sketch = None if window else LogBucketSketch(relative_accuracy)
+        self._tail: List[float] = []
+        self._tail_sum = 0.0
+        
+        self.equity = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self._underwater = 0
+        self.max_drawdown_duration = 0
+    
+    # ───────────────────────────────────────────────────────────────────────
+    # Updates
+    # ───────────────────────────────────────────────────────────────────────
+    
+    def _add_moments(self, x: float):
+        n1 = self.count
+        self.count += 1
+        n = self.count
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self._m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self._m2 - 4 * delta_n * self._m3
+        self._m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self._m2
+        self._m2 += term1
+    
+    def _remove_moments(self, x: float):
+        """Exact inverse of _add_moments for the oldest value of the window"""
+        n = self.count
+        if n <= 1:
+            self.count, self.mean, self._m2, self._m3, self._m4 = 0, 0.0, 0.0, 0.0, 0.0
+            return
+        n1 = n - 1
+        mean_a = (n * self.mean - x) / n1
+        delta = x - mean_a
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        m2 = self._m2 - term1
+        m3 = self._m3 - term1 * delta_n * (n - 2) + 3 * delta_n * m2
+        m4 = self._m4 - term1 * delta_n2 * (n * n - 3 * n + 3) - 6 * delta_n2 * m2 + 4 * delta_n * m3
+        self.count, self.mean, self._m2, self._m3, self._m4 = n1, mean_a, max(m2, 0.0), m3, max(m4, 0.0)
+    
+    def _recompute_window(self):
+        """Rebuild window moments from the buffer to cancel float drift"""
+        values = list(self._buffer)
+        self.count, self.mean, self._m2, self._m3, self._m4 = 0, 0.0, 0.0, 0.0, 0.0
+        for x in values:
+            self._add_moments(x)
+        self._gains = sum(x for x in values if x > 0)
+        self._losses = -sum(x for x in values if x < 0)
+    
+    def update(self, r: float):
+        """Add one return"""
+        r = float(r)
+        if not math.isfinite(r):
+            return
+        
+        self._add_moments(r)
+        if r > 0:
+            self._gains += r
+        elif r < 0:
+            self._losses -= r
+        
+        if self.window:
+            self._buffer.append(r)
+            bisect.insort(self._sorted, r)
+            if len(self._buffer) > self.window:
+                old = self._buffer.popleft()
+                del self._sorted[bisect.bisect_left(self._sorted, old)]
+                self._remove_moments(old)
+                if old > 0:
+                    self._gains -= old
+                elif old < 0:
+                    self._losses += old
+                self._removals += 1
+                if self._removals >= self.window:
+                    self._removals = 0
+                    self._recompute_window()
+        else:
+            self._sketch.update(r)
+            tail = self._tail
+            if len(tail) < self.tail_size:
+                bisect.insort(tail, r)
+                self._tail_sum += r
+            elif tail and r < tail[-1]:
+                bisect.insort(tail, r)
+                self._tail_sum += r - tail.pop()
+        
+        self.equity *= 1 + r
+        if self.equity >= self.peak:
+            self.peak = self.equity
+            self._underwater = 0
+        else:
+            self._underwater += 1
+            self.max_drawdown_duration = max(self.max_drawdown_duration, self._underwater)
+            self.max_drawdown = min(self.max_drawdown, self.equity / self.peak - 1)
+    
+    def update_many(self, returns):
+        for r in np.asarray(returns, dtype=np.float64).ravel().tolist():
+            self.update(r)
+    
+    # ───────────────────────────────────────────────────────────────────────
+    # Queries
+    # ───────────────────────────────────────────────────────────────────────
+    
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+    
+    @property
+    def skewness(self) -> float:
+        if self.count < 2 or self._m2 <= 0:
+            return 0.0
+        return math.sqrt(self.count) * self._m3 / self._m2 ** 1.5
+    
+    @property
+    def kurtosis(self) -> float:
+        if self.count < 2 or self._m2 <= 0:
+            return 0.0
+        return self.count * self._m4 / (self._m2 * self._m2) - 3.0
+    
+    @property
+    def drawdown(self) -> float:
+        """Current drawdown from the running peak (negative fraction)"""
+        return self.equity / self.peak - 1
+    
+    @property
+    def omega_ratio(self) -> float:
+        return self._gains / self._losses if self._losses > 0 else 0.0
+    
+    def is_exact(self, p: float) -> bool:
+        """True if quantile p (and the tail below it) comes from stored returns"""
+        if self.window or self.count == len(self._tail):
+            return True
+        return int(p * (self.count - 1)) + 1 < len(self._tail)
+    
+    def quantile(self, p: float) -> float:
+        """Return quantile p (exact from stored returns, sketch estimate beyond the tail)"""
+        values = self._sorted if self.window else self._tail
+        if self.count == 0:
+            return float('nan')
+        if self.is_exact(p):
+            pos = p * (self.count - 1)
+            lo = int(pos)
+            hi = min(lo + 1, self.count - 1)
+            return values[lo] + (pos - lo) * (values[hi] - values[lo])
+        # Kwantyl poza ogonem nie może leżeć poniżej największego zapisanego zwrotu
+        return max(self._sketch.quantile(p), values[-1])
+    
+    def tail_mean(self, threshold: float) -> Tuple[float, bool]:
+        """
+        Mean of returns <= threshold and whether it is exact
+        
+        Exact while every such return is stored (rolling window, or below the
+        largest value of the bounded tail). Otherwise the stored tail is used
+        as is and only the band above it comes from the sketch buckets.
+        """
+        values = self._sorted if self.window else self._tail
+        k = bisect.bisect_right(values, threshold)
+        if self.window or k < len(values) or self.count == len(values):
+            if k == 0:
+                return float('nan'), True
+            if values is self._tail and 2 * k > len(values):
+                total = self._tail_sum - sum(values[k:])   # krótsza strona ogona
+            else:
+                total = sum(values[:k])
+            return total / k, True
+        
+        count, total = self._sketch.below(threshold)
+        stored_count, stored_total = self._sketch.below(values[-1])
+        count += len(values) - stored_count
+        total += self._tail_sum - stored_total
+        return total / count, False
+    
+    def var(self, confidence: float = 0.95) -> float:
+        """Historical one-step VaR as a positive loss fraction"""
+        return -self.quantile(1 - confidence)
+    
+    def cvar(self, confidence: float = 0.95) -> float:
+        """Mean loss beyond VaR (exact while is_exact(1 - confidence))"""
+        mean, _ = self.tail_mean(self.quantile(1 - confidence))
+        return -mean if math.isfinite(mean) else self.var(confidence)
+    
+    def tail_metrics(self) -> Dict[str, Any]:
+        """Same keys as GeniusRiskEngine.tail_risk_metrics, from the running state"""
+        skew, kurt = self.skewness, self.kurtosis
+        left_5, left_1 = self.quantile(0.05), self.quantile(0.01)
+        right_95, right_99 = self.quantile(0.95), self.quantile(0.99)
+        jb_stat = self.count / 6 * (skew ** 2 + kurt ** 2 / 4)
+        jb_pvalue = float(stats.chi2.sf(jb_stat, 2))
+        
+        return {
+            'skewness': skew,
+            'kurtosis': kurt,
+            'left_tail_5pct': left_5,
+            'left_tail_1pct': left_1,
+            'right_tail_95pct': right_95,
+            'right_tail_99pct': right_99,
+            'tail_ratio': abs(right_95) / abs(left_5) if left_5 != 0 else 0,
+            'jarque_bera_stat': jb_stat,
+            'jarque_bera_pvalue': jb_pvalue,
+            'is_normal': jb_pvalue > 0.05,
+            'omega_ratio': self.omega_ratio
+        }
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Compact risk state for live checks"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'volatility_annual': self.std * math.sqrt(self.trading_days),
+            'skewness': self.skewness,
+            'kurtosis': self.kurtosis,
+            'var_95': self.var(0.95),
+            'cvar_95': self.cvar(0.95),
+            'var_99': self.var(0.99),
+            'cvar_99': self.cvar(0.99),
+            'drawdown': self.drawdown,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'omega_ratio': self.omega_ratio
+        }
+
+
 class GeniusRiskEngine:
     """
     Professional Risk Management Engine
@@ -83,7 +441,8 @@ class GeniusRiskEngine:
     def __init__(
         self,
         returns: pd.Series = None,
-        trading_days: int = 252
+        trading_days: int = 252,
+        seed: Optional[int] = None
     ):
         """
         Initialize Risk Engine
@@ -91,9 +450,12 @@ class GeniusRiskEngine:
         Args:
             returns: Historical returns series
             trading_days: Number of trading days per year
+            seed: Seed for Monte Carlo simulations (None = fresh entropy)
         """
         self.returns = returns
         self.trading_days = trading_days
+        self.monte_carlo = MonteCarloEngine(seed=seed)
+        self.stream: Optional[StreamingRiskAccumulator] = None
         
         if returns is not None:
             self.mean = returns.mean()
@@ -122,6 +484,41 @@ class GeniusRiskEngine:
             'Mt. Gox 2014': -0.70,
         }
     
+    # ═══════════════════════════════════════════════════════════════════════
+    # STREAMING UPDATES
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def enable_streaming(
+        self,
+        window: Optional[int] = None,
+        tail_size: int = 4096
+    ) -> StreamingRiskAccumulator:
+        """
+        Seed a StreamingRiskAccumulator from the current returns
+        
+        Afterwards add_return() keeps moments, historical VaR/CVaR and tail
+        metrics current without rescanning the series.
+        """
+        self.stream = StreamingRiskAccumulator(window, self.trading_days, tail_size)
+        if self.returns is not None:
+            self.stream.update_many(self.returns.dropna().values)
+        self._sync_stream_moments()
+        return self.stream
+    
+    def add_return(self, r: float):
+        """Push one new return into the live risk state (O(1) / O(log n))"""
+        if self.stream is None:
+            self.enable_streaming()
+        self.stream.update(r)
+        self._sync_stream_moments()
+    
+    def _sync_stream_moments(self):
+        if self.stream is not None and self.stream.count > 1:
+            self.mean = self.stream.mean
+            self.std = self.stream.std
+            self.skewness = self.stream.skewness
+            self.kurtosis = self.stream.kurtosis
+    
     # ═══════════════════════════════════════════════════════════════════════
     # VALUE AT RISK (VaR)
     # ═══════════════════════════════════════════════════════════════════════
@@ -145,16 +542,25 @@ class GeniusRiskEngine:
             n_simulations: Number of Monte Carlo simulations
         """
         
-        if self.returns is None or len(self.returns) == 0:
+        has_stream = self.stream is not None and self.stream.count > 0
+        if not has_stream and (self.returns is None or len(self.returns) == 0):
             raise ValueError("Returns data required for VaR calculation")
         
         # Scale for time horizon
         time_factor = np.sqrt(horizon_days)
+        method_name = method.value
         
         if method == VaRMethod.PARAMETRIC:
             var, cvar = self._var_parametric(confidence, time_factor)
         
+        elif method == VaRMethod.HISTORICAL and has_stream and horizon_days == 1:
+            var, cvar = self.stream.var(confidence), self.stream.cvar(confidence)
+            if not self.stream.is_exact(1 - confidence):
+                method_name += " (stream approx.)"
+        
         elif method == VaRMethod.HISTORICAL:
+            if self.returns is None:
+                raise ValueError("Multi-day historical VaR requires the returns series")
             var, cvar = self._var_historical(confidence, horizon_days)
         
         elif method == VaRMethod.MONTE_CARLO:
@@ -174,7 +580,7 @@ class GeniusRiskEngine:
             var=var_dollar,
             cvar=cvar_dollar,
             confidence=confidence,
-            method=method.value,
+            method=method_name,
             horizon_days=horizon_days,
             portfolio_value=portfolio_value,
             var_pct=var,
@@ -217,22 +623,59 @@ class GeniusRiskEngine:
         horizon_days: int,
         n_simulations: int
     ) -> Tuple[float, float]:
-        """Monte Carlo VaR"""
+        """Monte Carlo VaR (compounded normal daily returns)"""
         
-        # Simulate returns
-        simulated_returns = np.random.normal(
-            self.mean * horizon_days,
-            self.std * np.sqrt(horizon_days),
-            n_simulations
-        )
+        model = ReturnModel(kind='normal', mu=self.mean, sigma=self.std)
+        result = self.monte_carlo.simulate(model, n_simulations, (horizon_days,), (confidence,))
         
-        var = -np.percentile(simulated_returns, (1 - confidence) * 100)
+        return float(result.var[0, 0]), float(result.cvar[0, 0])
+    
+    def monte_carlo_var(
+        self,
+        portfolio_value: float,
+        horizons: Tuple[int, ...] = (1, 5, 10),
+        confidences: Tuple[float, ...] = (0.95, 0.99),
+        model: str = 'bootstrap',
+        n_simulations: int = 100_000,
+        block: int = 1,
+        n_jobs: Optional[int] = None
+    ) -> Dict[Tuple[int, float], VaRResult]:
+        """
+        Monte Carlo VaR / CVaR for every horizon × confidence from one set of paths
         
-        # CVaR
-        tail_returns = simulated_returns[simulated_returns <= -var]
-        cvar = -tail_returns.mean() if len(tail_returns) > 0 else var
+        Args:
+            portfolio_value: Current portfolio value
+            horizons: Horizons in days
+            confidences: Confidence levels
+            model: 'gbm', 'normal', 'bootstrap', 'student_t' or 'garch'
+            n_simulations: Number of paths (simulated in memory-bounded chunks)
+            block: Block length for bootstrap
+            n_jobs: Worker processes for chunks (None = engine setting, not changed by this call)
+        """
         
-        return var, cvar
+        if self.returns is None or len(self.returns) == 0:
+            raise ValueError("Returns data required for VaR calculation")
+        
+        return_model = ReturnModel.from_returns(self.returns, kind=model, block=block)
+        result = self.monte_carlo.simulate(return_model, n_simulations, horizons, confidences,
+                                           n_jobs=n_jobs)
+        
+        grid = {}
+        for i, horizon in enumerate(result.horizons):
+            for j, confidence in enumerate(result.confidences):
+                var, cvar = float(result.var[i, j]), float(result.cvar[i, j])
+                grid[(int(horizon), float(confidence))] = VaRResult(
+                    var=portfolio_value * var,
+                    cvar=portfolio_value * cvar,
+                    confidence=float(confidence),
+                    method=f"{VaRMethod.MONTE_CARLO.value}_{model}",
+                    horizon_days=int(horizon),
+                    portfolio_value=portfolio_value,
+                    var_pct=var,
+                    cvar_pct=cvar
+                )
+        
+        return grid
     
     def _var_cornish_fisher(self, confidence: float, time_factor: float) -> Tuple[float, float]:
         """Cornish-Fisher VaR (adjusted for skewness and kurtosis)"""
@@ -444,26 +887,18 @@ class GeniusRiskEngine:
         else:
             raise ValueError("Prices or returns required")
         
-        # Running maximum
-        running_max = cumulative.expanding().max()
-        
-        # Drawdown series
-        drawdown = (cumulative - running_max) / running_max
-        
-        # Maximum drawdown
-        max_dd = drawdown.min()
-        max_dd_idx = drawdown.idxmin()
+        # Drawdown series and headline stats in one vectorized pass
+        drawdown = pd.Series(drawdown_series(cumulative.values), index=cumulative.index)
+        summary = drawdown_summary(cumulative.values)
         
-        # Peak before max drawdown
-        peak_idx = running_max[:max_dd_idx].idxmax()
-        
-        # Recovery (if any)
-        recovery_idx = None
-        if cumulative.iloc[-1] >= running_max[max_dd_idx]:
-            for idx in drawdown[max_dd_idx:].index:
-                if drawdown[idx] >= 0:
-                    recovery_idx = idx
-                    break
+        max_dd = summary['max_drawdown']
+        if summary['trough'] is None:
+            # Brak obsunięcia - wszystkie daty wskazują na początek serii
+            max_dd_idx = peak_idx = recovery_idx = cumulative.index[0]
+        else:
+            max_dd_idx = cumulative.index[summary['trough']]
+            peak_idx = cumulative.index[summary['peak']]
+            recovery_idx = None if summary['recovery'] is None else cumulative.index[summary['recovery']]
         
         # All drawdown periods
         drawdown_periods = self._identify_drawdown_periods(drawdown)
@@ -480,12 +915,12 @@ class GeniusRiskEngine:
             'max_drawdown_date': max_dd_idx,
             'peak_date': peak_idx,
             'recovery_date': recovery_idx,
-            'current_drawdown': drawdown.iloc[-1],
-            'avg_drawdown': drawdown.mean(),
+            'current_drawdown': summary['current_drawdown'],
+            'avg_drawdown': summary['avg_drawdown'],
             'n_drawdown_periods': len(drawdown_periods),
             'drawdown_periods': drawdown_periods[:5],  # Top 5
             'calmar_ratio': calmar,
-            'time_underwater_pct': (drawdown < 0).mean() * 100
+            'time_underwater_pct': summary['time_underwater'] * 100
         }
     
     def _identify_drawdown_periods(
@@ -493,27 +928,24 @@ class GeniusRiskEngine:
         drawdown: pd.Series,
         threshold: float = -0.05
     ) -> List[Dict]:
-        """Identify significant drawdown periods"""
+        """Identify significant (closed) drawdown periods, deepest first"""
         
-        periods = []
-        in_drawdown = False
-        start_idx = None
-        
-        for idx, dd in drawdown.items():
-            if dd <= threshold and not in_drawdown:
-                in_drawdown = True
-                start_idx = idx
-            elif dd > threshold and in_drawdown:
-                in_drawdown = False
-                periods.append({
-                    'start': start_idx,
-                    'end': idx,
-                    'max_drawdown': drawdown[start_idx:idx].min(),
-                    'duration_days': (idx - start_idx).days if hasattr(idx, 'days') else None
-                })
+        # dd <= threshold  <=>  dd < nextafter(threshold, +inf)
+        episodes = drawdown_episodes(drawdown.values, np.nextafter(threshold, np.inf))
+        index = drawdown.index
+        is_dates = isinstance(index, pd.DatetimeIndex)
         
-        # Sort by severity
-        periods.sort(key=lambda x: x['max_drawdown'])
+        periods = []
+        for i in episodes.worst():
+            if not episodes.recovered[i]:
+                continue
+            start, end = index[episodes.start[i]], index[episodes.end[i]]
+            periods.append({
+                'start': start,
+                'end': end,
+                'max_drawdown': float(episodes.depth[i]),
+                'duration_days': (end - start).days if is_dates else None
+            })
         
         return periods
     
@@ -522,7 +954,10 @@ class GeniusRiskEngine:
     # ═══════════════════════════════════════════════════════════════════════
     
     def tail_risk_metrics(self) -> Dict[str, Any]:
-        """Calculate tail risk metrics"""
+        """Calculate tail risk metrics (from the live stream when enabled)"""
+        
+        if self.stream is not None and self.stream.count > 0:
+            return self.stream.tail_metrics()
         
         if self.returns is None or len(self.returns) == 0:
             raise ValueError("Returns data required")
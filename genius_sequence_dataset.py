@@ -0,0 +1,184 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    GENIUS SEQUENCE DATASET v1.0                               ║
+║                    Windowed Samples for LSTM / Transformer Training          ║
+║                                                                              ║
+║  Features:                                                                   ║
+║  • (n_samples, seq_len, n_features) as a zero-copy sliding_window_view       ║
+║  • Memory proportional to the base array, not seq_len × the data            ║
+║  • Chronological train / validation splits without copying                  ║
+║  • Batch generator (numpy) and tf.data pipeline gathering windows per batch ║
+║  • Single or multiple targets (multi-horizon heads)                         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Sample k ends at position p = start + k (exclusive): its window is
+data[p - sequence_length:p] and its target is targets[p]. Targets are passed
+as arrays aligned with `data`, so a model predicting h steps ahead passes a
+shifted array instead of building samples in a loop.
+
+Usage:
+    dataset = SequenceDataset(scaled, 60, targets=scaled[:, 0])
+    train, val = dataset.split(0.1)
+    model.fit(train.to_tf_dataset(32, shuffle=True), validation_data=val.to_tf_dataset(32))
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import math
+import logging
+
+try:
+    import tensorflow as tf
+    TF_AVAILABLE = True
+except ImportError:
+    TF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SEQUENCE DATASET
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SequenceDataset:
+    """
+    🪟 Windowed (X, y) samples over one base array
+
+    `X` and `y` are views; batches are gathered on demand, so only
+    batch_size windows exist as copies at any time.
+    """
+
+    def __init__(self,
+                 data: np.ndarray,
+                 sequence_length: int,
+                 targets: Optional[Union[np.ndarray, Sequence[np.ndarray]]] = None,
+                 start: Optional[int] = None,
+                 stop: Optional[int] = None,
+                 dtype=np.float32):
+        """
+        Args:
+            data: (T,) or (T, n_features) base array (cast to `dtype` once)
+            sequence_length: Window length
+            targets: Array (or list of arrays, one per output) aligned with data
+            start: First window end position (default: sequence_length)
+            stop: Last window end position, exclusive (default: T)
+            dtype: Storage dtype (None keeps the input dtype)
+        """
+        data = np.asarray(data) if dtype is None else np.asarray(data, dtype=dtype)
+        self.data = np.ascontiguousarray(data.reshape(len(data), -1))
+        self.sequence_length = int(sequence_length)
+
+        self._multi = isinstance(targets, (list, tuple))
+        targets = [] if targets is None else (list(targets) if self._multi else [targets])
+        self.targets: List[np.ndarray] = [
+            np.asarray(t) if dtype is None else np.asarray(t, dtype=dtype) for t in targets
+        ]
+        for t in self.targets:
+            if len(t) != len(self.data):
+                raise ValueError(f"Target length {len(t)} != data length {len(self.data)}")
+
+        self.start = self.sequence_length if start is None else int(start)
+        self.stop = len(self.data) if stop is None else int(stop)
+        if self.start < self.sequence_length:
+            raise ValueError(f"start={self.start} leaves no room for {self.sequence_length}-step windows")
+        self.stop = max(min(self.stop, len(self.data)), self.start)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Window end positions (exclusive) of all samples"""
+        return np.arange(self.start, self.stop)
+
+    @property
+    def X(self) -> np.ndarray:
+        """Read-only (n_samples, sequence_length, n_features) view - no copy"""
+        lo = self.start - self.sequence_length
+        windows = sliding_window_view(self.data, self.sequence_length, axis=0)
+        return windows[lo:lo + len(self)].transpose(0, 2, 1)
+
+    @property
+    def y(self) -> Union[np.ndarray, List[np.ndarray], None]:
+        """Targets of all samples (views; list for multiple outputs)"""
+        if not self.targets:
+            return None
+        y = [t[self.start:self.stop] for t in self.targets]
+        return y if self._multi else y[0]
+
+    def _subset(self, start: int, stop: int) -> 'SequenceDataset':
+        subset = object.__new__(SequenceDataset)
+        subset.__dict__.update(self.__dict__)
+        subset.start, subset.stop = start, stop
+        return subset
+
+    def split(self, fraction: float) -> Tuple['SequenceDataset', 'SequenceDataset']:
+        """
+        Chronological split holding out the last `fraction` of samples
+
+        Same cut as Keras validation_split: floor(n * (1 - fraction)) samples first.
+        """
+        split_at = self.start + int(math.floor(len(self) * (1.0 - fraction)))
+        return self._subset(self.start, split_at), self._subset(split_at, self.stop)
+
+    def _gather(self, positions: np.ndarray):
+        offsets = np.arange(-self.sequence_length, 0)
+        X = self.data[positions[:, None] + offsets]
+        y = [t[positions] for t in self.targets]
+        if not y:
+            return X, None
+        return X, (y if self._multi else y[0])
+
+    def batches(self,
+                batch_size: int = 32,
+                shuffle: bool = False,
+                seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, object]]:
+        """Yield (X_batch, y_batch) copies - one batch of windows in memory at a time"""
+        positions = self.positions
+        if shuffle:
+            positions = np.random.default_rng(seed).permutation(positions)
+        for i in range(0, len(positions), batch_size):
+            yield self._gather(positions[i:i + batch_size])
+
+    def to_tf_dataset(self,
+                      batch_size: int = 32,
+                      shuffle: bool = False,
+                      seed: Optional[int] = None) -> 'tf.data.Dataset':
+        """
+        tf.data pipeline for model.fit / evaluate / predict
+
+        The base array is held once as a tensor; each batch gathers its
+        windows with tf.gather. Shuffling reorders sample positions
+        every epoch (like fit(shuffle=True) on arrays).
+        """
+        if not TF_AVAILABLE:
+            raise ImportError("TensorFlow required for to_tf_dataset")
+
+        base = tf.constant(self.data)
+        targets = [tf.constant(t) for t in self.targets]
+        offsets = tf.range(-self.sequence_length, 0, dtype=tf.int64)
+        multi = self._multi
+
+        def gather(positions):
+            X = tf.gather(base, positions[:, None] + offsets)
+            if not targets:
+                return X
+            y = tuple(tf.gather(t, positions) for t in targets)
+            return X, (y if multi else y[0])
+
+        positions = tf.data.Dataset.from_tensor_slices(self.positions.astype(np.int64))
+        if shuffle:
+            positions = positions.shuffle(max(len(self), 1), seed=seed, reshuffle_each_iteration=True)
+        return (positions.batch(batch_size)
+                .map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+                .prefetch(tf.data.AUTOTUNE))
+
+
+def shift_targets(values: np.ndarray, steps: int, fill: float = np.nan) -> np.ndarray:
+    """values[p + steps] aligned at position p (tail padded with `fill`)"""
+    values = np.asarray(values, dtype=np.float64)
+    shifted = np.full(values.shape, fill, dtype=np.float64)
+    if steps < len(values):
+        shifted[:len(values) - steps] = values[steps:]
+    return shifted
@@ -39,6 +39,8 @@ try:
 except ImportError:
     TORCH_AVAILABLE = False
 
+from genius_sequence_dataset import SequenceDataset, shift_targets
+
 
 @dataclass
 class TransformerConfig:
@@ -244,10 +246,29 @@ class GeniusTransformerTF:
             target_col: Target column name
             
         Returns:
-            X: Input sequences
+            X: Input sequences (read-only window view)
             y: List of target arrays for each horizon
         """
         
+        dataset = self.build_dataset(df, target_col)
+        return dataset.X, dataset.y
+    
+    def build_dataset(
+        self,
+        df: pd.DataFrame,
+        target_col: str = 'close'
+    ) -> SequenceDataset:
+        """
+        Normalize OHLCV and window it without materializing sequences
+        
+        Args:
+            df: DataFrame with OHLCV data
+            target_col: Target column name
+            
+        Returns:
+            SequenceDataset with one target per prediction horizon
+        """
+        
         config = self.config
         
         # Extract features
@@ -274,29 +295,19 @@ class GeniusTransformerTF:
         
         data_normalized = (data - self.scaler_params['mean']) / self.scaler_params['std']
         
-        # Create sequences
-        X = []
-        y = {h: [] for h in config.prediction_horizons}
-        
-        max_horizon = max(config.prediction_horizons)
-        
-        for i in range(config.sequence_length, len(data) - max_horizon):
-            X.append(data_normalized[i - config.sequence_length:i])
-            
-            # Get close price index
-            close_idx = available_features.index('close')
-            
-            for horizon in config.prediction_horizons:
-                # Target is the percentage change
-                current_price = data[i, close_idx]
-                future_price = data[i + horizon, close_idx]
-                pct_change = (future_price - current_price) / current_price
-                y[horizon].append(pct_change)
-        
-        X = np.array(X)
-        y_arrays = [np.array(y[h]) for h in config.prediction_horizons]
-        
-        return X, y_arrays
+        # Target is the percentage change from the bar right after each window
+        close = data[:, available_features.index('close')].astype(np.float64)
+        targets = [
+            (shift_targets(close, horizon) - close) / close
+            for horizon in config.prediction_horizons
+        ]
+        
+        # Sequences are windows over data_normalized - no per-sample copies
+        return SequenceDataset(
+            data_normalized, config.sequence_length,
+            targets=targets,
+            stop=len(data) - max(config.prediction_horizons)
+        )
     
     def train(
         self,
@@ -319,7 +330,8 @@ class GeniusTransformerTF:
         if not TF_AVAILABLE:
             raise ImportError("TensorFlow required for training")
         
-        X, y_arrays = self.prepare_data(df)
+        dataset = self.build_dataset(df)
+        train_set, val_set = dataset.split(validation_split)
         
         # Early stopping
         early_stop = keras.callbacks.EarlyStopping(
@@ -330,10 +342,9 @@ class GeniusTransformerTF:
         
         # Train
         history = self.model.fit(
-            X, y_arrays,
-            batch_size=self.config.batch_size,
+            train_set.to_tf_dataset(self.config.batch_size, shuffle=True),
+            validation_data=val_set.to_tf_dataset(self.config.batch_size),
             epochs=self.config.epochs,
-            validation_split=validation_split,
             callbacks=[early_stop],
             verbose=verbose
         )
@@ -36,8 +36,13 @@ from datetime import datetime, timedelta
 from enum import Enum
 import logging
 import asyncio
+import bisect
 import json
+import time
 import pytz
+from concurrent.futures import ThreadPoolExecutor
+
+from trading_bot.strategies.session_calendar import SessionCalendar, SessionZone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -152,6 +157,21 @@ class TradeSetup:
     killzone: Killzone
     timeframe: str
     timestamp: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'signal': self.signal.name,
+            'scenario': self.scenario.name,
+            'entry_price': self.entry_price,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit,
+            'position_size': self.position_size,
+            'confidence': self.confidence,
+            'reasons': self.reasons,
+            'killzone': self.killzone.name,
+            'timeframe': self.timeframe,
+            'timestamp': self.timestamp.isoformat()
+        }
 
 
 @dataclass
@@ -184,6 +204,137 @@ class BotConfig:
     emergency_exit_pct: float = 18.0  # Zamknij przed 20% buffer
 
 
+# ═══════════════════════════════════════════════════════════════
+# ZONE INDEX (FVG / Liquidity)
+# ═══════════════════════════════════════════════════════════════
+
+class ZoneIndex:
+    """
+    Indeks otwartych stref cenowych [low, high] posortowany po cenie.
+    
+    Strefy trzymane są w dwóch posortowanych listach (po dolnej i górnej
+    krawędzi), więc zapytania per tick to bisect zamiast skanowania całej
+    historii FVG / poziomów płynności:
+    - at_price(x): strefy, których dotyka cena x
+    - nearest_above(x) / nearest_below(x): najbliższa strefa nad / pod ceną
+    - crossed(last, current): strefy przecięte między dwiema cenami
+    
+    Wyszukiwanie po cenie kosztuje O(log n + k), gdzie k to liczba stref
+    w oknie [x - max_width, x] (szerokość stref jest mała względem ceny).
+    """
+    
+    def __init__(self):
+        self._by_low: List[Tuple[float, int]] = []
+        self._by_high: List[Tuple[float, int]] = []
+        self._zones: Dict[int, Tuple[float, float, Any]] = {}
+        self._next_id = 0
+        self._max_width = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._zones)
+    
+    def __iter__(self):
+        """Strefy w kolejności dodania"""
+        return (item for _, _, item in self._zones.values())
+    
+    def add(self, low: float, high: float, item: Any) -> int:
+        """Dodaj strefę, zwraca jej id"""
+        if low > high:
+            low, high = high, low
+        
+        zone_id = self._next_id
+        self._next_id += 1
+        
+        self._zones[zone_id] = (low, high, item)
+        bisect.insort(self._by_low, (low, zone_id))
+        bisect.insort(self._by_high, (high, zone_id))
+        self._max_width = max(self._max_width, high - low)
+        
+        return zone_id
+    
+    def rebuild(self, zones: List[Tuple[float, float, Any]]):
+        """Zbuduj indeks od zera (jedno sortowanie zamiast n x insort)"""
+        self.clear()
+        
+        for low, high, item in zones:
+            if low > high:
+                low, high = high, low
+            self._zones[self._next_id] = (low, high, item)
+            self._next_id += 1
+        
+        self._by_low = sorted((low, zid) for zid, (low, _, _) in self._zones.items())
+        self._by_high = sorted((high, zid) for zid, (_, high, _) in self._zones.items())
+        self._max_width = max((high - low for low, high, _ in self._zones.values()), default=0.0)
+    
+    def remove(self, zone_id: int) -> Any:
+        """Usuń strefę po id"""
+        low, high, item = self._zones.pop(zone_id)
+        
+        del self._by_low[bisect.bisect_left(self._by_low, (low, zone_id))]
+        del self._by_high[bisect.bisect_left(self._by_high, (high, zone_id))]
+        
+        if not self._zones:
+            self._max_width = 0.0
+        
+        return item
+    
+    def clear(self):
+        self._by_low = []
+        self._by_high = []
+        self._zones = {}
+        self._max_width = 0.0
+    
+    def at_price(self, price: float) -> List[Any]:
+        """Strefy, których dotyka cena (low <= price <= high)"""
+        return self.in_range(price, price)
+    
+    def in_range(self, lower: float, upper: float) -> List[Any]:
+        """Strefy przecinające przedział [lower, upper]"""
+        if lower > upper:
+            lower, upper = upper, lower
+        
+        start = bisect.bisect_left(self._by_low, (lower - self._max_width, -1))
+        end = bisect.bisect_right(self._by_low, (upper, float('inf')))
+        
+        hits = [
+            zone_id for _, zone_id in self._by_low[start:end]
+            if self._zones[zone_id][1] >= lower
+        ]
+        hits.sort()
+        
+        return [self._zones[zone_id][2] for zone_id in hits]
+    
+    def crossed(self, last_price: float, current_price: float) -> List[Any]:
+        """Strefy przecięte przez cenę między ostatnim a obecnym tickiem"""
+        return self.in_range(last_price, current_price)
+    
+    def nearest_above(self, price: float) -> Optional[Any]:
+        """Najbliższa strefa leżąca w całości nad ceną"""
+        idx = bisect.bisect_right(self._by_low, (price, float('inf')))
+        if idx == len(self._by_low):
+            return None
+        return self._zones[self._by_low[idx][1]][2]
+    
+    def nearest_below(self, price: float) -> Optional[Any]:
+        """Najbliższa strefa leżąca w całości pod ceną"""
+        idx = bisect.bisect_left(self._by_high, (price, -1))
+        if idx == 0:
+            return None
+        return self._zones[self._by_high[idx - 1][1]][2]
+    
+    def pop_low_at_or_above(self, price: float) -> List[Any]:
+        """Usuń i zwróć strefy z dolną krawędzią >= price"""
+        idx = bisect.bisect_left(self._by_low, (price, -1))
+        zone_ids = sorted(zone_id for _, zone_id in self._by_low[idx:])
+        return [self.remove(zone_id) for zone_id in zone_ids]
+    
+    def pop_high_at_or_below(self, price: float) -> List[Any]:
+        """Usuń i zwróć strefy z górną krawędzią <= price"""
+        idx = bisect.bisect_right(self._by_high, (price, float('inf')))
+        zone_ids = sorted(zone_id for _, zone_id in self._by_high[:idx])
+        return [self.remove(zone_id) for zone_id in zone_ids]
+
+
 # ═══════════════════════════════════════════════════════════════
 # KILLZONE DETECTOR
 # ═══════════════════════════════════════════════════════════════
@@ -192,6 +343,9 @@ class KillzoneDetector:
     """
     Wykrywanie sesji tradingowych (Killzones) wg ICT.
     Czas bazowy: New York (EST/EDT)
+    
+    Granice sesji prekalkulowane w SessionCalendar (epoch, DST-aware) -
+    aktualna sesja to jeden bisect zamiast porównań stringów HH:MM.
     """
     
     KILLZONES = {
@@ -203,52 +357,41 @@ class KillzoneDetector:
     
     def __init__(self):
         self.tz_ny = pytz.timezone('America/New_York')
+        self.calendar = SessionCalendar([
+            SessionZone(zone.value, start, end, label=zone.name.replace('_', ' ').title())
+            for zone, (start, end) in self.KILLZONES.items()
+        ], tz='America/New_York')
     
-    def get_current_killzone(self) -> Tuple[Killzone, Dict]:
+    def get_current_killzone(self, when: datetime = None) -> Tuple[Killzone, Dict]:
         """
         Pobierz aktualną sesję.
         
         Returns:
             (Killzone, info_dict)
         """
-        now_ny = datetime.now(self.tz_ny)
-        current_time = now_ny.strftime("%H:%M")
-        
-        for zone, (start, end) in self.KILLZONES.items():
-            if self._is_in_range(current_time, start, end):
-                return zone, {
-                    'name': zone.value,
-                    'start': start,
-                    'end': end,
-                    'time_remaining': self._time_remaining(current_time, end),
-                    'optimal_for_trading': zone in [Killzone.LONDON, Killzone.NY_OPEN]
-                }
+        current = self.calendar.current_zone(when)
+        
+        if current is not None:
+            zone = Killzone(current['name'])
+            start, end = self.KILLZONES[zone]
+            return zone, {
+                'name': zone.value,
+                'start': start,
+                'end': end,
+                'time_remaining': f"{current['minutes_remaining']:.0f}min",
+                'optimal_for_trading': zone in [Killzone.LONDON, Killzone.NY_OPEN]
+            }
         
+        upcoming = self.calendar.next_zone(when)
         return Killzone.OFF_HOURS, {
             'name': 'off_hours',
             'optimal_for_trading': False,
-            'next_killzone': self._next_killzone(current_time)
+            'next_killzone': f"{upcoming['label']} @ {upcoming['start'].strftime('%H:%M')}" if upcoming else None
         }
     
-    def _is_in_range(self, current: str, start: str, end: str) -> bool:
-        """Sprawdź czy czas jest w zakresie (obsługuje przejście przez północ)"""
-        if start <= end:
-            return start <= current <= end
-        else:  # Przejście przez północ (np. 20:00 - 00:00)
-            return current >= start or current <= end
-    
-    def _time_remaining(self, current: str, end: str) -> str:
-        """Ile czasu do końca sesji"""
-        # Uproszczona wersja
-        return f"~{end}"
-    
-    def _next_killzone(self, current: str) -> str:
-        """Następna sesja"""
-        times = [("02:00", "London"), ("08:00", "NY"), ("20:00", "Asian")]
-        for t, name in times:
-            if current < t:
-                return f"{name} @ {t}"
-        return "Asian @ 20:00"
+    def label_killzones(self, index: pd.DatetimeIndex) -> pd.Series:
+        """Killzone dla każdej świecy (backtesty) - jedno wektorowe wywołanie"""
+        return self.calendar.label_index(index)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -268,6 +411,7 @@ class LiquidityAnalyzer:
     def __init__(self, lookback: int = 50):
         self.lookback = lookback
         self.liquidity_levels: List[LiquidityLevel] = []
+        self.level_index = ZoneIndex()
     
     def find_liquidity_levels(self, data: pd.DataFrame) -> List[LiquidityLevel]:
         """
@@ -298,8 +442,25 @@ class LiquidityAnalyzer:
                 ))
         
         self.liquidity_levels = levels
+        self.level_index.rebuild([(lvl.price, lvl.price, lvl) for lvl in levels])
         return levels
     
+    def levels_near(self, price: float, tolerance: float = 0.001) -> List[LiquidityLevel]:
+        """Poziomy w odległości tolerance (ułamek ceny) od ceny"""
+        band = price * tolerance
+        return self.level_index.in_range(price - band, price + band)
+    
+    def nearest_levels(self, price: float) -> Tuple[Optional[LiquidityLevel], Optional[LiquidityLevel]]:
+        """Najbliższy poziom pod i nad ceną: (below, above)"""
+        return self.level_index.nearest_below(price), self.level_index.nearest_above(price)
+    
+    def levels_crossed(self, last_price: float, current_price: float) -> List[LiquidityLevel]:
+        """Poziomy przecięte między ostatnim a obecnym tickiem (oznacza je jako touched)"""
+        crossed = self.level_index.crossed(last_price, current_price)
+        for lvl in crossed:
+            lvl.touched = True
+        return crossed
+    
     def _calculate_strength(self, prices: np.ndarray, idx: int, level_type: str) -> float:
         """Oblicz siłę poziomu (ile razy testowany)"""
         level_price = prices[idx]
@@ -385,6 +546,39 @@ class LiquidityAnalyzer:
             result['signal'] = Signal.SHORT
         
         return result
+    
+    def label_liquidity_grabs(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Liquidity Grab dla każdej świecy całej historii (jak detect_liquidity_grab
+        wywołane na danych kończących się na tej świecy) - operacje rolling
+        zamiast wywołania per świeca.
+        
+        Returns:
+            DataFrame: type ('bullish'/'bearish'/None), level, strength
+        """
+        highs = data['high'].astype(float)
+        lows = data['low'].astype(float)
+        closes = data['close'].values.astype(float)
+        
+        # Szczyt/dołek z 19 poprzednich świec (highs[-20:-1])
+        recent_high = highs.rolling(19).max().shift(1).values
+        recent_low = lows.rolling(19).min().shift(1).values
+        
+        bullish = (lows.values < recent_low) & (closes > recent_low)
+        bearish = ~bullish & (highs.values > recent_high) & (closes < recent_high)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            strength = np.where(
+                bullish, (recent_low - lows.values) / recent_low,
+                np.where(bearish, (highs.values - recent_high) / recent_high, 0.0)
+            )
+        
+        return pd.DataFrame({
+            'type': pd.Series(np.select([bullish, bearish], ['bullish', 'bearish'], default=None),
+                              index=data.index, dtype=object),
+            'level': np.where(bullish, recent_low, np.where(bearish, recent_high, np.nan)),
+            'strength': strength
+        }, index=data.index)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -401,6 +595,9 @@ class FVGScanner:
     
     def __init__(self):
         self.fvgs: List[FVG] = []
+        # Otwarte FVG osobno per kierunek - warunek zapełnienia to próg ceny
+        self._bullish_open = ZoneIndex()
+        self._bearish_open = ZoneIndex()
     
     def scan(self, data: pd.DataFrame, timeframe: str = "1h") -> List[FVG]:
         """
@@ -435,29 +632,62 @@ class FVGScanner:
                 fvgs.append(fvg)
         
         self.fvgs = fvgs
+        self._bullish_open.rebuild([(f.low, f.high, f) for f in fvgs if f.bullish and not f.filled])
+        self._bearish_open.rebuild([(f.low, f.high, f) for f in fvgs if not f.bullish and not f.filled])
         return fvgs
     
+    def add_fvg(self, fvg: FVG):
+        """Dodaj pojedynczy FVG (np. z nowej świecy) bez ponownego skanu"""
+        self.fvgs.append(fvg)
+        if not fvg.filled:
+            index = self._bullish_open if fvg.bullish else self._bearish_open
+            index.add(fvg.low, fvg.high, fvg)
+    
+    def _open_in_range(self, lower: float, upper: float) -> List[FVG]:
+        return [
+            fvg for index in (self._bullish_open, self._bearish_open)
+            for fvg in index.in_range(lower, upper)
+            if not fvg.filled
+        ]
+    
     def get_unfilled_fvgs(self, current_price: float) -> List[FVG]:
         """Pobierz niezapełnione FVG blisko obecnej ceny"""
-        unfilled = []
+        band = current_price * 0.05  # 5% od ceny
+        
+        return [
+            fvg for fvg in self._open_in_range(current_price - band, current_price + band)
+            if abs(current_price - fvg.midpoint) / current_price < 0.05
+        ]
+    
+    def fvgs_at_price(self, price: float) -> List[FVG]:
+        """Otwarte FVG, w których znajduje się cena"""
+        return self._open_in_range(price, price)
+    
+    def fvgs_crossed(self, last_price: float, current_price: float) -> List[FVG]:
+        """Otwarte FVG przecięte między ostatnim a obecnym tickiem"""
+        return self._open_in_range(last_price, current_price)
+    
+    def nearest_fvgs(self, price: float) -> Tuple[Optional[FVG], Optional[FVG]]:
+        """Najbliższy otwarty FVG pod i nad ceną: (below, above)"""
+        below = [idx.nearest_below(price) for idx in (self._bullish_open, self._bearish_open)]
+        above = [idx.nearest_above(price) for idx in (self._bullish_open, self._bearish_open)]
+        below = [f for f in below if f is not None]
+        above = [f for f in above if f is not None]
+        
+        return (
+            max(below, key=lambda f: f.high) if below else None,
+            min(above, key=lambda f: f.low) if above else None
+        )
+    
+    def check_fvg_fill(self, current_price: float) -> List[FVG]:
+        """Sprawdź czy FVG zostały zapełnione (zwraca nowo zapełnione)"""
+        filled = self._bullish_open.pop_low_at_or_above(current_price)
+        filled += self._bearish_open.pop_high_at_or_below(current_price)
         
-        for fvg in self.fvgs:
-            if not fvg.filled:
-                # Sprawdź czy cena jest blisko FVG
-                distance = abs(current_price - fvg.midpoint) / current_price
-                if distance < 0.05:  # 5% od ceny
-                    unfilled.append(fvg)
+        for fvg in filled:
+            fvg.filled = True
         
-        return unfilled
-    
-    def check_fvg_fill(self, current_price: float):
-        """Sprawdź czy FVG zostały zapełnione"""
-        for fvg in self.fvgs:
-            if not fvg.filled:
-                if fvg.bullish and current_price <= fvg.low:
-                    fvg.filled = True
-                elif not fvg.bullish and current_price >= fvg.high:
-                    fvg.filled = True
+        return filled
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -526,6 +756,10 @@ class WyckoffDetector:
     - Markdown: Trend spadkowy
     """
     
+    def __init__(self, quiet_volatility_ratio: float = 0.7):
+        # Zmienność < ratio * średnia = akumulacja/dystrybucja zamiast trendu
+        self.quiet_volatility_ratio = quiet_volatility_ratio
+    
     def detect_phase(self, data: pd.DataFrame, volume: pd.Series = None) -> Tuple[MarketPhase, Dict]:
         """
         Wykryj aktualną fazę Wyckoffa.
@@ -544,7 +778,7 @@ class WyckoffDetector:
         
         # Określ fazę
         if current_price < sma_20 < sma_50:
-            if volatility < avg_volatility * 0.7:
+            if volatility < avg_volatility * self.quiet_volatility_ratio:
                 phase = MarketPhase.ACCUMULATION
                 info = {
                     'description': 'Smart Money akumuluje - szukaj Liquidity Grab w dół',
@@ -560,7 +794,7 @@ class WyckoffDetector:
                 }
         
         elif current_price > sma_20 > sma_50:
-            if volatility < avg_volatility * 0.7:
+            if volatility < avg_volatility * self.quiet_volatility_ratio:
                 phase = MarketPhase.DISTRIBUTION
                 info = {
                     'description': 'Smart Money dystrybuuje - szukaj Liquidity Grab w górę',
@@ -583,6 +817,34 @@ class WyckoffDetector:
             }
         
         return phase, info
+    
+    def label_phases(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Faza Wyckoffa dla każdej świecy całej historii (jak detect_phase na
+        danych kończących się na tej świecy) - gotowe jako feature dla ML.
+        """
+        closes = data['close'].astype(float).reset_index(drop=True)
+        
+        sma_20 = closes.rolling(20).mean().values
+        sma_50 = closes.rolling(50).mean().values
+        price = closes.values
+        
+        returns = closes.pct_change()
+        volatility = returns.rolling(20, min_periods=1).std(ddof=0).values
+        avg_volatility = returns.expanding().std(ddof=0).values
+        quiet = volatility < avg_volatility * self.quiet_volatility_ratio
+        
+        down = (price < sma_20) & (sma_20 < sma_50)
+        up = (price > sma_20) & (sma_20 > sma_50)
+        
+        phases = np.select(
+            [down & quiet, down, up & quiet, up],
+            [MarketPhase.ACCUMULATION.value, MarketPhase.MARKDOWN.value,
+             MarketPhase.DISTRIBUTION.value, MarketPhase.MARKUP.value],
+            default=MarketPhase.UNKNOWN.value
+        )
+        
+        return pd.Series(phases, index=data.index, name='wyckoff_phase')
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -594,25 +856,33 @@ class ICTScenarioBuilder:
     Buduje scenariusze ICT na podstawie wszystkich danych.
     """
     
-    def __init__(self):
+    def __init__(self,
+                 killzone: KillzoneDetector = None,
+                 wyckoff: WyckoffDetector = None,
+                 smt: SMTDivergence = None):
+        # Komponenty bezstanowe mogą być współdzielone między botami (multi-symbol)
         self.liquidity = LiquidityAnalyzer()
         self.fvg_scanner = FVGScanner()
-        self.smt = SMTDivergence()
-        self.wyckoff = WyckoffDetector()
-        self.killzone = KillzoneDetector()
+        self.smt = smt or SMTDivergence()
+        self.wyckoff = wyckoff or WyckoffDetector()
+        self.killzone = killzone or KillzoneDetector()
     
     def build_scenario(self, 
                        btc_data: pd.DataFrame,
                        eth_data: pd.DataFrame = None,
-                       current_price: float = None) -> Tuple[ICTScenario, Dict]:
+                       current_price: float = None,
+                       killzone_state: Tuple[Killzone, Dict] = None) -> Tuple[ICTScenario, Dict]:
         """
         🎯 GŁÓWNA FUNKCJA: Zbuduj kompletny scenariusz ICT
+        
+        killzone_state: gotowy wynik get_current_killzone() (np. liczony raz
+        na cykl przez ICTMultiSymbolRunner)
         """
         if current_price is None:
             current_price = btc_data['close'].iloc[-1]
         
         # 1. Killzone
-        zone, zone_info = self.killzone.get_current_killzone()
+        zone, zone_info = killzone_state or self.killzone.get_current_killzone()
         
         # 2. Liquidity levels
         liquidity_levels = self.liquidity.find_liquidity_levels(btc_data)
@@ -898,11 +1168,11 @@ class ICTSmartMoneyBot:
     Łączy wszystkie komponenty w jeden działający system.
     """
     
-    def __init__(self, config: BotConfig = None):
+    def __init__(self, config: BotConfig = None, scenario_builder: ICTScenarioBuilder = None):
         self.config = config or BotConfig()
         
         # Komponenty
-        self.scenario_builder = ICTScenarioBuilder()
+        self.scenario_builder = scenario_builder or ICTScenarioBuilder()
         self.position_manager = PositionManager(self.config)
         
         # State
@@ -923,7 +1193,8 @@ class ICTSmartMoneyBot:
     def analyze(self, 
                 btc_data: pd.DataFrame,
                 eth_data: pd.DataFrame = None,
-                current_price: float = None) -> Dict:
+                current_price: float = None,
+                killzone_state: Tuple[Killzone, Dict] = None) -> Dict:
         """
         🔍 Analiza rynku - główna funkcja analizy
         """
@@ -932,7 +1203,7 @@ class ICTSmartMoneyBot:
         
         # Zbuduj scenariusz ICT
         scenario, details = self.scenario_builder.build_scenario(
-            btc_data, eth_data, current_price
+            btc_data, eth_data, current_price, killzone_state
         )
         
         # Oblicz ATR dla trailing stop
@@ -1169,7 +1440,11 @@ def get_ict_signal(btc_data: pd.DataFrame,
     bot = ICTSmartMoneyBot()
     analysis = bot.analyze(btc_data, eth_data)
     
-    # Konwertuj na format dla orchestratora
+    return _to_orchestrator_signal(analysis)
+
+
+def _to_orchestrator_signal(analysis: Dict) -> Dict:
+    """Konwertuj wynik ICTSmartMoneyBot.analyze na format dla orchestratora"""
     scenario = analysis.get('scenario', 'no_trade')
     details = analysis.get('details', {})
     
@@ -1195,6 +1470,224 @@ def get_ict_signal(btc_data: pd.DataFrame,
     }
 
 
+# ═══════════════════════════════════════════════════════════════
+# MULTI-SYMBOL RUNNER
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class SymbolLatency:
+    """Metryki czasu analizy jednego symbolu"""
+    count: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+    
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+    
+    def record(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': self.mean_ms,
+            'last_ms': self.last_ms,
+            'max_ms': self.max_ms,
+            'errors': self.errors
+        }
+
+
+class ICTMultiSymbolRunner:
+    """
+    🎯 Runner wielu symboli - jeden ICTSmartMoneyBot na symbol.
+    
+    - KillzoneDetector, WyckoffDetector i SMTDivergence są współdzielone,
+      killzone liczony raz na cykl
+    - Seria referencyjna SMT (domyślnie ETH) przekazywana wszystkim botom
+    - Analizowane są tylko symbole z nową zamkniętą świecą
+    - Analizy rozdzielane na pulę wątków (numpy/pandas zwalniają GIL)
+    
+    Użycie:
+        runner = ICTMultiSymbolRunner(['BTCUSDT', 'SOLUSDT'], reference_symbol='ETHUSDT')
+        runner.update_candles('BTCUSDT', df)   # po zamknięciu świecy
+        results = runner.run_cycle()           # {symbol: analysis}
+    """
+    
+    def __init__(self,
+                 symbols: List[str],
+                 config: BotConfig = None,
+                 reference_symbol: Optional[str] = 'ETHUSDT',
+                 max_workers: int = 8):
+        self.config = config or BotConfig()
+        self.reference_symbol = reference_symbol
+        self.max_workers = max_workers
+        
+        # Współdzielone komponenty
+        self.killzone = KillzoneDetector()
+        self.wyckoff = WyckoffDetector()
+        self.smt = SMTDivergence()
+        
+        self.bots: Dict[str, ICTSmartMoneyBot] = {}
+        self.candles: Dict[str, pd.DataFrame] = {}
+        self.latency: Dict[str, SymbolLatency] = {}
+        self.last_results: Dict[str, Dict] = {}
+        
+        self._last_candle_key: Dict[str, Any] = {}
+        self._analyzed_key: Dict[str, Any] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        for symbol in symbols:
+            self.add_symbol(symbol)
+    
+    def add_symbol(self, symbol: str):
+        """Dodaj symbol z własnym botem i współdzielonymi detektorami"""
+        if symbol in self.bots:
+            return
+        
+        builder = ICTScenarioBuilder(killzone=self.killzone, wyckoff=self.wyckoff, smt=self.smt)
+        self.bots[symbol] = ICTSmartMoneyBot(self.config, scenario_builder=builder)
+        self.latency[symbol] = SymbolLatency()
+    
+    def remove_symbol(self, symbol: str):
+        for store in (self.bots, self.candles, self.latency, self.last_results,
+                      self._last_candle_key, self._analyzed_key):
+            store.pop(symbol, None)
+    
+    def update_candles(self, symbol: str, data: pd.DataFrame):
+        """
+        Podaj zamknięte świece symbolu (OHLCV).
+        
+        Nowa świeca rozpoznawana jest po indeksie (DatetimeIndex), kolumnie
+        'timestamp'/'close_time' lub długości danych.
+        """
+        if symbol not in self.bots and symbol != self.reference_symbol:
+            self.add_symbol(symbol)
+        
+        self.candles[symbol] = data
+        self._last_candle_key[symbol] = self._candle_key(data)
+    
+    @staticmethod
+    def _candle_key(data: pd.DataFrame) -> Any:
+        if len(data) == 0:
+            return None
+        if isinstance(data.index, pd.DatetimeIndex):
+            return data.index[-1]
+        for col in ('close_time', 'timestamp'):
+            if col in data.columns:
+                return data[col].iloc[-1]
+        return len(data)
+    
+    def pending_symbols(self) -> List[str]:
+        """Symbole z nową zamkniętą świecą od ostatniej analizy"""
+        return [
+            symbol for symbol in self.bots
+            if symbol in self.candles
+            and self._last_candle_key.get(symbol) != self._analyzed_key.get(symbol)
+        ]
+    
+    @staticmethod
+    def _time_index(data: pd.DataFrame) -> Optional[pd.Index]:
+        """Znaczniki czasu świec (indeks lub kolumna close_time / timestamp)"""
+        if isinstance(data.index, pd.DatetimeIndex):
+            return data.index
+        for col in ('close_time', 'timestamp'):
+            if col in data.columns:
+                return pd.Index(data[col])
+        return None
+    
+    def _reference_for(self, data: pd.DataFrame, lookback: int = 20) -> Optional[pd.DataFrame]:
+        """
+        Świece symbolu referencyjnego wyrównane do czasów `data` (SMT)
+        
+        Luka lub brak świecy referencyjnej w ostatnich `lookback` świecach
+        (okno SMTDivergence) -> None, zamiast porównywać świece z różnych godzin.
+        Bez znaczników czasu w obu ramkach - wyrównanie po ogonie.
+        """
+        ref = self.candles.get(self.reference_symbol) if self.reference_symbol else None
+        if ref is None or len(ref) == 0:
+            return None
+        
+        times, ref_times = self._time_index(data), self._time_index(ref)
+        if times is None or ref_times is None:
+            if len(ref) < len(data):
+                return None
+            return ref.iloc[-len(data):] if len(ref) > len(data) else ref
+        
+        keyed = ref.set_axis(ref_times, axis=0)
+        keyed = keyed[~keyed.index.duplicated(keep='last')]
+        aligned = keyed.reindex(times)
+        if aligned[['high', 'low']].iloc[-lookback:].isna().any(axis=None):
+            return None
+        return aligned.set_axis(data.index, axis=0)
+    
+    def _analyze_symbol(self, symbol: str, killzone_state: Tuple[Killzone, Dict]) -> Tuple[str, Optional[Dict]]:
+        data = self.candles[symbol]
+        eth_data = None if symbol == self.reference_symbol else self._reference_for(data)
+        
+        start = time.perf_counter()
+        try:
+            analysis = self.bots[symbol].analyze(data, eth_data, killzone_state=killzone_state)
+        except Exception as e:
+            self.latency[symbol].errors += 1
+            logger.error(f"ICT analysis failed for {symbol}: {e}")
+            return symbol, None
+        
+        self.latency[symbol].record((time.perf_counter() - start) * 1000)
+        return symbol, analysis
+    
+    def run_cycle(self, force: bool = False) -> Dict[str, Dict]:
+        """
+        Przeanalizuj symbole z nową świecą (force=True: wszystkie).
+        
+        Returns:
+            {symbol: analysis} tylko dla przeanalizowanych symboli
+        """
+        symbols = [s for s in self.bots if s in self.candles] if force else self.pending_symbols()
+        if not symbols:
+            return {}
+        
+        # Killzone raz na cykl dla wszystkich symboli
+        killzone_state = self.killzone.get_current_killzone()
+        keys = {symbol: self._last_candle_key.get(symbol) for symbol in symbols}
+        
+        if self.max_workers <= 1 or len(symbols) == 1:
+            outputs = [self._analyze_symbol(symbol, killzone_state) for symbol in symbols]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            outputs = list(self._executor.map(
+                lambda symbol: self._analyze_symbol(symbol, killzone_state), symbols
+            ))
+        
+        results = {}
+        for symbol, analysis in outputs:
+            self._analyzed_key[symbol] = keys[symbol]
+            if analysis is not None:
+                results[symbol] = analysis
+                self.last_results[symbol] = analysis
+        
+        return results
+    
+    def get_signals(self) -> Dict[str, Dict]:
+        """Ostatnie sygnały w formacie Genius Orchestrator (jak get_ict_signal)"""
+        return {symbol: _to_orchestrator_signal(analysis)
+                for symbol, analysis in self.last_results.items()}
+    
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        return {symbol: stats.to_dict() for symbol, stats in self.latency.items()}
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
 # ═══════════════════════════════════════════════════════════════
 # CLI TEST
 # ═══════════════════════════════════════════════════════════════
@@ -28,8 +28,16 @@ import requests
 import os
 from datetime import datetime, timedelta
 
+from genius_drawdown import max_drawdown as _max_drawdown
+
 logger = logging.getLogger(__name__)
 
+try:
+    from genius_options_greeks import GeniusOptionsGreeks, get_vol_surface
+    OPTIONS_GREEKS_AVAILABLE = True
+except ImportError:
+    OPTIONS_GREEKS_AVAILABLE = False
+
 # ============ TWELVE DATA PRO API CONFIG ============
 TWELVE_DATA_API_KEY = os.getenv('TWELVE_DATA_API_KEY', '5203977ec0204755904ef326abe77e7c')
 TWELVE_DATA_BASE_URL = 'https://api.twelvedata.com'
@@ -345,6 +353,11 @@ class OptionsPricer:
         """
         Back-solve implied volatility from straddle price
         
+        Exact Black-76 inversion (ATMF straddle = 2 × ATMF call) with the batched
+        IV solver from genius_options_greeks; the closed-form approximation is
+        used when the solver is unavailable or does not converge.
+        Accepts scalars or arrays.
+        
         Args:
             straddle_price: Market straddle price
             time: Time to maturity
@@ -355,7 +368,15 @@ class OptionsPricer:
         """
         # From formula: straddle ≈ (2/√(2π)) × F × σ × √T
         # Solving for σ: σ = straddle × √(2π) / (2 × F × √T)
-        return straddle_price * np.sqrt(2 * np.pi) / (2 * forward * np.sqrt(time))
+        approx = np.asarray(straddle_price, dtype=np.float64) * np.sqrt(2 * np.pi) / (2 * forward * np.sqrt(time))
+        if not OPTIONS_GREEKS_AVAILABLE:
+            return float(approx) if approx.ndim == 0 else approx
+        
+        solved = GeniusOptionsGreeks().implied_volatility_chain(
+            np.asarray(straddle_price, dtype=np.float64) / 2, forward, forward, time, 0.0
+        )
+        iv = np.where(solved['converged'], solved['iv'], approx)
+        return float(iv) if iv.ndim == 0 else iv
     
     @staticmethod
     def black_scholes_call(S: float, K: float, T: float, r: float, sigma: float) -> float:
@@ -706,9 +727,7 @@ class RiskMetrics:
         """
         Calculate maximum drawdown
         """
-        rolling_max = cumulative_returns.cummax()
-        drawdowns = (cumulative_returns - rolling_max) / rolling_max
-        return drawdowns.min()
+        return _max_drawdown(np.asarray(cumulative_returns, dtype=np.float64))
 
 
 # ============ CRYPTO-SPECIFIC ADAPTATIONS ============
@@ -938,7 +957,8 @@ class LiveMarketAnalyzer:
         
         Args:
             symbol: Symbol to analyze
-            implied_vol: Override implied vol (uses historical if None)
+            implied_vol: Override implied vol (cached vol surface ATM IV, then
+                historical if None)
             days_to_expiry: Days until option expiry
         
         Returns:
@@ -949,6 +969,15 @@ class LiveMarketAnalyzer:
             return None
         
         current_price = quote['price']
+        time_to_expiry = days_to_expiry / 365.0
+        
+        # ATM IV from the cached fitted surface (no IV re-solve)
+        vol_source = 'override' if implied_vol is not None else 'historical'
+        if implied_vol is None and OPTIONS_GREEKS_AVAILABLE:
+            surface = get_vol_surface(symbol.split('/')[0])
+            if surface is not None:
+                implied_vol = surface.atm_iv(time_to_expiry)
+                vol_source = 'surface'
         
         # Get implied vol from historical if not provided
         if implied_vol is None:
@@ -956,7 +985,6 @@ class LiveMarketAnalyzer:
             implied_vol = vol_analysis['volatility_annual'] if vol_analysis else 0.5
         
         # Calculate straddle
-        time_to_expiry = days_to_expiry / 365.0
         straddle_pct = self.options.straddle_price_closed_form(
             vol=implied_vol,
             time=time_to_expiry,
@@ -969,6 +997,7 @@ class LiveMarketAnalyzer:
             'symbol': symbol,
             'current_price': current_price,
             'implied_volatility': implied_vol,
+            'volatility_source': vol_source,
             'days_to_expiry': days_to_expiry,
             'straddle_price_usd': straddle_usd,
             'straddle_price_pct': straddle_pct * 100,
@@ -75,6 +75,41 @@ class MagnetZone:
     reasons: List[str]
 
 
+@dataclass
+class LiquidationDensity:
+    """Gęstość likwidacji w binach cenowych (wolumen ważony OI)"""
+    bin_edges: np.ndarray
+    long_volume: np.ndarray
+    short_volume: np.ndarray
+    leverage_volume: np.ndarray  # sum(leverage * volume) - do średniej dźwigni
+    counts: np.ndarray  # liczba punktów siatki w binie
+    
+    @property
+    def centers(self) -> np.ndarray:
+        return (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+    
+    @property
+    def total_volume(self) -> np.ndarray:
+        return self.long_volume + self.short_volume
+    
+    def to_levels(self, current_price: float) -> List[LiquidationLevel]:
+        """Jeden LiquidationLevel na niepusty bin i stronę"""
+        centers = self.centers
+        levels = []
+        for side, volume in (('long', self.long_volume), ('short', self.short_volume)):
+            for i in np.flatnonzero(volume > 0):
+                avg_lev = self.leverage_volume[i] / self.total_volume[i]
+                levels.append(LiquidationLevel(
+                    price=float(centers[i]),
+                    volume_usd=float(volume[i]),
+                    type=side,
+                    leverage=int(round(avg_lev)),
+                    distance_pct=abs(centers[i] - current_price) / current_price,
+                    strength=min(1.0, avg_lev / 100)
+                ))
+        return levels
+
+
 @dataclass 
 class LiquidationHeatmap:
     """Pełna mapa ciepła likwidacji"""
@@ -85,6 +120,7 @@ class LiquidationHeatmap:
     magnet_zones: List[MagnetZone]
     overall_sentiment: str  # 'long_heavy', 'short_heavy', 'balanced'
     risk_level: str  # 'low', 'medium', 'high', 'extreme'
+    density: Optional[LiquidationDensity] = None
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -135,6 +171,75 @@ class LiquidationCalculator:
         
         return liq_price
     
+    @classmethod
+    def generate_liquidation_grid(cls,
+                                  current_price: float,
+                                  price_range_pct: float = 0.20,
+                                  leverages: List[int] = None,
+                                  entry_offsets=10,
+                                  entry_weights: np.ndarray = None,
+                                  leverage_weights: np.ndarray = None,
+                                  total_oi_usd: float = None,
+                                  long_share: float = 0.5,
+                                  exchange: str = 'default') -> Dict[str, np.ndarray]:
+        """
+        Ceny likwidacji dla całego tensora (dźwignia × cena wejścia × strona).
+        
+        Args:
+            entry_offsets: liczba punktów w ±5% lub tablica offsetów wejścia
+            entry_weights: rozkład OI po cenach wejścia (np. volume profile)
+            leverage_weights: rozkład OI po dźwigniach
+            total_oi_usd: łączne OI do rozłożenia; None = losowy model wolumenu
+            long_share: udział longów w OI
+        
+        Returns:
+            Dict płaskich tablic: price, volume, side (+1 long / -1 short), leverage
+            - tylko punkty w zakresie ±price_range_pct po właściwej stronie ceny
+        """
+        if leverages is None:
+            leverages = [5, 10, 20, 25, 50, 75, 100, 125]
+        
+        lev = np.asarray(leverages, dtype=np.float64)
+        if np.isscalar(entry_offsets):
+            offsets = np.linspace(-0.05, 0.05, int(entry_offsets))
+        else:
+            offsets = np.asarray(entry_offsets, dtype=np.float64)
+        n_lev, n_entry = len(lev), len(offsets)
+        
+        mm = cls.MAINTENANCE_MARGINS.get(exchange, cls.MAINTENANCE_MARGINS['default'])
+        entry = current_price * (1 + offsets)                      # (E,)
+        long_liq = entry[None, :] * (1 - 1 / lev[:, None] + mm)    # (L, E)
+        short_liq = entry[None, :] * (1 + 1 / lev[:, None] - mm)
+        
+        # Wolumen na punkt siatki
+        if total_oi_usd is not None:
+            w_entry = np.ones(n_entry) if entry_weights is None else np.asarray(entry_weights, dtype=np.float64)
+            w_lev = np.ones(n_lev) if leverage_weights is None else np.asarray(leverage_weights, dtype=np.float64)
+            base = np.outer(w_lev / w_lev.sum(), w_entry / w_entry.sum()) * total_oi_usd
+            long_vol = base * long_share
+            short_vol = base * (1 - long_share)
+        else:
+            # Wyższa dźwignia = więcej wolumenu; skalowane do gęstości siatki
+            scale = (lev[:, None] / 50) * (10 / n_entry)
+            long_vol = np.random.uniform(10_000_000, 100_000_000, (n_lev, n_entry)) * scale
+            short_vol = np.random.uniform(10_000_000, 100_000_000, (n_lev, n_entry)) * scale
+        
+        long_dist = (long_liq - current_price) / current_price
+        short_dist = (short_liq - current_price) / current_price
+        long_mask = (long_dist > -price_range_pct) & (long_dist < 0)
+        short_mask = (short_dist > 0) & (short_dist < price_range_pct)
+        
+        lev_grid = np.broadcast_to(lev[:, None], (n_lev, n_entry))
+        return {
+            'price': np.concatenate([long_liq[long_mask], short_liq[short_mask]]),
+            'volume': np.concatenate([long_vol[long_mask], short_vol[short_mask]]),
+            'side': np.concatenate([
+                np.ones(int(long_mask.sum()), dtype=np.int8),
+                -np.ones(int(short_mask.sum()), dtype=np.int8)
+            ]),
+            'leverage': np.concatenate([lev_grid[long_mask], lev_grid[short_mask]])
+        }
+    
     @classmethod
     def generate_liquidation_levels(cls,
                                      current_price: float,
@@ -145,53 +250,24 @@ class LiquidationCalculator:
         
         Zakładamy rozkład pozycji wokół bieżącej ceny.
         """
-        if leverages is None:
-            leverages = [5, 10, 20, 25, 50, 75, 100, 125]
-        
-        levels = []
+        grid = cls.generate_liquidation_grid(current_price, price_range_pct, leverages)
         
-        # Dla każdej dźwigni, oblicz gdzie byłaby likwidacja
-        for leverage in leverages:
-            # LONG positions opened at various prices
-            for entry_offset in np.linspace(-0.05, 0.05, 10):
-                entry_price = current_price * (1 + entry_offset)
-                liq_price = cls.calculate_liquidation_price(entry_price, leverage, 'long')
-                
-                distance = (liq_price - current_price) / current_price
-                
-                if -price_range_pct < distance < 0:  # Below current price
-                    # Volume estimation (higher leverage = more volume at that level)
-                    volume = np.random.uniform(10_000_000, 100_000_000) * (leverage / 50)
-                    
-                    levels.append(LiquidationLevel(
-                        price=liq_price,
-                        volume_usd=volume,
-                        type='long',
-                        leverage=leverage,
-                        distance_pct=abs(distance),
-                        strength=min(1.0, leverage / 100)
-                    ))
-            
-            # SHORT positions
-            for entry_offset in np.linspace(-0.05, 0.05, 10):
-                entry_price = current_price * (1 + entry_offset)
-                liq_price = cls.calculate_liquidation_price(entry_price, leverage, 'short')
-                
-                distance = (liq_price - current_price) / current_price
-                
-                if 0 < distance < price_range_pct:  # Above current price
-                    volume = np.random.uniform(10_000_000, 100_000_000) * (leverage / 50)
-                    
-                    levels.append(LiquidationLevel(
-                        price=liq_price,
-                        volume_usd=volume,
-                        type='short',
-                        leverage=leverage,
-                        distance_pct=abs(distance),
-                        strength=min(1.0, leverage / 100)
-                    ))
+        distance = np.abs(grid['price'] - current_price) / current_price
+        strength = np.minimum(1.0, grid['leverage'] / 100)
         
-        return levels
+        return [
+            LiquidationLevel(
+                price=float(price),
+                volume_usd=float(volume),
+                type='long' if side > 0 else 'short',
+                leverage=int(leverage),
+                distance_pct=float(dist),
+                strength=float(strg)
+            )
+            for price, volume, side, leverage, dist, strg in zip(
+                grid['price'], grid['volume'], grid['side'], grid['leverage'], distance, strength
+            )
+        ]
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -205,6 +281,12 @@ class ClusterDetector:
     To są "magnetic zones" - Market Makers CHCĄ tam dotrzeć!
     """
     
+    @staticmethod
+    def _cluster_strength(total_volume: np.ndarray, center: np.ndarray, current_price: float) -> np.ndarray:
+        """Im więcej wolumenu i bliżej ceny, tym silniejszy klaster"""
+        distance = np.abs(center - current_price) / current_price
+        return np.maximum(0, np.minimum(1.0, (total_volume / 1_000_000_000) * (1 - distance * 5)))
+    
     @classmethod
     def detect_clusters(cls, 
                         levels: List[LiquidationLevel],
@@ -221,53 +303,179 @@ class ClusterDetector:
         if not levels:
             return []
         
-        clusters = []
+        prices = np.array([l.price for l in levels])
+        volumes = np.array([l.volume_usd for l in levels])
+        is_long = np.array([l.type == 'long' for l in levels])
+        leverages = np.array([l.leverage for l in levels], dtype=np.float64)
         
         # Grupuj poziomy w bins
         price_step = current_price * cluster_width_pct
+        bins = np.arange(prices.min(), prices.max() + price_step, price_step)
+        n_bins = len(bins) - 1
         
-        # Stwórz bins
-        prices = [l.price for l in levels]
-        min_price = min(prices)
-        max_price = max(prices)
+        idx = np.searchsorted(bins, prices, side='right') - 1
+        valid = idx < n_bins
+        idx, volumes, is_long, leverages = idx[valid], volumes[valid], is_long[valid], leverages[valid]
         
-        bins = np.arange(min_price, max_price + price_step, price_step)
+        counts = np.bincount(idx, minlength=n_bins)
+        total_volume = np.bincount(idx, weights=volumes, minlength=n_bins)
+        long_vol = np.bincount(idx, weights=volumes * is_long, minlength=n_bins)
+        lev_sum = np.bincount(idx, weights=leverages, minlength=n_bins)
         
-        for i in range(len(bins) - 1):
-            bin_low = bins[i]
-            bin_high = bins[i + 1]
-            
-            # Znajdź poziomy w tym binie
-            bin_levels = [l for l in levels if bin_low <= l.price < bin_high]
-            
-            if len(bin_levels) >= 3:  # Minimum 3 poziomy = klaster
-                total_volume = sum(l.volume_usd for l in bin_levels)
-                
-                # Dominujący typ
-                long_vol = sum(l.volume_usd for l in bin_levels if l.type == 'long')
-                short_vol = sum(l.volume_usd for l in bin_levels if l.type == 'short')
-                dominant = 'long' if long_vol > short_vol else 'short'
-                
-                # Średnia dźwignia
-                avg_lev = np.mean([l.leverage for l in bin_levels])
-                
-                # Siła klastra (im więcej wolumenu i bliżej ceny, tym silniejszy)
-                distance = abs((bin_low + bin_high) / 2 - current_price) / current_price
-                strength = min(1.0, (total_volume / 1_000_000_000) * (1 - distance * 5))
-                
-                clusters.append(LiquidationCluster(
-                    price_low=bin_low,
-                    price_high=bin_high,
-                    total_volume_usd=total_volume,
-                    dominant_type=dominant,
-                    avg_leverage=avg_lev,
-                    strength=max(0, strength)
-                ))
+        # Minimum 3 poziomy = klaster
+        cluster_bins = np.flatnonzero(counts >= 3)
+        strength = cls._cluster_strength(
+            total_volume[cluster_bins], (bins[cluster_bins] + bins[cluster_bins + 1]) / 2, current_price
+        )
+        
+        clusters = [
+            LiquidationCluster(
+                price_low=bins[i],
+                price_high=bins[i + 1],
+                total_volume_usd=total_volume[i],
+                dominant_type='long' if long_vol[i] > total_volume[i] - long_vol[i] else 'short',
+                avg_leverage=lev_sum[i] / counts[i],
+                strength=float(strg)
+            )
+            for i, strg in zip(cluster_bins, strength)
+        ]
         
         # Sortuj po sile
         clusters.sort(key=lambda c: c.strength, reverse=True)
         
         return clusters
+    
+    @staticmethod
+    def bin_liquidations(grid: Dict[str, np.ndarray],
+                         current_price: float,
+                         bin_width_pct: float = 0.0025) -> Optional[LiquidationDensity]:
+        """
+        Histogram siatki likwidacji (generate_liquidation_grid) w binach cenowych
+        ważonych wolumenem.
+        """
+        prices = grid['price']
+        if len(prices) == 0:
+            return None
+        
+        step = current_price * bin_width_pct
+        lo = np.floor(prices.min() / step) * step
+        n_bins = int(np.floor((prices.max() - lo) / step)) + 1
+        edges = lo + np.arange(n_bins + 1) * step
+        
+        idx = np.minimum(((prices - lo) / step).astype(np.int64), n_bins - 1)
+        volume = grid['volume']
+        is_long = grid['side'] > 0
+        
+        return LiquidationDensity(
+            bin_edges=edges,
+            long_volume=np.bincount(idx, weights=volume * is_long, minlength=n_bins),
+            short_volume=np.bincount(idx, weights=volume * ~is_long, minlength=n_bins),
+            leverage_volume=np.bincount(idx, weights=volume * grid['leverage'], minlength=n_bins),
+            counts=np.bincount(idx, minlength=n_bins)
+        )
+    
+    @classmethod
+    def detect_density_clusters(cls,
+                                density: LiquidationDensity,
+                                current_price: float,
+                                smooth_pct: float = 0.01,
+                                min_peak_ratio: float = 0.05,
+                                min_prominence: float = 0.05,
+                                rel_height: float = 0.5,
+                                max_width_pct: float = 0.02,
+                                min_levels: int = 3) -> List[LiquidationCluster]:
+        """
+        Klastry jako piki wygładzonej gęstości wolumenu.
+        
+        Args:
+            smooth_pct: szerokość okna wygładzania jako % ceny
+            min_peak_ratio: minimalna wysokość piku względem maksimum
+            min_prominence: minimalne wybicie piku ponad wyższą z sąsiednich dolin
+                            (ułamek wysokości piku) - odsiewa szum drobnej siatki
+            rel_height: klaster obejmuje biny >= rel_height * pik (do doliny z sąsiadem)
+            max_width_pct: maksymalna szerokość klastra jako % ceny
+            min_levels: minimalna liczba punktów siatki w klastrze
+        """
+        if density is None or len(density.counts) == 0:
+            return []
+        
+        step = density.bin_edges[1] - density.bin_edges[0]
+        smooth_bins = max(1, int(round(current_price * smooth_pct / step)))
+        half_width = max(0, int(current_price * max_width_pct / step / 2))
+        
+        total = density.total_volume
+        if smooth_bins > 1:
+            kernel = np.ones(smooth_bins) / smooth_bins
+            smooth = np.convolve(total, kernel, mode='same')
+        else:
+            smooth = total
+        
+        # Lokalne maksima (plateau liczone raz - lewa krawędź)
+        padded = np.concatenate([[-np.inf], smooth, [-np.inf]])
+        is_peak = (smooth > padded[:-2]) & (smooth >= padded[2:]) & (smooth > 0)
+        peaks = np.flatnonzero(is_peak & (smooth >= smooth.max() * min_peak_ratio))
+        if len(peaks) == 0:
+            return []
+        
+        def valley_splits(peaks: np.ndarray) -> List[int]:
+            # Granice między sąsiednimi pikami = minimum doliny
+            splits = [0]
+            for a, b in zip(peaks[:-1], peaks[1:]):
+                splits.append(a + int(np.argmin(smooth[a:b + 1])))
+            splits.append(len(smooth) - 1)
+            return splits
+        
+        splits = valley_splits(peaks)
+        left_valley = np.array([smooth[lo:p + 1].min() for lo, p in zip(splits[:-1], peaks)])
+        right_valley = np.array([smooth[p:hi + 1].min() for p, hi in zip(peaks, splits[1:])])
+        prominence = smooth[peaks] - np.maximum(left_valley, right_valley)
+        peaks = peaks[prominence >= smooth[peaks] * min_prominence]
+        if len(peaks) == 0:
+            return []
+        splits = valley_splits(peaks)
+        
+        edges = density.bin_edges
+        cum_long = np.concatenate([[0.0], np.cumsum(density.long_volume)])
+        cum_short = np.concatenate([[0.0], np.cumsum(density.short_volume)])
+        cum_lev = np.concatenate([[0.0], np.cumsum(density.leverage_volume)])
+        cum_count = np.concatenate([[0], np.cumsum(density.counts)])
+        
+        lows, highs = [], []
+        for k, peak in enumerate(peaks):
+            left = max(splits[k], peak - half_width)
+            right = min(splits[k + 1], peak + half_width)
+            inside = np.flatnonzero(smooth[left:right + 1] >= smooth[peak] * rel_height) + left
+            # Ciągły zakres wokół piku
+            gaps = np.flatnonzero(np.diff(inside) > 1)
+            pos = np.searchsorted(inside, peak)
+            run_start = inside[gaps[gaps < pos][-1] + 1] if np.any(gaps < pos) else inside[0]
+            run_end = inside[gaps[gaps >= pos][0]] if np.any(gaps >= pos) else inside[-1]
+            lows.append(run_start)
+            highs.append(run_end + 1)
+        
+        lows, highs = np.array(lows), np.array(highs)
+        long_vol = cum_long[highs] - cum_long[lows]
+        short_vol = cum_short[highs] - cum_short[lows]
+        total_vol = long_vol + short_vol
+        counts = cum_count[highs] - cum_count[lows]
+        avg_lev = np.divide(cum_lev[highs] - cum_lev[lows], total_vol,
+                            out=np.zeros(len(total_vol)), where=total_vol > 0)
+        strength = cls._cluster_strength(total_vol, (edges[lows] + edges[highs]) / 2, current_price)
+        
+        clusters = [
+            LiquidationCluster(
+                price_low=float(edges[lows[k]]),
+                price_high=float(edges[highs[k]]),
+                total_volume_usd=float(total_vol[k]),
+                dominant_type='long' if long_vol[k] > short_vol[k] else 'short',
+                avg_leverage=float(avg_lev[k]),
+                strength=float(strength[k])
+            )
+            for k in range(len(peaks)) if counts[k] >= min_levels
+        ]
+        
+        clusters.sort(key=lambda c: c.strength, reverse=True)
+        return clusters
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -455,11 +663,19 @@ class LiquidationHeatmapAnalyzer:
     Łączy wszystkie komponenty i tworzy pełną mapę likwidacji.
     """
     
-    def __init__(self):
+    def __init__(self,
+                 entry_points: int = 200,
+                 bin_width_pct: float = 0.0025,
+                 leverages: List[int] = None):
         self.calculator = LiquidationCalculator()
         self.cluster_detector = ClusterDetector()
         self.magnet_analyzer = MagnetZoneAnalyzer()
         
+        # Siatka tablicowa: entry_points cen wejścia × dźwignie × strony
+        self.entry_points = entry_points
+        self.bin_width_pct = bin_width_pct
+        self.leverages = leverages
+        
         # Cache
         self.last_heatmap = None
         self.last_update = None
@@ -467,7 +683,9 @@ class LiquidationHeatmapAnalyzer:
     def generate_heatmap(self,
                          current_price: float,
                          ohlcv_data: pd.DataFrame = None,
-                         external_liquidation_data: Dict = None) -> LiquidationHeatmap:
+                         external_liquidation_data: Dict = None,
+                         open_interest_usd: float = None,
+                         entry_weights: np.ndarray = None) -> LiquidationHeatmap:
         """
         Generuj pełną mapę ciepła likwidacji.
         
@@ -475,50 +693,43 @@ class LiquidationHeatmapAnalyzer:
             current_price: Aktualna cena
             ohlcv_data: OHLCV DataFrame
             external_liquidation_data: Dane z zewnętrznych API (Coinglass etc.)
+            open_interest_usd: Łączne OI do rozłożenia na siatce (None = model losowy)
+            entry_weights: Rozkład OI po cenach wejścia (długość entry_points)
         
         Returns:
             LiquidationHeatmap
         """
         timestamp = datetime.now()
+        density = None
         
-        # 1. Generate liquidation levels
+        # 1-2. Generate liquidation levels + detect clusters
         if external_liquidation_data:
             levels = self._parse_external_data(external_liquidation_data, current_price)
+            clusters = self.cluster_detector.detect_clusters(levels, current_price)
+            long_volume = sum(l.volume_usd for l in levels if l.type == 'long')
+            short_volume = sum(l.volume_usd for l in levels if l.type == 'short')
         else:
-            levels = self.calculator.generate_liquidation_levels(current_price)
-        
-        # 2. Detect clusters
-        clusters = self.cluster_detector.detect_clusters(levels, current_price)
+            grid = self.calculator.generate_liquidation_grid(
+                current_price,
+                leverages=self.leverages,
+                entry_offsets=self.entry_points,
+                entry_weights=entry_weights,
+                total_oi_usd=open_interest_usd
+            )
+            density = self.cluster_detector.bin_liquidations(grid, current_price, self.bin_width_pct)
+            clusters = self.cluster_detector.detect_density_clusters(density, current_price)
+            levels = density.to_levels(current_price) if density is not None else []
+            long_volume = float(density.long_volume.sum()) if density is not None else 0
+            short_volume = float(density.short_volume.sum()) if density is not None else 0
         
         # 3. Find magnet zones
         magnet_zones = self.magnet_analyzer.analyze(current_price, clusters, ohlcv_data)
         
         # 4. Overall sentiment
-        long_volume = sum(l.volume_usd for l in levels if l.type == 'long')
-        short_volume = sum(l.volume_usd for l in levels if l.type == 'short')
-        
-        if long_volume > short_volume * 1.5:
-            sentiment = 'long_heavy'
-        elif short_volume > long_volume * 1.5:
-            sentiment = 'short_heavy'
-        else:
-            sentiment = 'balanced'
+        sentiment = self._overall_sentiment(long_volume, short_volume)
         
         # 5. Risk level
-        nearest_cluster_distance = float('inf')
-        for c in clusters:
-            center = (c.price_low + c.price_high) / 2
-            distance = abs(center - current_price) / current_price
-            nearest_cluster_distance = min(nearest_cluster_distance, distance)
-        
-        if nearest_cluster_distance < 0.02:
-            risk_level = 'extreme'
-        elif nearest_cluster_distance < 0.05:
-            risk_level = 'high'
-        elif nearest_cluster_distance < 0.10:
-            risk_level = 'medium'
-        else:
-            risk_level = 'low'
+        risk_level = self._risk_level(clusters, current_price)
         
         heatmap = LiquidationHeatmap(
             current_price=current_price,
@@ -527,7 +738,8 @@ class LiquidationHeatmapAnalyzer:
             clusters=clusters,
             magnet_zones=magnet_zones,
             overall_sentiment=sentiment,
-            risk_level=risk_level
+            risk_level=risk_level,
+            density=density
         )
         
         self.last_heatmap = heatmap
@@ -535,6 +747,30 @@ class LiquidationHeatmapAnalyzer:
         
         return heatmap
     
+    @staticmethod
+    def _overall_sentiment(long_volume: float, short_volume: float) -> str:
+        if long_volume > short_volume * 1.5:
+            return 'long_heavy'
+        elif short_volume > long_volume * 1.5:
+            return 'short_heavy'
+        return 'balanced'
+    
+    @staticmethod
+    def _risk_level(clusters: List[LiquidationCluster], current_price: float) -> str:
+        nearest_cluster_distance = float('inf')
+        for c in clusters:
+            center = (c.price_low + c.price_high) / 2
+            distance = abs(center - current_price) / current_price
+            nearest_cluster_distance = min(nearest_cluster_distance, distance)
+        
+        if nearest_cluster_distance < 0.02:
+            return 'extreme'
+        elif nearest_cluster_distance < 0.05:
+            return 'high'
+        elif nearest_cluster_distance < 0.10:
+            return 'medium'
+        return 'low'
+    
     def _parse_external_data(self, data: Dict, current_price: float) -> List[LiquidationLevel]:
         """Parse dane z zewnętrznych API"""
         levels = []
@@ -623,23 +859,394 @@ class LiquidationHeatmapAnalyzer:
         }
 
 
+# ═══════════════════════════════════════════════════════════════
+# ROLLING LIQUIDATION HEATMAP (CENA × CZAS)
+# ═══════════════════════════════════════════════════════════════
+
+class RollingLiquidationHeatmap:
+    """
+    🗺️ ROLLING HEATMAP LIKWIDACJI
+    
+    Macierz gęstości cena × czas aktualizowana świeca po świecy:
+    - wzrost OI = nowe pozycje otwarte w zakresie świecy → poziomy likwidacji
+      dla siatki dźwigni
+    - spadek OI = proporcjonalne zamknięcie pozycji
+    - cena przechodzi przez poziom = likwidacja (wygaszenie binu)
+    - powolny zanik czasowy (pozycje zamykane poza sygnałem OI)
+    
+    Historia trzymana w stałym buforze pierścieniowym NumPy (history_size × n_bins).
+    Siatka cenowa jest liniowa i przesuwana o całe biny, gdy cena oddali się od środka.
+    """
+    
+    DEFAULT_LEVERAGES = [5, 10, 20, 25, 50, 75, 100, 125]
+    DEFAULT_LEVERAGE_WEIGHTS = [0.20, 0.25, 0.20, 0.10, 0.10, 0.05, 0.05, 0.05]
+    
+    def __init__(self,
+                 symbol: str = 'BTCUSDT',
+                 history_size: int = 500,
+                 range_pct: float = 0.25,
+                 bin_width_pct: float = 0.0025,
+                 leverages: List[int] = None,
+                 leverage_weights: List[float] = None,
+                 entry_points: int = 5,
+                 decay: float = 0.998,
+                 cross_decay: float = 0.0,
+                 volume_oi_ratio: float = 0.05,
+                 default_open_usd: float = None,
+                 exchange: str = 'default'):
+        """
+        Args:
+            range_pct: zakres siatki ±% od ceny środka
+            entry_points: liczba cen wejścia rozłożonych w [low, high] świecy
+            decay: mnożnik zaniku wszystkich poziomów na świecę
+            cross_decay: mnożnik dla poziomów przekroczonych przez cenę (0 = usunięte)
+            volume_oi_ratio: bez OI - część wolumenu (USD) traktowana jako nowe pozycje
+            default_open_usd: bez OI i wolumenu - stała wartość nowych pozycji na świecę
+        """
+        self.symbol = symbol.upper()
+        self.history_size = history_size
+        self.range_pct = range_pct
+        self.bin_width_pct = bin_width_pct
+        self.entry_points = entry_points
+        self.decay = decay
+        self.cross_decay = cross_decay
+        self.volume_oi_ratio = volume_oi_ratio
+        self.default_open_usd = default_open_usd
+        
+        lev = leverages or self.DEFAULT_LEVERAGES
+        weights = leverage_weights or (self.DEFAULT_LEVERAGE_WEIGHTS if leverages is None else [1.0] * len(lev))
+        self.leverages = np.asarray(lev, dtype=np.float64)
+        self.leverage_weights = np.asarray(weights, dtype=np.float64) / np.sum(weights)
+        self.maintenance_margin = LiquidationCalculator.MAINTENANCE_MARGINS.get(
+            exchange, LiquidationCalculator.MAINTENANCE_MARGINS['default']
+        )
+        
+        self.n_bins = int(round(2 * range_pct / bin_width_pct))
+        self.step: Optional[float] = None
+        self.origin: Optional[float] = None  # dolna krawędź siatki
+        
+        # Aktualny stan (wolumen USD pozycji na bin i sumy dźwignia × wolumen)
+        self.long_volume = np.zeros(self.n_bins)
+        self.short_volume = np.zeros(self.n_bins)
+        self._long_lev = np.zeros(self.n_bins)
+        self._short_lev = np.zeros(self.n_bins)
+        
+        # Historia (bufor pierścieniowy)
+        self.long_history = np.zeros((history_size, self.n_bins), dtype=np.float32)
+        self.short_history = np.zeros((history_size, self.n_bins), dtype=np.float32)
+        self.times = np.zeros(history_size, dtype='datetime64[ns]')
+        self.closes = np.zeros(history_size)
+        self.liquidated_long = np.zeros(history_size)
+        self.liquidated_short = np.zeros(history_size)
+        self._head = 0
+        self.count = 0
+        
+        self.current_price = 0.0
+        self._last_oi: Optional[float] = None
+    
+    # ------------------------------------------------------------------
+    # Siatka cenowa
+    # ------------------------------------------------------------------
+    
+    @property
+    def price_edges(self) -> np.ndarray:
+        if self.origin is None:
+            return np.empty(0)
+        return self.origin + np.arange(self.n_bins + 1) * self.step
+    
+    @property
+    def centers(self) -> np.ndarray:
+        if self.origin is None:
+            return np.empty(0)
+        return self.origin + (np.arange(self.n_bins) + 0.5) * self.step
+    
+    def _init_grid(self, price: float):
+        self.step = price * self.bin_width_pct
+        self.origin = price - self.n_bins / 2 * self.step
+    
+    @staticmethod
+    def _shift(array: np.ndarray, shift: int):
+        """Przesuń wzdłuż osi cen o shift binów (w miejscu, wypełnienie zerami)"""
+        if shift > 0:
+            array[..., :-shift] = array[..., shift:]
+            array[..., -shift:] = 0
+        elif shift < 0:
+            array[..., -shift:] = array[..., :shift]
+            array[..., :-shift] = 0
+    
+    def _recenter(self, price: float):
+        """Przesuń siatkę, gdy cena wyjdzie poza środkową połowę zakresu"""
+        width = self.n_bins * self.step
+        if self.origin + width * 0.25 <= price <= self.origin + width * 0.75:
+            return
+        shift = int(round((price - (self.origin + width / 2)) / self.step))
+        if abs(shift) >= self.n_bins:
+            for array in (self.long_volume, self.short_volume, self._long_lev, self._short_lev,
+                          self.long_history, self.short_history):
+                array[...] = 0
+        else:
+            for array in (self.long_volume, self.short_volume, self._long_lev, self._short_lev,
+                          self.long_history, self.short_history):
+                self._shift(array, shift)
+        self.origin += shift * self.step
+    
+    def _bin_index(self, prices: np.ndarray) -> np.ndarray:
+        return np.floor((prices - self.origin) / self.step).astype(np.int64)
+    
+    # ------------------------------------------------------------------
+    # Aktualizacja
+    # ------------------------------------------------------------------
+    
+    def _open_positions(self, value_usd: float, low: float, high: float, close: float, long_share: float):
+        """Rozłóż nowe pozycje po siatce (dźwignia × cena wejścia) i dodaj poziomy likwidacji"""
+        entries = np.linspace(low, high, self.entry_points)
+        inv_lev = 1 / self.leverages[:, None]
+        long_liq = entries[None, :] * (1 - inv_lev + self.maintenance_margin)
+        short_liq = entries[None, :] * (1 + inv_lev - self.maintenance_margin)
+        
+        weight = np.broadcast_to(
+            self.leverage_weights[:, None] * value_usd / self.entry_points, long_liq.shape
+        )
+        lev = np.broadcast_to(self.leverages[:, None], long_liq.shape)
+        
+        for liq, share, volume, lev_volume, alive in (
+            (long_liq, long_share, self.long_volume, self._long_lev, long_liq < close),
+            (short_liq, 1 - long_share, self.short_volume, self._short_lev, short_liq > close)
+        ):
+            idx = self._bin_index(liq)
+            mask = alive & (idx >= 0) & (idx < self.n_bins)
+            w = weight[mask] * share
+            volume += np.bincount(idx[mask], weights=w, minlength=self.n_bins)
+            lev_volume += np.bincount(idx[mask], weights=w * lev[mask], minlength=self.n_bins)
+    
+    def update(self,
+               timestamp,
+               open_: float,
+               high: float,
+               low: float,
+               close: float,
+               open_interest: float = None,
+               volume: float = None,
+               long_share: float = None) -> Dict:
+        """
+        Dodaj świecę.
+        
+        Args:
+            open_interest: OI w USD (delta względem poprzedniej świecy)
+            volume: wolumen świecy (w jednostkach bazowych) - proxy gdy brak OI
+            long_share: udział longów w nowych pozycjach; None = z korpusu świecy
+        
+        Returns:
+            Dict z wolumenem zlikwidowanym w tej świecy
+        """
+        if self.origin is None:
+            self._init_grid(close)
+        self._recenter(close)
+        self.current_price = close
+        
+        # 1. Likwidacje: longi poniżej ceny trafione przez low, shorty przez high
+        centers = self.centers
+        long_hit = centers >= low
+        short_hit = centers <= high
+        liq_long = self.long_volume[long_hit].sum() * (1 - self.cross_decay)
+        liq_short = self.short_volume[short_hit].sum() * (1 - self.cross_decay)
+        self.long_volume[long_hit] *= self.cross_decay
+        self._long_lev[long_hit] *= self.cross_decay
+        self.short_volume[short_hit] *= self.cross_decay
+        self._short_lev[short_hit] *= self.cross_decay
+        
+        # 2. Zanik czasowy
+        if self.decay < 1:
+            for array in (self.long_volume, self.short_volume, self._long_lev, self._short_lev):
+                array *= self.decay
+        
+        # 3. Zmiana OI → nowe / zamknięte pozycje
+        if open_interest is not None and not np.isnan(open_interest):
+            delta = open_interest - self._last_oi if self._last_oi is not None else 0.0
+            self._last_oi = open_interest
+        elif volume:
+            delta = volume * close * self.volume_oi_ratio
+        else:
+            delta = self.default_open_usd or 0.0
+        
+        if long_share is None:
+            candle_range = high - low
+            body = (close - open_) / candle_range if candle_range > 0 else 0.0
+            long_share = 0.5 + 0.25 * body
+        
+        if delta > 0:
+            self._open_positions(delta, low, high, close, long_share)
+        elif delta < 0:
+            total = self.long_volume.sum() + self.short_volume.sum()
+            if total > 0:
+                scale = max(0.0, 1 + delta / total)
+                for array in (self.long_volume, self.short_volume, self._long_lev, self._short_lev):
+                    array *= scale
+        
+        # 4. Zapis wiersza historii
+        row = self._head
+        self.long_history[row] = self.long_volume
+        self.short_history[row] = self.short_volume
+        ts = pd.Timestamp(timestamp)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert('UTC').tz_localize(None)
+        self.times[row] = ts.as_unit('ns').to_datetime64()
+        self.closes[row] = close
+        self.liquidated_long[row] = liq_long
+        self.liquidated_short[row] = liq_short
+        self._head = (row + 1) % self.history_size
+        self.count = min(self.count + 1, self.history_size)
+        
+        return {'liquidated_long': liq_long, 'liquidated_short': liq_short}
+    
+    def update_frame(self,
+                     df: pd.DataFrame,
+                     oi_column: str = 'open_interest',
+                     volume_column: str = 'volume'):
+        """Dodaj wszystkie świece z DataFrame (indeks = czas albo kolumna timestamp/datetime)"""
+        if isinstance(df.index, pd.DatetimeIndex):
+            times = df.index
+        else:
+            time_column = next(c for c in ('timestamp', 'datetime', 'date', 'time') if c in df.columns)
+            times = pd.DatetimeIndex(pd.to_datetime(df[time_column]))
+        
+        opens = df['open'].to_numpy(dtype=np.float64)
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        ois = df[oi_column].to_numpy(dtype=np.float64) if oi_column in df.columns else None
+        volumes = df[volume_column].to_numpy(dtype=np.float64) if volume_column in df.columns else None
+        
+        for i in range(len(df)):
+            self.update(
+                times[i], opens[i], highs[i], lows[i], closes[i],
+                open_interest=ois[i] if ois is not None else None,
+                volume=volumes[i] if volumes is not None else None
+            )
+    
+    @classmethod
+    def from_csv(cls, path: str, last_n: int = None, **kwargs) -> 'RollingLiquidationHeatmap':
+        """
+        Zbuduj heatmapę z lokalnego pliku świec (+ opcjonalnie open_interest)
+        - do testów offline.
+        """
+        df = pd.read_csv(path)
+        if last_n:
+            df = df.tail(last_n)
+        oi_column = kwargs.pop('oi_column', 'open_interest')
+        heatmap = cls(**kwargs)
+        heatmap.update_frame(df, oi_column=oi_column)
+        return heatmap
+    
+    # ------------------------------------------------------------------
+    # Zapytania
+    # ------------------------------------------------------------------
+    
+    def _order(self, last: int = None) -> np.ndarray:
+        """Indeksy wierszy historii w kolejności chronologicznej"""
+        n = self.count if last is None else min(last, self.count)
+        return (self._head - n + np.arange(n)) % self.history_size
+    
+    def history(self, last: int = None, side: str = 'total') -> pd.DataFrame:
+        """Macierz czas × cena (wiersze chronologicznie, kolumny = środki binów)"""
+        order = self._order(last)
+        if side == 'long':
+            values = self.long_history[order]
+        elif side == 'short':
+            values = self.short_history[order]
+        else:
+            values = self.long_history[order] + self.short_history[order]
+        return pd.DataFrame(values, index=pd.DatetimeIndex(self.times[order]), columns=self.centers)
+    
+    def liquidation_series(self, last: int = None) -> pd.DataFrame:
+        """Wolumen zlikwidowany per świeca"""
+        order = self._order(last)
+        return pd.DataFrame({
+            'close': self.closes[order],
+            'liquidated_long': self.liquidated_long[order],
+            'liquidated_short': self.liquidated_short[order]
+        }, index=pd.DatetimeIndex(self.times[order]))
+    
+    def current_density(self) -> LiquidationDensity:
+        return LiquidationDensity(
+            bin_edges=self.price_edges,
+            long_volume=self.long_volume.copy(),
+            short_volume=self.short_volume.copy(),
+            leverage_volume=self._long_lev + self._short_lev,
+            counts=((self.long_volume + self.short_volume) > 0).astype(np.int64)  # aktywne biny
+        )
+    
+    def to_heatmap(self, ohlcv_data: pd.DataFrame = None) -> Optional[LiquidationHeatmap]:
+        """Snapshot bieżącego stanu jako LiquidationHeatmap"""
+        if self.count == 0:
+            return None
+        
+        price = self.current_price
+        density = self.current_density()
+        clusters = ClusterDetector.detect_density_clusters(density, price)
+        magnet_zones = MagnetZoneAnalyzer().analyze(price, clusters, ohlcv_data)
+        
+        return LiquidationHeatmap(
+            current_price=price,
+            timestamp=pd.Timestamp(self.times[(self._head - 1) % self.history_size]).to_pydatetime(),
+            levels=density.to_levels(price),
+            clusters=clusters,
+            magnet_zones=magnet_zones,
+            overall_sentiment=LiquidationHeatmapAnalyzer._overall_sentiment(
+                self.long_volume.sum(), self.short_volume.sum()
+            ),
+            risk_level=LiquidationHeatmapAnalyzer._risk_level(clusters, price),
+            density=density
+        )
+    
+    def get_trading_signal(self, ohlcv_data: pd.DataFrame = None) -> Dict:
+        heatmap = self.to_heatmap(ohlcv_data)
+        signal = LiquidationHeatmapAnalyzer().get_trading_signal(heatmap)
+        if heatmap is not None:
+            recent = self.liquidation_series(last=24)
+            signal['recent_liquidations'] = {
+                'long': float(recent['liquidated_long'].sum()),
+                'short': float(recent['liquidated_short'].sum())
+            }
+        return signal
+
+
+# Heatmapy utrzymywane z feedu świec/OI, dostępne dla Genius Brain
+_ROLLING_HEATMAPS: Dict[str, RollingLiquidationHeatmap] = {}
+
+
+def register_rolling_heatmap(heatmap: RollingLiquidationHeatmap):
+    """Udostępnij rolling heatmapę pod jej symbolem"""
+    _ROLLING_HEATMAPS[heatmap.symbol] = heatmap
+
+
+def get_rolling_heatmap(symbol: str) -> Optional[RollingLiquidationHeatmap]:
+    return _ROLLING_HEATMAPS.get(symbol.upper())
+
+
 # ═══════════════════════════════════════════════════════════════
 # INTEGRATION WITH GENIUS BRAIN
 # ═══════════════════════════════════════════════════════════════
 
 def get_liquidation_heatmap_signal(current_price: float,
-                                    ohlcv_data: pd.DataFrame = None) -> Dict:
+                                    ohlcv_data: pd.DataFrame = None,
+                                    symbol: str = 'BTCUSDT') -> Dict:
     """
     Get liquidation heatmap signal for Genius Brain.
     
     Args:
         current_price: Current BTC price
         ohlcv_data: Optional OHLCV DataFrame
+        symbol: Symbol of a registered rolling heatmap (used when available)
     
     Returns:
         Dict with signal for brain aggregation
     """
     try:
+        rolling = get_rolling_heatmap(symbol)
+        if rolling is not None and rolling.count > 0:
+            return rolling.get_trading_signal(ohlcv_data)
+        
         analyzer = LiquidationHeatmapAnalyzer()
         heatmap = analyzer.generate_heatmap(current_price, ohlcv_data)
         signal = analyzer.get_trading_signal(heatmap)
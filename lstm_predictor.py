@@ -22,6 +22,8 @@ try:
 except ImportError:
     TF_AVAILABLE = False
 
+from genius_sequence_dataset import SequenceDataset, shift_targets
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,20 +51,20 @@ class LSTMPredictor:
         if not TF_AVAILABLE:
             self.logger.warning("⚠️ TensorFlow not available - LSTM disabled")
     
-    def prepare_data(self, prices: np.ndarray, 
-                    features: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    def build_dataset(self, prices: np.ndarray,
+                      features: Optional[np.ndarray] = None) -> Optional[SequenceDataset]:
         """
-        Prepare data for LSTM training
+        Scale the data and window it without copying
         
         Args:
             prices: Price array
             features: Additional features (RSI, MACD, volume, etc.)
             
         Returns:
-            (X, y) arrays ready for training
+            SequenceDataset over the scaled array (None if TF not available)
         """
         if not TF_AVAILABLE:
-            return np.array([]), np.array([])
+            return None
         
         # Combine price with features
         if features is not None:
@@ -73,13 +75,30 @@ class LSTMPredictor:
         # Normalize
         scaled_data = self.scaler.fit_transform(data)
         
-        # Create sequences
-        X, y = [], []
-        for i in range(self.lookback, len(scaled_data) - self.prediction_horizon):
-            X.append(scaled_data[i - self.lookback:i])
-            y.append(scaled_data[i + self.prediction_horizon - 1, 0])  # Predict price
+        # Window ending at i predicts the price at i + prediction_horizon - 1
+        return SequenceDataset(
+            scaled_data, self.lookback,
+            targets=shift_targets(scaled_data[:, 0], self.prediction_horizon - 1),
+            stop=len(scaled_data) - self.prediction_horizon
+        )
+    
+    def prepare_data(self, prices: np.ndarray, 
+                    features: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prepare data for LSTM training
+        
+        Args:
+            prices: Price array
+            features: Additional features (RSI, MACD, volume, etc.)
+            
+        Returns:
+            (X, y) arrays ready for training - X is a read-only window view
+        """
+        dataset = self.build_dataset(prices, features)
+        if dataset is None:
+            return np.array([]), np.array([])
         
-        return np.array(X), np.array(y)
+        return dataset.X, dataset.y
     
     def build_model(self, input_shape: Tuple[int, int]):
         """
@@ -145,7 +164,8 @@ class LSTMPredictor:
         
         try:
             # Prepare data
-            X, y = self.prepare_data(prices, features)
+            dataset = self.build_dataset(prices, features)
+            X = dataset.X
             
             if len(X) < 100:
                 self.logger.warning("⚠️ Not enough data for training (need 100+)")
@@ -161,11 +181,11 @@ class LSTMPredictor:
             
             # Train
             self.logger.info(f"🎓 Training LSTM on {len(X)} samples...")
+            train_set, val_set = dataset.split(validation_split)
             history = self.model.fit(
-                X, y,
+                train_set.to_tf_dataset(batch_size, shuffle=True),
+                validation_data=val_set.to_tf_dataset(batch_size),
                 epochs=epochs,
-                batch_size=batch_size,
-                validation_split=validation_split,
                 callbacks=[early_stop, reduce_lr],
                 verbose=0
             )
@@ -17,6 +17,7 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Konfiguracja
 MODEL_DIR = 'ml_models'
@@ -58,11 +59,53 @@ class FeatureEngineer:
     Tworzy features z surowych danych OHLCV i wskaźników technicznych.
     """
     
+    @staticmethod
+    def _windows(values: np.ndarray, size: int, start: int, stop: int) -> np.ndarray:
+        """Widok okien [i-size+1, i] dla i w [start, stop) - bez kopiowania"""
+        return sliding_window_view(values, size)[start - size + 1:stop - size + 1]
+    
+    @staticmethod
+    def _pct(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """(a - b) / b * 100, 0 gdy b <= 0"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(b > 0, (a - b) / np.where(b > 0, b, 1) * 100, 0.0)
+    
+    @staticmethod
+    def _rsi(gains: np.ndarray, losses: np.ndarray, end: int, count: int, period: int = 14) -> np.ndarray:
+        """RSI z prostych średnich ostatnich `period` zmian, okna kończące się na świecach end..end+count-1"""
+        avg_gain = FeatureEngineer._windows(gains, period, end - 1, end - 1 + count).sum(axis=1) / period
+        avg_loss = FeatureEngineer._windows(losses, period, end - 1, end - 1 + count).sum(axis=1) / period
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+    
+    @staticmethod
+    def _window_ema(closes: np.ndarray, window: int, period: int, start: int, stop: int) -> np.ndarray:
+        """
+        EMA liczona od nowa w każdym oknie `window` świec (start = SMA pierwszych `period`)
+        
+        Rekurencja idzie po kolumnach okna (max `window` kroków), wektorowo dla
+        wszystkich świec naraz - ta sama kolejność działań co świeca po świecy.
+        """
+        if window < period:
+            return closes[start:stop]
+        windows = FeatureEngineer._windows(closes, window, start, stop)
+        multiplier = 2 / (period + 1)
+        ema = windows[:, 0].copy()
+        for k in range(1, period):
+            ema += windows[:, k]
+        ema /= period
+        for k in range(period, window):
+            ema = (windows[:, k] - ema) * multiplier + ema
+        return ema
+    
     @staticmethod
     def create_features(data: List[Dict], lookback: int = 20) -> List[Dict]:
         """
         Utwórz features dla każdego punktu danych.
         
+        Wszystkie kolumny liczone są naraz dla całej historii na oknach
+        (sliding_window_view) - te same definicje co cechy liczone świeca po świecy.
+        
         Args:
             data: Lista świec OHLCV
             lookback: Ile świec wstecz analizować
@@ -70,148 +113,127 @@ class FeatureEngineer:
         Returns:
             Lista feature vectors
         """
-        features_list = []
+        start, stop = max(200, lookback), len(data) - 5  # -5 bo potrzebujemy label z przyszłości
+        window = lookback + 1
+        if stop <= start:
+            return []
+        if window < 6:
+            logger.error(f"Feature engineering error: lookback={lookback} too short for 5-candle changes")
+            return []
         
-        for i in range(max(200, lookback), len(data) - 5):  # -5 bo potrzebujemy label z przyszłości
-            try:
-                candle = data[i]
-                closes = [d['close'] for d in data[i-lookback:i+1]]
-                highs = [d['high'] for d in data[i-lookback:i+1]]
-                lows = [d['low'] for d in data[i-lookback:i+1]]
-                volumes = [d.get('volume', 0) for d in data[i-lookback:i+1]]
-                
-                # Podstawowe cechy cenowe
-                price = candle['close']
-                price_change = (price - closes[-2]) / closes[-2] * 100 if closes[-2] > 0 else 0
-                price_change_5 = (price - closes[-6]) / closes[-6] * 100 if closes[-6] > 0 else 0
-                price_change_10 = (price - closes[-11]) / closes[-11] * 100 if len(closes) > 10 and closes[-11] > 0 else 0
-                
-                # Volatility
-                returns = [(closes[i] - closes[i-1]) / closes[i-1] for i in range(1, len(closes))]
-                volatility = np.std(returns) * 100 if returns else 0
-                
-                # Range features
-                range_pct = (candle['high'] - candle['low']) / price * 100 if price > 0 else 0
-                avg_range = np.mean([(h - l) / l for h, l in zip(highs, lows) if l > 0]) * 100
-                
-                # RSI
-                def calc_rsi(prices, period=14):
-                    if len(prices) < period + 1:
-                        return 50
-                    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-                    gains = [d if d > 0 else 0 for d in deltas[-period:]]
-                    losses = [-d if d < 0 else 0 for d in deltas[-period:]]
-                    avg_gain = sum(gains) / period
-                    avg_loss = sum(losses) / period
-                    if avg_loss == 0:
-                        return 100
-                    rs = avg_gain / avg_loss
-                    return 100 - (100 / (1 + rs))
-                
-                rsi = calc_rsi(closes)
-                rsi_prev = calc_rsi(closes[:-1])
-                rsi_change = rsi - rsi_prev
-                
-                # MACD
-                def calc_ema(prices, period):
-                    if len(prices) < period:
-                        return prices[-1]
-                    multiplier = 2 / (period + 1)
-                    ema = sum(prices[:period]) / period
-                    for p in prices[period:]:
-                        ema = (p - ema) * multiplier + ema
-                    return ema
-                
-                ema_12 = calc_ema(closes, 12)
-                ema_26 = calc_ema(closes, 26)
-                macd = ema_12 - ema_26
-                macd_normalized = macd / price * 100 if price > 0 else 0
-                
-                # Bollinger Bands
-                sma_20 = np.mean(closes[-20:])
-                std_20 = np.std(closes[-20:])
-                bb_upper = sma_20 + 2 * std_20
-                bb_lower = sma_20 - 2 * std_20
-                bb_position = (price - bb_lower) / (bb_upper - bb_lower) if bb_upper != bb_lower else 0.5
-                bb_width = (bb_upper - bb_lower) / sma_20 * 100 if sma_20 > 0 else 0
-                
-                # SMAs
-                sma_5 = np.mean(closes[-5:])
-                sma_10 = np.mean(closes[-10:])
-                sma_50 = np.mean(closes[-50:]) if len(closes) >= 50 else sma_20
-                sma_200_data = [d['close'] for d in data[max(0, i-199):i+1]]
-                sma_200 = np.mean(sma_200_data) if len(sma_200_data) >= 200 else sma_50
-                
-                price_to_sma_5 = (price - sma_5) / sma_5 * 100 if sma_5 > 0 else 0
-                price_to_sma_20 = (price - sma_20) / sma_20 * 100 if sma_20 > 0 else 0
-                price_to_sma_50 = (price - sma_50) / sma_50 * 100 if sma_50 > 0 else 0
-                sma_5_to_sma_20 = (sma_5 - sma_20) / sma_20 * 100 if sma_20 > 0 else 0
-                
-                # Volume
-                avg_volume = np.mean(volumes) if volumes else 0
-                volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 1
-                
-                # Momentum
-                momentum_5 = (closes[-1] - closes[-6]) / closes[-6] * 100 if closes[-6] > 0 else 0
-                momentum_10 = (closes[-1] - closes[-11]) / closes[-11] * 100 if len(closes) > 10 and closes[-11] > 0 else 0
-                
-                # === LABEL: Czy cena wzrośnie w następnych 5 świecach o >1%? ===
-                future_price = data[i + 5]['close']
-                future_return = (future_price - price) / price * 100
-                
-                # 3 klasy: 0 = spadek (< -1%), 1 = neutralny (-1% to 1%), 2 = wzrost (> 1%)
-                if future_return > 1.5:
-                    label = 2  # BUY
-                elif future_return < -1.5:
-                    label = 0  # SELL
-                else:
-                    label = 1  # HOLD
-                
-                features = {
-                    # Price features
-                    'price_change_1': price_change,
-                    'price_change_5': price_change_5,
-                    'price_change_10': price_change_10,
-                    'volatility': volatility,
-                    'range_pct': range_pct,
-                    'avg_range': avg_range,
-                    
-                    # Technical indicators
-                    'rsi': rsi,
-                    'rsi_change': rsi_change,
-                    'macd_normalized': macd_normalized,
-                    'bb_position': bb_position,
-                    'bb_width': bb_width,
-                    
-                    # Trend features
-                    'price_to_sma_5': price_to_sma_5,
-                    'price_to_sma_20': price_to_sma_20,
-                    'price_to_sma_50': price_to_sma_50,
-                    'sma_5_to_sma_20': sma_5_to_sma_20,
-                    'golden_cross': 1 if sma_5 > sma_20 > sma_50 else 0,
-                    'death_cross': 1 if sma_5 < sma_20 < sma_50 else 0,
-                    
-                    # Volume
-                    'volume_ratio': volume_ratio,
-                    
-                    # Momentum
-                    'momentum_5': momentum_5,
-                    'momentum_10': momentum_10,
-                    
-                    # Meta
-                    'datetime': candle['datetime'],
-                    'price': price,
-                    'label': label,
-                    'future_return': future_return
-                }
-                
-                features_list.append(features)
-                
-            except Exception as e:
-                logger.error(f"Feature engineering error at index {i}: {e}")
-                continue
+        closes = np.array([d['close'] for d in data], dtype=np.float64)
+        highs = np.array([d['high'] for d in data], dtype=np.float64)
+        lows = np.array([d['low'] for d in data], dtype=np.float64)
+        volumes = np.array([d.get('volume', 0) for d in data], dtype=np.float64)
+        windows = FeatureEngineer._windows
+        pct = FeatureEngineer._pct
+        zeros = np.zeros(stop - start)
+        
+        # Podstawowe cechy cenowe
+        price = closes[start:stop]
+        price_change = pct(price, closes[start - 1:stop - 1])
+        price_change_5 = pct(price, closes[start - 5:stop - 5])
+        price_change_10 = pct(price, closes[start - 10:stop - 10]) if window > 10 else zeros
+        
+        # Volatility (zwroty w oknie; zerowa cena w oknie -> wiersz odrzucony)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(closes) / closes[:-1]
+        volatility = windows(returns, lookback, start - 1, stop - 1).std(axis=1) * 100
+        valid = np.isfinite(volatility) & (price != 0)
+        
+        # Range features
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_pct = np.where(price > 0, (highs[start:stop] - lows[start:stop]) / price * 100, 0.0)
+            ranges = np.where(lows > 0, (highs - lows) / np.where(lows > 0, lows, 1), 0.0)
+            avg_range = (windows(ranges, window, start, stop).sum(axis=1) /
+                         windows(lows > 0, window, start, stop).sum(axis=1)) * 100
         
-        return features_list
+        # RSI (okno musi mieć period + 1 cen, inaczej 50)
+        deltas = np.diff(closes)
+        gains, losses = np.where(deltas > 0, deltas, 0.0), np.where(deltas < 0, -deltas, 0.0)
+        count = stop - start
+        rsi = FeatureEngineer._rsi(gains, losses, start, count) if window >= 15 else zeros + 50
+        rsi_prev = FeatureEngineer._rsi(gains, losses, start - 1, count) if window - 1 >= 15 else zeros + 50
+        rsi_change = rsi - rsi_prev
+        
+        # MACD
+        ema_12 = FeatureEngineer._window_ema(closes, window, 12, start, stop)
+        ema_26 = FeatureEngineer._window_ema(closes, window, 26, start, stop)
+        macd_normalized = np.where(price > 0, (ema_12 - ema_26) / np.where(price > 0, price, 1) * 100, 0.0)
+        
+        # Bollinger Bands
+        last_20 = windows(closes, min(20, window), start, stop)
+        sma_20 = last_20.mean(axis=1)
+        std_20 = last_20.std(axis=1)
+        bb_upper = sma_20 + 2 * std_20
+        bb_lower = sma_20 - 2 * std_20
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_position = np.where(bb_upper != bb_lower, (price - bb_lower) / (bb_upper - bb_lower), 0.5)
+            bb_width = np.where(sma_20 > 0, (bb_upper - bb_lower) / sma_20 * 100, 0.0)
+        
+        # SMAs
+        sma_5 = windows(closes, min(5, window), start, stop).mean(axis=1)
+        sma_10 = windows(closes, min(10, window), start, stop).mean(axis=1)
+        sma_50 = windows(closes, 50, start, stop).mean(axis=1) if window >= 50 else sma_20
+        
+        # Volume
+        avg_volume = windows(volumes, window, start, stop).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(avg_volume > 0, volumes[start:stop] / avg_volume, 1.0)
+        
+        # === LABEL: Czy cena wzrośnie w następnych 5 świecach o >1%? ===
+        with np.errstate(divide='ignore', invalid='ignore'):
+            future_return = (closes[start + 5:stop + 5] - price) / price * 100
+        
+        # 3 klasy: 0 = spadek (< -1%), 1 = neutralny (-1% to 1%), 2 = wzrost (> 1%)
+        label = np.where(future_return > 1.5, 2, np.where(future_return < -1.5, 0, 1))
+        
+        columns = {
+            # Price features
+            'price_change_1': price_change,
+            'price_change_5': price_change_5,
+            'price_change_10': price_change_10,
+            'volatility': volatility,
+            'range_pct': range_pct,
+            'avg_range': avg_range,
+            
+            # Technical indicators
+            'rsi': rsi,
+            'rsi_change': rsi_change,
+            'macd_normalized': macd_normalized,
+            'bb_position': bb_position,
+            'bb_width': bb_width,
+            
+            # Trend features
+            'price_to_sma_5': pct(price, sma_5),
+            'price_to_sma_20': pct(price, sma_20),
+            'price_to_sma_50': pct(price, sma_50),
+            'sma_5_to_sma_20': pct(sma_5, sma_20),
+            'golden_cross': ((sma_5 > sma_20) & (sma_20 > sma_50)).astype(int),
+            'death_cross': ((sma_5 < sma_20) & (sma_20 < sma_50)).astype(int),
+            
+            # Volume
+            'volume_ratio': volume_ratio,
+            
+            # Momentum (closes[-1] == price)
+            'momentum_5': price_change_5,
+            'momentum_10': price_change_10,
+            
+            # Meta
+            'datetime': [d['datetime'] for d in data[start:stop]],
+            'price': price,
+            'label': label,
+            'future_return': future_return
+        }
+        
+        if not valid.all():
+            logger.error(f"Feature engineering error: skipped {int((~valid).sum())} candles with zero prices in window")
+        
+        rows = np.flatnonzero(valid)
+        names = list(columns)
+        values = [np.asarray(columns[name], dtype=object if name == 'datetime' else None)[rows].tolist()
+                  for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
 
 
 class MLSignalPredictor:
@@ -271,8 +293,8 @@ class MLSignalPredictor:
             logger.warning(f"Model {self.model_type} not available, using RandomForest")
             return RandomForestClassifier(n_estimators=100, random_state=42)
     
-    def prepare_data(self, features_list: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
-        """Przygotuj dane do treningu"""
+    def prepare_data(self, features_list) -> Tuple[np.ndarray, np.ndarray]:
+        """Przygotuj dane do treningu (lista features lub DataFrame z FeatureStore)"""
         # Kolumny do użycia jako features
         self.feature_columns = [
             'price_change_1', 'price_change_5', 'price_change_10',
@@ -284,6 +306,14 @@ class MLSignalPredictor:
             'volume_ratio', 'momentum_5', 'momentum_10'
         ]
         
+        if hasattr(features_list, 'columns'):
+            missing = [col for col in self.feature_columns + ['label'] if col not in features_list.columns]
+            if missing:
+                logger.warning(f"Missing features: {missing}")
+                return np.empty((0, len(self.feature_columns))), np.empty(0)
+            return (features_list[self.feature_columns].to_numpy(dtype=np.float64),
+                    features_list['label'].to_numpy())
+        
         X = []
         y = []
         
@@ -298,12 +328,12 @@ class MLSignalPredictor:
         
         return np.array(X), np.array(y)
     
-    def train(self, features_list: List[Dict], test_size: float = 0.2) -> Dict:
+    def train(self, features_list, test_size: float = 0.2) -> Dict:
         """
         Trenuj model na danych.
         
         Args:
-            features_list: Lista features z FeatureEngineer
+            features_list: Lista features z FeatureEngineer (lub DataFrame z FeatureStore)
             test_size: Część danych na test
         
         Returns:
@@ -532,13 +562,15 @@ Class Distribution:
 # INTEGRATION WITH BACKTESTING
 # ═══════════════════════════════════════════════════════════════
 
-def train_from_backtest_data(symbol: str, interval: str = '1h') -> MLSignalPredictor:
+def train_from_backtest_data(symbol: str, interval: str = '1h', feature_store=None) -> MLSignalPredictor:
     """
     Trenuj model ML na danych z backtestingu.
     
     Args:
         symbol: Symbol (np. 'BTC/USD')
         interval: Interwał czasowy
+        feature_store: Opcjonalny genius_feature_store.FeatureStore - features
+            liczone tylko dla nowych (zamkniętych) świec, historia rośnie ponad limit 5000
     
     Returns:
         Wytrenowany MLSignalPredictor
@@ -556,7 +588,11 @@ def train_from_backtest_data(symbol: str, interval: str = '1h') -> MLSignalPredi
     
     # Feature engineering
     logger.info(f"🔧 Engineering features from {len(data)} candles...")
-    features = FeatureEngineer.create_features(data)
+    if feature_store is not None:
+        # Ostatnia świeca jeszcze się tworzy - zmiana jej close = "history revised" w store
+        features = feature_store.materialize(symbol, interval, data[:-1], 'ml_signal')
+    else:
+        features = FeatureEngineer.create_features(data)
     
     if len(features) < 200:
         logger.error(f"❌ Insufficient features: {len(features)}")
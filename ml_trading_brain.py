@@ -5,13 +5,80 @@ Bot uczy się z każdej transakcji i poprawia swoje decyzje
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import pickle
 import os
+import zipfile
 from datetime import datetime, timedelta
 from funding_rate_calculator import FundingRateCalculator
 
 
+# Dyskretny stan rynku: (cecha, poziomy) - indeks stanu to liczba w systemie
+# mieszanym o podstawach = liczby poziomów (rsi najbardziej znaczące)
+STATE_LEVELS = (
+    ('rsi', ('oversold', 'neutral', 'overbought')),
+    ('macd', ('bearish', 'bullish')),
+    ('momentum', ('negative', 'positive')),
+    ('volume', ('normal', 'high')),
+    ('trend', ('downtrend', 'uptrend')),
+)
+STATE_RADIX = tuple(len(levels) for _, levels in STATE_LEVELS)
+N_STATES = int(np.prod(STATE_RADIX))
+UNKNOWN_STATE = N_STATES  # ostatni wiersz Q-array: stany spoza siatki ('unknown')
+
+ACTIONS = ('BUY', 'SELL', 'HOLD')
+ACTION_INDEX = {'BUY': 0, 'SELL': 1, 'HOLD': 2, 'LONG': 0, 'SHORT': 1}
+
+
+def encode_states(rsi, macd, macd_signal, momentum, volume, volume_ma, price, sma_20) -> np.ndarray:
+    """
+    Zakoduj wskaźniki (skalary lub tablice) jako indeksy stanów 0..N_STATES-1
+    Progi jak w TradingBrain.get_state (NaN -> neutral / bearish / negative / normal / downtrend)
+    """
+    rsi = np.asarray(rsi, dtype=np.float64)
+    digits = (
+        np.where(rsi < 30, 0, np.where(rsi > 70, 2, 1)),
+        np.asarray(macd) > np.asarray(macd_signal),
+        np.asarray(momentum) > 0,
+        np.asarray(volume) > np.asarray(volume_ma) * 1.5,
+        np.asarray(price) > np.asarray(sma_20),
+    )
+    digits = np.broadcast_arrays(*[np.asarray(d, dtype=np.int64) for d in digits])
+    return np.ravel_multi_index(digits, STATE_RADIX)
+
+
+def state_name(state: int) -> str:
+    """Indeks stanu -> czytelna nazwa, np. 'oversold_bullish_positive_high_uptrend'"""
+    state = int(state)
+    if not 0 <= state < N_STATES:
+        return 'unknown'
+    digits = np.unravel_index(state, STATE_RADIX)
+    return '_'.join(levels[d] for (_, levels), d in zip(STATE_LEVELS, digits))
+
+
+STATE_INDEX = {state_name(i): i for i in range(N_STATES)}
+
+
+def _clipped_product(value: float, factors: np.ndarray, low: float, high: float) -> float:
+    """
+    value -> clip(value * f, low, high) for each factor in turn, without a Python loop
+    
+    Each step is x -> clip(x * m, lo, hi) and two such steps compose into one:
+    clip(clip(x*m1, lo1, hi1) * m2, lo2, hi2) = clip(x*m1*m2, clip(lo1*m2, lo2, hi2), clip(hi1*m2, lo2, hi2)),
+    so the whole sequence folds pairwise in log2(n) vectorized rounds.
+    """
+    m = np.asarray(factors, dtype=np.float64)
+    lo = np.full(len(m), low)
+    hi = np.full(len(m), high)
+    while len(m) > 1:
+        if len(m) % 2:
+            m, lo, hi = np.append(m, 1.0), np.append(lo, low), np.append(hi, high)
+        m1, lo1, hi1 = m[0::2], lo[0::2], hi[0::2]
+        m2, lo2, hi2 = m[1::2], lo[1::2], hi[1::2]
+        m, lo, hi = m1 * m2, np.clip(lo1 * m2, lo2, hi2), np.clip(hi1 * m2, lo2, hi2)
+    return float(np.clip(value * m[0], lo[0], hi[0]))
+
+
 class TradingBrain:
     """
     AI Brain for trading bot - learns from experience
@@ -31,8 +98,9 @@ class TradingBrain:
         self.discount_factor = discount_factor
         self.epsilon = epsilon
         
-        # Q-Table: stores learned values for state-action pairs
-        self.q_table = {}
+        # Q-Table: dense array [state, action] (+1 row for unknown states)
+        self.q_values = np.zeros((N_STATES + 1, len(ACTIONS)))
+        self.visited = np.zeros(N_STATES + 1, dtype=bool)
         
         # Experience memory
         self.memory = []
@@ -58,44 +126,73 @@ class TradingBrain:
         # Funding Rate Calculator
         self.funding_calculator = FundingRateCalculator()
         
-    def get_state(self, indicators: Dict, market_data: Dict) -> str:
+    def get_state(self, indicators: Dict, market_data: Dict) -> int:
         """
-        Convert market data to discrete state
+        Convert market data to discrete state (mixed-radix index, see state_name)
         """
-        # RSI state
-        rsi = indicators.get('rsi', pd.Series([50])).iloc[-1]
-        if rsi < 30:
-            rsi_state = "oversold"
-        elif rsi > 70:
-            rsi_state = "overbought"
-        else:
-            rsi_state = "neutral"
-        
-        # MACD state
-        macd = indicators.get('macd', pd.Series([0])).iloc[-1]
-        macd_signal = indicators.get('macd_signal', pd.Series([0])).iloc[-1]
-        macd_state = "bullish" if macd > macd_signal else "bearish"
-        
-        # Momentum state
-        momentum = indicators.get('momentum', pd.Series([0])).iloc[-1]
-        momentum_state = "positive" if momentum > 0 else "negative"
-        
-        # Volume state
-        volume_ma = market_data.get('volume_ma', 1)
-        current_volume = market_data.get('volume', 1)
-        volume_state = "high" if current_volume > volume_ma * 1.5 else "normal"
-        
-        # Trend state
         price = market_data.get('price', 0)
-        sma_20 = market_data.get('sma_20', price)
-        trend_state = "uptrend" if price > sma_20 else "downtrend"
-        
-        # Combine into state string
-        state = f"{rsi_state}_{macd_state}_{momentum_state}_{volume_state}_{trend_state}"
+        return int(encode_states(
+            rsi=indicators.get('rsi', pd.Series([50])).iloc[-1],
+            macd=indicators.get('macd', pd.Series([0])).iloc[-1],
+            macd_signal=indicators.get('macd_signal', pd.Series([0])).iloc[-1],
+            momentum=indicators.get('momentum', pd.Series([0])).iloc[-1],
+            volume=market_data.get('volume', 1),
+            volume_ma=market_data.get('volume_ma', 1),
+            price=price,
+            sma_20=market_data.get('sma_20', price)
+        ))
+    
+    def get_states(self, indicators: Dict, market_data: Dict) -> np.ndarray:
+        """
+        Discrete states for whole series at once (e.g. years of candles)
         
-        return state
+        Same keys and defaults as get_state, but every value may be a
+        Series/array aligned on the same candles.
+        """
+        price = market_data.get('price', 0)
+        return encode_states(
+            rsi=indicators.get('rsi', 50),
+            macd=indicators.get('macd', 0),
+            macd_signal=indicators.get('macd_signal', 0),
+            momentum=indicators.get('momentum', 0),
+            volume=market_data.get('volume', 1),
+            volume_ma=market_data.get('volume_ma', 1),
+            price=price,
+            sma_20=market_data.get('sma_20', price)
+        )
+    
+    def _state_indices(self, states) -> np.ndarray:
+        """States as Q-array rows: ints pass through, names (legacy strings) are looked up"""
+        states = np.atleast_1d(np.asarray(states, dtype=object if isinstance(states, str) else None))
+        if states.dtype.kind in 'iu':
+            return np.where((states >= 0) & (states < N_STATES), states, UNKNOWN_STATE).astype(np.int64)
+        
+        # Nazwy stanów: słownik tylko dla unikalnych wartości
+        codes, uniques = pd.factorize(states, use_na_sentinel=False)
+        lookup = np.array([
+            int(s) if isinstance(s, (int, np.integer)) and 0 <= s < N_STATES
+            else STATE_INDEX.get(s, UNKNOWN_STATE)
+            for s in uniques
+        ], dtype=np.int64)
+        return lookup[codes]
+    
+    @staticmethod
+    def _action_indices(actions) -> np.ndarray:
+        actions = np.atleast_1d(np.asarray(actions, dtype=object))
+        try:
+            return np.array([ACTION_INDEX[a] for a in actions], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Unknown action {e.args[0]!r}, expected one of {list(ACTION_INDEX)}")
+    
+    @property
+    def q_table(self) -> Dict[str, Dict[str, float]]:
+        """Dict view of visited states (read-only, for reports)"""
+        return {
+            state_name(s): dict(zip(ACTIONS, self.q_values[s].tolist()))
+            for s in np.flatnonzero(self.visited)
+        }
     
-    def get_action(self, state: str, valid_actions: List[str] = None) -> str:
+    def get_action(self, state: Union[int, str], valid_actions: List[str] = None) -> str:
         """
         Choose action based on Q-table (with epsilon-greedy exploration)
         
@@ -113,40 +210,53 @@ class TradingBrain:
         if np.random.random() < self.epsilon:
             return np.random.choice(valid_actions)
         
-        # Otherwise, choose best action from Q-table
-        if state not in self.q_table:
-            self.q_table[state] = {action: 0.0 for action in valid_actions}
+        # Otherwise, choose best action from Q-table (first best on ties)
+        state = self._state_indices(state)[0]
+        self.visited[state] = True
         
-        state_values = self.q_table[state]
-        best_action = max(state_values, key=state_values.get)
+        state_values = [
+            self.q_values[state, ACTION_INDEX[action]] if action in ACTION_INDEX else 0.0
+            for action in valid_actions
+        ]
+        best_action = valid_actions[int(np.argmax(state_values))]
         
         return best_action
     
-    def update_q_value(self, state: str, action: str, reward: float, next_state: str):
+    def update_q_value(self, state: Union[int, str], action: str, reward: float,
+                       next_state: Union[int, str]):
         """
         Update Q-value based on received reward (Q-Learning algorithm)
         
         Q(s,a) = Q(s,a) + α * [R + γ * max(Q(s',a')) - Q(s,a)]
         """
-        # Initialize if needed
-        if state not in self.q_table:
-            self.q_table[state] = {'BUY': 0.0, 'SELL': 0.0, 'HOLD': 0.0}
+        self._update_q_values(self._state_indices(state), self._action_indices(action),
+                              np.atleast_1d(float(reward)), self._state_indices(next_state))
+    
+    def _update_q_values(self, states: np.ndarray, actions: np.ndarray,
+                         rewards: np.ndarray, next_states: np.ndarray):
+        """
+        Batched Q-Learning update with bootstrap targets from the current Q-array
         
-        if next_state not in self.q_table:
-            self.q_table[next_state] = {'BUY': 0.0, 'SELL': 0.0, 'HOLD': 0.0}
+        k updates of the same (s, a) with targets t_1..t_k compose exactly:
+        Q <- (1-α)^k Q + Σ_j α (1-α)^(k-j) t_j, so one pass handles duplicates.
+        """
+        alpha = self.learning_rate
+        targets = rewards + self.discount_factor * self.q_values[next_states].max(axis=1)
         
-        # Current Q-value
-        current_q = self.q_table[state][action]
+        keys = states * len(ACTIONS) + actions
+        order = np.argsort(keys, kind='stable')
+        keys, targets = keys[order], targets[order]
         
-        # Max Q-value for next state
-        max_next_q = max(self.q_table[next_state].values())
+        unique, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        group = np.repeat(np.arange(len(unique)), counts)
+        remaining = counts[group] - 1 - (np.arange(len(keys)) - first[group])
+        contribution = np.bincount(group, weights=alpha * (1 - alpha) ** remaining * targets)
         
-        # Q-Learning update
-        new_q = current_q + self.learning_rate * (
-            reward + self.discount_factor * max_next_q - current_q
-        )
+        q = self.q_values.reshape(-1)
+        q[unique] = (1 - alpha) ** counts * q[unique] + contribution
         
-        self.q_table[state][action] = new_q
+        self.visited[states] = True
+        self.visited[next_states] = True
     
     def learn_from_trade(self, trade_result: Dict):
         """
@@ -155,69 +265,126 @@ class TradingBrain:
         Args:
             trade_result: {
                 'state': state when entered,
-                'action': 'BUY' or 'SELL',
+                'action': 'BUY' or 'SELL' (or 'LONG' / 'SHORT'),
                 'next_state': state when exited,
                 'pnl': profit/loss in $,
                 'pnl_pct': profit/loss in %
             }
         """
-        # Calculate reward
-        reward = self._calculate_reward(trade_result)
+        self.learn_from_trades([trade_result], batch_size=1)
+    
+    @staticmethod
+    def _exact_chunks(states: np.ndarray, next_states: np.ndarray) -> np.ndarray:
+        """
+        Chunk starts such that no trade bootstraps from a state updated
+        earlier in its own chunk - batched updates then equal sequential ones
+        """
+        starts, updated = [0], set()
+        for j, (state, next_state) in enumerate(zip(states.tolist(), next_states.tolist())):
+            if next_state in updated:
+                starts.append(j)
+                updated = set()
+            updated.add(state)
+        return np.asarray(starts + [len(states)])
+    
+    def learn_from_trades(self, trades: Union[List[Dict], pd.DataFrame, Dict],
+                          batch_size: Optional[int] = None):
+        """
+        Learn from many completed trades at once (e.g. offline over history)
         
-        # Update Q-table
-        self.update_q_value(
-            state=trade_result['state'],
-            action=trade_result['action'],
-            reward=reward,
-            next_state=trade_result['next_state']
+        Trades are applied in order. By default (batch_size=None) they are
+        split into the longest chunks in which no trade's next_state was
+        updated earlier in the same chunk, so the result equals learning
+        them one by one. A fixed batch_size bootstraps max Q(s', a') from the
+        Q-array at the start of each chunk - faster, but an approximation
+        of the sequential update when next states repeat within a chunk.
+        
+        Args:
+            trades: list of trade_result dicts (see learn_from_trade),
+                    a DataFrame or a dict of equal-length columns
+            batch_size: None (exact) or trades per vectorized Q-update
+        """
+        if isinstance(trades, list):
+            columns = {
+                key: [trade.get(key, default) for trade in trades]
+                for key, default in (('state', None), ('action', None), ('next_state', None),
+                                     ('pnl', 0), ('pnl_pct', 0), ('hold_time_minutes', 0),
+                                     ('active_features', []))
+            }
+        else:
+            columns = trades
+        
+        n = len(columns['action'])
+        if n == 0:
+            return
+        
+        states = self._state_indices(columns['state'])
+        actions = self._action_indices(columns['action'])
+        next_states = self._state_indices(columns['next_state'])
+        pnl = np.asarray(columns['pnl'], dtype=np.float64)
+        rewards = self._calculate_rewards(
+            np.asarray(columns.get('pnl_pct', np.zeros(n)), dtype=np.float64),
+            np.asarray(columns.get('hold_time_minutes', np.zeros(n)), dtype=np.float64)
         )
         
-        # Store in memory
-        self.memory.append({
-            'timestamp': datetime.now(),
-            'state': trade_result['state'],
-            'action': trade_result['action'],
-            'reward': reward,
-            'pnl': trade_result['pnl']
-        })
+        # Update Q-table
+        if batch_size is None:
+            bounds = self._exact_chunks(states, next_states)
+        else:
+            bounds = np.append(np.arange(0, n, batch_size), n)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            chunk = slice(start, stop)
+            self._update_q_values(states[chunk], actions[chunk], rewards[chunk], next_states[chunk])
+        
+        # Store in memory (only the tail survives the size limit)
+        now = datetime.now()
+        raw_states = list(columns['state'])
+        raw_actions = list(columns['action'])
+        tail = range(max(0, n - self.max_memory_size), n)
+        self.memory.extend({
+            'timestamp': now,
+            'state': raw_states[i],
+            'action': raw_actions[i],
+            'reward': float(rewards[i]),
+            'pnl': float(pnl[i])
+        } for i in tail)
         
         # Limit memory size
         if len(self.memory) > self.max_memory_size:
             self.memory = self.memory[-self.max_memory_size:]
         
         # Update statistics
-        self.total_trades += 1
-        if trade_result['pnl'] > 0:
-            self.winning_trades += 1
-        self.total_pnl += trade_result['pnl']
+        self.total_trades += n
+        self.winning_trades += int(np.count_nonzero(pnl > 0))
+        self.total_pnl += float(pnl.sum())
         
         # Adapt weights based on performance
-        self._adapt_feature_weights(trade_result)
+        self._adapt_feature_weights_batch(pnl, columns.get('active_features', [[]] * n))
     
     def _calculate_reward(self, trade_result: Dict) -> float:
         """
         Calculate reward for reinforcement learning
         Positive reward for profit, negative for loss
         """
-        pnl_pct = trade_result.get('pnl_pct', 0)
-        
+        return float(self._calculate_rewards(
+            np.atleast_1d(float(trade_result.get('pnl_pct', 0))),
+            np.atleast_1d(float(trade_result.get('hold_time_minutes', 0)))
+        )[0])
+    
+    @staticmethod
+    def _calculate_rewards(pnl_pct: np.ndarray, hold_time: np.ndarray) -> np.ndarray:
+        """Vectorized reward for arrays of trades (see _calculate_reward)"""
         # Base reward from P&L
         reward = pnl_pct * 100  # Scale to reasonable range
         
-        # Bonus for big wins
-        if pnl_pct > 0.05:  # > 5% profit
-            reward += 10
-        elif pnl_pct > 0.10:  # > 10% profit
-            reward += 50
+        # Bonus for big wins (> 5% profit)
+        reward = reward + np.where(pnl_pct > 0.05, 10, 0)
         
-        # Penalty for big losses
-        if pnl_pct < -0.05:  # > 5% loss
-            reward -= 20
+        # Penalty for big losses (> 5% loss)
+        reward = reward - np.where(pnl_pct < -0.05, 20, 0)
         
-        # Penalty for holding too long without profit
-        hold_time = trade_result.get('hold_time_minutes', 0)
-        if hold_time > 120 and pnl_pct < 0.01:  # 2 hours with no profit
-            reward -= 5
+        # Penalty for holding too long without profit (2 hours with no profit)
+        reward = reward - np.where((hold_time > 120) & (pnl_pct < 0.01), 5, 0)
         
         return reward
     
@@ -226,21 +393,34 @@ class TradingBrain:
         Adapt feature weights based on trade performance
         Increases weights for features that predicted winning trades
         """
-        if trade_result['pnl'] > 0:
-            adjustment = 0.05  # Increase by 5%
-        else:
-            adjustment = -0.03  # Decrease by 3%
-        
-        # Get features that were active during this trade
-        active_features = trade_result.get('active_features', [])
+        self._adapt_feature_weights_batch(
+            np.atleast_1d(float(trade_result['pnl'])),
+            [trade_result.get('active_features', [])]
+        )
+    
+    def _adapt_feature_weights_batch(self, pnl: np.ndarray, active_features: List[List[str]]):
+        """
+        Sequential weight adaptation over many trades
         
-        for feature in active_features:
-            if feature in self.feature_weights:
-                self.feature_weights[feature] *= (1 + adjustment)
+        Winning trades scale active features by 1.05, losing ones by 0.97,
+        clipped to [0.1, 5.0] after each trade (see _clipped_product).
+        """
+        factors = np.where(pnl > 0, 1.05, 0.97)
+        
+        # (trade, feature) pary aktywnych cech jednym przebiegiem
+        feature_index = {feature: k for k, feature in enumerate(self.feature_weights)}
+        pairs = [(i, feature_index[feature])
+                 for i, active in enumerate(active_features)
+                 for feature in active if feature in feature_index]
+        if not pairs:
+            return
+        trade, feature = np.array(pairs, dtype=np.int64).T
+        
+        for k, name in enumerate(self.feature_weights):
+            steps = factors[trade[feature == k]]
+            if len(steps):
                 # Keep weights in reasonable range
-                self.feature_weights[feature] = np.clip(
-                    self.feature_weights[feature], 0.1, 5.0
-                )
+                self.feature_weights[name] = _clipped_product(self.feature_weights[name], steps, 0.1, 5.0)
     
     def get_confidence_score(self, indicators: Dict, market_data: Dict, 
                             action: str) -> float:
@@ -251,12 +431,13 @@ class TradingBrain:
         state = self.get_state(indicators, market_data)
         
         # Get Q-value for this state-action pair
-        if state in self.q_table:
-            q_value = self.q_table[state].get(action, 0)
+        if self.visited[state]:
+            state_values = self.q_values[state]
+            q_value = state_values[ACTION_INDEX[action]] if action in ACTION_INDEX else 0
             
             # Normalize Q-value to 0-100 range
-            max_q = max(self.q_table[state].values())
-            min_q = min(self.q_table[state].values())
+            max_q = state_values.max()
+            min_q = state_values.min()
             
             if max_q != min_q:
                 normalized = (q_value - min_q) / (max_q - min_q) * 100
@@ -560,37 +741,95 @@ class TradingBrain:
             'is_profitable': trade_data['pnl_net'] > 0
         }
     
-    def save_brain(self, filename: str = "trading_brain.pkl"):
+    def save_brain(self, filename: str = "trading_brain.npz"):
         """
-        Save learned Q-table and weights to file
+        Save learned Q-array, weights and stats as a compact .npz
         """
+        memory = self.memory[-1000:]  # Save last 1000 memories
         brain_data = {
-            'q_table': self.q_table,
-            'feature_weights': self.feature_weights,
-            'total_trades': self.total_trades,
-            'winning_trades': self.winning_trades,
-            'total_pnl': self.total_pnl,
-            'memory': self.memory[-1000:]  # Save last 1000 memories
+            'q_values': self.q_values,
+            'visited': self.visited,
+            'feature_names': np.array(list(self.feature_weights), dtype=str),
+            'feature_weights': np.array(list(self.feature_weights.values()), dtype=np.float64),
+            'stats': np.array([self.total_trades, self.winning_trades, self.total_pnl], dtype=np.float64),
+            'memory_timestamp': np.array([m['timestamp'] for m in memory], dtype='datetime64[us]'),
+            'memory_state': self._state_indices([m['state'] for m in memory]) if memory else np.empty(0, dtype=np.int64),
+            'memory_action': np.array([m['action'] for m in memory], dtype=str),
+            'memory_reward': np.array([m['reward'] for m in memory], dtype=np.float64),
+            'memory_pnl': np.array([m['pnl'] for m in memory], dtype=np.float64)
         }
         
+        # Plik zamiast nazwy - np.savez nie dokleja wtedy rozszerzenia
         with open(filename, 'wb') as f:
-            pickle.dump(brain_data, f)
+            np.savez_compressed(f, **brain_data)
         
         print(f"[✓] AI Brain saved to {filename}")
     
-    def load_brain(self, filename: str = "trading_brain.pkl"):
+    def _load_legacy_brain(self, filename: str) -> Dict:
+        """Old pickle format: Q-table as dict of state strings"""
+        with open(filename, 'rb') as f:
+            brain_data = pickle.load(f)
+        
+        q_values = np.zeros_like(self.q_values)
+        visited = np.zeros_like(self.visited)
+        for state, values in brain_data.get('q_table', {}).items():
+            row = self._state_indices(state)[0]
+            visited[row] = True
+            for action, value in values.items():
+                if action in ACTION_INDEX:
+                    q_values[row, ACTION_INDEX[action]] = value
+        
+        brain_data['q_values'] = q_values
+        brain_data['visited'] = visited
+        return brain_data
+    
+    def _load_npz_brain(self, filename: str) -> Dict:
+        with np.load(filename, allow_pickle=False) as data:
+            if data['q_values'].shape != self.q_values.shape:
+                raise ValueError(f"Q-array shape {data['q_values'].shape} does not match "
+                                 f"state layout {self.q_values.shape}")
+            total_trades, winning_trades, total_pnl = data['stats']
+            memory = [
+                {'timestamp': timestamp, 'state': int(state), 'action': str(action),
+                 'reward': float(reward), 'pnl': float(pnl)}
+                for timestamp, state, action, reward, pnl in zip(
+                    data['memory_timestamp'].astype(datetime), data['memory_state'],
+                    data['memory_action'], data['memory_reward'], data['memory_pnl'])
+            ]
+            return {
+                'q_values': data['q_values'],
+                'visited': data['visited'],
+                'feature_weights': dict(zip(data['feature_names'].tolist(),
+                                            data['feature_weights'].tolist())),
+                'total_trades': int(total_trades),
+                'winning_trades': int(winning_trades),
+                'total_pnl': float(total_pnl),
+                'memory': memory
+            }
+    
+    def load_brain(self, filename: str = "trading_brain.npz"):
         """
-        Load previously learned Q-table and weights
+        Load previously learned Q-array and weights
+        
+        Reads the .npz format; old pickled brains (.pkl) are converted on load,
+        also when `filename` is missing but a .pkl with the same stem exists.
         """
+        legacy = os.path.splitext(filename)[0] + '.pkl'
+        if not os.path.exists(filename) and os.path.exists(legacy):
+            filename = legacy
+        
         if not os.path.exists(filename):
             print(f"[!] No saved brain found at {filename}")
             return False
         
         try:
-            with open(filename, 'rb') as f:
-                brain_data = pickle.load(f)
+            if zipfile.is_zipfile(filename):
+                brain_data = self._load_npz_brain(filename)
+            else:
+                brain_data = self._load_legacy_brain(filename)
             
-            self.q_table = brain_data.get('q_table', {})
+            self.q_values = brain_data['q_values']
+            self.visited = brain_data['visited']
             self.feature_weights = brain_data.get('feature_weights', self.feature_weights)
             self.total_trades = brain_data.get('total_trades', 0)
             self.winning_trades = brain_data.get('winning_trades', 0)
@@ -619,11 +858,9 @@ class TradingBrain:
         exploration_rate = self.epsilon * 100
         
         # Most learned states
-        top_states = sorted(
-            self.q_table.items(),
-            key=lambda x: max(x[1].values()),
-            reverse=True
-        )[:5]
+        learned = np.flatnonzero(self.visited)
+        best_q = self.q_values[learned].max(axis=1)
+        top_states = learned[np.argsort(-best_q, kind='stable')][:5]
         
         return {
             'total_trades': self.total_trades,
@@ -631,9 +868,9 @@ class TradingBrain:
             'win_rate': win_rate,
             'total_pnl': self.total_pnl,
             'avg_pnl_per_trade': avg_pnl,
-            'states_learned': len(self.q_table),
+            'states_learned': int(self.visited.sum()),
             'exploration_rate': exploration_rate,
-            'top_learned_states': [s[0] for s in top_states],
+            'top_learned_states': [state_name(s) for s in top_states],
             'feature_weights': self.feature_weights.copy()
         }
     
@@ -20,13 +20,16 @@ Version: 1.0.0
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from collections import deque
 import logging
 import json
+import math
+import time
+import bisect
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -124,6 +127,219 @@ class WhaleAlert:
     significance: str  # 'large', 'massive', 'whale'
 
 
+# ═══════════════════════════════════════════════════════════════
+# TRADE RING BUFFER
+# ═══════════════════════════════════════════════════════════════
+
+class TradeRingBuffer:
+    """
+    Bufor cykliczny transakcji w układzie struct-of-arrays (NumPy).
+    
+    - append: O(1), bez tworzenia obiektów Trade (50k+ trades/s z aggTrade)
+    - zapytania okna czasowego: binary search po timestamps (O(log n))
+    - sumy buy/sell w oknie: O(1) z bieżących sum skumulowanych
+    
+    Zakłada niemalejące timestampy (kolejność strumienia giełdy).
+    Timestampy to epoch w sekundach.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.sizes = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)      # price * size
+        self.sides = np.zeros(capacity, dtype=np.int8)          # +1 buy, -1 sell
+        self.aggressive = np.zeros(capacity, dtype=bool)
+        
+        # Sumy skumulowane (łącznie z transakcją w danym slocie)
+        self._cum_buy = np.zeros(capacity, dtype=np.float64)
+        self._cum_sell = np.zeros(capacity, dtype=np.float64)
+        self.total_buy = 0.0
+        self.total_sell = 0.0
+        
+        self._head = 0   # następny slot do zapisu
+        self._count = 0
+        self.total_count = 0  # ile transakcji dodano od początku (numer sekwencyjny)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def cumulative_delta(self) -> float:
+        """Buy - sell (USD) od początku strumienia, także spoza bufora"""
+        return self.total_buy - self.total_sell
+    
+    def append(self, timestamp: float, price: float, size: float, side: int, is_aggressive: bool = True) -> int:
+        """Dodaj transakcję (side: +1 buy, -1 sell), zwraca użyty slot"""
+        i = self._head
+        value = price * size
+        
+        if side > 0:
+            self.total_buy += value
+        else:
+            self.total_sell += value
+        
+        self.timestamps[i] = timestamp
+        self.prices[i] = price
+        self.sizes[i] = size
+        self.values[i] = value
+        self.sides[i] = side
+        self.aggressive[i] = is_aggressive
+        self._cum_buy[i] = self.total_buy
+        self._cum_sell[i] = self.total_sell
+        
+        self._head = (i + 1) % self.capacity
+        self.total_count += 1
+        if self._count < self.capacity:
+            self._count += 1
+        
+        return i
+    
+    def append_trade(self, trade: Trade):
+        self.append(trade.timestamp.timestamp(), trade.price, trade.size,
+                    1 if trade.side == 'buy' else -1, trade.is_aggressive)
+    
+    def append_agg_trade(self, msg: Dict):
+        """Dodaj wiadomość Binance aggTrade ('m' = buyer is maker -> agresor sprzedaje)"""
+        self.append(msg['T'] / 1000.0, float(msg['p']), float(msg['q']),
+                    -1 if msg['m'] else 1, True)
+    
+    def extend(self,
+               timestamps: np.ndarray,
+               prices: np.ndarray,
+               sizes: np.ndarray,
+               sides: np.ndarray,
+               aggressive: np.ndarray = None):
+        """Dodaj paczkę transakcji wektorowo"""
+        n = len(timestamps)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Do bufora trafi tylko ogon, ale sumy i licznik obejmują całą paczkę
+            self.total_count += n - self.capacity
+            values = np.asarray(prices, dtype=np.float64) * np.asarray(sizes, dtype=np.float64)
+            sides = np.asarray(sides)
+            self.total_buy += values[:n - self.capacity][sides[:n - self.capacity] > 0].sum()
+            self.total_sell += values[:n - self.capacity][sides[:n - self.capacity] <= 0].sum()
+            tail = slice(n - self.capacity, n)
+            self.extend(np.asarray(timestamps)[tail], np.asarray(prices)[tail], np.asarray(sizes)[tail],
+                        sides[tail], None if aggressive is None else np.asarray(aggressive)[tail])
+            return
+        
+        values = np.asarray(prices, dtype=np.float64) * np.asarray(sizes, dtype=np.float64)
+        sides = np.where(np.asarray(sides) > 0, 1, -1).astype(np.int8)
+        cum_buy = self.total_buy + np.cumsum(np.where(sides > 0, values, 0.0))
+        cum_sell = self.total_sell + np.cumsum(np.where(sides < 0, values, 0.0))
+        
+        idx = (self._head + np.arange(n)) % self.capacity
+        self.timestamps[idx] = timestamps
+        self.prices[idx] = prices
+        self.sizes[idx] = sizes
+        self.values[idx] = values
+        self.sides[idx] = sides
+        self.aggressive[idx] = True if aggressive is None else aggressive
+        self._cum_buy[idx] = cum_buy
+        self._cum_sell[idx] = cum_sell
+        
+        self.total_buy = float(cum_buy[-1])
+        self.total_sell = float(cum_sell[-1])
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+        self.total_count += n
+    
+    def _physical(self, k: int) -> int:
+        """Indeks logiczny (0 = najstarsza) -> slot w tablicach"""
+        return (self._head - self._count + k) % self.capacity
+    
+    def slot_of(self, seq: int) -> Optional[int]:
+        """Numer sekwencyjny transakcji -> slot (None jeśli już nadpisana)"""
+        k = seq - (self.total_count - self._count)
+        if k < 0 or k >= self._count:
+            return None
+        return self._physical(k)
+    
+    def _segments(self) -> List[slice]:
+        """Zawartość bufora jako 1-2 ciągłe wycinki, od najstarszej"""
+        start = (self._head - self._count) % self.capacity
+        if start + self._count <= self.capacity:
+            return [slice(start, start + self._count)]
+        return [slice(start, self.capacity), slice(0, self._head)]
+    
+    def search(self, timestamp: float) -> int:
+        """Pierwszy indeks logiczny z timestamp >= timestamp (binary search)"""
+        offset = 0
+        for seg in self._segments():
+            ts = self.timestamps[seg]
+            pos = int(np.searchsorted(ts, timestamp, side='left'))
+            if pos < len(ts):
+                return offset + pos
+            offset += len(ts)
+        return offset
+    
+    def _cum_before(self, k: int) -> Tuple[float, float]:
+        """Sumy buy/sell przed indeksem logicznym k"""
+        if k >= self._count:
+            return self.total_buy, self.total_sell
+        i = self._physical(k)
+        buy, sell = self._cum_buy[i], self._cum_sell[i]
+        if self.sides[i] > 0:
+            buy -= self.values[i]
+        else:
+            sell -= self.values[i]
+        return buy, sell
+    
+    def window_volume(self, since: float, until: float = None) -> Tuple[float, float, int]:
+        """
+        Wolumen buy/sell (USD) i liczba transakcji w oknie [since, until).
+        
+        Returns:
+            (buy_value, sell_value, count)
+        """
+        start = self.search(since)
+        end = self._count if until is None else self.search(until)
+        if end <= start:
+            return 0.0, 0.0, 0
+        
+        buy_start, sell_start = self._cum_before(start)
+        buy_end, sell_end = self._cum_before(end)
+        return buy_end - buy_start, sell_end - sell_start, end - start
+    
+    def window(self, since: float, until: float = None) -> Dict[str, np.ndarray]:
+        """Kopie tablic dla transakcji z okna [since, until), od najstarszej"""
+        start = self.search(since)
+        end = self._count if until is None else self.search(until)
+        return self._logical_range(start, max(start, end))
+    
+    def _logical_range(self, start: int, end: int) -> Dict[str, np.ndarray]:
+        idx = (self._head - self._count + np.arange(start, end)) % self.capacity
+        return {
+            'timestamps': self.timestamps[idx],
+            'prices': self.prices[idx],
+            'sizes': self.sizes[idx],
+            'values': self.values[idx],
+            'sides': self.sides[idx],
+            'aggressive': self.aggressive[idx]
+        }
+    
+    def last_trades(self, n: int) -> List[Trade]:
+        """Ostatnie n transakcji jako obiekty Trade (dla starszego API)"""
+        arrays = self._logical_range(max(0, self._count - n), self._count)
+        return [
+            Trade(
+                timestamp=datetime.fromtimestamp(ts),
+                price=float(price),
+                size=float(size),
+                side='buy' if side > 0 else 'sell',
+                is_aggressive=bool(aggr)
+            )
+            for ts, price, size, side, aggr in zip(
+                arrays['timestamps'], arrays['prices'], arrays['sizes'],
+                arrays['sides'], arrays['aggressive']
+            )
+        ]
+
+
 # ═══════════════════════════════════════════════════════════════
 # CVD ANALYZER
 # ═══════════════════════════════════════════════════════════════
@@ -139,21 +355,18 @@ class CVDAnalyzer:
     - Falling price + rising CVD = accumulation (buy signal!)
     """
     
-    def __init__(self, window_size: int = 100):
+    def __init__(self, window_size: int = 100, capacity: int = 10000):
         self.window_size = window_size
-        self.trades: deque = deque(maxlen=10000)
+        self.trades = TradeRingBuffer(capacity)
         self.cvd_history: deque = deque(maxlen=1000)
-        self.cumulative_delta = 0
+    
+    @property
+    def cumulative_delta(self) -> float:
+        return self.trades.cumulative_delta
     
     def add_trade(self, trade: Trade):
         """Dodaj nową transakcję"""
-        self.trades.append(trade)
-        
-        # Update cumulative delta
-        if trade.side == 'buy':
-            self.cumulative_delta += trade.value_usd
-        else:
-            self.cumulative_delta -= trade.value_usd
+        self.trades.append_trade(trade)
     
     def calculate_cvd(self, timeframe_minutes: int = 5) -> CVDData:
         """
@@ -168,12 +381,9 @@ class CVDAnalyzer:
                 cumulative_delta=self.cumulative_delta
             )
         
-        cutoff = datetime.now() - timedelta(minutes=timeframe_minutes)
-        
-        recent_trades = [t for t in self.trades if t.timestamp >= cutoff]
+        cutoff = (datetime.now() - timedelta(minutes=timeframe_minutes)).timestamp()
         
-        buy_vol = sum(t.value_usd for t in recent_trades if t.side == 'buy')
-        sell_vol = sum(t.value_usd for t in recent_trades if t.side == 'sell')
+        buy_vol, sell_vol, _ = self.trades.window_volume(cutoff)
         
         cvd = CVDData(
             timestamp=datetime.now(),
@@ -246,73 +456,132 @@ class IcebergDetector:
     def __init__(self, 
                  min_fills: int = 5,
                  price_tolerance: float = 0.0001,
-                 time_window_seconds: int = 60):
+                 time_window_seconds: int = 60,
+                 tick_size: float = None,
+                 capacity: int = 5000):
         self.min_fills = min_fills
         self.price_tolerance = price_tolerance
         self.time_window = time_window_seconds
-        self.recent_trades: deque = deque(maxlen=5000)
+        # Szerokość koszyka cenowego; None = price_tolerance * cena pierwszej transakcji
+        self.tick_size = tick_size
+        self.recent_trades = TradeRingBuffer(capacity)
         self.detected_icebergs: List[IcebergOrder] = []
+        
+        # Koszyki cenowe aktualizowane przy dodaniu/wygaśnięciu transakcji:
+        # bin -> [fills, mean, M2 (Welford, value_usd), buy_count, total_value]
+        self.bins: Dict[int, List[float]] = {}
+        self._slot_bins = np.zeros(capacity, dtype=np.int64)  # koszyk transakcji w danym slocie
+        self._next_expire = 0  # numer sekwencyjny najstarszej nie-wygasłej transakcji
     
-    def add_trade(self, trade: Trade):
+    def _bin_key(self, price: float) -> int:
+        if self.tick_size is None:
+            self.tick_size = price * self.price_tolerance
+        return math.floor(price / self.tick_size + 0.5)
+    
+    def _bin_add(self, key: int, value: float, side: int):
+        stats = self.bins.get(key)
+        if stats is None:
+            stats = self.bins[key] = [0, 0.0, 0.0, 0, 0.0]
+        
+        stats[0] += 1
+        delta = value - stats[1]
+        stats[1] += delta / stats[0]
+        stats[2] += delta * (value - stats[1])
+        if side > 0:
+            stats[3] += 1
+        stats[4] += value
+    
+    def _bin_remove(self, key: int, value: float, side: int):
+        stats = self.bins.get(key)
+        if stats is None:
+            return
+        
+        if stats[0] <= 1:
+            del self.bins[key]
+            return
+        
+        stats[0] -= 1
+        delta = value - stats[1]
+        stats[1] -= delta / stats[0]
+        stats[2] = max(0.0, stats[2] - delta * (value - stats[1]))
+        if side > 0:
+            stats[3] -= 1
+        stats[4] -= value
+    
+    def _expire(self, cutoff: float, make_room: bool = False):
+        """Usuń z koszyków transakcje starsze niż cutoff (make_room: także tę, którą append nadpisze)"""
+        buf = self.recent_trades
+        oldest_seq = buf.total_count - len(buf)
+        make_room = make_room and len(buf) == buf.capacity
+        
+        while self._next_expire < buf.total_count:
+            slot = buf.slot_of(self._next_expire)
+            if slot is None:
+                self._next_expire = oldest_seq
+                continue
+            if buf.timestamps[slot] >= cutoff and not (make_room and self._next_expire == oldest_seq):
+                break
+            self._bin_remove(int(self._slot_bins[slot]), float(buf.values[slot]), buf.sides[slot])
+            self._next_expire += 1
+    
+    def add_raw(self, timestamp: float, price: float, size: float, side: int,
+                is_aggressive: bool = True) -> Optional[IcebergOrder]:
+        """
+        Dodaj transakcję (epoch s, side +1/-1) i sprawdź jej koszyk.
+        
+        Returns:
+            IcebergOrder jeśli koszyk tej transakcji wygląda na iceberg
+        """
+        self._expire(timestamp - self.time_window, make_room=True)
+        
+        key = self._bin_key(float(price))
+        slot = self.recent_trades.append(timestamp, price, size, side, is_aggressive)
+        self._slot_bins[slot] = key
+        self._bin_add(key, price * size, side)
+        
+        return self._check_bin(key)
+    
+    def add_trade(self, trade: Trade) -> Optional[IcebergOrder]:
         """Dodaj transakcję do analizy"""
-        self.recent_trades.append(trade)
+        return self.add_raw(trade.timestamp.timestamp(), trade.price, trade.size,
+                            1 if trade.side == 'buy' else -1, trade.is_aggressive)
+    
+    def _check_bin(self, key: int) -> Optional[IcebergOrder]:
+        fills, mean, m2, buy_count, total_volume = self.bins[key]
+        
+        if fills < self.min_fills:
+            return None
+        
+        # Iceberg ma podobne rozmiary fills (std/mean jak np.std, ddof=0)
+        size_std = math.sqrt(m2 / fills) / mean if mean > 0 else 1
+        if size_std >= 0.5:
+            return None
+        
+        sell_count = fills - buy_count
+        
+        return IcebergOrder(
+            timestamp=datetime.now(),
+            price=key * self.tick_size,
+            estimated_size=total_volume * 2,  # Zakładamy jeszcze tyle ukryte
+            side='buy' if buy_count > sell_count else 'sell',
+            detection_confidence=min(1.0, fills / (self.min_fills * 2)),
+            fills_count=int(fills)
+        )
     
     def detect(self) -> List[IcebergOrder]:
         """
-        Wykryj icebergi w ostatnich transakcjach.
+        Wykryj icebergi w ostatnich transakcjach - O(aktywne koszyki).
         """
+        self._expire((datetime.now() - timedelta(seconds=self.time_window)).timestamp())
+        
         if len(self.recent_trades) < self.min_fills:
             return []
         
         icebergs = []
-        cutoff = datetime.now() - timedelta(seconds=self.time_window)
-        
-        recent = [t for t in self.recent_trades if t.timestamp >= cutoff]
-        
-        # Grupuj po cenie (z tolerancją)
-        price_groups: Dict[float, List[Trade]] = {}
-        
-        for trade in recent:
-            # Znajdź istniejącą grupę lub stwórz nową
-            found_group = False
-            for ref_price in price_groups:
-                if abs(trade.price - ref_price) / ref_price < self.price_tolerance:
-                    price_groups[ref_price].append(trade)
-                    found_group = True
-                    break
-            
-            if not found_group:
-                price_groups[trade.price] = [trade]
-        
-        # Szukaj icebergów - dużo fills na jednym poziomie
-        for ref_price, trades in price_groups.items():
-            if len(trades) >= self.min_fills:
-                # Sprawdź czy to iceberg pattern
-                total_volume = sum(t.value_usd for t in trades)
-                avg_fill_size = total_volume / len(trades)
-                
-                # Iceberg ma podobne rozmiary fills
-                sizes = [t.value_usd for t in trades]
-                size_std = np.std(sizes) / np.mean(sizes) if np.mean(sizes) > 0 else 1
-                
-                if size_std < 0.5:  # Spójne rozmiary = iceberg
-                    # Określ stronę
-                    buy_count = sum(1 for t in trades if t.side == 'buy')
-                    sell_count = len(trades) - buy_count
-                    side = 'buy' if buy_count > sell_count else 'sell'
-                    
-                    confidence = min(1.0, len(trades) / (self.min_fills * 2))
-                    
-                    iceberg = IcebergOrder(
-                        timestamp=datetime.now(),
-                        price=ref_price,
-                        estimated_size=total_volume * 2,  # Zakładamy jeszcze tyle ukryte
-                        side=side,
-                        detection_confidence=confidence,
-                        fills_count=len(trades)
-                    )
-                    
-                    icebergs.append(iceberg)
+        for key in self.bins:
+            iceberg = self._check_bin(key)
+            if iceberg is not None:
+                icebergs.append(iceberg)
         
         self.detected_icebergs = icebergs
         return icebergs
@@ -408,14 +677,22 @@ class WhaleDetector:
         'whale': 10_000_000
     }
     
-    def __init__(self):
-        self.whale_alerts: List[WhaleAlert] = []
+    def __init__(self, max_alerts: int = 10000):
+        self.whale_alerts: deque = deque(maxlen=max_alerts)
+        self._alert_buffer = TradeRingBuffer(max_alerts)
     
     def check_trade(self, trade: Trade) -> Optional[WhaleAlert]:
         """
         Sprawdź czy transakcja to whale activity.
         """
-        value = trade.value_usd
+        return self.check_raw(trade.timestamp, trade.price, trade.size, trade.side)
+    
+    def check_raw(self, timestamp: datetime, price: float, size: float, side: str) -> Optional[WhaleAlert]:
+        """check_trade bez obiektu Trade (ścieżka aggTrade)"""
+        value = price * size
+        
+        if value < self.THRESHOLDS['large']:
+            return None
         
         if value >= self.THRESHOLDS['whale']:
             significance = 'whale'
@@ -427,24 +704,25 @@ class WhaleDetector:
             return None
         
         alert = WhaleAlert(
-            timestamp=trade.timestamp,
+            timestamp=timestamp,
             trade_value_usd=value,
-            side=trade.side,
-            price=trade.price,
+            side=side,
+            price=price,
             significance=significance
         )
         
         self.whale_alerts.append(alert)
+        self._alert_buffer.append(timestamp.timestamp(), price, size, 1 if side == 'buy' else -1)
         return alert
     
     def get_recent_whale_activity(self, minutes: int = 60) -> Dict:
         """
         Podsumuj aktywność wielorybów.
         """
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        recent = [a for a in self.whale_alerts if a.timestamp >= cutoff]
+        cutoff = (datetime.now() - timedelta(minutes=minutes)).timestamp()
+        buy_vol, sell_vol, total_alerts = self._alert_buffer.window_volume(cutoff)
         
-        if not recent:
+        if not total_alerts:
             return {
                 'total_alerts': 0,
                 'buy_volume': 0,
@@ -453,9 +731,6 @@ class WhaleDetector:
                 'signal': 0
             }
         
-        buy_vol = sum(a.trade_value_usd for a in recent if a.side == 'buy')
-        sell_vol = sum(a.trade_value_usd for a in recent if a.side == 'sell')
-        
         net_flow = buy_vol - sell_vol
         
         # Signal based on whale flow
@@ -465,7 +740,7 @@ class WhaleDetector:
             signal = max(-1.0, net_flow / 50_000_000)
         
         return {
-            'total_alerts': len(recent),
+            'total_alerts': total_alerts,
             'buy_volume': buy_vol,
             'sell_volume': sell_vol,
             'net_flow': net_flow,
@@ -473,6 +748,306 @@ class WhaleDetector:
         }
 
 
+# ═══════════════════════════════════════════════════════════════
+# LOCAL ORDER BOOK (L2)
+# ═══════════════════════════════════════════════════════════════
+
+class _BookSide:
+    """
+    Jedna strona L2: posortowane klucze + dict rozmiarów.
+    
+    Klucz = cena dla bidów i -cena dla asków, więc najlepszy poziom
+    jest zawsze na końcu listy (O(1) odczyt i tanie usunięcie).
+    """
+    
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._sign = 1.0 if is_bid else -1.0
+        self.keys: List[float] = []
+        self.sizes: Dict[float, float] = {}
+        # Sumy sufiksowe (od klucza do najlepszego poziomu), liczone leniwie
+        self._suffix_qty: Optional[np.ndarray] = None
+        self._suffix_notional: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+        self._suffix_qty = None
+        self._suffix_notional = None
+    
+    def set(self, price: float, size: float):
+        """
+        Ustaw rozmiar poziomu (size <= 0 usuwa poziom)
+        
+        Zmiana rozmiaru istniejącego poziomu to O(1) (dict); nowy / usunięty
+        poziom to bisect O(log n) + przesunięcie listy O(n) (memmove), a sumy
+        sufiksowe są potem przeliczane leniwie w O(n) przy zapytaniu o głębokość.
+        """
+        key = self._sign * price
+        if size <= 0:
+            if self.sizes.pop(key, None) is not None:
+                del self.keys[bisect.bisect_left(self.keys, key)]
+                self._suffix_qty = None
+            return
+        if key not in self.sizes:
+            bisect.insort(self.keys, key)
+        self.sizes[key] = size
+        self._suffix_qty = None
+    
+    @property
+    def best(self) -> float:
+        return self._sign * self.keys[-1] if self.keys else 0
+    
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        """n najlepszych poziomów (cena, rozmiar) od najlepszego"""
+        return [(self._sign * key, self.sizes[key]) for key in reversed(self.keys[-n:])]
+    
+    def _first_index(self, limit_price: float) -> int:
+        """Indeks pierwszego klucza na poziomie limit_price lub lepszym"""
+        return bisect.bisect_left(self.keys, self._sign * limit_price)
+    
+    def _ensure_suffix(self):
+        if self._suffix_qty is not None:
+            return
+        keys = np.fromiter(self.keys, dtype=np.float64, count=len(self.keys))
+        sizes = np.fromiter((self.sizes[key] for key in self.keys), dtype=np.float64, count=len(self.keys))
+        self._suffix_qty = np.concatenate([np.cumsum(sizes[::-1])[::-1], [0.0]])
+        self._suffix_notional = np.concatenate([np.cumsum((np.abs(keys) * sizes)[::-1])[::-1], [0.0]])
+    
+    def depth_to(self, limit_price: float) -> Tuple[float, float]:
+        """(wolumen, wartość) wszystkich poziomów od najlepszego do limit_price włącznie"""
+        if not self.keys:
+            return 0.0, 0.0
+        self._ensure_suffix()
+        idx = self._first_index(limit_price)
+        return float(self._suffix_qty[idx]), float(self._suffix_notional[idx])
+    
+    def largest_to(self, limit_price: float) -> Optional[Tuple[float, float]]:
+        """Największy poziom (cena, rozmiar) w paśmie do limit_price"""
+        idx = self._first_index(limit_price)
+        if idx >= len(self.keys):
+            return None
+        key = max(self.keys[idx:], key=self.sizes.__getitem__)
+        return self._sign * key, self.sizes[key]
+
+
+class LocalOrderBook:
+    """
+    📖 LOKALNY ORDER BOOK L2
+    
+    Utrzymywany z diff depth streamu Binance (<symbol>@depth@100ms):
+    - snapshot REST tylko przy starcie / resyncu (bez pollingu)
+    - wykrywanie luk w sekwencji U/u (spot) lub pu (futures) → resync
+    - O(1) best bid/ask; aktualizacja poziomu O(1), dodanie / usunięcie O(n) memmove
+    - głębokość i imbalance w dowolnym paśmie bps od mid
+    """
+    
+    def __init__(self,
+                 symbol: str = 'BTCUSDT',
+                 max_buffer: int = 2000,
+                 on_resync: Callable[['LocalOrderBook'], None] = None):
+        self.symbol = symbol.upper()
+        self.bids = _BookSide(is_bid=True)
+        self.asks = _BookSide(is_bid=False)
+        self.on_resync = on_resync
+        
+        self.last_update_id = 0
+        self.synced = False
+        self.gap_count = 0
+        self.last_event_time: Optional[datetime] = None
+        self.last_update_at = 0.0  # time.time() ostatniej zmiany
+        
+        self._awaiting_first = False
+        self._pending: deque = deque(maxlen=max_buffer)
+    
+    # ------------------------------------------------------------------
+    # Synchronizacja
+    # ------------------------------------------------------------------
+    
+    @property
+    def needs_snapshot(self) -> bool:
+        return not self.synced
+    
+    def load_snapshot(self, last_update_id: int, bids: List, asks: List):
+        """
+        Załaduj snapshot (REST /depth: lastUpdateId, bids, asks) i odtwórz
+        zbuforowane diffy.
+        """
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.set(float(price), float(size))
+        for price, size in asks:
+            self.asks.set(float(price), float(size))
+        
+        self.last_update_id = int(last_update_id)
+        self.synced = True
+        self._awaiting_first = True
+        self.last_update_at = time.time()
+        
+        pending = list(self._pending)
+        self._pending.clear()
+        for i, msg in enumerate(pending):
+            self.apply_diff(msg)
+            if not self.synced:
+                # Luka w buforze - reszta czeka na kolejny snapshot
+                self._pending.extend(pending[i + 1:])
+                break
+    
+    def _is_contiguous(self, msg: Dict) -> bool:
+        if self._awaiting_first:
+            # Pierwszy diff po snapshocie musi obejmować lastUpdateId + 1
+            return msg['U'] <= self.last_update_id + 1
+        if 'pu' in msg:
+            return msg['pu'] == self.last_update_id
+        return msg['U'] == self.last_update_id + 1
+    
+    def _request_resync(self, msg: Dict):
+        self.synced = False
+        self.gap_count += 1
+        self._pending.clear()
+        self._pending.append(msg)
+        logger.warning(
+            f"{self.symbol} order book gap (last={self.last_update_id}, U={msg['U']}) - resync"
+        )
+        if self.on_resync:
+            self.on_resync(self)
+    
+    def apply_diff(self, msg: Dict) -> bool:
+        """
+        Zastosuj zdarzenie depthUpdate.
+        
+        msg: {'E': ms, 'U': first_id, 'u': final_id, ['pu': prev_final_id],
+              'b': [[price, qty], ...], 'a': [[price, qty], ...]}
+        
+        Returns:
+            True jeśli zmieniło księgę (False = zbuforowane, stare lub luka)
+        """
+        if not self.synced:
+            self._pending.append(msg)
+            return False
+        
+        if msg['u'] <= self.last_update_id:
+            return False
+        
+        if not self._is_contiguous(msg):
+            self._request_resync(msg)
+            return False
+        
+        for price, size in msg.get('b', ()):
+            self.bids.set(float(price), float(size))
+        for price, size in msg.get('a', ()):
+            self.asks.set(float(price), float(size))
+        
+        self.last_update_id = msg['u']
+        self._awaiting_first = False
+        if 'E' in msg:
+            self.last_event_time = datetime.fromtimestamp(msg['E'] / 1000.0)
+        self.last_update_at = time.time()
+        return True
+    
+    def update_level(self, side: str, price: float, size: float):
+        """Ręczna aktualizacja poziomu ('bid'/'ask', size 0 = usuń)"""
+        (self.bids if side == 'bid' else self.asks).set(price, size)
+        self.last_update_at = time.time()
+    
+    # ------------------------------------------------------------------
+    # Zapytania
+    # ------------------------------------------------------------------
+    
+    @property
+    def best_bid(self) -> float:
+        return self.bids.best
+    
+    @property
+    def best_ask(self) -> float:
+        return self.asks.best
+    
+    @property
+    def mid_price(self) -> float:
+        if not self.bids or not self.asks:
+            return 0
+        return (self.bids.best + self.asks.best) / 2
+    
+    @property
+    def spread_bps(self) -> float:
+        mid = self.mid_price
+        return (self.asks.best - self.bids.best) / mid * 10_000 if mid > 0 else 0
+    
+    def depth_within_bps(self, bps: float) -> Dict[str, float]:
+        """Skumulowana głębokość obu stron w paśmie ±bps od mid"""
+        mid = self.mid_price
+        if mid <= 0:
+            return {'bid_qty': 0.0, 'ask_qty': 0.0, 'bid_notional': 0.0, 'ask_notional': 0.0}
+        
+        bid_qty, bid_notional = self.bids.depth_to(mid * (1 - bps / 10_000))
+        ask_qty, ask_notional = self.asks.depth_to(mid * (1 + bps / 10_000))
+        return {
+            'bid_qty': bid_qty,
+            'ask_qty': ask_qty,
+            'bid_notional': bid_notional,
+            'ask_notional': ask_notional
+        }
+    
+    def imbalance(self, bps: float = 25.0) -> float:
+        """(bid - ask) / (bid + ask) wolumenu w paśmie ±bps, zakres -1..1"""
+        depth = self.depth_within_bps(bps)
+        total = depth['bid_qty'] + depth['ask_qty']
+        return (depth['bid_qty'] - depth['ask_qty']) / total if total > 0 else 0
+    
+    def depth_profile(self, bands: Tuple[float, ...] = (5, 10, 25, 50, 100)) -> Dict[float, Dict]:
+        """Głębokość i imbalance dla kilku pasm bps naraz"""
+        profile = {}
+        for bps in bands:
+            depth = self.depth_within_bps(bps)
+            total = depth['bid_qty'] + depth['ask_qty']
+            depth['imbalance'] = (depth['bid_qty'] - depth['ask_qty']) / total if total > 0 else 0
+            profile[bps] = depth
+        return profile
+    
+    def largest_levels(self, bps: float) -> Dict[str, Optional[Tuple[float, float]]]:
+        """Największy bid i ask (cena, rozmiar) w paśmie ±bps"""
+        mid = self.mid_price
+        if mid <= 0:
+            return {'bid': None, 'ask': None}
+        return {
+            'bid': self.bids.largest_to(mid * (1 - bps / 10_000)),
+            'ask': self.asks.largest_to(mid * (1 + bps / 10_000))
+        }
+    
+    def top_levels(self, n: int = 20) -> Dict:
+        """Top n poziomów w formacie WebSocketFeed (listy krotek cena, rozmiar)"""
+        return {
+            'bids': self.bids.top(n),
+            'asks': self.asks.top(n),
+            'timestamp': self.last_event_time or datetime.now()
+        }
+    
+    def to_snapshot(self, levels: int = 20) -> OrderBookSnapshot:
+        """Snapshot top-N dla OrderBookAnalyzer / AbsorptionAnalyzer"""
+        return OrderBookSnapshot(
+            timestamp=self.last_event_time or datetime.now(),
+            bids=[OrderBookLevel(price, size) for price, size in self.bids.top(levels)],
+            asks=[OrderBookLevel(price, size) for price, size in self.asks.top(levels)]
+        )
+
+
+# Księgi utrzymywane przez feedy, dostępne dla Genius Brain bez pollingu REST
+_LOCAL_BOOKS: Dict[str, LocalOrderBook] = {}
+
+
+def register_local_book(book: LocalOrderBook):
+    """Udostępnij księgę pod jej symbolem"""
+    _LOCAL_BOOKS[book.symbol] = book
+
+
+def get_local_book(symbol: str) -> Optional[LocalOrderBook]:
+    return _LOCAL_BOOKS.get(symbol.upper())
+
+
 # ═══════════════════════════════════════════════════════════════
 # ORDER BOOK ANALYZER
 # ═══════════════════════════════════════════════════════════════
@@ -528,6 +1103,18 @@ class OrderBookAnalyzer:
             'signal': max(-1, min(1, signal)),
             'confidence': min(1.0, abs(imbalance) * 2)
         }
+    
+    def analyze_local(self,
+                      book: LocalOrderBook,
+                      levels: int = 20,
+                      bands: Tuple[float, ...] = (10, 25, 50)) -> Dict:
+        """
+        Analiza lokalnej księgi L2: analyze() na top-N + głębokość w pasmach bps.
+        """
+        result = self.analyze(book.to_snapshot(levels))
+        result['spread_bps'] = book.spread_bps
+        result['depth_bands'] = book.depth_profile(bands)
+        return result
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -556,17 +1143,38 @@ class OrderFlowEngine:
         self.iceberg_detector.add_trade(trade)
         self.whale_detector.check_trade(trade)
     
+    def process_agg_trade(self, msg: Dict):
+        """
+        Przetwórz wiadomość Binance aggTrade bez tworzenia obiektu Trade.
+        
+        msg: {'T': ms, 'p': price, 'q': qty, 'm': buyer_is_maker, ...}
+        """
+        self.cvd_analyzer.trades.append_agg_trade(msg)
+        
+        price, qty = float(msg['p']), float(msg['q'])
+        self.iceberg_detector.add_raw(msg['T'] / 1000.0, price, qty, -1 if msg['m'] else 1)
+        if price * qty >= WhaleDetector.THRESHOLDS['large']:
+            self.whale_detector.check_raw(
+                datetime.fromtimestamp(msg['T'] / 1000.0), price, qty, 'sell' if msg['m'] else 'buy'
+            )
+    
     def analyze(self,
                 orderbook: OrderBookSnapshot,
                 price_series: List[float]) -> Dict:
         """
         Pełna analiza order flow.
         
+        orderbook: OrderBookSnapshot albo LocalOrderBook (L2 z diff streamu)
+        
         Returns:
             Dict z wszystkimi sygnałami
         """
         results = {}
         
+        local_book = orderbook if isinstance(orderbook, LocalOrderBook) else None
+        if local_book is not None:
+            orderbook = local_book.to_snapshot()
+        
         # 1. CVD Analysis
         cvd = self.cvd_analyzer.calculate_cvd()
         cvd_divergence = self.cvd_analyzer.detect_divergence(price_series)
@@ -597,7 +1205,7 @@ class OrderFlowEngine:
         # 3. Absorption
         price_change = (price_series[-1] - price_series[-10]) / price_series[-10] if len(price_series) >= 10 else 0
         
-        recent_trades = list(self.cvd_analyzer.trades)[-100:]
+        recent_trades = self.cvd_analyzer.trades.last_trades(100)
         absorption = self.absorption_analyzer.analyze(recent_trades, orderbook, price_change)
         
         absorption_signal = 0
@@ -618,7 +1226,10 @@ class OrderFlowEngine:
         results['whales'] = whale_activity
         
         # 5. Order Book
-        ob_analysis = self.orderbook_analyzer.analyze(orderbook)
+        if local_book is not None:
+            ob_analysis = self.orderbook_analyzer.analyze_local(local_book)
+        else:
+            ob_analysis = self.orderbook_analyzer.analyze(orderbook)
         results['orderbook'] = ob_analysis
         
         # ═══ AGGREGATE SIGNAL ═══
@@ -762,6 +1373,58 @@ def get_order_flow_signal(orderbook_data: Dict = None,
         return {'signal': 0, 'confidence': 0, 'reasons': [f'Error: {str(e)}']}
 
 
+def get_local_orderbook_signal(symbol: str = 'BTCUSDT',
+                               band_bps: float = 25.0,
+                               max_age_seconds: float = 10.0) -> Optional[Dict]:
+    """
+    Sygnał order book z lokalnej księgi L2 (zarejestrowanej przez feed).
+    
+    Returns:
+        Dict w formacie get_orderbook_signal albo None, gdy brak świeżej,
+        zsynchronizowanej księgi dla symbolu
+    """
+    book = get_local_book(symbol)
+    if book is None or not book.synced or not book.bids or not book.asks:
+        return None
+    if max_age_seconds is not None and time.time() - book.last_update_at > max_age_seconds:
+        return None
+    
+    analysis = OrderBookAnalyzer().analyze_local(book, bands=(band_bps,))
+    imbalance = analysis['depth_bands'][band_bps]['imbalance']
+    walls = book.largest_levels(band_bps)
+    
+    signal = imbalance * 0.5
+    if analysis['bid_walls'] and not analysis['ask_walls']:
+        signal += 0.2
+    elif analysis['ask_walls'] and not analysis['bid_walls']:
+        signal -= 0.2
+    signal = max(-1, min(1, signal))
+    
+    if signal > 0.1:
+        direction = 'BULLISH'
+    elif signal < -0.1:
+        direction = 'BEARISH'
+    else:
+        direction = 'NEUTRAL'
+    
+    def wall_info(level):
+        if level is None:
+            return {}
+        return {'price': level[0], 'size': level[1], 'size_usd': level[0] * level[1]}
+    
+    return {
+        'signal': signal,
+        'confidence': min(1.0, abs(imbalance) * 2),
+        'direction': direction,
+        'imbalance': imbalance,
+        'spread_bps': book.spread_bps,
+        'bid_wall': wall_info(walls['bid']),
+        'ask_wall': wall_info(walls['ask']),
+        'depth_bands': analysis['depth_bands'],
+        'source': 'local_l2'
+    }
+
+
 # ═══════════════════════════════════════════════════════════════
 # CLI TEST
 # ═══════════════════════════════════════════════════════════════
@@ -29,6 +29,14 @@ try:
 except ImportError:
     STATSMODELS_AVAILABLE = False
 
+try:
+    from genius_portfolio_optimizer import (
+        CriticalLineFrontier, FactorCovariance, ledoit_wolf_covariance
+    )
+    RISK_MODELS_AVAILABLE = True
+except ImportError:
+    RISK_MODELS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,16 +46,25 @@ class PortfolioOptimizer:
     Methods used by Renaissance Technologies, Two Sigma, Bridgewater
     """
     
-    def __init__(self, risk_free_rate: float = 0.02):
+    def __init__(self, risk_free_rate: float = 0.02,
+                 covariance: str = 'sample', n_factors: int = 5):
         """
         Initialize portfolio optimizer
         
         Args:
             risk_free_rate: Annual risk-free rate (default 2%)
+            covariance: 'sample', 'ledoit_wolf' or 'factor' (PCA + idiosyncratic)
+            n_factors: Principal components used by the factor model
         """
         self.risk_free_rate = risk_free_rate
+        self.covariance = covariance
+        self.n_factors = n_factors
         self.logger = logging.getLogger(__name__)
         
+        if covariance != 'sample' and not RISK_MODELS_AVAILABLE:
+            self.logger.warning(f"⚠️ {covariance} covariance not available - using sample covariance")
+            self.covariance = 'sample'
+        
         if not EMPYRICAL_AVAILABLE:
             self.logger.warning("⚠️ empyrical not available - some metrics disabled")
         if not SCIPY_AVAILABLE:
@@ -156,40 +173,77 @@ class PortfolioOptimizer:
             self.logger.error(f"Portfolio optimization failed: {e}")
             return self._equal_weight_portfolio(returns_df)
     
+    def _risk_model(self, returns_df: pd.DataFrame):
+        """
+        Annualized covariance for the configured estimator
+        
+        Returns:
+            (dense covariance, Σ·w function) - in factor mode Σ·w costs O(n·k)
+        """
+        if self.covariance == 'factor':
+            model = FactorCovariance.from_pca(returns_df.values, self.n_factors).scaled(252)
+            return model.dense(), model.matvec
+        if self.covariance == 'ledoit_wolf':
+            cov_matrix = ledoit_wolf_covariance(returns_df.values)[0] * 252
+        else:
+            cov_matrix = returns_df.cov().values * 252
+        return cov_matrix, lambda w: cov_matrix @ w
+    
+    def _frontier(self, mean_returns: np.ndarray, cov_matrix: np.ndarray):
+        """Long-only critical line frontier (None -> use SLSQP)"""
+        if not RISK_MODELS_AVAILABLE:
+            return None
+        try:
+            return CriticalLineFrontier(mean_returns, cov_matrix, 0.0, 1.0)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            self.logger.warning(f"Critical line frontier failed: {e}")
+            return None
+    
     def _maximize_sharpe(self, returns_df: pd.DataFrame) -> np.ndarray:
         """Maximize Sharpe ratio (used by most quant funds)"""
-        mean_returns = returns_df.mean() * 252  # Annualized
-        cov_matrix = returns_df.cov() * 252
+        mean_returns = returns_df.mean().values * 252  # Annualized
+        cov_matrix, cov_matvec = self._risk_model(returns_df)
         n_assets = len(returns_df.columns)
         
+        frontier = self._frontier(mean_returns, cov_matrix)
+        if frontier is not None and frontier.max_return > self.risk_free_rate:
+            return frontier.max_sharpe(self.risk_free_rate)
+        
         def neg_sharpe(weights):
-            portfolio_return = np.sum(mean_returns * weights)
-            portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-            sharpe = (portfolio_return - self.risk_free_rate) / portfolio_vol
-            return -sharpe
+            sigma_w = cov_matvec(weights)
+            portfolio_return = np.dot(mean_returns, weights)
+            portfolio_vol = np.sqrt(np.dot(weights, sigma_w))
+            excess = portfolio_return - self.risk_free_rate
+            grad = mean_returns / portfolio_vol - excess * sigma_w / portfolio_vol ** 3
+            return -excess / portfolio_vol, -grad
         
         constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
         bounds = tuple((0, 1) for _ in range(n_assets))
         initial_guess = np.array([1/n_assets] * n_assets)
         
-        result = minimize(neg_sharpe, initial_guess, method='SLSQP',
+        result = minimize(neg_sharpe, initial_guess, method='SLSQP', jac=True,
                          bounds=bounds, constraints=constraints)
         
         return result.x
     
     def _minimize_variance(self, returns_df: pd.DataFrame) -> np.ndarray:
         """Minimize portfolio variance (conservative approach)"""
-        cov_matrix = returns_df.cov() * 252
+        cov_matrix, cov_matvec = self._risk_model(returns_df)
         n_assets = len(returns_df.columns)
         
+        frontier = self._frontier(returns_df.mean().values * 252, cov_matrix)
+        if frontier is not None:
+            return frontier.min_variance()
+        
         def portfolio_variance(weights):
-            return np.dot(weights.T, np.dot(cov_matrix, weights))
+            sigma_w = cov_matvec(weights)
+            return np.dot(weights, sigma_w), 2 * sigma_w
         
         constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
         bounds = tuple((0, 1) for _ in range(n_assets))
         initial_guess = np.array([1/n_assets] * n_assets)
         
-        result = minimize(portfolio_variance, initial_guess, method='SLSQP',
+        result = minimize(portfolio_variance, initial_guess, method='SLSQP', jac=True,
                          bounds=bounds, constraints=constraints)
         
         return result.x
@@ -198,25 +252,28 @@ class PortfolioOptimizer:
         """
         Risk Parity allocation (Bridgewater's All Weather Portfolio)
         Equal risk contribution from each asset
+        
+        Solved as min ½y'Σy - (1/n)·Σ log y (Spinu, 2013); the normalized
+        optimum has equal risk contributions and is strictly positive, so it
+        also works for universes too large for a fixed 1% floor.
         """
-        cov_matrix = returns_df.cov() * 252
+        cov_matrix, cov_matvec = self._risk_model(returns_df)
         n_assets = len(returns_df.columns)
+        budget = 1.0 / n_assets
         
-        def risk_parity_objective(weights):
-            portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-            marginal_contrib = np.dot(cov_matrix, weights) / portfolio_vol
-            risk_contrib = weights * marginal_contrib
-            target = portfolio_vol / n_assets
-            return np.sum((risk_contrib - target) ** 2)
+        def risk_parity_objective(y):
+            sigma_y = cov_matvec(y)
+            value = 0.5 * np.dot(y, sigma_y) - budget * np.sum(np.log(y))
+            return value, sigma_y - budget / y
         
-        constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
-        bounds = tuple((0.01, 1) for _ in range(n_assets))  # Min 1% per asset
-        initial_guess = np.array([1/n_assets] * n_assets)
+        initial_guess = 1.0 / np.sqrt(np.maximum(np.diag(cov_matrix), 1e-300))
+        initial_guess /= np.sqrt(np.dot(initial_guess, cov_matvec(initial_guess)))
+        bounds = tuple((1e-12, None) for _ in range(n_assets))
         
-        result = minimize(risk_parity_objective, initial_guess, method='SLSQP',
-                         bounds=bounds, constraints=constraints)
+        result = minimize(risk_parity_objective, initial_guess, method='L-BFGS-B', jac=True,
+                         bounds=bounds, options={'gtol': 1e-12, 'ftol': 1e-15, 'maxiter': 1000})
         
-        return result.x
+        return result.x / result.x.sum()
     
     def _equal_weight_portfolio(self, returns_df: pd.DataFrame) -> Dict[str, float]:
         """Fallback: equal weight allocation"""
@@ -340,34 +397,57 @@ class PortfolioOptimizer:
         if not SCIPY_AVAILABLE:
             return pd.DataFrame({'risk': [0], 'return': [0]})
         
-        mean_returns = returns_df.mean() * 252
-        cov_matrix = returns_df.cov() * 252
+        mean_returns = returns_df.mean().values * 252
+        cov_matrix, cov_matvec = self._risk_model(returns_df)
         n_assets = len(returns_df.columns)
         
         target_returns = np.linspace(mean_returns.min(), mean_returns.max(), n_points)
         efficient_portfolios = []
         
+        # Interpolacja po punktach zwrotnych: gałąź górna z μ, dolna (cele poniżej
+        # portfela min-variance) to front efektywny dla -μ
+        frontier_points = {}
+        upper = self._frontier(mean_returns, cov_matrix)
+        lower = self._frontier(-mean_returns, cov_matrix) if upper is not None else None
+        if lower is not None:
+            on_upper = target_returns >= upper.min_return
+            weights = np.vstack([
+                upper.weights_for_returns(target_returns[on_upper]),
+                lower.weights_for_returns(-target_returns[~on_upper])
+            ])
+            targets = np.concatenate([target_returns[on_upper], target_returns[~on_upper]])
+            variances = np.einsum('ij,ij->i', weights, cov_matvec(weights.T).T)
+            frontier_points = dict(zip(targets, np.sqrt(variances)))
+            target_returns = target_returns[:0]
+        
+        def portfolio_variance(weights):
+            sigma_w = cov_matvec(weights)
+            return np.dot(weights, sigma_w), 2 * sigma_w
+        
+        bounds = tuple((0, 1) for _ in range(n_assets))
+        initial_guess = np.array([1/n_assets] * n_assets)
+        
         for target in target_returns:
-            def portfolio_variance(weights):
-                return np.dot(weights.T, np.dot(cov_matrix, weights))
-            
             constraints = [
                 {'type': 'eq', 'fun': lambda x: np.sum(x) - 1},
-                {'type': 'eq', 'fun': lambda x: np.sum(mean_returns * x) - target}
+                {'type': 'eq', 'fun': lambda x, t=target: np.dot(mean_returns, x) - t,
+                 'jac': lambda x: mean_returns}
             ]
-            bounds = tuple((0, 1) for _ in range(n_assets))
-            initial_guess = np.array([1/n_assets] * n_assets)
             
             try:
-                result = minimize(portfolio_variance, initial_guess, 
-                                method='SLSQP', bounds=bounds, constraints=constraints)
+                result = minimize(portfolio_variance, initial_guess, method='SLSQP', jac=True,
+                                bounds=bounds, constraints=constraints)
                 if result.success:
-                    vol = np.sqrt(portfolio_variance(result.x))
+                    vol = np.sqrt(portfolio_variance(result.x)[0])
                     efficient_portfolios.append({'risk': vol, 'return': target})
+                    initial_guess = result.x  # warm start kolejnego celu
             except:
                 continue
         
-        return pd.DataFrame(efficient_portfolios)
+        efficient_portfolios.extend({'risk': vol, 'return': target} for target, vol in frontier_points.items())
+        if not efficient_portfolios:
+            return pd.DataFrame(columns=['risk', 'return'])
+        return pd.DataFrame(efficient_portfolios).sort_values('return', ignore_index=True)
 
 
 # Global instance
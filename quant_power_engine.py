@@ -34,6 +34,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
 import warnings
+
+from genius_drawdown import max_drawdown
 warnings.filterwarnings('ignore')
 
 logging.basicConfig(level=logging.INFO)
@@ -90,6 +92,13 @@ try:
 except ImportError:
     AVAILABLE_LIBS['arch'] = False
 
+# Streaming risk (Welford + ogon/szkic kwantyli z genius_risk_engine)
+try:
+    from genius_risk_engine import StreamingRiskAccumulator
+    AVAILABLE_LIBS['streaming_risk'] = True
+except ImportError:
+    AVAILABLE_LIBS['streaming_risk'] = False
+
 
 # ═══════════════════════════════════════════════════════════════
 # DATA STRUCTURES
@@ -243,9 +252,7 @@ class FFNAnalyzer:
     
     def _calculate_max_drawdown(self, prices: pd.Series) -> float:
         """Oblicz Max Drawdown"""
-        peak = prices.expanding(min_periods=1).max()
-        drawdown = (prices - peak) / peak
-        return float(drawdown.min())
+        return max_drawdown(prices.values)
     
     def _calculate_calmar(self, prices: pd.Series) -> float:
         """Oblicz Calmar Ratio (CAGR / Max Drawdown)"""
@@ -267,6 +274,9 @@ class RiskAnalyzer:
     
     def __init__(self):
         self.scipy_available = AVAILABLE_LIBS.get('scipy', False)
+        self._streams: Dict[str, Dict[str, Any]] = {}
+        # Kwantyle normalne liczone raz - parametryczny VaR na żywo to jedno mnożenie
+        self._z = {c: float(stats.norm.ppf(1 - c)) for c in (0.95, 0.99)} if self.scipy_available else {}
     
     def calculate_var(self, returns: pd.Series, confidence: float = 0.95) -> float:
         """
@@ -338,6 +348,73 @@ class RiskAnalyzer:
             beta=beta,
             correlation_eth=corr
         )
+    
+    def update_price(self, price: float, symbol: str = 'BTC') -> Optional[RiskMetrics]:
+        """
+        Live wariant analyze_risk - bez przeliczania historii na każdą nową cenę.
+        
+        Momenty, drawdown i zmienność aktualizowane w O(1); CVaR z ograniczonego
+        ogona najmniejszych zwrotów akumulatora (dokładny, dopóki próg VaR mieści
+        się w ogonie, dalej ze szkicu log-kubełkowego) - pamięć nie rośnie z historią.
+        Pierwsza cena tylko otwiera strumień (brak zwrotu) - zwraca None.
+        Beta / korelacja nie są liczone strumieniowo (1.0 / 0.0 jak bez benchmarku).
+        """
+        if not AVAILABLE_LIBS.get('streaming_risk'):
+            raise RuntimeError("genius_risk_engine not available - use analyze_risk")
+        
+        state = self._streams.get(symbol)
+        if state is None:
+            self._streams[symbol] = {
+                'last_price': float(price),
+                'full': StreamingRiskAccumulator(),
+                'vol_30d': StreamingRiskAccumulator(window=30),
+                'vol_7d': StreamingRiskAccumulator(window=7)
+            }
+            return None
+        
+        r = float(price) / state['last_price'] - 1
+        state['last_price'] = float(price)
+        state['full'].update(r)
+        state['vol_30d'].update(r)
+        state['vol_7d'].update(r)
+        return self.stream_metrics(symbol)
+    
+    def update_prices(self, prices: pd.Series, symbol: str = 'BTC') -> Optional[RiskMetrics]:
+        """Zasil strumień historią cen (np. przy starcie bota)"""
+        metrics = None
+        for price in pd.Series(prices).dropna().tolist():
+            metrics = self.update_price(price, symbol)
+        return metrics
+    
+    def stream_metrics(self, symbol: str = 'BTC') -> Optional[RiskMetrics]:
+        """
+        RiskMetrics z bieżącego stanu strumienia (bez przeliczania historii)
+        
+        cvar_95 to średnia zwrotów <= var_95, z tym samym progiem co var_95
+        (parametrycznym ze scipy, inaczej kwantyl historyczny) - jak calculate_cvar.
+        """
+        state = self._streams.get(symbol)
+        if state is None or state['full'].count < 2:
+            return None
+        
+        full = state['full']
+        if self._z:
+            var_95 = full.mean + self._z[0.95] * full.std
+            var_99 = full.mean + self._z[0.99] * full.std
+        else:
+            var_95, var_99 = full.quantile(0.05), full.quantile(0.01)
+        
+        return RiskMetrics(
+            var_95=float(var_95),
+            var_99=float(var_99),
+            cvar_95=float(full.tail_mean(var_95)[0]),
+            max_drawdown=float(full.max_drawdown),
+            drawdown_duration=full.max_drawdown_duration,
+            volatility_30d=float(state['vol_30d'].std * np.sqrt(252)),
+            volatility_7d=float(state['vol_7d'].std * np.sqrt(252)),
+            beta=1.0,
+            correlation_eth=0.0
+        )
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -23,10 +23,12 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from collections import deque
 import random
 import logging
 import json
+import queue
+import time
+from multiprocessing import shared_memory
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,6 +39,7 @@ try:
     import torch.nn as nn
     import torch.optim as optim
     import torch.nn.functional as F
+    import torch.multiprocessing as mp
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
@@ -53,6 +56,60 @@ except ImportError:
 # TRADING ENVIRONMENT
 # ═══════════════════════════════════════════════════════════════
 
+TRADING_FEATURE_COLUMNS = ['returns', 'volatility', 'rsi', 'macd', 'macd_signal',
+                           'bb_position', 'momentum_5', 'momentum_20', 'volume_ma_ratio', 'atr']
+
+
+def compute_trading_features(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Features TradingEnvironment dla każdego timestep (bez skalowania).
+    
+    Returns:
+        DataFrame z TRADING_FEATURE_COLUMNS + close/high/low, bez wierszy warmup (NaN)
+    """
+    df = data.copy()
+    
+    # Technical indicators
+    df['returns'] = df['close'].pct_change()
+    df['volatility'] = df['returns'].rolling(20).std()
+    
+    # RSI
+    delta = df['close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    df['rsi'] = 100 - (100 / (1 + gain / loss))
+    
+    # MACD
+    df['ema12'] = df['close'].ewm(span=12).mean()
+    df['ema26'] = df['close'].ewm(span=26).mean()
+    df['macd'] = df['ema12'] - df['ema26']
+    df['macd_signal'] = df['macd'].ewm(span=9).mean()
+    
+    # Bollinger Bands position
+    df['sma20'] = df['close'].rolling(20).mean()
+    df['bb_std'] = df['close'].rolling(20).std()
+    df['bb_position'] = (df['close'] - df['sma20']) / (df['bb_std'] * 2)
+    
+    # Momentum
+    df['momentum_5'] = df['close'].pct_change(5)
+    df['momentum_20'] = df['close'].pct_change(20)
+    
+    # Volume
+    if 'volume' in df.columns:
+        df['volume_ma_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
+    else:
+        df['volume_ma_ratio'] = 1.0
+    
+    # ATR
+    high_low = df['high'] - df['low']
+    high_close = np.abs(df['high'] - df['close'].shift())
+    low_close = np.abs(df['low'] - df['close'].shift())
+    tr = np.maximum(high_low, np.maximum(high_close, low_close))
+    df['atr'] = tr.rolling(14).mean() / df['close']
+    
+    return df.dropna()[TRADING_FEATURE_COLUMNS + ['close', 'high', 'low']]
+
+
 class TradingAction(Enum):
     """Możliwe akcje bota"""
     HOLD = 0
@@ -103,7 +160,8 @@ class TradingEnvironment:
                  initial_balance: float = 5000,
                  position_size: float = 50,
                  leverage: int = 100,
-                 fee_rate: float = 0.0004):
+                 fee_rate: float = 0.0004,
+                 features: Optional[pd.DataFrame] = None):
         """
         Args:
             data: OHLCV DataFrame
@@ -111,8 +169,11 @@ class TradingEnvironment:
             position_size: Wielkość pojedynczej pozycji
             leverage: Dźwignia
             fee_rate: Opłata za transakcję
+            features: Gotowe compute_trading_features (np. zestaw 'rl_trading'
+                      z FeatureStore) - wtedy nie są liczone od nowa
         """
         self.data = data
+        self._precomputed = features
         self.initial_balance = initial_balance
         self.position_size = position_size
         self.leverage = leverage
@@ -126,56 +187,13 @@ class TradingEnvironment:
     
     def _prepare_features(self):
         """Przygotuj features dla każdego timestep"""
-        df = self.data.copy()
-        
-        # Technical indicators
-        df['returns'] = df['close'].pct_change()
-        df['volatility'] = df['returns'].rolling(20).std()
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        df['rsi'] = 100 - (100 / (1 + gain / loss))
-        
-        # MACD
-        df['ema12'] = df['close'].ewm(span=12).mean()
-        df['ema26'] = df['close'].ewm(span=26).mean()
-        df['macd'] = df['ema12'] - df['ema26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        
-        # Bollinger Bands position
-        df['sma20'] = df['close'].rolling(20).mean()
-        df['bb_std'] = df['close'].rolling(20).std()
-        df['bb_position'] = (df['close'] - df['sma20']) / (df['bb_std'] * 2)
-        
-        # Momentum
-        df['momentum_5'] = df['close'].pct_change(5)
-        df['momentum_20'] = df['close'].pct_change(20)
-        
-        # Volume
-        if 'volume' in df.columns:
-            df['volume_ma_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
-        else:
-            df['volume_ma_ratio'] = 1.0
-        
-        # ATR
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        tr = np.maximum(high_low, np.maximum(high_close, low_close))
-        df['atr'] = tr.rolling(14).mean() / df['close']
+        df = self._precomputed if self._precomputed is not None else compute_trading_features(self.data)
         
         # Normalize features
-        feature_cols = ['returns', 'volatility', 'rsi', 'macd', 'macd_signal',
-                       'bb_position', 'momentum_5', 'momentum_20', 'volume_ma_ratio', 'atr']
-        
-        df = df.dropna()
-        
         if self.scaler:
-            self.features = self.scaler.fit_transform(df[feature_cols].values)
+            self.features = self.scaler.fit_transform(df[TRADING_FEATURE_COLUMNS].values)
         else:
-            self.features = df[feature_cols].values
+            self.features = df[TRADING_FEATURE_COLUMNS].values
         
         self.prices = df['close'].values
         self.highs = df['high'].values
@@ -195,17 +213,16 @@ class TradingEnvironment:
             'wyckoff': np.zeros(n, dtype=int)
         }
         
-        # Detect liquidity grabs (simplified)
-        for i in range(20, n):
-            recent_low = min(self.lows[i-20:i])
-            recent_high = max(self.highs[i-20:i])
+        # Detect liquidity grabs (simplified) - okno [i-20, i) dla wszystkich i naraz
+        if n > 20:
+            recent_low = np.lib.stride_tricks.sliding_window_view(self.lows, 20)[:-1].min(axis=1)
+            recent_high = np.lib.stride_tricks.sliding_window_view(self.highs, 20)[:-1].max(axis=1)
+            lows, highs, prices = self.lows[20:], self.highs[20:], self.prices[20:]
             
-            # Bullish liquidity grab
-            if self.lows[i] < recent_low and self.prices[i] > recent_low:
-                self.ict_context['liquidity_grab'][i] = 1
-            # Bearish liquidity grab
-            elif self.highs[i] > recent_high and self.prices[i] < recent_high:
-                self.ict_context['liquidity_grab'][i] = 1
+            # Bullish / Bearish liquidity grab
+            bullish = (lows < recent_low) & (prices > recent_low)
+            bearish = (highs > recent_high) & (prices < recent_high)
+            self.ict_context['liquidity_grab'][20:] = bullish | bearish
     
     def reset(self) -> TradingState:
         """Reset środowiska"""
@@ -366,6 +383,211 @@ class TradingEnvironment:
         return reward
 
 
+class VectorTradingEnvironment:
+    """
+    N niezależnych środowisk krokowanych równolegle (lock-step).
+    
+    Features z _prepare_features liczone są raz na symbol (jeden
+    TradingEnvironment na źródło danych) i sklejane we wspólne tablice;
+    pozycje, P&L i nagrody są tablicami o długości N, a logika step()
+    jest identyczna z TradingEnvironment.step, tylko wyrażona maskami.
+    Zakończone środowiska są automatycznie resetowane.
+    """
+    
+    WARMUP = 50
+    _BUY, _SELL, _CLOSE = TradingAction.BUY.value, TradingAction.SELL.value, TradingAction.CLOSE.value
+    
+    def __init__(self,
+                 envs,
+                 n_envs: int = 16,
+                 episode_length: Optional[int] = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            envs: TradingEnvironment lub lista (np. różne symbole)
+            n_envs: Liczba równoległych środowisk
+            episode_length: Długość epizodu w krokach (None = od warmup do końca danych);
+                            z długością start jest losowany dla każdego epizodu
+            seed: Ziarno losowania źródeł i offsetów startowych
+        """
+        self.sources = envs if isinstance(envs, (list, tuple)) else [envs]
+        base = self.sources[0]
+        self.n_envs = n_envs
+        self.episode_length = episode_length
+        self.rng = np.random.default_rng(seed)
+        
+        self.initial_balance = base.initial_balance
+        self.position_size = base.position_size
+        self.leverage = base.leverage
+        self.fee_rate = base.fee_rate
+        
+        # Wspólne tablice: [features | killzone, liquidity_grab, fvg, wyckoff] dla wszystkich źródeł
+        static, prices, liquidity = [], [], []
+        for env in self.sources:
+            ctx = env.ict_context
+            static.append(np.column_stack([
+                env.features,
+                ctx['killzone'] / 3, ctx['liquidity_grab'], ctx['fvg'], ctx['wyckoff'] / 4
+            ]).astype(np.float32))
+            prices.append(env.prices.astype(np.float64))
+            liquidity.append(ctx['liquidity_grab'] == 1)
+        
+        lengths = np.array([len(p) for p in prices])
+        self._offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        self._last = lengths - 1
+        self._static = np.concatenate(static)
+        self._prices = np.concatenate(prices)
+        self._liquidity = np.concatenate(liquidity)
+        self.n_features = self._static.shape[1] - 4
+        self.state_size = self._static.shape[1] + 3
+        
+        # Stan N środowisk
+        self.source = np.zeros(n_envs, dtype=np.int64)
+        self.step_idx = np.zeros(n_envs, dtype=np.int64)
+        self.end_idx = np.zeros(n_envs, dtype=np.int64)
+        self.balance = np.zeros(n_envs)
+        self.position = np.zeros(n_envs, dtype=np.int64)
+        self.entry_price = np.zeros(n_envs)
+        self.time_in_position = np.zeros(n_envs, dtype=np.int64)
+        self.total_trades = np.zeros(n_envs, dtype=np.int64)
+        self.winning_trades = np.zeros(n_envs, dtype=np.int64)
+        self.total_pnl = np.zeros(n_envs)
+        
+        self.reset()
+    
+    def _reset_envs(self, mask: np.ndarray):
+        """Nowe epizody dla wybranych środowisk (losowe źródło i offset startu)"""
+        n = int(mask.sum())
+        if n == 0:
+            return
+        source = self.rng.integers(0, len(self.sources), size=n)
+        last = self._last[source]
+        if self.episode_length is None:
+            start = np.full(n, self.WARMUP)
+            end = last
+        else:
+            latest = np.maximum(last - self.episode_length, self.WARMUP)
+            start = self.rng.integers(self.WARMUP, latest + 1)
+            end = np.minimum(start + self.episode_length, last)
+        
+        self.source[mask] = source
+        self.step_idx[mask] = start
+        self.end_idx[mask] = end
+        self.balance[mask] = self.initial_balance
+        self.position[mask] = 0
+        self.entry_price[mask] = 0
+        self.time_in_position[mask] = 0
+        self.total_trades[mask] = 0
+        self.winning_trades[mask] = 0
+        self.total_pnl[mask] = 0
+    
+    def reset(self) -> np.ndarray:
+        """Reset wszystkich środowisk -> stany (n_envs, state_size)"""
+        self._reset_envs(np.ones(self.n_envs, dtype=bool))
+        return self._observe()
+    
+    def _pnl_pct(self, price: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Zwrot pozycji w `mask` (0 poza maską, bez dzielenia przez entry_price=0)"""
+        return np.divide(self.position * (price - self.entry_price), self.entry_price,
+                         out=np.zeros(self.n_envs), where=mask)
+    
+    def _unrealized(self, rows: np.ndarray) -> np.ndarray:
+        return self._pnl_pct(self._prices[rows], self.position != 0) * self.leverage
+    
+    def _observe(self) -> np.ndarray:
+        """Stany w układzie TradingState.to_tensor"""
+        rows = self._offsets[self.source] + self.step_idx
+        static = self._static[rows]
+        states = np.empty((self.n_envs, self.state_size), dtype=np.float32)
+        states[:, :self.n_features] = static[:, :self.n_features]
+        states[:, self.n_features] = self.position
+        states[:, self.n_features + 1] = self._unrealized(rows)
+        states[:, self.n_features + 2] = self.time_in_position / 100
+        states[:, self.n_features + 3:] = static[:, self.n_features:]
+        return states
+    
+    def _close(self, mask: np.ndarray, price: np.ndarray) -> np.ndarray:
+        """Zamknij pozycje w `mask` -> reward (0 poza maską)"""
+        mask = mask & (self.position != 0)
+        if not mask.any():
+            return 0.0
+        pnl = self._pnl_pct(price, mask) * self.position_size * self.leverage
+        pnl -= mask * (self.position_size * self.fee_rate)
+        
+        self.balance += pnl
+        self.total_pnl += pnl
+        self.total_trades += mask
+        self.winning_trades += mask & (pnl > 0)
+        self.position[mask] = 0
+        self.entry_price[mask] = 0
+        self.time_in_position[mask] = 0
+        return pnl / self.initial_balance * 10
+    
+    def _open(self, mask: np.ndarray, price: np.ndarray, direction: int):
+        if not mask.any():
+            return
+        self.position[mask] = direction
+        self.entry_price[mask] = price[mask]
+        self.time_in_position[mask] = 0
+        self.balance[mask] -= self.position_size * self.fee_rate
+    
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Krok wszystkich środowisk naraz.
+        
+        Returns:
+            (next_states, rewards, dones, info) - next_states to stany po kroku
+            (dla zakończonych: stan terminalny), info['observations'] to stany
+            do wyboru kolejnej akcji (po auto-resecie)
+        """
+        actions = np.asarray(actions)
+        position = self.position
+        rows = self._offsets[self.source] + self.step_idx
+        price = self._prices[rows]
+        rewards = np.zeros(self.n_envs)
+        
+        # ═══ WYKONAJ AKCJĘ ═══
+        buy = (actions == self._BUY) & (position != 1)
+        sell = (actions == self._SELL) & (position != -1)
+        close = (actions == self._CLOSE) & (position != 0)
+        
+        rewards += self._close((buy & (position == -1)) | (sell & (position == 1)) | close, price)
+        self._open(buy, price, 1)
+        self._open(sell, price, -1)
+        
+        # ═══ NASTĘPNY KROK ═══
+        self.step_idx += 1
+        self.time_in_position += self.position != 0
+        rows += 1
+        price = self._prices[rows]
+        
+        dones = self.step_idx >= self.end_idx
+        rewards += self._close(dones, price)
+        
+        # ═══ REWARD SHAPING ═══ (unrealized = 0 poza pozycją)
+        unrealized = self._unrealized(rows)
+        rewards += np.maximum(unrealized, 0.0) * 0.01
+        rewards -= 0.001 * ((self.time_in_position > 50) & (unrealized < 0))
+        rewards += 0.01 * (self._liquidity[rows] & (buy | sell))
+        
+        next_states = self._observe()
+        win_rate = np.divide(self.winning_trades, self.total_trades,
+                             out=np.zeros(self.n_envs), where=self.total_trades > 0)
+        info = {
+            'balance': self.balance.copy(),
+            'total_pnl': self.total_pnl.copy(),
+            'win_rate': win_rate
+        }
+        
+        if dones.any():
+            self._reset_envs(dones)
+            info['observations'] = self._observe()
+        else:
+            info['observations'] = next_states
+        
+        return next_states, rewards, dones, info
+
+
 # ═══════════════════════════════════════════════════════════════
 # DEEP Q-NETWORK
 # ═══════════════════════════════════════════════════════════════
@@ -424,23 +646,281 @@ if TORCH_AVAILABLE:
 # RL TRADING AGENT
 # ═══════════════════════════════════════════════════════════════
 
+class SumTree:
+    """
+    Drzewo sum priorytetów w płaskiej tablicy (liście na końcu).
+    
+    Zapis i próbkowanie działają na całych batchach: jeden przebieg numpy
+    na poziom drzewa, czyli O(batch · log capacity) bez pętli po elementach.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._leaf_base = 1 << max(int(np.ceil(np.log2(max(capacity, 1)))), 0)
+        self.tree = np.zeros(2 * self._leaf_base, dtype=np.float64)
+    
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+    
+    def update(self, indices: np.ndarray, priorities: np.ndarray):
+        """Ustaw priorytety liści i przelicz sumy w górę drzewa"""
+        nodes = np.asarray(indices, dtype=np.int64) + self._leaf_base
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes >> 1)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes >> 1)
+    
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(indices, dtype=np.int64) + self._leaf_base]
+    
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Indeksy liści, w których przedziały sum skumulowanych wpadają `values`"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self._leaf_base:
+            left = 2 * nodes
+            go_right = values >= self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self._leaf_base, self.capacity - 1)
+
+
 class ReplayBuffer:
-    """Experience Replay Buffer"""
+    """
+    Experience Replay Buffer
     
-    def __init__(self, capacity: int = 100000):
-        self.buffer = deque(maxlen=capacity)
+    Prealokowany bufor cykliczny: stany jako ciągłe tablice float32,
+    akcje / nagrody / flagi końca jako tablice typowane. Próbkowanie to
+    jedno losowanie indeksów i fancy-indexing - bez krotek i zip.
+    """
+    
+    def __init__(self, capacity: int = 100000, state_size: Optional[int] = None,
+                 seed: Optional[int] = None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.size = 0
+        self.states = self.next_states = None
+        if state_size is not None:
+            self._allocate(state_size)
+    
+    def _allocate(self, state_size: int):
+        self.states = np.zeros((self.capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((self.capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(self.capacity, dtype=np.int64)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=np.float32)
     
     def push(self, state, action, reward, next_state, done):
-        self.buffer.append((state, action, reward, next_state, done))
+        self.push_batch(
+            np.asarray(state)[None], np.asarray([action]), np.asarray([reward]),
+            np.asarray(next_state)[None], np.asarray([done])
+        )
+    
+    def push_batch(self, states, actions, rewards, next_states, dones) -> np.ndarray:
+        """Zapisz n przejść naraz (np. z wektorowego środowiska); zwraca użyte sloty"""
+        states = np.asarray(states, dtype=np.float32)
+        if self.states is None:
+            self._allocate(states.shape[1])
+        
+        n = len(states)
+        slots = (self.position + np.arange(n)) % self.capacity
+        self.states[slots] = states
+        self.next_states[slots] = next_states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.dones[slots] = dones
+        
+        self.position = int((self.position + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        return slots
+    
+    def _gather(self, indices: np.ndarray):
+        return (self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices])
     
     def sample(self, batch_size: int):
-        batch = random.sample(self.buffer, batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
-        return (np.array(states), np.array(actions), np.array(rewards),
-                np.array(next_states), np.array(dones))
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        return self._gather(indices)
     
     def __len__(self):
-        return len(self.buffer)
+        return self.size
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Prioritized Experience Replay (Schaul et al., 2016)
+    
+    Przejścia losowane proporcjonalnie do |TD error|^alpha z drzewa sum;
+    sample() zwraca dodatkowo wagi importance-sampling i indeksy do
+    update_priorities().
+    """
+    
+    def __init__(self, capacity: int = 100000, state_size: Optional[int] = None,
+                 alpha: float = 0.6, beta: float = 0.4, beta_increment: float = 1e-4,
+                 epsilon: float = 1e-6, seed: Optional[int] = None):
+        super().__init__(capacity, state_size, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+    
+    def push_batch(self, states, actions, rewards, next_states, dones) -> np.ndarray:
+        slots = super().push_batch(states, actions, rewards, next_states, dones)
+        # Nowe przejścia z maksymalnym priorytetem - każde zostanie choć raz wylosowane
+        self.tree.update(slots, np.full(len(slots), self.max_priority ** self.alpha))
+        return slots
+    
+    def sample(self, batch_size: int):
+        # Próbkowanie warstwowe: po jednym losowaniu na segment sumy priorytetów
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        indices = np.minimum(self.tree.find(np.minimum(values, total * (1 - 1e-12))), self.size - 1)
+        
+        probs = self.tree.get(indices) / total
+        weights = (self.size * np.maximum(probs, 1e-12)) ** (-self.beta)
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        
+        return self._gather(indices) + (weights, indices)
+    
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+
+class SharedTransitionRing:
+    """
+    Pierścień przejść w pamięci współdzielonej (jeden worker -> learner).
+    
+    Worker zapisuje batch, a dopiero potem przesuwa licznik zapisu w nagłówku;
+    learner kopiuje nowe wiersze do swojego ReplayBuffer. Czytana jest co
+    najwyżej połowa pojemności, żeby worker miał zapas przed nadpisaniem
+    czytanych wierszy - gdy learner nie nadąża, najstarsze przejścia przepadają.
+    """
+    
+    def __init__(self, capacity: int, state_size: int, name: Optional[str] = None):
+        """
+        Args:
+            capacity: Liczba przejść w pierścieniu
+            state_size: Rozmiar wektora stanu
+            name: Nazwa istniejącego bloku (worker) lub None (learner tworzy nowy)
+        """
+        self.capacity = capacity
+        self.state_size = state_size
+        
+        row_bytes = 2 * state_size * 4 + 8 + 4 + 4
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None,
+                                              size=8 + capacity * row_bytes)
+        
+        # Układ bloku: [licznik zapisu | states | next_states | actions | rewards | dones]
+        offset = 0
+        def view(dtype, shape):
+            nonlocal offset
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            offset += array.nbytes
+            return array
+        
+        self._written = view(np.int64, (1,))
+        self.states = view(np.float32, (capacity, state_size))
+        self.next_states = view(np.float32, (capacity, state_size))
+        self.actions = view(np.int64, (capacity,))
+        self.rewards = view(np.float32, (capacity,))
+        self.dones = view(np.float32, (capacity,))
+        
+        if name is None:
+            self._written[0] = 0
+    
+    @property
+    def name(self) -> str:
+        return self.shm.name
+    
+    def write(self, states, actions, rewards, next_states, dones):
+        """Dopisz batch przejść (wywołuje worker)"""
+        head = int(self._written[0])
+        slots = (head + np.arange(len(actions))) % self.capacity
+        self.states[slots] = states
+        self.next_states[slots] = next_states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.dones[slots] = dones
+        self._written[0] = head + len(actions)
+    
+    def read(self, cursor: int) -> Tuple[Optional[Tuple], int]:
+        """
+        Nowe przejścia od pozycji `cursor` (wywołuje learner).
+        
+        Returns:
+            (batch lub None, nowy cursor)
+        """
+        written = int(self._written[0])
+        start = max(cursor, written - self.capacity // 2)
+        if start >= written:
+            return None, written
+        
+        slots = np.arange(start, written) % self.capacity
+        batch = (self.states[slots], self.actions[slots], self.rewards[slots],
+                 self.next_states[slots], self.dones[slots])
+        return batch, written
+    
+    def close(self, unlink: bool = False):
+        # Widoki numpy trzymają bufor - zwolnij je przed zamknięciem bloku
+        self._written = self.states = self.next_states = None
+        self.actions = self.rewards = self.dones = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _rollout_worker(envs, n_envs: int, episode_length: Optional[int],
+                    ring_name: str, ring_capacity: int, state_size: int, action_size: int,
+                    shared_net, version, epsilon, lock, stats, stop, seed: int):
+    """
+    Proces zbierający doświadczenie: VectorTradingEnvironment + lokalna kopia
+    policy_net, synchronizowana ze współdzielonymi wagami learnera.
+    """
+    torch.set_num_threads(1)
+    env = VectorTradingEnvironment(envs, n_envs=n_envs, episode_length=episode_length, seed=seed)
+    ring = SharedTransitionRing(ring_capacity, state_size, name=ring_name)
+    rng = np.random.default_rng(seed)
+    
+    policy = DQN(state_size, action_size)
+    policy.eval()
+    synced = -1
+    
+    episode_rewards = np.zeros(n_envs)
+    states = env.reset()
+    
+    try:
+        while not stop.is_set():
+            if version.value != synced:
+                with lock:
+                    policy.load_state_dict(shared_net.state_dict())
+                    synced = version.value
+            
+            with torch.no_grad():
+                actions = policy(torch.from_numpy(states)).argmax(1).numpy()
+            explore = rng.random(n_envs) < epsilon.value
+            actions[explore] = rng.integers(0, action_size, size=int(explore.sum()))
+            
+            next_states, rewards, dones, info = env.step(actions)
+            ring.write(states, actions, rewards, next_states, dones)
+            
+            episode_rewards += rewards
+            states = info['observations']
+            for i in np.flatnonzero(dones):
+                stats.put((float(episode_rewards[i]), float(info['total_pnl'][i])))
+                episode_rewards[i] = 0
+    finally:
+        ring.close()
 
 
 class RLTradingAgent:
@@ -459,7 +939,9 @@ class RLTradingAgent:
                  epsilon_min: float = 0.01,
                  epsilon_decay: float = 0.995,
                  batch_size: int = 64,
-                 target_update: int = 10):
+                 target_update: int = 10,
+                 buffer_size: int = 100000,
+                 prioritized: bool = False):
         
         if not TORCH_AVAILABLE:
             raise ImportError("PyTorch required for RL Agent")
@@ -482,7 +964,11 @@ class RLTradingAgent:
         self.target_net.eval()
         
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=learning_rate)
-        self.memory = ReplayBuffer()
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(buffer_size, state_size)
+        else:
+            self.memory = ReplayBuffer(buffer_size, state_size)
+        self.prioritized = prioritized
         
         self.training_step = 0
         self.episode_rewards = []
@@ -513,16 +999,15 @@ class RLTradingAgent:
         if len(self.memory) < self.batch_size:
             return 0
         
-        states, actions, rewards, next_states, dones = self.memory.sample(self.batch_size)
+        batch = self.memory.sample(self.batch_size)
         
-        states = torch.FloatTensor(states).to(self.device)
-        actions = torch.LongTensor(actions).to(self.device)
-        rewards = torch.FloatTensor(rewards).to(self.device)
-        next_states = torch.FloatTensor(next_states).to(self.device)
-        dones = torch.FloatTensor(dones).to(self.device)
+        # Tablice z bufora są już typowane - from_numpy bez kopiowania
+        states, actions, rewards, next_states, dones = (
+            torch.from_numpy(array).to(self.device) for array in batch[:5]
+        )
         
         # Current Q values
-        current_q = self.policy_net(states).gather(1, actions.unsqueeze(1))
+        current_q = self.policy_net(states).gather(1, actions.unsqueeze(1)).squeeze(1)
         
         # Next Q values (from target network)
         with torch.no_grad():
@@ -530,7 +1015,14 @@ class RLTradingAgent:
             target_q = rewards + (1 - dones) * self.gamma * next_q
         
         # Loss
-        loss = F.smooth_l1_loss(current_q.squeeze(), target_q)
+        if self.prioritized:
+            weights, indices = batch[5], batch[6]
+            td_errors = current_q - target_q
+            loss = (torch.from_numpy(weights).to(self.device) *
+                    F.smooth_l1_loss(current_q, target_q, reduction='none')).mean()
+            self.memory.update_priorities(indices, td_errors.detach().cpu().numpy())
+        else:
+            loss = F.smooth_l1_loss(current_q, target_q)
         
         # Optimize
         self.optimizer.zero_grad()
@@ -549,13 +1041,22 @@ class RLTradingAgent:
         """Zmniejsz exploration rate"""
         self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
     
-    def train(self, env: TradingEnvironment, episodes: int = 100) -> Dict:
+    def train(self, env: TradingEnvironment, episodes: int = 100,
+              n_workers: int = 0, **parallel_kwargs) -> Dict:
         """
         Trenuj agenta na środowisku.
         
+        Args:
+            env: TradingEnvironment (lub lista - różne symbole, tylko z n_workers)
+            episodes: Liczba epizodów
+            n_workers: >0 = procesy rolloutów, patrz train_parallel
+        
         Returns:
             Dict z wynikami treningu
         """
+        if n_workers > 0:
+            return self.train_parallel(env, episodes, n_workers=n_workers, **parallel_kwargs)
+        
         logger.info(f"Starting training for {episodes} episodes...")
         
         all_rewards = []
@@ -598,6 +1099,201 @@ class RLTradingAgent:
             'all_pnls': all_pnls
         }
     
+    def select_actions(self, states: np.ndarray, training: bool = True) -> np.ndarray:
+        """
+        Epsilon-greedy dla N środowisk - jeden forward pass policy_net.
+        """
+        n = len(states)
+        with torch.no_grad():
+            self.policy_net.eval()
+            q_values = self.policy_net(torch.from_numpy(np.asarray(states, dtype=np.float32)).to(self.device))
+            self.policy_net.train()
+            actions = q_values.argmax(1).cpu().numpy()
+        
+        if training:
+            explore = np.random.random(n) < self.epsilon
+            actions[explore] = np.random.randint(self.action_size, size=int(explore.sum()))
+        return actions
+    
+    def train_vectorized(self, env: VectorTradingEnvironment, episodes: int = 100,
+                         updates_per_step: int = 1) -> Dict:
+        """
+        Trenuj agenta na N środowiskach równolegle.
+        
+        Przejścia ze wszystkich środowisk trafiają do pamięci jednym push_batch;
+        epsilon maleje po każdym zakończonym epizodzie, jak w train().
+        
+        Args:
+            env: VectorTradingEnvironment
+            episodes: Łączna liczba epizodów (ze wszystkich środowisk)
+            updates_per_step: Kroki uczenia na jeden krok wektorowy
+        
+        Returns:
+            Dict z wynikami treningu
+        """
+        logger.info(f"Starting vectorized training for {episodes} episodes on {env.n_envs} envs...")
+        
+        all_rewards = []
+        all_pnls = []
+        episode_rewards = np.zeros(env.n_envs)
+        states = env.reset()
+        
+        while len(all_rewards) < episodes:
+            actions = self.select_actions(states, training=True)
+            next_states, rewards, dones, info = env.step(actions)
+            
+            self.memory.push_batch(states, actions, rewards, next_states, dones)
+            for _ in range(updates_per_step):
+                self.learn()
+            
+            episode_rewards += rewards
+            states = info['observations']
+            
+            for i in np.flatnonzero(dones):
+                self.decay_epsilon()
+                all_rewards.append(float(episode_rewards[i]))
+                all_pnls.append(float(info['total_pnl'][i]))
+                episode_rewards[i] = 0
+                
+                if len(all_rewards) % 10 == 0:
+                    logger.info(f"Episode {len(all_rewards)}/{episodes} | Avg Reward: {np.mean(all_rewards[-10:]):.2f} | "
+                               f"Avg P&L: ${np.mean(all_pnls[-10:]):.2f} | Epsilon: {self.epsilon:.3f}")
+        
+        return {
+            'episodes': len(all_rewards),
+            'final_epsilon': self.epsilon,
+            'avg_reward': np.mean(all_rewards[-20:]),
+            'avg_pnl': np.mean(all_pnls[-20:]),
+            'best_pnl': max(all_pnls),
+            'all_rewards': all_rewards,
+            'all_pnls': all_pnls
+        }
+    
+    def _publish_weights(self, shared_net, version, lock):
+        """Skopiuj wagi policy_net do pamięci współdzielonej workerów"""
+        with lock:
+            shared_net.load_state_dict(self.policy_net.state_dict())
+            version.value += 1
+    
+    def train_parallel(self, env, episodes: int = 100,
+                       n_workers: int = 2,
+                       envs_per_worker: int = 8,
+                       episode_length: Optional[int] = None,
+                       sync_interval: int = 100,
+                       ring_capacity: int = 65536,
+                       seed: Optional[int] = None) -> Dict:
+        """
+        Trenuj z wieloma procesami rolloutów (CPU, actor-learner).
+        
+        Każdy worker krokuje własny VectorTradingEnvironment kopią policy_net
+        i dopisuje przejścia do pierścienia w pamięci współdzielonej; learner
+        przelewa je do self.memory i bez przerwy wywołuje learn(). Wagi trafiają
+        do workerów co `sync_interval` kroków uczenia, epsilon po każdym epizodzie.
+        Procesy startują metodą 'spawn' - skrypt wywołujący potrzebuje
+        `if __name__ == "__main__":`.
+        
+        Args:
+            env: TradingEnvironment lub lista (różne symbole)
+            episodes: Łączna liczba epizodów ze wszystkich workerów
+            n_workers: Liczba procesów rolloutów
+            envs_per_worker: Środowisk w VectorTradingEnvironment workera
+            episode_length: Długość epizodu (None = cała historia)
+            sync_interval: Co ile kroków learn() publikować wagi
+            ring_capacity: Pojemność pierścienia przejść na workera
+            seed: Ziarno workerów
+        
+        Returns:
+            Dict z wynikami treningu
+        """
+        logger.info(f"Starting parallel training for {episodes} episodes on "
+                   f"{n_workers} workers x {envs_per_worker} envs...")
+        
+        envs = env if isinstance(env, (list, tuple)) else [env]
+        ctx = mp.get_context('spawn')
+        
+        shared_net = DQN(self.state_size, self.action_size)
+        shared_net.load_state_dict(self.policy_net.state_dict())
+        shared_net.share_memory()
+        version = ctx.Value('l', 0)
+        epsilon = ctx.Value('d', self.epsilon)
+        lock = ctx.Lock()
+        stats = ctx.Queue()
+        stop = ctx.Event()
+        
+        seeds = np.random.SeedSequence(seed).generate_state(n_workers)
+        rings = [SharedTransitionRing(ring_capacity, self.state_size) for _ in range(n_workers)]
+        cursors = [0] * n_workers
+        workers = [
+            ctx.Process(target=_rollout_worker, daemon=True, args=(
+                envs, envs_per_worker, episode_length, ring.name, ring_capacity,
+                self.state_size, self.action_size, shared_net, version, epsilon,
+                lock, stats, stop, int(worker_seed)))
+            for ring, worker_seed in zip(rings, seeds)
+        ]
+        
+        all_rewards = []
+        all_pnls = []
+        last_sync = self.training_step
+        
+        try:
+            for worker in workers:
+                worker.start()
+            
+            while len(all_rewards) < episodes:
+                # Przelej nowe przejścia z pierścieni do pamięci learnera
+                for k, ring in enumerate(rings):
+                    batch, cursors[k] = ring.read(cursors[k])
+                    if batch is not None:
+                        self.memory.push_batch(*batch)
+                
+                if len(self.memory) < self.batch_size:
+                    time.sleep(0.01)
+                else:
+                    self.learn()
+                    if self.training_step - last_sync >= sync_interval:
+                        self._publish_weights(shared_net, version, lock)
+                        last_sync = self.training_step
+                
+                # Zakończone epizody -> epsilon decay (jak w train)
+                while True:
+                    try:
+                        reward, pnl = stats.get_nowait()
+                    except queue.Empty:
+                        break
+                    self.decay_epsilon()
+                    all_rewards.append(reward)
+                    all_pnls.append(pnl)
+                    
+                    if len(all_rewards) % 10 == 0:
+                        logger.info(f"Episode {len(all_rewards)}/{episodes} | Avg Reward: {np.mean(all_rewards[-10:]):.2f} | "
+                                   f"Avg P&L: ${np.mean(all_pnls[-10:]):.2f} | Epsilon: {self.epsilon:.3f}")
+                epsilon.value = self.epsilon
+                
+                # Workery działają do stop - wyjście wszystkich przed końcem to awaria
+                # (sprawdzane co iterację, także gdy learner już się uczy)
+                if len(all_rewards) < episodes and not any(worker.is_alive() for worker in workers):
+                    exitcodes = [worker.exitcode for worker in workers]
+                    raise RuntimeError(f"All rollout workers exited (exit codes: {exitcodes}) "
+                                       f"after {len(all_rewards)}/{episodes} episodes")
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            for ring in rings:
+                ring.close(unlink=True)
+        
+        return {
+            'episodes': len(all_rewards),
+            'final_epsilon': self.epsilon,
+            'avg_reward': np.mean(all_rewards[-20:]),
+            'avg_pnl': np.mean(all_pnls[-20:]),
+            'best_pnl': max(all_pnls),
+            'all_rewards': all_rewards,
+            'all_pnls': all_pnls
+        }
+    
     def save(self, path: str):
         """Zapisz model"""
         torch.save({
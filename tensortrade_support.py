@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 
 import numpy as np
 
+from genius_sequence_dataset import SequenceDataset
+
 try:  # TensorFlow / Keras stack
     import tensorflow as tf  # type: ignore
 
@@ -80,16 +82,10 @@ def _build_lstm_model(window_size: int) -> "tf.keras.Model":  # pragma: no cover
     return model
 
 
-def _prepare_sequences(prices: np.ndarray, window_size: int) -> (np.ndarray, np.ndarray):
-    x, y = [], []
-    for idx in range(len(prices) - window_size):
-        window = prices[idx : idx + window_size]
-        target = prices[idx + window_size]
-        x.append(window)
-        y.append(target)
-    x_arr = np.array(x, dtype="float32").reshape(-1, window_size, 1)
-    y_arr = np.array(y, dtype="float32").reshape(-1, 1)
-    return x_arr, y_arr
+def _prepare_sequences(prices: np.ndarray, window_size: int) -> SequenceDataset:
+    """Window ``prices`` so that each window predicts the next close (no copies)."""
+    prices = np.asarray(prices, dtype="float32")
+    return SequenceDataset(prices, window_size, targets=prices.reshape(-1, 1))
 
 
 def run_tensortrade_training(
@@ -135,9 +131,9 @@ def run_tensortrade_training(
         return report.as_dict()
 
     try:
-        x_train, y_train = _prepare_sequences(closes_array, window_size)
+        sequences = _prepare_sequences(closes_array, window_size)
         model = _build_lstm_model(window_size)
-        model.fit(x_train, y_train, epochs=epochs, batch_size=16, verbose=0)
+        model.fit(sequences.to_tf_dataset(16, shuffle=True), epochs=epochs, verbose=0)
 
         last_sequence = closes_array[-window_size:].reshape(1, window_size, 1)
         prediction = float(model.predict(last_sequence, verbose=0)[0][0])
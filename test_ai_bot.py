@@ -110,11 +110,11 @@ print("    ✓ Position sizing works correctly")
 
 # Save and load test
 print("\n[6] Testing brain save/load...")
-brain.save_brain("test_brain.pkl")
+brain.save_brain("test_brain.npz")
 print("    ✓ Brain saved")
 
 new_brain = TradingBrain()
-success = new_brain.load_brain("test_brain.pkl")
+success = new_brain.load_brain("test_brain.npz")
 if success:
     print("    ✓ Brain loaded successfully")
     print(f"    Loaded {new_brain.total_trades} trades from memory")
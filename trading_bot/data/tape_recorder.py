@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tape Recorder / Replayer - zapis i odtwarzanie trade + depth stream
+
+Format pliku (little-endian):
+- nagłówek: b'TAPE', wersja (uint8), długość symbolu (uint8), symbol (ascii)
+- rekordy: długość payloadu (uint32), typ (uint8), czas zdarzenia ms (int64), payload
+
+Typy rekordów:
+- TRADE:    trade_id (int64), price (float64), qty (float64), is_buyer_maker (uint8)
+- DEPTH:    U, u, pu (int64, pu = -1 dla spot), n_bids, n_asks (uint32), poziomy float64 [cena, qty]
+- SNAPSHOT: lastUpdateId (int64), n_bids, n_asks (uint32), poziomy float64 [cena, qty]
+
+Nieznane typy rekordów są pomijane dzięki prefiksowi długości.
+Okresowe snapshoty pozwalają odtworzyć księgę L2 bez REST.
+"""
+
+import asyncio
+import struct
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+import logging
+
+try:
+    from order_flow_engine import LocalOrderBook
+    LOCAL_BOOK_AVAILABLE = True
+except ImportError:
+    LOCAL_BOOK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'TAPE'
+VERSION = 1
+
+REC_TRADE = 1
+REC_DEPTH = 2
+REC_SNAPSHOT = 3
+
+_RECORD_HEADER = struct.Struct('<IBq')
+_TRADE = struct.Struct('<qddB')
+_DEPTH = struct.Struct('<qqqII')
+_SNAPSHOT = struct.Struct('<qII')
+
+
+def _levels_to_bytes(levels) -> bytes:
+    if not len(levels):
+        return b''
+    return np.asarray(levels, dtype=np.float64).reshape(-1, 2).tobytes()
+
+
+def _levels_from_bytes(payload: bytes, offset: int, count: int) -> Tuple[List[List[float]], int]:
+    size = count * 16
+    levels = np.frombuffer(payload, dtype=np.float64, count=count * 2, offset=offset).reshape(-1, 2)
+    return levels.tolist(), offset + size
+
+
+class TapeRecorder:
+    """
+    Zapis live streamów do kompaktowego pliku binarnego.
+
+    Użycie z WebSocketFeed:
+        recorder = TapeRecorder('btc.tape', 'btcusdt', book=feed.local_book)
+        feed.add_callback(recorder.on_trade)
+        feed.add_depth_callback(recorder.on_depth)
+    """
+
+    def __init__(self,
+                 path: str,
+                 symbol: str,
+                 book: 'LocalOrderBook' = None,
+                 snapshot_interval_s: float = 60.0,
+                 flush_every: int = 500):
+        self.path = Path(path)
+        self.symbol = symbol.upper()
+        self.book = book
+        self.snapshot_interval_ms = int(snapshot_interval_s * 1000)
+        self.flush_every = flush_every
+
+        self.records_written = 0
+        self.bytes_written = 0
+        self._last_snapshot_ms: Optional[int] = None
+        self._last_snapshot_id: Optional[int] = None
+
+        self._file = open(self.path, 'wb')
+        symbol_bytes = self.symbol.encode('ascii')
+        self._write_raw(MAGIC + struct.pack('<BB', VERSION, len(symbol_bytes)) + symbol_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write_raw(self, data: bytes):
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def _write_record(self, rec_type: int, ts_ms: int, payload: bytes):
+        self._write_raw(_RECORD_HEADER.pack(len(payload), rec_type, int(ts_ms)) + payload)
+        self.records_written += 1
+        if self.records_written % self.flush_every == 0:
+            self._file.flush()
+
+    # ------------------------------------------------------------------
+    # Zapis zdarzeń
+    # ------------------------------------------------------------------
+
+    def record_trade(self, ts_ms: int, price: float, qty: float, is_buyer_maker: bool, trade_id: int = -1):
+        self._write_record(REC_TRADE, ts_ms, _TRADE.pack(int(trade_id), price, qty, int(bool(is_buyer_maker))))
+
+    def record_depth(self, msg: Dict):
+        """Zapisz surowe zdarzenie depthUpdate Binance (U/u/[pu]/b/a)"""
+        bids, asks = msg.get('b', []), msg.get('a', [])
+        payload = (
+            _DEPTH.pack(msg['U'], msg['u'], msg.get('pu', -1), len(bids), len(asks))
+            + _levels_to_bytes(bids) + _levels_to_bytes(asks)
+        )
+        self._write_record(REC_DEPTH, msg.get('E', int(time.time() * 1000)), payload)
+
+    def record_snapshot(self, last_update_id: int, bids: List, asks: List, ts_ms: int = None):
+        payload = (
+            _SNAPSHOT.pack(int(last_update_id), len(bids), len(asks))
+            + _levels_to_bytes(bids) + _levels_to_bytes(asks)
+        )
+        if ts_ms is None:
+            ts_ms = int(time.time() * 1000)
+        self._write_record(REC_SNAPSHOT, ts_ms, payload)
+        self._last_snapshot_ms = ts_ms
+        self._last_snapshot_id = last_update_id
+
+    def snapshot_book(self, ts_ms: int = None):
+        """Zapisz pełny stan lokalnej księgi (musi być zsynchronizowana)"""
+        book = self.book
+        self.record_snapshot(
+            book.last_update_id,
+            book.bids.top(len(book.bids)),
+            book.asks.top(len(book.asks)),
+            ts_ms
+        )
+
+    # ------------------------------------------------------------------
+    # Callbacki WebSocketFeed
+    # ------------------------------------------------------------------
+
+    def on_trade(self, trade: Dict):
+        """Callback dla WebSocketFeed.add_callback (sparsowany trade)"""
+        ts_ms = trade.get('time_ms')
+        if ts_ms is None:
+            ts_ms = int(time.time() * 1000)
+        self.record_trade(ts_ms, trade['price'], trade['quantity'], trade['is_buyer_maker'],
+                          trade.get('trade_id', -1))
+
+    def on_depth(self, msg: Dict):
+        """
+        Callback dla WebSocketFeed.add_depth_callback (surowy diff, po
+        zastosowaniu w księdze). Co snapshot_interval_s zapisuje snapshot.
+        """
+        self.record_depth(msg)
+
+        book = self.book
+        if book is None or not book.synced or book.last_update_id == self._last_snapshot_id:
+            return
+        ts_ms = msg.get('E', int(time.time() * 1000))
+        if self._last_snapshot_ms is None or ts_ms - self._last_snapshot_ms >= self.snapshot_interval_ms:
+            self.snapshot_book(ts_ms)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+            logger.info(f"📼 Tape saved: {self.path} ({self.records_written} records, "
+                        f"{self.bytes_written / 1024:.1f} KB)")
+
+
+class TapeReplayer:
+    """
+    Odtwarzanie pliku z TapeRecorder jako zamiennik giełdy.
+
+    Wywołuje te same callbacki co WebSocketFeed.add_callback (trade dict)
+    oraz add_depth_callback (surowy diff), utrzymując własną LocalOrderBook.
+    speed: 1.0 = czas rzeczywisty, 10.0 = 10x szybciej, None = bez czekania.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None):
+        self.path = Path(path)
+        self.speed = speed
+
+        with open(self.path, 'rb') as f:
+            header = f.read(6)
+            if header[:4] != MAGIC:
+                raise ValueError(f"{self.path} is not a tape file")
+            self.version, symbol_len = struct.unpack('<BB', header[4:6])
+            self.symbol = f.read(symbol_len).decode('ascii')
+            self._data_offset = 6 + symbol_len
+
+        self.callbacks: List[Callable] = []
+        self.depth_callbacks: List[Callable] = []
+        # Bez order_flow_engine odtwarzane są tylko trade'y (depth/snapshoty pomijane)
+        self.local_book = LocalOrderBook(self.symbol) if LOCAL_BOOK_AVAILABLE else None
+        self.price_buffer = deque(maxlen=1000)
+        self.last_price = None
+        self.events_replayed = 0
+
+    def add_callback(self, callback: Callable):
+        """Callback dla trade'ów (format WebSocketFeed)"""
+        self.callbacks.append(callback)
+
+    def add_depth_callback(self, callback: Callable):
+        """Callback dla diffów depth (po zastosowaniu w local_book)"""
+        self.depth_callbacks.append(callback)
+
+    # ------------------------------------------------------------------
+    # Odczyt
+    # ------------------------------------------------------------------
+
+    def _decode(self, rec_type: int, ts_ms: int, payload: bytes) -> Optional[Dict]:
+        if rec_type == REC_TRADE:
+            trade_id, price, qty, maker = _TRADE.unpack_from(payload)
+            return {
+                'symbol': self.symbol,
+                'price': price,
+                'quantity': qty,
+                'timestamp': pd.Timestamp.fromtimestamp(ts_ms / 1000),
+                'is_buyer_maker': bool(maker),
+                'time_ms': ts_ms,
+                'trade_id': trade_id
+            }
+
+        if rec_type == REC_DEPTH:
+            first_id, final_id, prev_id, n_bids, n_asks = _DEPTH.unpack_from(payload)
+            bids, offset = _levels_from_bytes(payload, _DEPTH.size, n_bids)
+            asks, _ = _levels_from_bytes(payload, offset, n_asks)
+            msg = {'e': 'depthUpdate', 'E': ts_ms, 's': self.symbol,
+                   'U': first_id, 'u': final_id, 'b': bids, 'a': asks}
+            if prev_id >= 0:
+                msg['pu'] = prev_id
+            return msg
+
+        if rec_type == REC_SNAPSHOT:
+            last_update_id, n_bids, n_asks = _SNAPSHOT.unpack_from(payload)
+            bids, offset = _levels_from_bytes(payload, _SNAPSHOT.size, n_bids)
+            asks, _ = _levels_from_bytes(payload, offset, n_asks)
+            return {'lastUpdateId': last_update_id, 'bids': bids, 'asks': asks}
+
+        return None
+
+    def iter_events(self) -> Iterator[Tuple[int, int, Dict]]:
+        """Generator (typ, czas ms, zdarzenie) w kolejności zapisu"""
+        header_size = _RECORD_HEADER.size
+        with open(self.path, 'rb') as f:
+            f.seek(self._data_offset)
+            while True:
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    break
+                length, rec_type, ts_ms = _RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    logger.warning(f"Truncated record at end of {self.path}")
+                    break
+                event = self._decode(rec_type, ts_ms, payload)
+                if event is not None:
+                    yield rec_type, ts_ms, event
+
+    # ------------------------------------------------------------------
+    # Odtwarzanie
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, rec_type: int, event: Dict, notify: bool = True):
+        if rec_type == REC_TRADE:
+            self.last_price = event['price']
+            self.price_buffer.append(event)
+            callbacks = self.callbacks
+        elif self.local_book is None:
+            return
+        elif rec_type == REC_DEPTH:
+            self.local_book.apply_diff(event)
+            callbacks = self.depth_callbacks
+        else:
+            # Snapshot tylko gdy księga wymaga (re)synchronizacji
+            if self.local_book.needs_snapshot:
+                self.local_book.load_snapshot(event['lastUpdateId'], event['bids'], event['asks'])
+            return
+
+        if not notify:
+            return
+        self.events_replayed += 1
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
+
+    def _delays(self, start_ms: int = None, end_ms: int = None) -> Iterator[Tuple[int, Dict, bool, float]]:
+        """(typ, zdarzenie, czy wywołać callbacki, opóźnienie w s przed zdarzeniem)"""
+        prev_ms = None
+        for rec_type, ts_ms, event in self.iter_events():
+            if end_ms is not None and ts_ms > end_ms:
+                break
+            # Przed start_ms tylko budujemy stan księgi
+            if start_ms is not None and ts_ms < start_ms:
+                yield rec_type, event, False, 0.0
+                continue
+            delay = 0.0
+            if self.speed and prev_ms is not None and ts_ms > prev_ms:
+                delay = (ts_ms - prev_ms) / 1000.0 / self.speed
+            prev_ms = ts_ms
+            yield rec_type, event, True, delay
+
+    def replay(self, start_ms: int = None, end_ms: int = None) -> int:
+        """Odtwórz synchronicznie; zwraca liczbę zdarzeń przekazanych do callbacków"""
+        self.events_replayed = 0
+        for rec_type, event, notify, delay in self._delays(start_ms, end_ms):
+            if delay > 0:
+                time.sleep(delay)
+            self._dispatch(rec_type, event, notify)
+        return self.events_replayed
+
+    async def listen(self, start_ms: int = None, end_ms: int = None) -> int:
+        """Asynchroniczny odpowiednik WebSocketFeed.listen"""
+        self.events_replayed = 0
+        for rec_type, event, notify, delay in self._delays(start_ms, end_ms):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._dispatch(rec_type, event, notify)
+        return self.events_replayed
+
+    def get_current_price(self) -> float:
+        return self.last_price if self.last_price else 0
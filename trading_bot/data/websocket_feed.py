@@ -8,12 +8,19 @@ Dla scalpingu 5m i niskiej latencji
 import asyncio
 import json
 import websockets
+import requests
 import pandas as pd
 from datetime import datetime
 from typing import Callable, Dict
 from collections import deque
 import logging
 
+try:
+    from order_flow_engine import LocalOrderBook, register_local_book
+    LOCAL_BOOK_AVAILABLE = True
+except ImportError:
+    LOCAL_BOOK_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,14 +43,20 @@ class WebSocketFeed:
         self.running = False
         self.price_buffer = deque(maxlen=1000)
         self.callbacks = []
+        self.depth_callbacks = []
         self.last_price = None
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
+        self.local_book = LocalOrderBook(self.symbol) if LOCAL_BOOK_AVAILABLE else None
         
     def add_callback(self, callback: Callable):
         """Dodaj callback dla nowych danych"""
         self.callbacks.append(callback)
     
+    def add_depth_callback(self, callback: Callable):
+        """Dodaj callback dla surowych diffów depth (po aktualizacji local_book)"""
+        self.depth_callbacks.append(callback)
+    
     async def connect(self):
         """Połącz z WebSocket"""
         # Binance WebSocket URL
@@ -85,7 +98,9 @@ class WebSocketFeed:
                     'price': float(data.get('p', 0)),
                     'quantity': float(data.get('q', 0)),
                     'timestamp': pd.Timestamp.fromtimestamp(data.get('T', 0) / 1000),
-                    'is_buyer_maker': data.get('m', False)
+                    'is_buyer_maker': data.get('m', False),
+                    'time_ms': data.get('T', 0),
+                    'trade_id': data.get('t', -1)
                 }
                 
                 self.last_price = trade['price']
@@ -130,6 +145,63 @@ class WebSocketFeed:
         except Exception as e:
             logger.error(f"OrderBook error: {e}")
     
+    async def subscribe_depth_diff(self, snapshot_limit: int = 1000, analyze_levels: int = 20):
+        """
+        Subscribe do diff depth stream - lokalny L2 order book.
+        
+        Snapshot REST pobierany tylko przy starcie i po wykryciu luki w sekwencji.
+        """
+        if not LOCAL_BOOK_AVAILABLE:
+            logger.error("order_flow_engine not importable - run from the project root for the local order book")
+            return
+        
+        depth_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@depth@100ms"
+        register_local_book(self.local_book)
+        loop = asyncio.get_running_loop()
+        snapshot_task = None
+        
+        try:
+            self.depth_ws = await websockets.connect(depth_url)
+            logger.info("✅ Depth diff WebSocket connected!")
+            
+            while self.running:
+                message = await self.depth_ws.recv()
+                diff = json.loads(message)
+                applied = self.local_book.apply_diff(diff)
+                
+                for callback in self.depth_callbacks:
+                    try:
+                        callback(diff)
+                    except Exception as e:
+                        logger.error(f"Depth callback error: {e}")
+                
+                if self.local_book.needs_snapshot:
+                    if snapshot_task is None:
+                        snapshot_task = loop.run_in_executor(None, self._fetch_depth_snapshot, snapshot_limit)
+                    elif snapshot_task.done():
+                        try:
+                            snapshot = snapshot_task.result()
+                            self.local_book.load_snapshot(snapshot['lastUpdateId'], snapshot['bids'], snapshot['asks'])
+                            logger.info(f"📖 Local order book synced @ {self.local_book.last_update_id}")
+                        except Exception as e:
+                            logger.error(f"Depth snapshot error: {e}")
+                        snapshot_task = None
+                elif applied:
+                    self._analyze_orderbook(self.local_book.top_levels(analyze_levels))
+                
+        except Exception as e:
+            logger.error(f"Depth diff error: {e}")
+    
+    def _fetch_depth_snapshot(self, limit: int = 1000) -> Dict:
+        """Jednorazowy snapshot REST do (re)synchronizacji lokalnej księgi"""
+        response = requests.get(
+            'https://api.binance.com/api/v3/depth',
+            params={'symbol': self.symbol.upper(), 'limit': limit},
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    
     def _analyze_orderbook(self, orderbook: Dict):
         """
         Analiza orderbook - wykryj bid/ask walls
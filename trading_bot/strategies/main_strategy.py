@@ -88,6 +88,36 @@ class TradingStrategy:
         
         return {'signals': signals, 'count': len(signals)}
     
+    def label_liquidity_grabs(self, df: pd.DataFrame,
+                              liquidity_levels: Dict) -> pd.DataFrame:
+        """
+        Liquidity Grab dla każdej świecy całej historii (wektorowo).
+        
+        Liczba poziomów EQL/EQH zebranych na danej świecy - to samo co
+        detect_liquidity_grab wywołane per świeca, ale przez searchsorted
+        po posortowanych poziomach zamiast pętli.
+        """
+        lows = df['low'].values.astype(float)
+        highs = df['high'].values.astype(float)
+        closes = df['close'].values.astype(float)
+        
+        eql = np.sort(np.asarray(liquidity_levels.get('equal_lows', []), dtype=float))
+        eqh = np.sort(np.asarray(liquidity_levels.get('equal_highs', []), dtype=float))
+        
+        # LONG: low < eql < close
+        long_count = np.clip(
+            np.searchsorted(eql, closes, side='left') - np.searchsorted(eql, lows, side='right'), 0, None
+        )
+        # SHORT: close < eqh < high
+        short_count = np.clip(
+            np.searchsorted(eqh, highs, side='left') - np.searchsorted(eqh, closes, side='right'), 0, None
+        )
+        
+        return pd.DataFrame({
+            'grab_long': long_count,
+            'grab_short': short_count
+        }, index=df.index)
+    
     def detect_fvg_strategy(self, df: pd.DataFrame, fvg_data: pd.DataFrame) -> List[Dict]:
         """
         FVG (Fair Value Gap) Strategy
@@ -180,6 +210,29 @@ class TradingStrategy:
         
         return {'trap': None}
     
+    def label_bull_bear_traps(self, df: pd.DataFrame, lookback: int = 20) -> pd.Series:
+        """
+        BULL/BEAR TRAP dla każdej świecy całej historii (rolling zamiast
+        detect_bull_bear_trap per świeca). Wartości: 'BULL_TRAP', 'BEAR_TRAP', None.
+        """
+        high = df['high'].astype(float)
+        low = df['low'].astype(float)
+        close = df['close'].values.astype(float)
+        volume = df['volume'].astype(float)
+        
+        resistance = high.rolling(lookback).quantile(0.95).values
+        support = low.rolling(lookback).quantile(0.05).values
+        low_volume = volume.values < volume.rolling(lookback).mean().values * 0.8
+        
+        prev_high = high.shift(1).values
+        prev_low = low.shift(1).values
+        
+        bull_trap = (prev_high > resistance) & (close < resistance) & low_volume
+        bear_trap = (prev_low < support) & (close > support) & low_volume
+        
+        traps = np.select([bull_trap, bear_trap], ['BULL_TRAP', 'BEAR_TRAP'], default=None)
+        return pd.Series(traps, index=df.index, dtype=object, name='trap')
+    
     def wyckoff_phase_detection(self, df: pd.DataFrame, lookback: int = 100) -> str:
         """
         WYCKOFF METHOD - Phase Detection
@@ -218,6 +271,42 @@ class TradingStrategy:
         
         return 'NEUTRAL'
     
+    def label_wyckoff_phases(self, df: pd.DataFrame, lookback: int = 100) -> pd.Series:
+        """
+        Faza Wyckoffa dla każdej świecy całej historii - okno `lookback`
+        kończące się na świecy, liczone operacjami rolling (jak
+        wyckoff_phase_detection per świeca). Pierwsze lookback-1 świec: 'UNKNOWN'.
+        """
+        close = df['close'].astype(float)
+        volume = df['volume'].astype(float)
+        
+        price = close.values
+        price_change = (price - close.shift(lookback - 1).values) / close.shift(lookback - 1).values
+        
+        # Wolumen ostatnich 20 vs pierwszych 20 świec okna
+        volume_20 = volume.rolling(20).mean()
+        volume_trend = (volume_20 / volume_20.shift(lookback - 20)).values
+        
+        # pct_change w oknie ma lookback-1 wartości
+        volatility = close.pct_change().rolling(lookback - 1).std().values
+        top_decile = close.rolling(lookback).quantile(0.9).values
+        
+        sideways = np.abs(price_change) < 0.05
+        
+        phases = np.select(
+            [
+                sideways & (volume_trend > 1.2) & (volatility < 0.02),
+                (price_change > 0.15) & (volume_trend > 1.0),
+                sideways & (volume_trend > 1.2) & (price > top_decile),
+                price_change < -0.15
+            ],
+            ['ACCUMULATION', 'MARKUP', 'DISTRIBUTION', 'MARKDOWN'],
+            default='NEUTRAL'
+        ).astype(object)
+        phases[:lookback - 1] = 'UNKNOWN'
+        
+        return pd.Series(phases, index=df.index, name='wyckoff_phase')
+    
     def open_range_breakout(self, df: pd.DataFrame, 
                            session_start: int = 0,
                            session_length: int = 30) -> Dict:
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Session Calendar - Killzones / sesje jako prekalkulowane interwały epoch
+
+Granice sesji liczone są raz dla zakresu dni (z uwzględnieniem DST strefy
+czasowej sesji), spłaszczane do nienakładających się segmentów i trzymane
+w posortowanych tablicach int64 (ns). Dzięki temu:
+- current_zone / next_zone to jeden bisect (np.searchsorted)
+- label_index etykietuje cały DatetimeIndex jednym wektorowym wywołaniem
+
+Przy nakładających się strefach wygrywa ta zdefiniowana wcześniej.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from dataclasses import dataclass
+from datetime import datetime
+
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+
+
+@dataclass
+class SessionZone:
+    """Definicja sesji w czasie lokalnym strefy kalendarza"""
+    name: str
+    start: str  # "HH:MM"
+    end: str    # "HH:MM" (koniec wyłączny, end <= start = przejście przez północ)
+    priority: str = 'medium'
+    label: str = ''
+
+    @property
+    def start_minute(self) -> int:
+        hours, minutes = self.start.split(':')
+        return int(hours) * 60 + int(minutes)
+
+    @property
+    def end_minute(self) -> int:
+        hours, minutes = self.end.split(':')
+        return int(hours) * 60 + int(minutes)
+
+
+class SessionCalendar:
+    """
+    Kalendarz sesji z prekalkulowanymi granicami per dzień.
+
+    Czasy bez strefy (naive) traktowane są jako UTC.
+    """
+
+    def __init__(self,
+                 zones: List[SessionZone],
+                 tz: str = 'America/New_York',
+                 off_name: str = 'off_hours',
+                 horizon_days: int = 14):
+        self.zones = list(zones)
+        self.tz = tz
+        self.off_name = off_name
+        self.horizon_days = horizon_days
+
+        # Kod 0 = poza sesjami, kody 1..n = strefy w kolejności definicji
+        self.names = [off_name] + [zone.name for zone in self.zones]
+        self._zone_by_name = {zone.name: zone for zone in self.zones}
+
+        self._first_day: Optional[pd.Timestamp] = None
+        self._last_day: Optional[pd.Timestamp] = None
+        self._covered_ns = (0, -1)
+        self._seg_start = np.empty(0, dtype=np.int64)
+        self._seg_end = np.empty(0, dtype=np.int64)
+        self._seg_code = np.empty(0, dtype=np.int16)
+
+    # ------------------------------------------------------------------
+    # Budowa segmentów
+    # ------------------------------------------------------------------
+
+    def _build(self, first_day: pd.Timestamp, last_day: pd.Timestamp):
+        """Prekalkuluj segmenty sesji dla dni lokalnych [first_day, last_day]"""
+        days = pd.date_range(first_day, last_day, freq='D')
+        n_days = len(days)
+
+        starts, ends, codes = [], [], []
+        for code, zone in enumerate(self.zones, start=1):
+            start_local = days + pd.to_timedelta(zone.start_minute, unit='m')
+            end_offset = zone.end_minute if zone.end_minute > zone.start_minute else zone.end_minute + 24 * 60
+            end_local = days + pd.to_timedelta(end_offset, unit='m')
+
+            starts.append(self._localize(start_local))
+            ends.append(self._localize(end_local))
+            codes.append(np.full(n_days, code, dtype=np.int16))
+
+        starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        ends = np.concatenate(ends) if ends else np.empty(0, dtype=np.int64)
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int16)
+
+        # Spłaszcz do segmentów elementarnych - pierwsza zdefiniowana strefa wygrywa
+        bounds = np.unique(np.concatenate([starts, ends]))
+        if len(bounds) < 2:
+            seg_code = np.empty(0, dtype=np.int16)
+        else:
+            seg_code = np.zeros(len(bounds) - 1, dtype=np.int16)
+            for code in range(len(self.zones), 0, -1):
+                mask = codes == code
+                lo = np.searchsorted(bounds, starts[mask])
+                hi = np.searchsorted(bounds, ends[mask])
+                cover = np.zeros(len(bounds), dtype=np.int32)
+                np.add.at(cover, lo, 1)
+                np.add.at(cover, hi, -1)
+                covered = np.cumsum(cover)[:-1] > 0
+                seg_code[covered] = code
+
+        # Połącz sąsiednie segmenty tej samej strefy, odrzuć off_hours
+        if len(seg_code):
+            change = np.concatenate([[True], seg_code[1:] != seg_code[:-1]])
+            run_starts = np.flatnonzero(change)
+            run_ends = np.concatenate([run_starts[1:], [len(seg_code)]])
+            run_codes = seg_code[run_starts]
+            keep = run_codes != 0
+            self._seg_start = bounds[run_starts[keep]]
+            self._seg_end = bounds[run_ends[keep]]
+            self._seg_code = run_codes[keep]
+        else:
+            self._seg_start = np.empty(0, dtype=np.int64)
+            self._seg_end = np.empty(0, dtype=np.int64)
+            self._seg_code = np.empty(0, dtype=np.int16)
+
+        self._first_day = first_day
+        self._last_day = last_day
+        # Zakres UTC na pewno pokryty (margines dnia na offset strefy)
+        self._covered_ns = (
+            pd.Timestamp(first_day, tz='UTC').value + NS_PER_DAY,
+            pd.Timestamp(last_day, tz='UTC').value - NS_PER_DAY
+        )
+
+    def _localize(self, local_times: pd.DatetimeIndex) -> np.ndarray:
+        """Czas lokalny sesji -> epoch ns (DST: luka przesunięta do przodu, niejednoznaczne = czas letni)"""
+        localized = local_times.tz_localize(
+            self.tz,
+            ambiguous=np.ones(len(local_times), dtype=bool),
+            nonexistent='shift_forward'
+        )
+        return localized.as_unit('ns').asi8
+
+    def _ensure_range(self, min_ns: int, max_ns: int):
+        """Rozszerz prekalkulowany zakres tak, by pokrywał [min_ns, max_ns] + horyzont"""
+        if self._covered_ns[0] <= min_ns and max_ns <= self._covered_ns[1]:
+            return
+
+        first = pd.Timestamp(min_ns, tz='UTC').tz_convert(self.tz).tz_localize(None).normalize() - pd.Timedelta(days=1)
+        last = pd.Timestamp(max_ns, tz='UTC').tz_convert(self.tz).tz_localize(None).normalize() + pd.Timedelta(days=1)
+
+        if self._first_day is not None and self._first_day <= first and last <= self._last_day:
+            return
+
+        if self._first_day is not None:
+            first = min(first, self._first_day)
+            last = max(last, self._last_day)
+
+        self._build(first, last + pd.Timedelta(days=self.horizon_days))
+
+    @staticmethod
+    def _to_ns(when: Union[datetime, pd.Timestamp, None]) -> int:
+        if when is None:
+            return pd.Timestamp.now(tz='UTC').value
+        ts = pd.Timestamp(when)
+        if ts.tzinfo is None:
+            ts = ts.tz_localize('UTC')
+        return ts.value
+
+    # ------------------------------------------------------------------
+    # Zapytania
+    # ------------------------------------------------------------------
+
+    def _segment_info(self, idx: int, now_ns: int) -> Dict:
+        zone = self.zones[self._seg_code[idx] - 1]
+        start = pd.Timestamp(self._seg_start[idx], tz='UTC').tz_convert(self.tz)
+        end = pd.Timestamp(self._seg_end[idx], tz='UTC').tz_convert(self.tz)
+
+        return {
+            'name': zone.name,
+            'label': zone.label or zone.name,
+            'priority': zone.priority,
+            'start': start,
+            'end': end,
+            'minutes_until_start': (self._seg_start[idx] - now_ns) / NS_PER_MINUTE,
+            'minutes_remaining': (self._seg_end[idx] - now_ns) / NS_PER_MINUTE
+        }
+
+    def current_zone(self, when: Union[datetime, pd.Timestamp, None] = None) -> Optional[Dict]:
+        """Aktywna sesja w chwili `when` (None = teraz) albo None poza sesjami"""
+        now_ns = self._to_ns(when)
+        self._ensure_range(now_ns, now_ns)
+
+        idx = int(np.searchsorted(self._seg_start, now_ns, side='right')) - 1
+        if idx >= 0 and now_ns < self._seg_end[idx]:
+            return self._segment_info(idx, now_ns)
+        return None
+
+    def next_zone(self, when: Union[datetime, pd.Timestamp, None] = None) -> Optional[Dict]:
+        """Najbliższa sesja zaczynająca się po `when`"""
+        now_ns = self._to_ns(when)
+        self._ensure_range(now_ns, now_ns)
+
+        idx = int(np.searchsorted(self._seg_start, now_ns, side='right'))
+        if idx >= len(self._seg_start):
+            return None
+        return self._segment_info(idx, now_ns)
+
+    def label_codes(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Kody sesji (0 = off, i = self.names[i]) dla całego indeksu"""
+        index = pd.DatetimeIndex(index)
+        if len(index) == 0:
+            return np.empty(0, dtype=np.int16)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+
+        ns = index.as_unit('ns').asi8
+        self._ensure_range(int(ns.min()), int(ns.max()))
+
+        idx = np.searchsorted(self._seg_start, ns, side='right') - 1
+        valid = idx >= 0
+        inside = np.zeros(len(ns), dtype=bool)
+        inside[valid] = ns[valid] < self._seg_end[idx[valid]]
+
+        codes = np.zeros(len(ns), dtype=np.int16)
+        codes[inside] = self._seg_code[idx[inside]]
+        return codes
+
+    def label_index(self, index: pd.DatetimeIndex) -> pd.Series:
+        """Etykiety sesji dla całego DatetimeIndex (Series kategoryczna)"""
+        codes = self.label_codes(index)
+        labels = pd.Categorical.from_codes(codes, categories=self.names)
+        return pd.Series(labels, index=index, name='session')
+
+    def get_zone(self, name: str) -> Optional[SessionZone]:
+        return self._zone_by_name.get(name)
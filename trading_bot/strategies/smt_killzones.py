@@ -10,6 +10,11 @@ import numpy as np
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+try:
+    from .session_calendar import SessionCalendar, SessionZone
+except ImportError:
+    from session_calendar import SessionCalendar, SessionZone
+
 
 @dataclass
 class SMTSignal:
@@ -216,24 +221,24 @@ class KillzonesManager:
             'ny_pm': {'start': 18, 'end': 21, 'priority': 'medium'},
             'asia': {'start': 1, 'end': 5, 'priority': 'low'}
         }
+        self.calendar = SessionCalendar([
+            SessionZone(name, f"{zone['start']:02d}:00", f"{zone['end']:02d}:00", zone['priority'])
+            for name, zone in self.killzones.items()
+        ], tz='UTC', off_name='chop_hours')
         
     def get_current_killzone(self, current_time: pd.Timestamp = None) -> Dict:
         """
         Określ aktualną killzone
         """
-        if current_time is None:
-            current_time = pd.Timestamp.now(tz='UTC')
-        
-        hour = current_time.hour
+        current = self.calendar.current_zone(current_time)
         
-        for name, zone in self.killzones.items():
-            if zone['start'] <= hour < zone['end']:
-                return {
-                    'name': name,
-                    'priority': zone['priority'],
-                    'active': True,
-                    'recommendation': self._get_recommendation(zone['priority'])
-                }
+        if current is not None:
+            return {
+                'name': current['name'],
+                'priority': current['priority'],
+                'active': True,
+                'recommendation': self._get_recommendation(current['priority'])
+            }
         
         return {
             'name': 'chop_hours',
@@ -266,32 +271,17 @@ class KillzonesManager:
         """
         Kiedy będzie następna killzone?
         """
-        if current_time is None:
-            current_time = pd.Timestamp.now(tz='UTC')
-        
-        hour = current_time.hour
-        
-        # Znajdź następną killzone
-        upcoming = []
-        for name, zone in self.killzones.items():
-            if zone['start'] > hour:
-                hours_until = zone['start'] - hour
-                upcoming.append({
-                    'name': name,
-                    'hours_until': hours_until,
-                    'priority': zone['priority']
-                })
+        upcoming = self.calendar.next_zone(current_time)
         
-        if upcoming:
-            next_zone = min(upcoming, key=lambda x: x['hours_until'])
-            return next_zone
-        else:
-            # Następna killzone jest jutro
-            return {
-                'name': 'london_open',
-                'hours_until': 24 - hour + self.killzones['london_open']['start'],
-                'priority': 'high'
-            }
+        return {
+            'name': upcoming['name'],
+            'hours_until': upcoming['minutes_until_start'] / 60,
+            'priority': upcoming['priority']
+        }
+    
+    def label_index(self, index: pd.DatetimeIndex) -> pd.Series:
+        """Killzone dla każdej świecy (backtesty) - jedno wektorowe wywołanie"""
+        return self.calendar.label_index(index)
 
 
 def demo_smt_killzones():